@@ -1,14 +1,32 @@
+import asyncio
 import logging
+from collections.abc import AsyncIterator, Sequence
+from contextlib import AsyncExitStack, asynccontextmanager
 from typing import Any, cast
 
 import aioboto3  # type: ignore
+from aiobotocore.config import AioConfig  # type: ignore
+from botocore.exceptions import ClientError  # type: ignore
 
 from api.config import Configuration
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_POOL_CONNECTIONS = 10
+# BatchGetItem accepts at most 100 keys per request
+MAX_BATCH_GET_KEYS = 100
+# BatchWriteItem accepts at most 25 requests
+MAX_BATCH_WRITE_ITEMS = 25
+DEFAULT_BATCH_RETRIES = 5
+DEFAULT_RETRY_BACKOFF_SECONDS = 0.05
+
+
+def _error_code(error: ClientError) -> str:
+    return str(error.response.get("Error", {}).get("Code", ""))
+
 
 class DynamoDBClient:
+    # pylint: disable=too-many-instance-attributes
     def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
         self,
         endpoint_url: str | None,
@@ -16,13 +34,18 @@ class DynamoDBClient:
         access_key: str | None,
         secret_key: str | None,
         table_name: str,
+        max_pool_connections: int = DEFAULT_MAX_POOL_CONNECTIONS,
     ) -> None:
         self.__endpoint_url = endpoint_url
         self.__region = region
         self.__access_key = access_key
         self.__secret_key = secret_key
         self.__table_name = table_name
+        self.__max_pool_connections = max_pool_connections
         self.__session = aioboto3.Session()
+        self.__exit_stack: AsyncExitStack | None = None
+        self.__resource: Any = None
+        self.__table: Any = None
 
     @staticmethod
     def create(config: Configuration) -> "DynamoDBClient":
@@ -35,34 +58,103 @@ class DynamoDBClient:
             access_key=config.aws_access_key_id,
             secret_key=config.aws_secret_access_key,
             table_name=config.dynamodb_table,
+            max_pool_connections=config.aws_max_pool_connections,
+        )
+
+    async def start(self) -> "DynamoDBClient":
+        """
+        Opens the long-lived DynamoDB resource and table handle shared by every call.
+        Calls made before start() (or after close()) open a resource per call.
+        """
+        if self.__resource is not None:
+            return self
+
+        exit_stack = AsyncExitStack()
+        resource = await exit_stack.enter_async_context(self.__create_resource())
+        self.__table = await resource.Table(self.__table_name)
+        self.__resource = resource
+        self.__exit_stack = exit_stack
+        return self
+
+    async def close(self) -> None:
+        """
+        Closes the long-lived DynamoDB resource and its connection pool.
+        """
+        exit_stack = self.__exit_stack
+        self.__exit_stack = None
+        self.__resource = None
+        self.__table = None
+        if exit_stack is not None:
+            await exit_stack.aclose()
+
+    def __create_resource(self) -> Any:
+        return self.__session.resource(
+            "dynamodb",
+            endpoint_url=self.__endpoint_url,
+            region_name=self.__region,
+            aws_access_key_id=self.__access_key,
+            aws_secret_access_key=self.__secret_key,
+            config=AioConfig(max_pool_connections=self.__max_pool_connections),
         )
 
-    async def put_item(self, item: dict) -> bool:
+    @asynccontextmanager
+    async def __acquire(self) -> AsyncIterator[tuple[Any, Any]]:
+        """
+        Yields the long-lived resource and table if started,
+        or short-lived ones otherwise.
+        """
+        if self.__resource is not None:
+            yield self.__resource, self.__table
+            return
+
+        async with self.__create_resource() as dynamodb:
+            yield dynamodb, await dynamodb.Table(self.__table_name)
+
+    async def put_item(self, item: dict, if_absent: str | None = None) -> bool:
+        """
+        Puts an item. With if_absent, the name of the key attribute, an existing
+        item is left untouched and False is returned.
+        """
+        request: dict[str, Any] = {"Item": item}
+        if if_absent:
+            request["ConditionExpression"] = "attribute_not_exists(#k)"
+            request["ExpressionAttributeNames"] = {"#k": if_absent}
         try:
-            async with self.__session.resource(
-                "dynamodb",
-                endpoint_url=self.__endpoint_url,
-                region_name=self.__region,
-                aws_access_key_id=self.__access_key,
-                aws_secret_access_key=self.__secret_key,
-            ) as dynamodb:
-                table = await dynamodb.Table(self.__table_name)
-                await table.put_item(Item=item)
+            async with self.__acquire() as (_, table):
+                await table.put_item(**request)
                 return True
+        except ClientError as e:
+            if if_absent and _error_code(e) == "ConditionalCheckFailedException":
+                return False
+            logger.error("Failed to put item: %s", e)
+            raise e
         except Exception as e:
             logger.error("Failed to put item: %s", e)
             raise e
 
+    async def update_item(self, key: dict, attributes: dict[str, Any]) -> bool:
+        """
+        Sets attributes of an item, creating it if needed.
+        """
+        names = {f"#a{i}": name for i, name in enumerate(attributes)}
+        values = {f":v{i}": value for i, value in enumerate(attributes.values())}
+        try:
+            async with self.__acquire() as (_, table):
+                await table.update_item(
+                    Key=key,
+                    UpdateExpression="SET "
+                    + ", ".join(f"#a{i} = :v{i}" for i in range(len(attributes))),
+                    ExpressionAttributeNames=names,
+                    ExpressionAttributeValues=values,
+                )
+                return True
+        except Exception as e:
+            logger.error("Failed to update item in DynamoDB: %s", e)
+            raise e
+
     async def get_item(self, key: dict) -> dict[Any, Any] | None:
         try:
-            async with self.__session.resource(
-                "dynamodb",
-                endpoint_url=self.__endpoint_url,
-                region_name=self.__region,
-                aws_access_key_id=self.__access_key,
-                aws_secret_access_key=self.__secret_key,
-            ) as dynamodb:
-                table = await dynamodb.Table(self.__table_name)
+            async with self.__acquire() as (_, table):
                 response = await table.get_item(Key=key)
                 item = response.get("Item")
                 return cast(dict[Any, Any], item) if item else None
@@ -70,16 +162,120 @@ class DynamoDBClient:
             logger.error("Failed to get item from DynamoDB: %s", e)
             raise e
 
+    async def batch_get_items(
+        self,
+        keys: Sequence[dict],
+        attributes: Sequence[str] | None = None,
+        max_retries: int = DEFAULT_BATCH_RETRIES,
+    ) -> list[dict[Any, Any]]:
+        """
+        Fetches many items in concurrent 100-key BatchGetItem requests.
+        attributes restricts the returned attributes (projection expression).
+        Keys that are missing, or still unprocessed after the retries,
+        are absent from the result.
+        """
+        unique_keys = list({tuple(sorted(k.items())): k for k in keys}.values())
+        request: dict[str, Any] = {}
+        if attributes:
+            names = {f"#a{i}": name for i, name in enumerate(attributes)}
+            request["ProjectionExpression"] = ", ".join(names)
+            request["ExpressionAttributeNames"] = names
+
+        try:
+            async with self.__acquire() as (dynamodb, _):
+                chunks = await asyncio.gather(
+                    *(
+                        self.__batch_get_chunk(
+                            dynamodb,
+                            {
+                                **request,
+                                "Keys": unique_keys[i : i + MAX_BATCH_GET_KEYS],
+                            },
+                            max_retries,
+                        )
+                        for i in range(0, len(unique_keys), MAX_BATCH_GET_KEYS)
+                    )
+                )
+        except Exception as e:
+            logger.error("Failed to batch get items from DynamoDB: %s", e)
+            raise e
+        return [item for chunk in chunks for item in chunk]
+
+    async def __batch_get_chunk(
+        self, dynamodb: Any, request: dict[str, Any], max_retries: int
+    ) -> list[dict[Any, Any]]:
+        items: list[dict[Any, Any]] = []
+        pending: dict[str, Any] | None = request
+        for attempt in range(max_retries + 1):
+            if attempt:
+                await asyncio.sleep(DEFAULT_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+            response = await dynamodb.batch_get_item(
+                RequestItems={self.__table_name: pending}
+            )
+            items.extend(response.get("Responses", {}).get(self.__table_name, []))
+            pending = response.get("UnprocessedKeys", {}).get(self.__table_name)
+            if not pending:
+                return items
+
+        logger.warning(
+            "%s DynamoDB keys still unprocessed after %s retries",
+            len(pending["Keys"]) if pending else 0,
+            max_retries,
+        )
+        return items
+
+    async def batch_write_items(
+        self, items: Sequence[dict], max_retries: int = DEFAULT_BATCH_RETRIES
+    ) -> int:
+        """
+        Puts many items in concurrent 25-item BatchWriteItem requests,
+        retrying the unprocessed ones.
+        Returns the number of items still unprocessed after the retries.
+        """
+        try:
+            async with self.__acquire() as (dynamodb, _):
+                unprocessed = await asyncio.gather(
+                    *(
+                        self.__batch_write_chunk(
+                            dynamodb,
+                            [
+                                {"PutRequest": {"Item": item}}
+                                for item in items[i : i + MAX_BATCH_WRITE_ITEMS]
+                            ],
+                            max_retries,
+                        )
+                        for i in range(0, len(items), MAX_BATCH_WRITE_ITEMS)
+                    )
+                )
+        except Exception as e:
+            logger.error("Failed to batch write items to DynamoDB: %s", e)
+            raise e
+        return sum(unprocessed)
+
+    async def __batch_write_chunk(
+        self, dynamodb: Any, requests: list[dict[str, Any]], max_retries: int
+    ) -> int:
+        pending = requests
+        for attempt in range(max_retries + 1):
+            if attempt:
+                await asyncio.sleep(DEFAULT_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+            response = await dynamodb.batch_write_item(
+                RequestItems={self.__table_name: pending}
+            )
+            pending = response.get("UnprocessedItems", {}).get(self.__table_name, [])
+            if not pending:
+                return 0
+
+        logger.warning(
+            "%s DynamoDB items still unprocessed after %s retries",
+            len(pending),
+            max_retries,
+        )
+        return len(pending)
+
     async def delete_item(self, key: dict) -> bool:
         try:
-            async with self.__session.resource(
-                "dynamodb",
-                endpoint_url=self.__endpoint_url,
-                region_name=self.__region,
-                aws_access_key_id=self.__access_key,
-                aws_secret_access_key=self.__secret_key,
-            ) as dynamodb:
-                table = await dynamodb.Table(self.__table_name)
+            async with self.__acquire() as (_, table):
                 await table.delete_item(Key=key)
                 return True
         except Exception as e:
@@ -1,32 +1,121 @@
+from collections.abc import AsyncIterator
 from typing import Any, cast
 
 import redis.asyncio as redis  # type: ignore
 
 from api.config import Configuration
 
+DEFAULT_MAX_CONNECTIONS = 50
+
 
 class RedisClient:
-    def __init__(self, host: str, port: int, db: int = 0):
-        self.__client = redis.Redis(host=host, port=port, db=db)
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        db: int = 0,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    ):
+        self.__client = redis.Redis(
+            host=host, port=port, db=db, max_connections=max_connections
+        )
+        self.__db = db
 
     @staticmethod
-    def create(config: Configuration) -> "RedisClient":
+    def create(
+        config: Configuration, max_connections: int | None = None
+    ) -> "RedisClient":
         """
-        Creates a RedisClient instance from the configuration.
+        Creates a RedisClient instance from the configuration, with a pool of
+        max_connections connections (REDIS_MAX_CONNECTIONS by default).
         """
-        return RedisClient(host=config.redis_host, port=config.redis_port)
+        return RedisClient(
+            host=config.redis_host,
+            port=config.redis_port,
+            max_connections=max_connections or config.redis_max_connections,
+        )
 
     async def set(self, key: str, value: Any, ex: int | None = None) -> None:
         await self.__client.set(key, value, ex=ex)
 
+    async def set_if_absent(self, key: str, value: Any, ex: int | None = None) -> bool:
+        """
+        Sets a key that does not exist yet, returning whether it was set.
+        """
+        return bool(await self.__client.set(key, value, ex=ex, nx=True))
+
     async def get(self, key: str) -> str | None:
         value = await self.__client.get(key)
         if value is None:
             return None
         return value.decode("utf-8")
 
+    async def mset(self, mapping: dict[str, Any]) -> None:
+        await self.__client.mset(mapping)
+
+    async def mget(self, keys: list[str]) -> list[str | None]:
+        values = await self.__client.mget(keys)
+        return [None if value is None else value.decode("utf-8") for value in values]
+
+    async def delete(self, key: str) -> None:
+        await self.__client.delete(key)
+
+    async def zrem(self, key: str, members: list[str]) -> int:
+        return cast(int, await self.__client.zrem(key, *members))
+
+    async def eval(self, script: str, keys: list[str], args: list[Any]) -> Any:
+        """
+        Runs a Lua script atomically, cached server-side by its SHA1.
+        """
+        return await self.__client.register_script(script)(keys=keys, args=args)
+
     async def incr(self, key: str, amount: int = 1) -> int:
         return cast(int, await self.__client.incrby(key, amount))
 
     async def decr(self, key: str, amount: int = 1) -> int:
         return cast(int, await self.__client.decrby(key, amount))
+
+    async def publish(self, channel: str, message: str) -> int:
+        return cast(int, await self.__client.publish(channel, message))
+
+    async def subscribe(self, channel: str) -> AsyncIterator[str]:
+        """
+        Yields the messages published on a channel until the caller stops iterating.
+        """
+        pubsub = self.__client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(channel)
+            async for message in pubsub.listen():
+                yield message["data"].decode("utf-8")
+        finally:
+            await pubsub.aclose()
+
+    async def subscribe_many(
+        self, channels: list[str]
+    ) -> AsyncIterator[tuple[str, str]]:
+        """
+        Yields (channel, message) for the messages published on several channels
+        until the caller stops iterating.
+        """
+        pubsub = self.__client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(*channels)
+            async for message in pubsub.listen():
+                yield message["channel"].decode("utf-8"), message["data"].decode(
+                    "utf-8"
+                )
+        finally:
+            await pubsub.aclose()
+
+    def keyspace_channel(self, key: str) -> str:
+        """
+        Returns the channel of the keyspace notifications of a key, which Redis
+        only publishes when notify-keyspace-events is enabled.
+        """
+        return f"__keyspace@{self.__db}__:{key}"
+
+    async def close(self) -> None:
+        """
+        Closes the client and disconnects its connection pool.
+        """
+        await self.__client.aclose()
@@ -5,13 +5,24 @@ from shared.config import Configuration as BaseConfiguration
 
 
 @dataclass
-class Configuration(BaseConfiguration):
+class Configuration(BaseConfiguration):  # pylint: disable=too-many-instance-attributes
     """
     API-specific configuration.
     """
 
     deletion_queue_url: str
     opensearch_url: str
+    redis_max_connections: int
+    opensearch_max_connections: int
+    search_highlight_fragment_size: int
+    search_highlight_fragments: int
+    search_cache_ttl: int
+    idempotency_ttl: int
+    rate_limit_requests: int
+    rate_limit_window: int
+    max_inflight_scrapings: int
+    inflight_scraping_ttl: int
+    sse_max_streams: int
 
     @classmethod
     def from_env(cls) -> "Configuration":
@@ -24,6 +35,7 @@ class Configuration(BaseConfiguration):
             aws_region=os.getenv("AWS_REGION", "us-east-1"),
             aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID", "test"),
             aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY", "test"),
+            aws_max_pool_connections=int(os.getenv("AWS_MAX_POOL_CONNECTIONS", "10")),
             sqs_queue_url=os.getenv(
                 "SQS_QUEUE_URL",
                 "http://localstack:4566/000000000000/scraper-queue",
@@ -41,6 +53,23 @@ class Configuration(BaseConfiguration):
                 "http://localstack:4566/000000000000/deletion-queue",
             ),
             opensearch_url=os.getenv("OPENSEARCH_URL", "http://opensearch:9200"),
+            redis_max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "50")),
+            opensearch_max_connections=int(
+                os.getenv("OPENSEARCH_MAX_CONNECTIONS", "25")
+            ),
+            search_highlight_fragment_size=int(
+                os.getenv("SEARCH_HIGHLIGHT_FRAGMENT_SIZE", "150")
+            ),
+            search_highlight_fragments=int(
+                os.getenv("SEARCH_HIGHLIGHT_FRAGMENTS", "3")
+            ),
+            search_cache_ttl=int(os.getenv("SEARCH_CACHE_TTL", "30")),
+            idempotency_ttl=int(os.getenv("IDEMPOTENCY_TTL", "86400")),
+            rate_limit_requests=int(os.getenv("RATE_LIMIT_REQUESTS", "120")),
+            rate_limit_window=int(os.getenv("RATE_LIMIT_WINDOW", "60")),
+            max_inflight_scrapings=int(os.getenv("MAX_INFLIGHT_SCRAPINGS", "20")),
+            inflight_scraping_ttl=int(os.getenv("INFLIGHT_SCRAPING_TTL", "21600")),
+            sse_max_streams=int(os.getenv("SSE_MAX_STREAMS", "100")),
         )
 
 
@@ -1,8 +1,11 @@
+import asyncio
 import hashlib
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack, asynccontextmanager, suppress
 from datetime import datetime, timezone
 from typing import cast
 
-from fastapi import Depends, HTTPException, Security, status
+from fastapi import Depends, FastAPI, HTTPException, Request, Security, status
 from fastapi.security import APIKeyHeader
 
 from api.clients.dynamodb_client import DynamoDBClient
@@ -12,27 +15,84 @@ from api.config import Configuration
 from api.models import APIKey
 from api.repositories.db_repository import DbRepository
 from api.repositories.search_repository import SearchRepository
+from api.services.api_key_cache import INVALID_API_KEY, APIKeyCache
+from api.services.api_key_usage import APIKeyUsageRecorder
 from api.services.db_service import DbService
+from api.services.idempotency import IdempotencyStore
+from api.services.job_quota import JobQuota
+from api.services.rate_limiter import RateLimiter, RateLimitExceededError
 from api.services.scraper_service import ScraperService
+from api.services.scraping_cache import ScrapingCache
 from api.services.search_service import SearchService
+from api.services.stream_limiter import StreamLimiter
 
 config = Configuration.from_env()
 
 API_KEY_HEADER = APIKeyHeader(name="X-API-Key", auto_error=False)
 
 
-def get_sqs_client() -> SQSClient:
+@asynccontextmanager
+async def open_clients(app: FastAPI) -> AsyncIterator[None]:
     """
-    Creates and returns an SQSClient instance configured with environment variables.
+    Creates the long-lived, connection-pooled clients shared by every request,
+    exposes them on app.state and closes them when the application shuts down.
     """
-    return SQSClient.create(config)
+    async with AsyncExitStack() as stack:
+        sqs_client = await stack.enter_async_context(SQSClient.create(config))
 
+        dynamodb_client = await DynamoDBClient.create(config).start()
+        stack.push_async_callback(dynamodb_client.close)
 
-def get_dynamodb_client() -> DynamoDBClient:
+        redis_client = RedisClient.create(config)
+        stack.push_async_callback(redis_client.close)
+
+        # Event streams hold a pub/sub connection each: they get a pool of their
+        # own, sized to their cap, so that they cannot starve the other requests
+        pubsub_client = RedisClient.create(
+            config, max_connections=config.sse_max_streams
+        )
+        stack.push_async_callback(pubsub_client.close)
+
+        search_repository = SearchRepository(config)
+        stack.push_async_callback(search_repository.close)
+
+        api_key_cache = APIKeyCache(redis_client)
+        listener = asyncio.create_task(api_key_cache.listen())
+        stack.push_async_callback(_cancel, listener)
+
+        api_key_usage = APIKeyUsageRecorder(DbRepository())
+        flusher = asyncio.create_task(api_key_usage.run())
+        stack.push_async_callback(_cancel, flusher)
+
+        app.state.sqs_client = sqs_client
+        app.state.dynamodb_client = dynamodb_client
+        app.state.redis_client = redis_client
+        app.state.pubsub_client = pubsub_client
+        app.state.stream_limiter = StreamLimiter(config.sse_max_streams)
+        app.state.search_repository = search_repository
+        app.state.api_key_cache = api_key_cache
+        app.state.api_key_usage = api_key_usage
+        yield
+
+
+async def _cancel(task: asyncio.Task) -> None:
+    task.cancel()
+    with suppress(asyncio.CancelledError):
+        await task
+
+
+def get_sqs_client(request: Request) -> SQSClient:
+    """
+    Returns the process-wide, connection-pooled SQSClient.
+    """
+    return cast(SQSClient, request.app.state.sqs_client)
+
+
+def get_dynamodb_client(request: Request) -> DynamoDBClient:
     """
-    Creates and returns a DynamoDBClient instance configured with environment variables.
+    Returns the process-wide DynamoDBClient with its persistent table handle.
     """
-    return DynamoDBClient.create(config)
+    return cast(DynamoDBClient, request.app.state.dynamodb_client)
 
 
 def get_db_repository() -> DbRepository:
@@ -42,29 +102,87 @@ def get_db_repository() -> DbRepository:
     return DbRepository()
 
 
-def get_search_repository() -> SearchRepository:
+def get_search_repository(request: Request) -> SearchRepository:
+    """
+    Returns the process-wide SearchRepository and its OpenSearch connection pool.
+    """
+    return cast(SearchRepository, request.app.state.search_repository)
+
+
+def get_redis_client(request: Request) -> RedisClient:
+    """
+    Returns the process-wide RedisClient and its connection pool.
+    """
+    return cast(RedisClient, request.app.state.redis_client)
+
+
+def get_pubsub_client(request: Request) -> RedisClient:
+    """
+    Returns the process-wide RedisClient of the event streams' subscriptions.
+    """
+    return cast(RedisClient, request.app.state.pubsub_client)
+
+
+def get_stream_limiter(request: Request) -> StreamLimiter:
+    """
+    Returns the process-wide cap on the open event streams.
+    """
+    return cast(StreamLimiter, request.app.state.stream_limiter)
+
+
+def get_api_key_cache(request: Request) -> APIKeyCache:
+    """
+    Returns the process-wide two-tier API key cache.
+    """
+    return cast(APIKeyCache, request.app.state.api_key_cache)
+
+
+def get_api_key_usage(request: Request) -> APIKeyUsageRecorder:
     """
-    Creates and returns a SearchRepository instance for OpenSearch.
+    Returns the process-wide recorder of API key usage.
     """
-    return SearchRepository(config)
+    return cast(APIKeyUsageRecorder, request.app.state.api_key_usage)
 
 
-def get_redis_client() -> RedisClient:
+def get_job_quota(
+    redis_client: RedisClient = Depends(get_redis_client),
+) -> JobQuota:
     """
-    Dependency to get the Redis client.
+    Dependency to get the cap on the in-flight scrapings of each user.
     """
-    return RedisClient.create(config)
+    return JobQuota(
+        redis_client,
+        max_inflight=config.max_inflight_scrapings,
+        stale_after=config.inflight_scraping_ttl,
+    )
 
 
+def get_rate_limiter(
+    redis_client: RedisClient = Depends(get_redis_client),
+) -> RateLimiter:
+    """
+    Dependency to get the limit on the requests of each API key.
+    """
+    return RateLimiter(
+        redis_client,
+        limit=config.rate_limit_requests,
+        window=config.rate_limit_window,
+    )
+
+
+# pylint: disable-next=too-many-arguments,too-many-positional-arguments
 def get_scraper_service(
     sqs_client: SQSClient = Depends(get_sqs_client),
     redis_client: RedisClient = Depends(get_redis_client),
     dynamodb_client: DynamoDBClient = Depends(get_dynamodb_client),
     db_repository: DbRepository = Depends(get_db_repository),
+    job_quota: JobQuota = Depends(get_job_quota),
+    pubsub_client: RedisClient = Depends(get_pubsub_client),
 ) -> ScraperService:
     """
     Dependency provider for ScraperService.
-    Requires SQSClient, RedisClient, DynamoDBClient, DbRepository.
+    Requires SQSClient, RedisClient, DynamoDBClient, DbRepository, JobQuota and
+    the pub/sub RedisClient.
     """
     return ScraperService(
         sqs_client,
@@ -72,6 +190,8 @@ def get_scraper_service(
         db_repository,
         dynamodb_client,
         config.deletion_queue_url,
+        job_quota,
+        pubsub_client,
     )
 
 
@@ -86,20 +206,46 @@ def get_db_service(
 
 def get_search_service(
     repository: SearchRepository = Depends(get_search_repository),
+    redis_client: RedisClient = Depends(get_redis_client),
 ) -> SearchService:
     """
-    Dependency to get the search service.
+    Dependency to get the search service, caching result pages in Redis.
+    """
+    return SearchService(
+        repository,
+        redis_client,
+        cache_ttl=config.search_cache_ttl,
+        fragment_size=config.search_highlight_fragment_size,
+        fragments=config.search_highlight_fragments,
+    )
+
+
+def get_scraping_cache(
+    redis_client: RedisClient = Depends(get_redis_client),
+) -> ScrapingCache:
+    """
+    Dependency to get the cache of completed scraping responses.
     """
-    return SearchService(repository)
+    return ScrapingCache(redis_client)
+
+
+def get_idempotency_store(
+    redis_client: RedisClient = Depends(get_redis_client),
+) -> IdempotencyStore:
+    """
+    Dependency to get the store of Idempotency-Key results.
+    """
+    return IdempotencyStore(redis_client, ttl=config.idempotency_ttl)
 
 
 async def get_api_key(
     api_key_header: str | None = Security(API_KEY_HEADER),
-    redis_client: RedisClient = Depends(get_redis_client),
+    api_key_cache: APIKeyCache = Depends(get_api_key_cache),
+    api_key_usage: APIKeyUsageRecorder = Depends(get_api_key_usage),
 ) -> APIKey:
     """
     Validates the API key from the header.
-    Uses Redis for caching and Postgres as the source of truth.
+    Uses the in-process and Redis caches, and Postgres as the source of truth.
     """
     if not api_key_header:
         raise HTTPException(
@@ -109,17 +255,23 @@ async def get_api_key(
 
     # Hash the key to look it up
     hashed_key = hashlib.sha256(api_key_header.encode()).hexdigest()
-    cache_key = f"auth:key:{hashed_key}"
 
-    # 1. Try Redis Cache
-    cached_val = await redis_client.get(cache_key)
+    # 1. Try the caches
+    cached_val = await api_key_cache.get(hashed_key)
+    if cached_val == INVALID_API_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid API Key",
+        )
     if cached_val:
         # Format: "name:user_id"
         try:
             name, user_id_str = cached_val.split(":", 1)
+            user_id = int(user_id_str)
+            api_key_usage.record(hashed_key)
             return APIKey(
                 name=name,
-                user_id=int(user_id_str),
+                user_id=user_id,
                 hashed_key=hashed_key,
                 is_active=True,
             )
@@ -130,6 +282,7 @@ async def get_api_key(
     # 2. Try Database
     api_key = await APIKey.filter(hashed_key=hashed_key, is_active=True).first()
     if not api_key:
+        await api_key_cache.set_invalid(hashed_key)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid API Key",
@@ -137,16 +290,38 @@ async def get_api_key(
 
     # Check expiration
     if api_key.expires_at and api_key.expires_at < datetime.now(timezone.utc):
+        await api_key_cache.set_invalid(hashed_key)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="API Key expired",
         )
 
-    # 3. Cache it for 5 minutes
+    # 3. Cache it until it expires, for 5 minutes at most
     # Store as "name:user_id"
-    await redis_client.set(cache_key, f"{api_key.name}:{api_key.user_id}", ex=300)
+    ttl = None
+    if api_key.expires_at:
+        ttl = int((api_key.expires_at - datetime.now(timezone.utc)).total_seconds())
+    await api_key_cache.set(hashed_key, f"{api_key.name}:{api_key.user_id}", ttl=ttl)
 
-    # Update last_used_at (Asynchronous fire-and-forget or background
-    # task would be better)
-    # For now, let's just update it periodically or skip to keep it fast
+    # last_used_at and request_count are written behind, in bulk
+    api_key_usage.record(hashed_key)
     return cast(APIKey, api_key)
+
+
+async def get_rate_limited_api_key(
+    api_key: APIKey = Depends(get_api_key),
+    rate_limiter: RateLimiter = Depends(get_rate_limiter),
+) -> APIKey:
+    """
+    Validates the API key from the header and counts the request against
+    the rate limit of the key.
+    """
+    try:
+        await rate_limiter.check(api_key.hashed_key)
+    except RateLimitExceededError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        ) from e
+    return api_key
@@ -1,26 +1,94 @@
-from typing import TypedDict
+import json
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any, TypedDict
 
-from fastapi import Depends, FastAPI, HTTPException
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from tortoise.contrib.fastapi import register_tortoise  # pylint: disable=import-error
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
+from starlette.background import BackgroundTask
+from tortoise import Tortoise, connections  # pylint: disable=import-error
+from tortoise.exceptions import (  # pylint: disable=import-error
+    DoesNotExist,
+    IntegrityError,
+)
 
 from api.config import Configuration
 from api.dependencies import (
-    get_api_key,
+    get_idempotency_store,
+    get_rate_limited_api_key,
     get_scraper_service,
+    get_scraping_cache,
     get_search_service,
+    get_stream_limiter,
+    open_clients,
 )
 from api.models import APIKey
+from api.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    decode_search_cursor,
+    encode_cursor,
+    encode_search_cursor,
+)
+from api.repositories.db_repository import ScrapedPageRecord
+from api.services.idempotency import (
+    IdempotencyKeyInProgressError,
+    IdempotencyKeyReusedError,
+    IdempotencyStore,
+    fingerprint,
+)
+from api.services.job_quota import BatchTooLargeError, QuotaExceededError
 from api.services.scraper_service import (
     FullScrapingRecord,
     NotAuthorizedError,
+    ProgressEvent,
     ScraperService,
     ScrapingNotFoundError,
 )
+from api.services.scraping_cache import CachedResponse, ScrapingCache, compute_etag
 from api.services.search_service import SearchPageResult, SearchService
+from api.services.stream_limiter import (
+    StreamLimiter,
+    StreamLimitExceededError,
+    StreamSlot,
+)
+
+MAX_PAGE_SIZE = 100
+MAX_BATCH_SCRAPES = 10_000
+# Retry-After of the event streams refused while all of their slots are taken
+STREAM_RETRY_AFTER_SECONDS = 5
+
+
+def get_database_url(config: Configuration) -> str:
+    """
+    Returns the database URL with the connection pool settings appended.
+    """
+    db_url = config.database_url
+    separator = "&" if "?" in db_url else "?"
+    return f"{db_url}{separator}minsize=10&maxsize=50"
+
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(application: FastAPI) -> AsyncIterator[None]:
+    """
+    Opens the Tortoise ORM connection pool and the shared clients on startup,
+    and closes them on shutdown.
+    """
+    await Tortoise.init(
+        db_url=get_database_url(Configuration.from_env()),
+        modules={"models": ["api.models"]},
+    )
+    try:
+        async with open_clients(application):
+            yield
+    finally:
+        await connections.close_all()
+
+
+app = FastAPI(lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -31,14 +99,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Idempotent-Replayed", "Retry-After"],
 )
 
 
-class ScrapeRequest(BaseModel):
+class ScrapeJob(BaseModel):
     url: str
     depth: int = 1
 
 
+class ScrapeRequest(ScrapeJob):
+    # Seconds within which a completed scraping of the same URL and depth is reused
+    max_age: int | None = Field(None, ge=0)
+
+
+class ScrapeBatchRequest(BaseModel):
+    scrapes: list[ScrapeJob] = Field(min_length=1, max_length=MAX_BATCH_SCRAPES)
+
+
 class MessageResponse(TypedDict):
     message: str
 
@@ -46,7 +124,8 @@ class MessageResponse(TypedDict):
 class ScrapingsMeta(TypedDict):
     page: int
     size: int
-    total: int
+    total: int | None
+    next_cursor: str | None
 
 
 class ScrapingsResponse(TypedDict):
@@ -56,6 +135,7 @@ class ScrapingsResponse(TypedDict):
 
 class SearchResponse(TypedDict):
     results: list[SearchPageResult]
+    next_cursor: str | None
 
 
 class StatusResponse(TypedDict):
@@ -66,10 +146,21 @@ class ScrapeResponse(TypedDict):
     scraping_id: int
 
 
+class ScrapeBatchResponse(TypedDict):
+    scraping_ids: list[int]
+    # Created but not enqueued, so they will not be scraped
+    failed_ids: list[int]
+
+
 class ScrapingResponse(TypedDict):
     scraping: FullScrapingRecord
 
 
+class ScrapingPagesResponse(TypedDict):
+    pages: list[ScrapedPageRecord]
+    next_cursor: str | None
+
+
 @app.get("/health")
 async def health_check() -> StatusResponse:
     return {"status": "ok"}
@@ -78,67 +169,314 @@ async def health_check() -> StatusResponse:
 @app.post("/scrape")
 async def scrape(
     request: ScrapeRequest,
+    response: Response,
     scraper_service: ScraperService = Depends(get_scraper_service),
-    _api_key: APIKey = Depends(get_api_key),
+    idempotency: IdempotencyStore = Depends(get_idempotency_store),
+    _api_key: APIKey = Depends(get_rate_limited_api_key),
+    idempotency_key: str | None = Header(
+        None, alias="Idempotency-Key", min_length=1, max_length=255
+    ),
+) -> ScrapeResponse:
+    """
+    Starts a scraping job. Requests repeated with the same Idempotency-Key
+    return the job started by the first one instead of starting another.
+    With max_age, the results of a scraping of the same URL and depth completed
+    within the last max_age seconds are reused instead of scraping again.
+    """
+    # Extract user_id from the APIKey dependency
+    user_id = _api_key.user_id if _api_key else None
+    if idempotency_key is None:
+        return await _start_scraping(scraper_service, request, user_id)
+
+    request_fingerprint = fingerprint(request.url, request.depth, request.max_age)
+    try:
+        scraping_id = await idempotency.claim(
+            user_id, idempotency_key, request_fingerprint
+        )
+    except IdempotencyKeyReusedError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+    except IdempotencyKeyInProgressError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+    if scraping_id is not None:
+        response.headers["Idempotent-Replayed"] = "true"
+        return {"scraping_id": scraping_id}
+
+    try:
+        result = await _start_scraping(scraper_service, request, user_id)
+    except BaseException:
+        await idempotency.release(user_id, idempotency_key)
+        raise
+    await idempotency.complete(
+        user_id, idempotency_key, request_fingerprint, result["scraping_id"]
+    )
+    return result
+
+
+def _too_many_requests(error: QuotaExceededError) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=str(error),
+        headers={"Retry-After": str(error.retry_after)},
+    )
+
+
+async def _start_scraping(
+    scraper_service: ScraperService, request: ScrapeRequest, user_id: int | None
 ) -> ScrapeResponse:
     try:
-        # Extract user_id from the APIKey dependency
-        user_id = _api_key.user_id if _api_key else None
         scraping_id = await scraper_service.start_scraping(
-            request.url, request.depth, user_id
+            request.url, request.depth, user_id, request.max_age
         )
         return {"scraping_id": scraping_id}
     except HTTPException:
         raise
+    except QuotaExceededError as e:
+        raise _too_many_requests(e) from e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+@app.post("/scrape/batch")
+async def scrape_batch(
+    request: ScrapeBatchRequest,
+    scraper_service: ScraperService = Depends(get_scraper_service),
+    _api_key: APIKey = Depends(get_rate_limited_api_key),
+) -> ScrapeBatchResponse:
+    """
+    Starts one scraping job per requested URL, with set-based writes.
+    Returns the IDs of the jobs in the order of the request.
+    Batches larger than the in-flight cap are refused with 422.
+    """
+    try:
+        user_id = _api_key.user_id if _api_key else None
+        scraping_ids, failed_ids = await scraper_service.start_scrapings(
+            [(scrape.url, scrape.depth) for scrape in request.scrapes], user_id
+        )
+        return {"scraping_ids": scraping_ids, "failed_ids": failed_ids}
+    except HTTPException:
+        raise
+    except BatchTooLargeError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+    except QuotaExceededError as e:
+        raise _too_many_requests(e) from e
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
-@app.get("/scraping/{scraping_id}")
+@app.get("/scraping/{scraping_id}", response_model=ScrapingResponse)
 async def scraping(
+    scraping_id: int,
+    request: Request,
+    service: ScraperService = Depends(get_scraper_service),
+    cache: ScrapingCache = Depends(get_scraping_cache),
+    _api_key: APIKey = Depends(get_rate_limited_api_key),
+) -> Response:
+    """
+    Returns a scraping with its results, with a strong ETag.
+    Completed scrapings are served from Redis until the version of their
+    results is bumped; a matching If-None-Match is answered with 304.
+    """
+    version, cached = await cache.get(scraping_id)
+    if cached is None:
+        source_id = scraping_id
+        try:
+            full_scraping = await service.get_full_scraping(scraping_id)
+            if not full_scraping:
+                raise HTTPException(status_code=404, detail="Scraping not found")
+
+            pages = []
+            if full_scraping["status"] == "COMPLETED":
+                source_id = await service.get_results_scraping_id(scraping_id)
+                # An alias is cached against the version of its source's
+                # results, read before the results themselves
+                if version is not None and source_id != scraping_id:
+                    version = await cache.version(source_id)
+                pages = await service.get_scraping_results(scraping_id)
+
+            full_scraping["pages"] = pages
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e)) from e
+
+        body = JSONResponse(jsonable_encoder({"scraping": full_scraping})).body
+        cached = {"etag": compute_etag(body), "body": body.decode("utf-8")}
+        if version is not None and full_scraping["status"] == "COMPLETED":
+            await cache.set(scraping_id, version, cached, source_id)
+
+    return _conditional_response(request, cached)
+
+
+def _conditional_response(request: Request, cached: CachedResponse) -> Response:
+    headers = {"ETag": cached["etag"], "Cache-Control": "private, no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), cached["etag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=cached["body"], media_type="application/json", headers=headers
+    )
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+@app.get("/scraping/{scraping_id}/results")
+async def scraping_results(
     scraping_id: int,
     service: ScraperService = Depends(get_scraper_service),
-    _api_key: APIKey = Depends(get_api_key),
-) -> ScrapingResponse:
+    _api_key: APIKey = Depends(get_rate_limited_api_key),
+) -> StreamingResponse:
+    """
+    Streams the results of a scraping as NDJSON, one scraped page per line,
+    reading them from the database batch by batch.
+    """
     try:
-        full_scraping = await service.get_full_scraping(scraping_id)
-        if not full_scraping:
-            raise HTTPException(status_code=404, detail="Scraping not found")
+        await service.check_ownership(scraping_id, _api_key.user_id)
+    except ScrapingNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    except NotAuthorizedError as e:
+        raise HTTPException(status_code=403, detail=str(e)) from e
 
-        pages = []
-        if full_scraping["status"] == "COMPLETED":
-            pages = await service.get_scraping_results(scraping_id)
+    return StreamingResponse(
+        _ndjson(service.stream_scraping_results(scraping_id)),
+        media_type="application/x-ndjson",
+    )
 
-        full_scraping["pages"] = pages
-        return {"scraping": full_scraping}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) from e
+
+@app.get("/scraping/{scraping_id}/events")
+async def scraping_events(
+    scraping_id: int,
+    service: ScraperService = Depends(get_scraper_service),
+    limiter: StreamLimiter = Depends(get_stream_limiter),
+    _api_key: APIKey = Depends(get_rate_limited_api_key),
+) -> StreamingResponse:
+    """
+    Streams the progress of a scraping as Server-Sent Events until it completes,
+    in place of polling GET /scraping/{scraping_id}.
+    Answers 503 while the API already serves SSE_MAX_STREAMS streams.
+    """
+    try:
+        await service.check_ownership(scraping_id, _api_key.user_id)
+    except ScrapingNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    except NotAuthorizedError as e:
+        raise HTTPException(status_code=403, detail=str(e)) from e
+
+    try:
+        slot = limiter.acquire()
+    except StreamLimitExceededError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(STREAM_RETRY_AFTER_SECONDS)},
+        ) from e
+
+    return StreamingResponse(
+        _sse(service.stream_progress(scraping_id), slot),
+        media_type="text/event-stream",
+        # Keep reverse proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Frees the slot of a client gone before the stream started
+        background=BackgroundTask(slot.release),
+    )
+
+
+async def _sse(
+    events: AsyncIterator[ProgressEvent], slot: StreamSlot
+) -> AsyncIterator[str]:
+    try:
+        async for event in events:
+            yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+    finally:
+        slot.release()
+
+
+@app.get("/scraping/{scraping_id}/pages")
+async def scraping_pages(
+    scraping_id: int,
+    cursor: str | None = None,
+    size: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    service: ScraperService = Depends(get_scraper_service),
+    _api_key: APIKey = Depends(get_rate_limited_api_key),
+) -> ScrapingPagesResponse:
+    """
+    Lists the results of a scraping one page at a time, in crawl order.
+    Pass the returned next_cursor to get the following page.
+    """
+    after_id = _decode_cursor(cursor)
+    try:
+        await service.check_ownership(scraping_id, _api_key.user_id)
+    except ScrapingNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    except NotAuthorizedError as e:
+        raise HTTPException(status_code=403, detail=str(e)) from e
+
+    pages, next_after_id = await service.get_scraping_results_page(
+        scraping_id, after_id=after_id, limit=size
+    )
+    return {
+        "pages": pages,
+        "next_cursor": None if next_after_id is None else encode_cursor(next_after_id),
+    }
+
+
+def _decode_cursor(cursor: str | None) -> int | None:
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+async def _ndjson(records: AsyncIterator[Any]) -> AsyncIterator[str]:
+    async for record in records:
+        yield json.dumps(record) + "\n"
 
 
 @app.get("/scrapings")
-async def scrapings(
-    page: int = 1,
-    size: int = 10,
+async def scrapings(  # pylint: disable=too-many-arguments
+    page: int = Query(1, ge=1),
+    size: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    include_total: bool = False,
     service: ScraperService = Depends(get_scraper_service),
-    _api_key: APIKey = Depends(get_api_key),
+    _api_key: APIKey = Depends(get_rate_limited_api_key),
 ) -> ScrapingsResponse:
     """
-    List scrapings for the authenticated user.
+    List scrapings for the authenticated user, newest first.
+    Pass the returned next_cursor to get the following page in constant time;
+    `page` is only used without a cursor. The exact total is opt-in.
     """
     if not _api_key.user_id:
         # Should be handled by get_api_key usually, but for safety
         raise HTTPException(status_code=401, detail="User context required")
 
+    before_id = _decode_cursor(cursor)
     try:
-        offset = (page - 1) * size
-        full_scrapings, total = await service.get_full_scrapings(
-            user_id=_api_key.user_id, offset=offset, limit=size
+        offset = 0 if before_id is not None else (page - 1) * size
+        full_scrapings, total, next_before_id = await service.get_full_scrapings(
+            user_id=_api_key.user_id,
+            offset=offset,
+            limit=size,
+            include_total=include_total,
+            before_id=before_id,
         )
+        next_cursor = None if next_before_id is None else encode_cursor(next_before_id)
         return {
             "scrapings": full_scrapings,
-            "meta": {"page": page, "size": size, "total": total},
+            "meta": {
+                "page": page,
+                "size": size,
+                "total": total,
+                "next_cursor": next_cursor,
+            },
         }
     except HTTPException:
         raise
@@ -149,46 +487,65 @@ async def scrapings(
 @app.get("/search")
 async def search(
     t: str,
-    _api_key: APIKey = Depends(get_api_key),
+    size: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    _api_key: APIKey = Depends(get_rate_limited_api_key),
     search_service: SearchService = Depends(get_search_service),
 ) -> SearchResponse:
+    """
+    Full-text search across the user's pages, best matches first.
+    Pass the returned next_cursor to get the following page.
+    """
     if not t:
         raise HTTPException(status_code=400, detail="Search term 't' is required")
 
+    search_after = None
+    if cursor is not None:
+        try:
+            search_after = decode_search_cursor(cursor)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+
     try:
-        results = await search_service.search_pages(t, _api_key.user_id)
-        return {"results": results}
+        page = await search_service.search_pages(
+            t, _api_key.user_id, size=size, search_after=search_after
+        )
+        next_search_after = page["next_search_after"]
+        return {
+            "results": page["results"],
+            "next_cursor": (
+                None
+                if next_search_after is None
+                else encode_search_cursor(next_search_after)
+            ),
+        }
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
-def setup_database(application: FastAPI) -> None:
-    # Tortoise ORM Init with Connection Pooling
-    config = Configuration.from_env()
-    db_url = config.database_url
-    # Append connection pool settings
-    separator = "&" if "?" in db_url else "?"
-    db_url += f"{separator}minsize=10&maxsize=50"
-
-    register_tortoise(
-        application,
-        db_url=db_url,
-        modules={"models": ["api.models"]},
-        generate_schemas=False,
-        add_exception_handlers=True,
-    )
+@app.exception_handler(DoesNotExist)
+async def does_not_exist_handler(_request: Request, exc: DoesNotExist) -> JSONResponse:
+    return JSONResponse(status_code=404, content={"detail": str(exc)})
 
 
-setup_database(app)
+@app.exception_handler(IntegrityError)
+async def integrity_error_handler(
+    _request: Request, exc: IntegrityError
+) -> JSONResponse:
+    return JSONResponse(
+        status_code=422,
+        content={"detail": [{"loc": [], "msg": str(exc), "type": "IntegrityError"}]},
+    )
 
 
 @app.delete("/scraping/{scraping_id}")
 async def delete_scraping(
     scraping_id: int,
     service: ScraperService = Depends(get_scraper_service),
-    _api_key: APIKey = Depends(get_api_key),
+    cache: ScrapingCache = Depends(get_scraping_cache),
+    _api_key: APIKey = Depends(get_rate_limited_api_key),
 ) -> MessageResponse:
     """
     Deletes a scraping job.
@@ -198,6 +555,7 @@ async def delete_scraping(
         success = await service.delete_scraping(scraping_id, _api_key.user_id)
         if not success:
             raise HTTPException(status_code=500, detail="Failed to enqueue deletion")
+        await cache.mark_deleting(scraping_id)
         return {"message": "Scraping deletion enqueued"}
     except ScrapingNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e)) from e
@@ -6,6 +6,11 @@ class Scraping(models.Model):
     id = fields.IntField(pk=True)
     user_id = fields.IntField(null=True)
     url = fields.TextField()
+    depth = fields.IntField(null=True)
+    normalized_url = fields.TextField(null=True)
+    completed_at = fields.DatetimeField(null=True)
+    # Set on aliases, which reuse the results of a recent scraping
+    source_scraping_id = fields.IntField(null=True)
 
     class Meta:
         table = "scrapings"
@@ -65,6 +70,7 @@ class APIKey(models.Model):
     created_at = fields.DatetimeField(auto_now_add=True)
     expires_at = fields.DatetimeField(null=True)
     last_used_at = fields.DatetimeField(null=True)
+    request_count = fields.BigIntField(default=0)
 
     class Meta:
         table = "api_keys"
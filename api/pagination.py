@@ -0,0 +1,64 @@
+import base64
+import binascii
+import json
+from typing import Any
+
+
+class InvalidCursorError(ValueError):
+    """Exception raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Encodes the ID of the last row of a page as an opaque cursor
+    to the next page.
+    """
+    return _encode({"id": last_id})
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Returns the row ID encoded in a cursor returned by encode_cursor().
+    """
+    last_id = _decode(cursor, "id")
+    if not isinstance(last_id, int) or isinstance(last_id, bool) or last_id < 1:
+        raise InvalidCursorError("Invalid cursor")
+    return last_id
+
+
+def encode_search_cursor(sort_values: list[Any]) -> str:
+    """
+    Encodes the sort values of the last hit of a search page as an opaque
+    cursor to the next page (OpenSearch search_after).
+    """
+    return _encode({"after": sort_values})
+
+
+def decode_search_cursor(cursor: str) -> list[Any]:
+    """
+    Returns the sort values encoded in a cursor returned by encode_search_cursor().
+    """
+    sort_values = _decode(cursor, "after")
+    if (
+        not isinstance(sort_values, list)
+        or not sort_values
+        or not all(
+            value is None or isinstance(value, (str, int, float))
+            for value in sort_values
+        )
+    ):
+        raise InvalidCursorError("Invalid cursor")
+    return sort_values
+
+
+def _encode(payload: dict[str, Any]) -> str:
+    data = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def _decode(cursor: str, field: str) -> Any:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))[field]
+    except (binascii.Error, UnicodeError, ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
@@ -1,7 +1,28 @@
+from collections.abc import Sequence
 from datetime import datetime
-from typing import TypedDict
+from typing import Any, TypedDict
+
+from tortoise import connections  # pylint: disable=import-error
+from tortoise.transactions import in_transaction  # pylint: disable=import-error
 
 from api import models
+from api.urls import normalize_url
+
+# Rows per UPDATE statement, 3 bind parameters each
+API_KEY_USAGE_BATCH_SIZE = 1000
+
+# The seed page of a scraping is its page whose URL is the scraping's URL,
+# looked up in the scraping an alias reuses the results of
+SEED_PAGE_JOIN = (
+    "LEFT JOIN scrapings AS src ON src.id = s.source_scraping_id "
+    "LEFT JOIN LATERAL (SELECT summary, scraped_at FROM scraped_pages "
+    "WHERE scraping_id = COALESCE(src.id, s.id) AND url = COALESCE(src.url, s.url) "
+    "ORDER BY id LIMIT 1) AS p ON TRUE"
+)
+SCRAPINGS_QUERY = (
+    "SELECT s.id, s.url, s.user_id, p.summary, p.scraped_at "
+    f"FROM scrapings AS s {SEED_PAGE_JOIN}"
+)
 
 
 class ScrapingRecord(TypedDict):
@@ -23,85 +44,195 @@ class ScrapedPageRecord(TypedDict):
     summary: str | None
 
 
+class ResultsHeir(TypedDict):
+    id: int
+    user_id: int | None
+
+
+class APIKeyUsage(TypedDict):
+    hashed_key: str
+    last_used_at: datetime
+    requests: int
+
+
+def _scraping_record(row: dict[str, Any]) -> ScrapingRecord:
+    return {
+        "id": row["id"],
+        "url": row["url"],
+        "user_id": row["user_id"],
+        "summary": row["summary"],
+        "scraped_at": row["scraped_at"],
+    }
+
+
+def _scraped_page_record(page: models.ScrapedPage) -> ScrapedPageRecord:
+    images_list: list[PageImageResult] = [
+        {"url": i.image_url, "explanation": i.explanation} for i in page.images
+    ]
+    return {
+        "url": page.url,
+        "images": images_list,
+        "summary": page.summary,
+    }
+
+
 class DbRepository:
-    async def create_scraping(self, url: str, user_id: int | None = None) -> int:
+    async def create_scraping(
+        self, url: str, user_id: int | None = None, depth: int | None = None
+    ) -> int:
         """
         Creates a new scraping record.
         """
-        scraping = await models.Scraping.create(url=url, user_id=user_id)
+        scraping = await models.Scraping.create(
+            url=url, user_id=user_id, depth=depth, normalized_url=normalize_url(url)
+        )
         return int(scraping.id)
 
+    async def create_scrapings(
+        self, jobs: Sequence[tuple[str, int]], user_id: int | None = None
+    ) -> list[int]:
+        """
+        Creates one scraping per (url, depth) job in a single statement.
+        Returns the new IDs in the order of the jobs.
+        """
+        if not jobs:
+            return []
+        # IDs are drawn from the sequence in insertion order
+        rows = await connections.get("default").execute_query_dict(
+            "INSERT INTO scrapings (url, depth, normalized_url, user_id) "
+            "SELECT url, depth, normalized_url, $4::int "
+            "FROM unnest($1::text[], $2::int[], $3::text[]) WITH ORDINALITY "
+            "AS t(url, depth, normalized_url, n) ORDER BY n RETURNING id",
+            [
+                [url for url, _ in jobs],
+                [depth for _, depth in jobs],
+                [normalize_url(url) for url, _ in jobs],
+                user_id,
+            ],
+        )
+        return sorted(int(row["id"]) for row in rows)
+
+    async def create_fresh_alias(
+        self, url: str, depth: int, user_id: int | None, max_age: int
+    ) -> tuple[int, int] | None:
+        """
+        Creates an alias of the latest scraping of the same normalized URL and
+        depth completed less than max_age seconds ago, if any, so that its
+        results are reused instead of being scraped again.
+        Returns (alias ID, source scraping ID), or None without a fresh scraping.
+        """
+        # The lookup and the insert are one statement, served by idx_scrapings_fresh
+        rows = await connections.get("default").execute_query_dict(
+            "INSERT INTO scrapings "
+            "(url, depth, normalized_url, user_id, source_scraping_id) "
+            "SELECT $1, $2, $3, $4, id FROM scrapings "
+            "WHERE normalized_url = $3 AND depth = $2 "
+            "AND source_scraping_id IS NULL "
+            "AND completed_at >= now() - make_interval(secs => $5) "
+            "ORDER BY completed_at DESC LIMIT 1 "
+            "RETURNING id, source_scraping_id",
+            [url, depth, normalize_url(url), user_id, max_age],
+        )
+        if not rows:
+            return None
+        return int(rows[0]["id"]), int(rows[0]["source_scraping_id"])
+
     async def get_scraping(self, scraping_id: int) -> ScrapingRecord | None:
         """
-        Retrieves a scraping by ID.
+        Retrieves a scraping by ID, with the summary of its seed page.
         """
-        scraping = await models.Scraping.get_or_none(id=scraping_id)
-        if scraping:
-            seed_page = await models.ScrapedPage.filter(
-                scraping_id=scraping.id, url=scraping.url
-            ).first()
-            return {
-                "id": scraping.id,
-                "url": scraping.url,
-                "user_id": scraping.user_id,
-                "summary": seed_page.summary if seed_page else None,
-                "scraped_at": seed_page.scraped_at if seed_page else None,
-            }
-        return None
-
-    async def get_scrapings(
-        self, user_id: int, offset: int = 0, limit: int = 10
-    ) -> tuple[list[ScrapingRecord], int]:
-        """
-        Retrieves a paginated list of scrapings for a specific user.
-        Returns (list of scrapings, total_count).
-        """
-        query = models.Scraping.filter(user_id=user_id)
-        total = await query.count()
-        scrapings = await query.offset(offset).limit(limit).order_by("-id")
-
-        results: list[ScrapingRecord] = []
-        for s in scrapings:
-            seed_page = await models.ScrapedPage.filter(
-                scraping_id=s.id, url=s.url
-            ).first()
-            results.append(
-                {
-                    "id": s.id,
-                    "url": s.url,
-                    "user_id": s.user_id,
-                    "summary": seed_page.summary if seed_page else None,
-                    "scraped_at": seed_page.scraped_at if seed_page else None,
-                }
-            )
+        rows = await connections.get("default").execute_query_dict(
+            f"{SCRAPINGS_QUERY} WHERE s.id = $1",
+            [scraping_id],
+        )
+        return _scraping_record(rows[0]) if rows else None
 
-        return results, total
+    async def get_scrapings(  # pylint: disable=too-many-arguments
+        self,
+        user_id: int,
+        offset: int = 0,
+        limit: int = 10,
+        *,
+        include_total: bool = True,
+        before_id: int | None = None,
+    ) -> tuple[list[ScrapingRecord], int | None]:
+        """
+        Retrieves a paginated list of scrapings for a specific user, newest first,
+        with the summaries of their seed pages, in a single statement.
+        Pages start after `offset` rows, or below the scraping with ID before_id
+        (keyset pagination) when it is given.
+        Returns (list of scrapings, total_count), the count being None unless
+        include_total is set.
+        """
+        values: list[Any] = [user_id, limit, offset]
+        condition = "user_id = $1"
+        if before_id is not None:
+            condition += " AND id < $4"
+            values.append(before_id)
+        # Under a keyset condition the window would only count the remaining rows
+        window_total = include_total and before_id is None
+        total_column = "count(*) OVER ()" if window_total else "NULL::bigint"
+        rows = await connections.get("default").execute_query_dict(
+            "SELECT s.id, s.url, s.user_id, s.total, p.summary, p.scraped_at "
+            "FROM (SELECT id, url, user_id, source_scraping_id, "
+            f"{total_column} AS total "
+            f"FROM scrapings WHERE {condition} "
+            "ORDER BY id DESC LIMIT $2 OFFSET $3) AS s "
+            f"{SEED_PAGE_JOIN} ORDER BY s.id DESC",
+            values,
+        )
+
+        total: int | None = None
+        if window_total and rows:
+            total = int(rows[0]["total"])
+        elif include_total:
+            # The window count is only returned along with a row
+            total = await models.Scraping.filter(user_id=user_id).count()
+        return [_scraping_record(row) for row in rows], total
 
     async def get_scraping_results(self, scraping_id: int) -> list[ScrapedPageRecord]:
         """
         Retrieves the scrape results (URLs, terms, and images) for a given scraping.
         """
+        scraping_id = await self.get_results_scraping_id(scraping_id)
         pages = (
             await models.ScrapedPage.filter(scraping_id=scraping_id)
             .order_by("url")
             .prefetch_related("images")
         )
 
-        results: list[ScrapedPageRecord] = []
-        for page in pages:
-            images_list: list[PageImageResult] = [
-                {"url": i.image_url, "explanation": i.explanation} for i in page.images
-            ]
+        return [_scraped_page_record(page) for page in pages]
 
-            results.append(
-                {
-                    "url": page.url,
-                    "images": images_list,
-                    "summary": page.summary,
-                }
-            )
+    async def get_scraping_results_page(
+        self, scraping_id: int, after_id: int | None = None, limit: int = 500
+    ) -> tuple[list[ScrapedPageRecord], int | None]:
+        """
+        Retrieves one page of scrape results in crawl order, starting after the
+        page with ID after_id (keyset pagination).
+        Returns (results, after_id of the next page or None on the last page).
+        """
+        scraping_id = await self.get_results_scraping_id(scraping_id)
+        query = models.ScrapedPage.filter(scraping_id=scraping_id)
+        if after_id is not None:
+            query = query.filter(id__gt=after_id)
+        # One extra row tells whether there is a next page
+        pages = await query.order_by("id").limit(limit + 1).prefetch_related("images")
+
+        next_after_id = pages[limit - 1].id if len(pages) > limit else None
+        return [_scraped_page_record(page) for page in pages[:limit]], next_after_id
 
-        return results
+    @staticmethod
+    async def get_results_scraping_id(scraping_id: int) -> int:
+        """
+        Returns the ID of the scraping holding the results of a scraping,
+        which is its source for an alias.
+        """
+        rows = await connections.get("default").execute_query_dict(
+            "SELECT source_scraping_id FROM scrapings WHERE id = $1", [scraping_id]
+        )
+        if rows and rows[0]["source_scraping_id"] is not None:
+            return int(rows[0]["source_scraping_id"])
+        return scraping_id
 
     async def get_scraping_s3_paths(self, scraping_id: int) -> list[str]:
         """
@@ -121,3 +252,69 @@ class DbRepository:
             await scraping.delete()
             return True
         return False
+
+    async def transfer_results(self, scraping_id: int) -> ResultsHeir | None:
+        """
+        Hands the results of a scraping over to its oldest alias, which becomes
+        the source of the other aliases, so that deleting the scraping leaves
+        them intact.
+        Returns the alias taking over, or None when the scraping has none.
+        """
+        async with in_transaction() as connection:
+            rows = await connection.execute_query_dict(
+                "SELECT id, user_id FROM scrapings WHERE source_scraping_id = $1 "
+                "ORDER BY id LIMIT 1 FOR UPDATE",
+                [scraping_id],
+            )
+            if not rows:
+                return None
+            heir: ResultsHeir = {"id": rows[0]["id"], "user_id": rows[0]["user_id"]}
+            for table in ("scraped_pages", "page_images", "page_links"):
+                await connection.execute_query(
+                    f"UPDATE {table} SET scraping_id = $1 WHERE scraping_id = $2",
+                    [heir["id"], scraping_id],
+                )
+            # The heir inherits the completion time, and with it the reuse
+            await connection.execute_query(
+                "UPDATE scrapings SET source_scraping_id = NULLIF($1, id), "
+                "completed_at = CASE WHEN id = $1 THEN "
+                "(SELECT completed_at FROM scrapings WHERE id = $2) "
+                "ELSE completed_at END "
+                "WHERE source_scraping_id = $2",
+                [heir["id"], scraping_id],
+            )
+            await connection.execute_query(
+                "UPDATE scrapings SET completed_at = NULL WHERE id = $1",
+                [scraping_id],
+            )
+        return heir
+
+    async def record_api_key_usage(self, usages: Sequence[APIKeyUsage]) -> None:
+        """
+        Adds the request counts and advances last_used_at of many API keys
+        with one UPDATE ... FROM (VALUES ...) statement per batch.
+        """
+        connection = connections.get("default")
+        for start in range(0, len(usages), API_KEY_USAGE_BATCH_SIZE):
+            batch = usages[start : start + API_KEY_USAGE_BATCH_SIZE]
+            rows = ", ".join(
+                f"(${i * 3 + 1}::text, ${i * 3 + 2}::timestamptz, ${i * 3 + 3}::bigint)"
+                for i in range(len(batch))
+            )
+            values = [
+                value
+                for usage in batch
+                for value in (
+                    usage["hashed_key"],
+                    usage["last_used_at"],
+                    usage["requests"],
+                )
+            ]
+            await connection.execute_query(
+                "UPDATE api_keys AS k SET "
+                "last_used_at = GREATEST(k.last_used_at, v.last_used_at), "
+                "request_count = k.request_count + v.requests "
+                f"FROM (VALUES {rows}) AS v(hashed_key, last_used_at, requests) "
+                "WHERE k.hashed_key = v.hashed_key",
+                values,
+            )
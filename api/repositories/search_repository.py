@@ -14,22 +14,17 @@ class SearchRepository:
             verify_certs=False,
             ssl_assert_hostname=False,
             ssl_show_warn=False,
+            maxsize=config.opensearch_max_connections,
         )
 
     async def search(self, index: str, body: dict[str, Any]) -> dict[str, Any]:
         """
         Executes a search query against OpenSearch.
         """
-        try:
-            return cast(
-                dict[str, Any],
-                await self.__client.search(index=index, body=body),
-            )
-        finally:
-            # Note: We might want to keep the client open if this is a singleton
-            # but for now we follow the existing pattern of closing it or
-            # managing its lifecycle. In FastAPI, we usually close on shutdown.
-            pass
+        return cast(
+            dict[str, Any],
+            await self.__client.search(index=index, body=body),
+        )
 
     async def close(self) -> None:
         """
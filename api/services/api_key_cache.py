@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+
+from api.clients.redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+API_KEY_CACHE_PREFIX = "auth:key:"
+# Channel on which the hashes of changed or deactivated keys are published
+API_KEY_INVALIDATION_CHANNEL = "auth:key:invalidate"
+# Cached in place of the owner of an unknown key
+INVALID_API_KEY = "!"
+
+DEFAULT_LOCAL_MAX_SIZE = 10_000
+DEFAULT_LOCAL_TTL_SECONDS = 30.0
+DEFAULT_REDIS_TTL_SECONDS = 300
+DEFAULT_NEGATIVE_TTL_SECONDS = 60
+RESUBSCRIBE_DELAY_SECONDS = 1.0
+
+
+class APIKeyCache:
+    """
+    Two-tier cache of API key lookups, indexed by key hash: a bounded in-process
+    LRU with a short TTL in front of Redis. Unknown hashes are cached as
+    INVALID_API_KEY so that bad keys do not reach Postgres.
+    Replicas evict their local entries when a hash is published on
+    API_KEY_INVALIDATION_CHANNEL, see listen().
+    """
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(
+        self,
+        redis_client: RedisClient,
+        max_size: int = DEFAULT_LOCAL_MAX_SIZE,
+        local_ttl: float = DEFAULT_LOCAL_TTL_SECONDS,
+        redis_ttl: int = DEFAULT_REDIS_TTL_SECONDS,
+        negative_ttl: int = DEFAULT_NEGATIVE_TTL_SECONDS,
+    ) -> None:
+        self.__redis_client = redis_client
+        self.__max_size = max_size
+        self.__local_ttl = local_ttl
+        self.__redis_ttl = redis_ttl
+        self.__negative_ttl = negative_ttl
+        # hashed key -> (expiry on the monotonic clock, cached value)
+        self.__local: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    async def get(self, hashed_key: str) -> str | None:
+        """
+        Returns the cached value of a key hash, looking in Redis on a local miss.
+        """
+        value = self.__get_local(hashed_key)
+        if value is not None:
+            return value
+
+        value = await self.__redis_client.get(f"{API_KEY_CACHE_PREFIX}{hashed_key}")
+        if value is not None:
+            self.__set_local(hashed_key, value, self.__local_ttl)
+        return value
+
+    async def set(self, hashed_key: str, value: str, ttl: int | None = None) -> None:
+        """
+        Caches the value of a key hash in both tiers.
+        The Redis entry lives `ttl` seconds, capped by the default Redis TTL.
+        """
+        redis_ttl = self.__redis_ttl if ttl is None else min(ttl, self.__redis_ttl)
+        if redis_ttl <= 0:
+            return
+        await self.__redis_client.set(
+            f"{API_KEY_CACHE_PREFIX}{hashed_key}", value, ex=redis_ttl
+        )
+        self.__set_local(hashed_key, value, min(self.__local_ttl, redis_ttl))
+
+    async def set_invalid(self, hashed_key: str) -> None:
+        """
+        Remembers that a key hash is unknown for the negative TTL.
+        """
+        await self.set(hashed_key, INVALID_API_KEY, ttl=self.__negative_ttl)
+
+    async def invalidate(self, hashed_key: str) -> None:
+        """
+        Drops a key hash from Redis and from the local cache of every replica.
+        """
+        self.evict(hashed_key)
+        await self.__redis_client.delete(f"{API_KEY_CACHE_PREFIX}{hashed_key}")
+        await self.__redis_client.publish(API_KEY_INVALIDATION_CHANNEL, hashed_key)
+
+    def evict(self, hashed_key: str) -> None:
+        """
+        Drops a key hash from the local cache only.
+        """
+        self.__local.pop(hashed_key, None)
+
+    def clear(self) -> None:
+        """
+        Drops every entry of the local cache.
+        """
+        self.__local.clear()
+
+    async def listen(self) -> None:
+        """
+        Evicts the key hashes published on the invalidation channel until cancelled.
+        The local cache is cleared whenever the subscription is (re)established,
+        as invalidations may have been missed while it was down.
+        """
+        while True:
+            try:
+                self.clear()
+                async for hashed_key in self.__redis_client.subscribe(
+                    API_KEY_INVALIDATION_CHANNEL
+                ):
+                    self.evict(hashed_key)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.warning("API key invalidation subscription lost: %s", e)
+            await asyncio.sleep(RESUBSCRIBE_DELAY_SECONDS)
+
+    def __get_local(self, hashed_key: str) -> str | None:
+        entry = self.__local.get(hashed_key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self.__local[hashed_key]
+            return None
+        self.__local.move_to_end(hashed_key)
+        return value
+
+    def __set_local(self, hashed_key: str, value: str, ttl: float) -> None:
+        self.__local[hashed_key] = (time.monotonic() + ttl, value)
+        self.__local.move_to_end(hashed_key)
+        while len(self.__local) > self.__max_size:
+            self.__local.popitem(last=False)
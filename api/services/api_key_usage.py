@@ -0,0 +1,80 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from api.repositories.db_repository import APIKeyUsage, DbRepository
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL_SECONDS = 30.0
+
+
+class APIKeyUsageRecorder:
+    """
+    Write-behind recorder of API key usage. Requests are counted in memory,
+    off the request path, and flushed to api_keys periodically in bulk.
+    Usage that fails to flush is kept for the next attempt.
+    """
+
+    def __init__(
+        self,
+        db_repository: DbRepository,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+    ) -> None:
+        self.__db_repository = db_repository
+        self.__flush_interval = flush_interval
+        self.__usages: dict[str, APIKeyUsage] = {}
+
+    def record(self, hashed_key: str) -> None:
+        """
+        Counts a request authenticated with the key.
+        """
+        now = datetime.now(timezone.utc)
+        usage = self.__usages.get(hashed_key)
+        if usage is None:
+            self.__usages[hashed_key] = {
+                "hashed_key": hashed_key,
+                "last_used_at": now,
+                "requests": 1,
+            }
+        else:
+            usage["last_used_at"] = now
+            usage["requests"] += 1
+
+    async def flush(self) -> int:
+        """
+        Writes the pending usage to the database.
+        Returns the number of keys updated.
+        """
+        usages, self.__usages = self.__usages, {}
+        if not usages:
+            return 0
+        try:
+            await self.__db_repository.record_api_key_usage(list(usages.values()))
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Failed to flush usage of %s API keys: %s", len(usages), e)
+            self.__restore(usages)
+            return 0
+        return len(usages)
+
+    async def run(self) -> None:
+        """
+        Flushes the usage periodically until cancelled, then one last time.
+        """
+        try:
+            while True:
+                await asyncio.sleep(self.__flush_interval)
+                await self.flush()
+        finally:
+            await self.flush()
+
+    def __restore(self, usages: dict[str, APIKeyUsage]) -> None:
+        """
+        Merges usage that could not be flushed with the usage recorded since.
+        """
+        for hashed_key, usage in usages.items():
+            current = self.__usages.get(hashed_key)
+            if current is None:
+                self.__usages[hashed_key] = usage
+            else:
+                current["requests"] += usage["requests"]
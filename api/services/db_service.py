@@ -8,7 +8,19 @@ class DbService:  # pylint: disable=too-few-public-methods
     def __init__(self, db_repo: DbRepository) -> None:
         self.__db_repo = db_repo
 
-    async def get_scrapings(
-        self, user_id: int, offset: int, limit: int
-    ) -> tuple[list[ScrapingRecord], int]:
-        return await self.__db_repo.get_scrapings(user_id, offset, limit)
+    async def get_scrapings(  # pylint: disable=too-many-arguments
+        self,
+        user_id: int,
+        offset: int,
+        limit: int,
+        *,
+        include_total: bool = True,
+        before_id: int | None = None,
+    ) -> tuple[list[ScrapingRecord], int | None]:
+        return await self.__db_repo.get_scrapings(
+            user_id,
+            offset,
+            limit,
+            include_total=include_total,
+            before_id=before_id,
+        )
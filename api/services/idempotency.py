@@ -0,0 +1,119 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+
+from api.clients.redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_KEY = "idempotency:{user_id}:{key_hash}"
+
+DEFAULT_TTL_SECONDS = 86_400
+# Lifetime of the claim of a request in progress, should its process die
+DEFAULT_LOCK_TTL_SECONDS = 60
+DEFAULT_WAIT_SECONDS = 5.0
+POLL_INTERVAL_SECONDS = 0.1
+
+
+class IdempotencyKeyReusedError(ValueError):
+    """Exception raised when an idempotency key is reused with another request."""
+
+
+class IdempotencyKeyInProgressError(Exception):
+    """Exception raised when the request of an idempotency key is still running."""
+
+
+def fingerprint(*parts: object) -> str:
+    """
+    Returns the fingerprint of the parameters of a request.
+    """
+    payload = json.dumps(parts, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class IdempotencyStore:
+    """
+    Redis record of the scraping started for each Idempotency-Key, per user.
+    The first request claims the key with SET NX; concurrent requests with the
+    same key wait for it to complete, repeated ones get the recorded result.
+    Redis errors are logged and the request proceeds without idempotency.
+    """
+
+    def __init__(
+        self,
+        redis_client: RedisClient,
+        ttl: int = DEFAULT_TTL_SECONDS,
+        lock_ttl: int = DEFAULT_LOCK_TTL_SECONDS,
+        wait: float = DEFAULT_WAIT_SECONDS,
+    ) -> None:
+        self.__redis_client = redis_client
+        self.__ttl = ttl
+        self.__lock_ttl = lock_ttl
+        self.__wait = wait
+
+    async def claim(self, user_id: int | None, key: str, request: str) -> int | None:
+        """
+        Returns the scraping_id recorded for the key, or None once the caller has
+        claimed the key and must start the scraping, then complete() or release().
+        `request` is the fingerprint of the request parameters.
+        """
+        redis_key = self.__redis_key(user_id, key)
+        pending = json.dumps({"request": request, "scraping_id": None})
+        deadline = time.monotonic() + self.__wait
+        try:
+            while True:
+                if await self.__redis_client.set_if_absent(
+                    redis_key, pending, ex=self.__lock_ttl
+                ):
+                    return None
+                entry = await self.__redis_client.get(redis_key)
+                if entry is None:
+                    # Released or expired in the meantime
+                    continue
+                recorded = json.loads(entry)
+                if recorded["request"] != request:
+                    raise IdempotencyKeyReusedError(
+                        "Idempotency-Key was already used with different parameters"
+                    )
+                if recorded["scraping_id"] is not None:
+                    return int(recorded["scraping_id"])
+                if time.monotonic() >= deadline:
+                    raise IdempotencyKeyInProgressError(
+                        "A request with this Idempotency-Key is in progress"
+                    )
+                await asyncio.sleep(POLL_INTERVAL_SECONDS)
+        except (IdempotencyKeyReusedError, IdempotencyKeyInProgressError):
+            raise
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Idempotency store unavailable: %s", e)
+            return None
+
+    async def complete(
+        self, user_id: int | None, key: str, request: str, scraping_id: int
+    ) -> None:
+        """
+        Records the scraping started for a claimed key.
+        """
+        entry = json.dumps({"request": request, "scraping_id": scraping_id})
+        try:
+            await self.__redis_client.set(
+                self.__redis_key(user_id, key), entry, ex=self.__ttl
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Failed to record idempotency key: %s", e)
+
+    async def release(self, user_id: int | None, key: str) -> None:
+        """
+        Frees a claimed key after a failure, so that the request can be retried.
+        """
+        try:
+            await self.__redis_client.delete(self.__redis_key(user_id, key))
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Failed to release idempotency key: %s", e)
+
+    @staticmethod
+    def __redis_key(user_id: int | None, key: str) -> str:
+        key_hash = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return IDEMPOTENCY_KEY.format(user_id=user_id, key_hash=key_hash)
@@ -0,0 +1,137 @@
+import logging
+import time
+import uuid
+from collections.abc import Sequence
+
+from api.clients.redis_client import RedisClient
+from api.services.rate_limiter import RateLimitExceededError
+
+logger = logging.getLogger(__name__)
+
+# Sorted set of the in-flight scrapings of a user, scored by start time.
+# The writer worker removes a scraping from it when the scraping completes.
+INFLIGHT_KEY = "quota:{user_id}:inflight"
+RESERVATION_PREFIX = "reserved:"
+
+DEFAULT_MAX_INFLIGHT = 20
+# Scrapings that never complete stop counting after this delay
+DEFAULT_STALE_AFTER_SECONDS = 6 * 3600
+DEFAULT_RETRY_AFTER_SECONDS = 30
+
+# Reserves ARGV[5..] if the user has room for them once stale entries are dropped
+ACQUIRE_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[2])
+local requested = #ARGV - 4
+if redis.call('ZCARD', KEYS[1]) + requested > tonumber(ARGV[3]) then
+    return 0
+end
+for i = 5, #ARGV do
+    redis.call('ZADD', KEYS[1], ARGV[1], ARGV[i])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return 1
+"""
+
+# Replaces the ARGV[2] reservations that follow by the scraping IDs after them
+ASSIGN_SCRIPT = """
+local count = tonumber(ARGV[2])
+for i = 1, count do
+    redis.call('ZREM', KEYS[1], ARGV[2 + i])
+    redis.call('ZADD', KEYS[1], ARGV[1], ARGV[2 + count + i])
+end
+return count
+"""
+
+
+class QuotaExceededError(RateLimitExceededError):
+    """Exception raised when a user has too many scrapings in flight."""
+
+
+class BatchTooLargeError(Exception):
+    """Exception raised when more scrapings are requested at once than the cap."""
+
+
+class JobQuota:
+    """
+    Cap on the in-flight scrapings of each user, tracked in Redis.
+    Slots are reserved before a scraping is created, assigned to it once it is,
+    and freed by the writer worker when it completes. A cap of 0 disables it.
+    Redis errors are logged and the scraping is let through.
+    """
+
+    def __init__(
+        self,
+        redis_client: RedisClient,
+        max_inflight: int = DEFAULT_MAX_INFLIGHT,
+        stale_after: int = DEFAULT_STALE_AFTER_SECONDS,
+        retry_after: int = DEFAULT_RETRY_AFTER_SECONDS,
+    ) -> None:
+        self.__redis_client = redis_client
+        self.__max_inflight = max_inflight
+        self.__stale_after = stale_after
+        self.__retry_after = retry_after
+
+    async def acquire(self, user_id: int | None, count: int = 1) -> list[str]:
+        """
+        Reserves slots for `count` scrapings of a user, raising
+        QuotaExceededError when the user does not have room for all of them,
+        or BatchTooLargeError when `count` exceeds the cap, which no wait fixes.
+        Returns the reservations, empty when nothing had to be reserved.
+        """
+        if user_id is None or self.__max_inflight <= 0 or count <= 0:
+            return []
+        if count > self.__max_inflight:
+            raise BatchTooLargeError(
+                f"At most {self.__max_inflight} scrapings may be in progress, "
+                f"{count} were requested at once"
+            )
+        reservations = [f"{RESERVATION_PREFIX}{uuid.uuid4().hex}" for _ in range(count)]
+        now = time.time()
+        try:
+            acquired = await self.__redis_client.eval(
+                ACQUIRE_SCRIPT,
+                [INFLIGHT_KEY.format(user_id=user_id)],
+                [now, now - self.__stale_after, self.__max_inflight, self.__stale_after]
+                + reservations,
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Scraping quota unavailable: %s", e)
+            return []
+        if not acquired:
+            raise QuotaExceededError(
+                f"At most {self.__max_inflight} scrapings may be in progress",
+                self.__retry_after,
+            )
+        return reservations
+
+    async def assign(
+        self, user_id: int | None, reservations: list[str], scraping_ids: list[int]
+    ) -> None:
+        """
+        Hands reserved slots over to the created scrapings, in order.
+        """
+        if user_id is None or not reservations:
+            return
+        try:
+            await self.__redis_client.eval(
+                ASSIGN_SCRIPT,
+                [INFLIGHT_KEY.format(user_id=user_id)],
+                [time.time(), len(reservations)]
+                + reservations
+                + [str(scraping_id) for scraping_id in scraping_ids],
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Failed to assign scraping quota: %s", e)
+
+    async def release(self, user_id: int | None, members: Sequence[str | int]) -> None:
+        """
+        Frees the slots of reservations or scrapings that will not run.
+        """
+        if user_id is None or not members:
+            return
+        try:
+            await self.__redis_client.zrem(
+                INFLIGHT_KEY.format(user_id=user_id), [str(m) for m in members]
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Failed to release scraping quota: %s", e)
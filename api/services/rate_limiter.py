@@ -0,0 +1,101 @@
+import logging
+import math
+import time
+
+from api.clients.redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_KEY = "ratelimit:{hashed_key}:{window}"
+
+DEFAULT_LIMIT = 120
+DEFAULT_WINDOW_SECONDS = 60
+
+# Sliding window counter: the count of the previous fixed window is weighted by
+# the share of it still inside the sliding window. A request is only counted
+# when it is allowed, so rejected retries do not extend the wait.
+SLIDING_WINDOW_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local elapsed = tonumber(ARGV[3])
+if previous * (window - elapsed) / window + current + 1 > limit then
+    return {0, current, previous}
+end
+redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], window * 2)
+return {1, current + 1, previous}
+"""
+
+
+class RateLimitExceededError(Exception):
+    """Exception raised when a request exceeds a limit of its API key."""
+
+    def __init__(self, message: str, retry_after: int) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def retry_after_seconds(
+    current: int, previous: int, limit: int, window: int, elapsed: float
+) -> int:
+    """
+    Returns the seconds until the sliding window has room for one more request.
+    """
+    if current + 1 <= limit and previous > 0:
+        # The previous window slides out within the current one
+        wait = window - elapsed - (limit - current - 1) * window / previous
+    else:
+        # Only once the current window has become the previous one
+        wait = 2 * window - elapsed - (limit - 1) * window / max(current, 1)
+    return max(1, math.ceil(wait))
+
+
+class RateLimiter:  # pylint: disable=too-few-public-methods
+    """
+    Sliding-window limit of the requests of each API key, counted in Redis so
+    that it holds across API replicas. A limit of 0 disables it.
+    Redis errors are logged and the request is let through.
+    """
+
+    def __init__(
+        self,
+        redis_client: RedisClient,
+        limit: int = DEFAULT_LIMIT,
+        window: int = DEFAULT_WINDOW_SECONDS,
+    ) -> None:
+        self.__redis_client = redis_client
+        self.__limit = limit
+        self.__window = window
+
+    async def check(self, hashed_key: str) -> None:
+        """
+        Counts a request of an API key, raising RateLimitExceededError when the
+        key has used up its limit.
+        """
+        if self.__limit <= 0:
+            return
+        now = time.time()
+        window = int(now // self.__window)
+        elapsed = now - window * self.__window
+        try:
+            allowed, current, previous = await self.__redis_client.eval(
+                SLIDING_WINDOW_SCRIPT,
+                [
+                    RATE_LIMIT_KEY.format(hashed_key=hashed_key, window=window),
+                    RATE_LIMIT_KEY.format(hashed_key=hashed_key, window=window - 1),
+                ],
+                [self.__limit, self.__window, elapsed],
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Rate limiter unavailable: %s", e)
+            return
+        if not allowed:
+            raise RateLimitExceededError(
+                f"Rate limit of {self.__limit} requests "
+                f"per {self.__window} seconds exceeded",
+                retry_after_seconds(
+                    int(current), int(previous), self.__limit, self.__window, elapsed
+                ),
+            )
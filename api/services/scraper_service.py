@@ -1,5 +1,10 @@
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator, Awaitable, Sequence
+from contextlib import suppress
 from datetime import datetime, timezone
-from typing import TypedDict, cast
+from typing import Any, TypedDict, cast
 
 from api.clients.dynamodb_client import DynamoDBClient
 from api.clients.redis_client import RedisClient
@@ -9,6 +14,32 @@ from api.repositories.db_repository import (
     ScrapedPageRecord,
     ScrapingRecord,
 )
+from api.services.job_quota import JobQuota
+from shared.messages import DeletionMessage, ScrapeMessage
+
+logger = logging.getLogger(__name__)
+
+# Scrape results fetched per query when streaming them
+RESULTS_BATCH_SIZE = 500
+
+# Redis counter of the URLs of a scraping still to be processed
+PENDING_KEY = "scrape:{scraping_id}:pending"
+# Published by the writer worker after each write to a scraping
+PROGRESS_CHANNEL = "scrape:{scraping_id}:progress"
+# Seconds without events after which the progress of a scraping is re-read
+PROGRESS_HEARTBEAT_SECONDS = 15.0
+# Progress events after which a scraping no longer progresses
+FINAL_PROGRESS_EVENTS = ("completed", "failed")
+
+# DynamoDB attributes needed to build a scraping listing
+METADATA_ATTRIBUTES = (
+    "scraping_id",
+    "status",
+    "created_at",
+    "completed_at",
+    "depth",
+    "links_count",
+)
 
 
 class ScrapingNotFoundError(Exception):
@@ -32,6 +63,56 @@ class FullScrapingRecord(ScrapingRecord, ScrapingMetadata):
     pass
 
 
+class ProgressEvent(TypedDict):
+    event: str
+    data: dict[str, Any]
+
+
+def _scraping_metadata(
+    record: ScrapingRecord,
+    item: dict[Any, Any] | None,
+    default_status: str = "PENDING",
+) -> ScrapingMetadata:
+    """
+    Builds the metadata of a scraping from its DynamoDB item, defaulting
+    to what Postgres knows when the item is missing.
+    """
+    scraped_at = record["scraped_at"]
+    created_at = scraped_at.isoformat() if scraped_at else None
+    if not item:
+        return {
+            "status": default_status,
+            "created_at": created_at,
+            "completed_at": None,
+            "depth": 1,
+            "links_count": 0,
+            "pages": None,
+        }
+    return {
+        "status": item.get("status", default_status),
+        "created_at": item.get("created_at") or created_at,
+        "completed_at": item.get("completed_at"),
+        "depth": int(item.get("depth", 1)),
+        "links_count": int(item.get("links_count", 0)),
+        "pages": None,
+    }
+
+
+def _progress_event(data: str) -> ProgressEvent | None:
+    """
+    Converts a message of the writer worker into a progress event.
+    """
+    try:
+        message = json.loads(data)
+        message_type = message["type"]
+    except (ValueError, KeyError, TypeError):
+        logger.warning("Ignoring malformed progress message: %s", data)
+        return None
+    if message_type == "scraping_complete":
+        return {"event": "completed", "data": {"status": "COMPLETED"}}
+    return {"event": "page", "data": {"type": message_type, "url": message.get("url")}}
+
+
 class ScraperService:
     def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
         self,
@@ -40,147 +121,349 @@ class ScraperService:
         db_repository: DbRepository,
         dynamodb_client: DynamoDBClient | None = None,
         deletion_queue_url: str | None = None,
+        job_quota: JobQuota | None = None,
+        pubsub_client: RedisClient | None = None,
     ):
         self.sqs_client = sqs_client
         self.redis_client = redis_client
+        # Subscriptions hold a connection each, kept off the shared pool
+        self.pubsub_client = pubsub_client or redis_client
         self.db_repository = db_repository
         self.dynamodb_client = dynamodb_client
         self.deletion_queue_url = deletion_queue_url
+        self.job_quota = job_quota
 
     async def start_scraping(
-        self, url: str, depth: int, user_id: int | None = None
+        self,
+        url: str,
+        depth: int,
+        user_id: int | None = None,
+        max_age: int | None = None,
     ) -> int:
         """
         Starts a new scraping job.
+        With max_age, a scraping of the same normalized URL and depth completed
+        less than max_age seconds ago is reused: the new job is a completed alias
+        of it, and nothing is enqueued.
+        The DynamoDB status item is written while the job is enqueued; if the job
+        cannot be enqueued it is marked FAILED and the error is raised.
+        Raises QuotaExceededError when the user has too many jobs in progress.
         """
-        scraping_id = await self.db_repository.create_scraping(url, user_id)
+        if max_age is not None:
+            alias = await self.db_repository.create_fresh_alias(
+                url, depth, user_id, max_age
+            )
+            if alias is not None:
+                alias_id, source_id = alias
+                await self.__put_alias_metadata(alias_id, source_id, url, depth)
+                return alias_id
+
+        reservations = await self.__acquire_quota(user_id, 1)
+        try:
+            scraping_id = await self.db_repository.create_scraping(url, user_id, depth)
+        except BaseException:
+            await self.__release_quota(user_id, reservations)
+            raise
+
+        enqueued, logged = await asyncio.gather(
+            self.__enqueue(scraping_id, url, depth, user_id, reservations),
+            self.__put_metadata(scraping_id, url, depth),
+            return_exceptions=True,
+        )
+        if isinstance(enqueued, BaseException):
+            logger.error("Failed to start scraping %s: %s", scraping_id, enqueued)
+            await self.__abort(scraping_id)
+            if reservations:
+                await self.__release_quota(user_id, [*reservations, scraping_id])
+            raise enqueued
+        if isinstance(logged, BaseException):
+            # The job runs anyway: the writer creates the item on its first update
+            logger.warning(
+                "Failed to log scraping %s to DynamoDB: %s", scraping_id, logged
+            )
+
+        return scraping_id
 
-        # Initial Redis Key for Distributed Completion Tracking
-        pending_key = f"scrape:{scraping_id}:pending"
+    async def __enqueue(  # pylint: disable=too-many-arguments
+        self,
+        scraping_id: int,
+        url: str,
+        depth: int,
+        user_id: int | None,
+        reservations: list[str],
+    ) -> None:
+        # The quota slot, like the pending counter, must be in place before the
+        # workers can complete the scraping and free it
+        await self.__assign_quota(user_id, reservations, [scraping_id])
+        pending_key = PENDING_KEY.format(scraping_id=scraping_id)
         await self.redis_client.set(pending_key, 1)
 
-        # Log to DynamoDB if client is available
-        if self.dynamodb_client:
-            now = datetime.now(timezone.utc).isoformat()
+        message = ScrapeMessage(
+            url=url, depth=depth, scraping_id=scraping_id, user_id=user_id
+        )
+        await self.sqs_client.send_message(message)
+
+    async def __put_metadata(self, scraping_id: int, url: str, depth: int) -> None:
+        if not self.dynamodb_client:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        # Conditional, so as not to overwrite the progress of a fast writer
+        await self.dynamodb_client.put_item(
+            {
+                "scraping_id": str(scraping_id),
+                "url": url,
+                "depth": depth,
+                "status": "PENDING",
+                "links_count": 0,
+                "created_at": now,
+            },
+            if_absent="scraping_id",
+        )
+
+    async def __put_alias_metadata(
+        self, alias_id: int, source_id: int, url: str, depth: int
+    ) -> None:
+        if not self.dynamodb_client:
+            return
+        source = await self.__get_metadata_item(source_id) or {}
+        now = datetime.now(timezone.utc).isoformat()
+        try:
             await self.dynamodb_client.put_item(
                 {
-                    "scraping_id": str(scraping_id),
+                    "scraping_id": str(alias_id),
                     "url": url,
                     "depth": depth,
-                    "status": "PENDING",
-                    "links_count": 0,
+                    "status": "COMPLETED",
+                    "links_count": source.get("links_count", 0),
                     "created_at": now,
+                    "completed_at": source.get("completed_at") or now,
+                    "source_scraping_id": str(source_id),
                 }
             )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Failed to log scraping %s to DynamoDB: %s", alias_id, e)
 
-        # Send first message to Scraper Queue
-        message = {
-            "url": url,
-            "depth": depth,
-            "scraping_id": scraping_id,
-            "user_id": user_id,
-        }
-        await self.sqs_client.send_message(message)
+    async def __abort(self, scraping_id: int) -> None:
+        """
+        Best-effort cleanup of a job that could not be enqueued.
+        """
+        cleanups: list[Awaitable[Any]] = [
+            self.redis_client.delete(PENDING_KEY.format(scraping_id=scraping_id))
+        ]
+        if self.dynamodb_client:
+            cleanups.append(
+                self.dynamodb_client.update_item(
+                    {"scraping_id": str(scraping_id)}, {"status": "FAILED"}
+                )
+            )
+        for result in await asyncio.gather(*cleanups, return_exceptions=True):
+            if isinstance(result, BaseException):
+                logger.error("Failed to clean up scraping %s: %s", scraping_id, result)
 
-        return scraping_id
+    async def __abort_all(self, scraping_ids: Sequence[int]) -> None:
+        await asyncio.gather(
+            *(self.__abort(scraping_id) for scraping_id in scraping_ids)
+        )
+
+    async def start_scrapings(
+        self, jobs: Sequence[tuple[str, int]], user_id: int | None = None
+    ) -> tuple[list[int], list[int]]:
+        """
+        Starts many scraping jobs, given as (url, depth), with set-based writes:
+        one INSERT, one Redis MSET, DynamoDB BatchWriteItem and SQS
+        SendMessageBatch requests.
+        Returns (IDs of the jobs in order, IDs of those that could not be enqueued).
+        Jobs that cannot be enqueued are marked FAILED and free their quota slots;
+        if the batch cannot be set up at all, all of them are, and the error is
+        raised.
+        Raises QuotaExceededError when the user cannot have all of them in progress.
+        """
+        reservations = await self.__acquire_quota(user_id, len(jobs))
+        try:
+            scraping_ids = await self.db_repository.create_scrapings(jobs, user_id)
+        except BaseException:
+            await self.__release_quota(user_id, reservations)
+            raise
+        await self.__assign_quota(user_id, reservations, scraping_ids)
+
+        # Both must be in place before the scraper picks the messages up
+        now = datetime.now(timezone.utc).isoformat()
+        written = await asyncio.gather(
+            self.redis_client.mset(
+                {
+                    PENDING_KEY.format(scraping_id=scraping_id): 1
+                    for scraping_id in scraping_ids
+                }
+            ),
+            self.__put_metadata_items(
+                [
+                    {
+                        "scraping_id": str(scraping_id),
+                        "url": url,
+                        "depth": depth,
+                        "status": "PENDING",
+                        "links_count": 0,
+                        "created_at": now,
+                    }
+                    for scraping_id, (url, depth) in zip(
+                        scraping_ids, jobs, strict=True
+                    )
+                ]
+            ),
+            return_exceptions=True,
+        )
+        error = next((r for r in written if isinstance(r, BaseException)), None)
+        if error is None:
+            try:
+                results = await self.sqs_client.send_messages(
+                    [
+                        ScrapeMessage(
+                            url=url,
+                            depth=depth,
+                            scraping_id=scraping_id,
+                            user_id=user_id,
+                        )
+                        for scraping_id, (url, depth) in zip(
+                            scraping_ids, jobs, strict=True
+                        )
+                    ]
+                )
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                error = e
+        if error is not None:
+            logger.error("Failed to start %s scrapings: %s", len(scraping_ids), error)
+            await self.__abort_all(scraping_ids)
+            if reservations:
+                await self.__release_quota(user_id, [*reservations, *scraping_ids])
+            raise error
+
+        failed_ids = [
+            scraping_id
+            for scraping_id, result in zip(scraping_ids, results, strict=True)
+            if not result["success"]
+        ]
+        await self.__abort_all(failed_ids)
+        if reservations:
+            await self.__release_quota(user_id, failed_ids)
+        return scraping_ids, failed_ids
+
+    async def __acquire_quota(self, user_id: int | None, count: int) -> list[str]:
+        if not self.job_quota:
+            return []
+        return await self.job_quota.acquire(user_id, count)
+
+    async def __assign_quota(
+        self, user_id: int | None, reservations: list[str], scraping_ids: list[int]
+    ) -> None:
+        if self.job_quota and reservations:
+            await self.job_quota.assign(user_id, reservations, scraping_ids)
+
+    async def __release_quota(
+        self, user_id: int | None, members: Sequence[str | int]
+    ) -> None:
+        if self.job_quota and members:
+            await self.job_quota.release(user_id, members)
+
+    async def __put_metadata_items(self, items: list[dict[str, Any]]) -> None:
+        if not self.dynamodb_client:
+            return
+        unprocessed = await self.dynamodb_client.batch_write_items(items)
+        if unprocessed:
+            logger.warning("%s scraping metadata items were not written", unprocessed)
 
     async def get_full_scraping(self, scraping_id: int) -> FullScrapingRecord | None:
         """
         Retrieves the status of a scraping session, using DynamoDB as
         the source of truth for the scraping metadata (status, timestamps).
+        Postgres and DynamoDB are queried concurrently.
         """
-        # 1. Get identity from Postgres
-        id_record = await self.db_repository.get_scraping(scraping_id)
+        id_record, item = await asyncio.gather(
+            self.db_repository.get_scraping(scraping_id),
+            self.__get_metadata_item(scraping_id),
+        )
         if not id_record:
             return None
 
-        # 2. Get scraping metadata from DynamoDB
-        scraping_metadata: ScrapingMetadata = {
-            "status": "UNKNOWN",
-            "created_at": None,
-            "completed_at": None,
-            "depth": 1,
-            "links_count": 0,
-            "pages": None,
-        }
-        if self.dynamodb_client:
-            item = await self.dynamodb_client.get_item(
-                {"scraping_id": str(scraping_id)}
-            )
-            if item:
-                scraping_metadata.update(
-                    {
-                        "status": item.get("status", "UNKNOWN"),
-                        "created_at": item.get("created_at"),
-                        "completed_at": item.get("completed_at"),
-                        "depth": int(item.get("depth", 1)),
-                        "links_count": int(item.get("links_count", 0)),
-                    }
-                )
+        metadata = _scraping_metadata(id_record, item, default_status="UNKNOWN")
+        return cast(FullScrapingRecord, {**id_record, **metadata})
 
-        # Ensure default fields exist even if DynamoDB call fails or is empty
-        # This prevents Pydantic validation errors in the API layer
-        if scraping_metadata["status"] == "UNKNOWN":
-            # If we don't have DynamoDB data, we provide safe defaults
-            # that satisfy the FullScrapingRecord TypedDict/Model
-            scraping_metadata.setdefault("status", "PENDING")
-
-            scraped_at = id_record["scraped_at"]
-            created_at_str = scraped_at.isoformat() if scraped_at else None
-            scraping_metadata.setdefault("created_at", created_at_str)
-
-            scraping_metadata.setdefault("completed_at", None)
-            scraping_metadata.setdefault("depth", 1)
-            scraping_metadata.setdefault("links_count", 0)
-
-        # 3. Merge
-        full_scraping_record = {**id_record, **scraping_metadata}
-        return cast(FullScrapingRecord, full_scraping_record)
-
-    async def get_full_scrapings(
-        self, user_id: int, offset: int = 0, limit: int = 10
-    ) -> tuple[list[FullScrapingRecord], int]:
+    async def get_full_scrapings(  # pylint: disable=too-many-arguments
+        self,
+        user_id: int,
+        offset: int = 0,
+        limit: int = 10,
+        *,
+        include_total: bool = True,
+        before_id: int | None = None,
+    ) -> tuple[list[FullScrapingRecord], int | None, int | None]:
         """
-        Retrieves all scrapings for a user, merging data from Postgres and DynamoDB.
+        Retrieves a page of a user's scrapings, newest first, merging data from
+        Postgres and DynamoDB.
+        The metadata of the whole page is fetched in one DynamoDB batch.
+        Returns (scrapings, total, before_id of the next page or None on the
+        last page), the total being None unless include_total is set.
         """
+        # One extra row tells whether there is a next page
         scrapings, total = await self.db_repository.get_scrapings(
-            user_id, offset, limit
+            user_id,
+            offset,
+            limit + 1,
+            include_total=include_total,
+            before_id=before_id,
+        )
+        next_before_id = scrapings[limit - 1]["id"] if len(scrapings) > limit else None
+        scrapings = scrapings[:limit]
+        items_by_id = await self.__get_metadata_items(
+            [scraping["id"] for scraping in scrapings]
         )
 
-        merged_scrapings: list[FullScrapingRecord] = []
-        for scraping in scrapings:
-            sid = str(scraping["id"])
-
-            scraped_at = scraping["scraped_at"]
-            created_at_str = scraped_at.isoformat() if scraped_at else None
-
-            # Default metadata
-            metadata: ScrapingMetadata = {
-                "status": "PENDING",
-                "created_at": created_at_str,
-                "completed_at": None,
-                "depth": 1,
-                "links_count": 0,
-                "pages": None,
-            }
-
-            if self.dynamodb_client:
-                item = await self.dynamodb_client.get_item({"scraping_id": sid})
-                if item:
-                    metadata.update(
-                        {
-                            "status": item.get("status", "PENDING"),
-                            "created_at": item.get("created_at") or created_at_str,
-                            "completed_at": item.get("completed_at"),
-                            "depth": int(item.get("depth", 1)),
-                            "links_count": int(item.get("links_count", 0)),
-                        }
-                    )
+        merged_scrapings = [
+            cast(
+                FullScrapingRecord,
+                {
+                    **scraping,
+                    **_scraping_metadata(
+                        scraping, items_by_id.get(str(scraping["id"]))
+                    ),
+                },
+            )
+            for scraping in scrapings
+        ]
+        return merged_scrapings, total, next_before_id
 
-            merged_scraping = cast(FullScrapingRecord, {**scraping, **metadata})
-            merged_scrapings.append(merged_scraping)
+    async def __get_metadata_item(self, scraping_id: int) -> dict[Any, Any] | None:
+        """
+        Fetches the DynamoDB metadata of a scraping, or None if unavailable.
+        """
+        if not self.dynamodb_client:
+            return None
+        try:
+            return await self.dynamodb_client.get_item(
+                {"scraping_id": str(scraping_id)}
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Falling back to Postgres-only scraping metadata: %s", e)
+            return None
 
-        return merged_scrapings, total
+    async def __get_metadata_items(
+        self, scraping_ids: list[int]
+    ) -> dict[str, dict[Any, Any]]:
+        """
+        Fetches the DynamoDB metadata of scrapings, indexed by scraping ID.
+        Scrapings whose metadata cannot be fetched are left out, so that
+        their Postgres-only defaults are used.
+        """
+        if not self.dynamodb_client or not scraping_ids:
+            return {}
+        try:
+            items = await self.dynamodb_client.batch_get_items(
+                [{"scraping_id": str(scraping_id)} for scraping_id in scraping_ids],
+                attributes=METADATA_ATTRIBUTES,
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Falling back to Postgres-only scraping metadata: %s", e)
+            return {}
+        return {str(item["scraping_id"]): item for item in items}
 
     async def get_scraping_results(self, scraping_id: int) -> list[ScrapedPageRecord]:
         """
@@ -188,10 +471,139 @@ class ScraperService:
         """
         return await self.db_repository.get_scraping_results(scraping_id)
 
-    async def delete_scraping(self, scraping_id: int, user_id: int) -> bool:
+    async def get_results_scraping_id(self, scraping_id: int) -> int:
         """
-        Initiates the deletion of a scraping job.
-        Verifies existence and ownership before enqueuing to the deletion worker.
+        Returns the ID of the scraping holding the results of a scraping.
+        """
+        return await self.db_repository.get_results_scraping_id(scraping_id)
+
+    async def get_scraping_results_page(
+        self, scraping_id: int, after_id: int | None = None, limit: int = 50
+    ) -> tuple[list[ScrapedPageRecord], int | None]:
+        """
+        Retrieves one page of the results of a scraping session in crawl order.
+        Returns (results, after_id of the next page or None on the last page).
+        """
+        return await self.db_repository.get_scraping_results_page(
+            scraping_id, after_id=after_id, limit=limit
+        )
+
+    async def stream_scraping_results(
+        self, scraping_id: int, batch_size: int = RESULTS_BATCH_SIZE
+    ) -> AsyncIterator[ScrapedPageRecord]:
+        """
+        Yields the results of a scraping session, fetched batch by batch
+        with a keyset cursor so that memory stays flat whatever the crawl size.
+        """
+        after_id: int | None = None
+        while True:
+            results, after_id = await self.db_repository.get_scraping_results_page(
+                scraping_id, after_id=after_id, limit=batch_size
+            )
+            for result in results:
+                yield result
+            if after_id is None:
+                return
+
+    async def stream_progress(
+        self, scraping_id: int, heartbeat: float = PROGRESS_HEARTBEAT_SECONDS
+    ) -> AsyncIterator[ProgressEvent]:
+        """
+        Yields the progress of a scraping until it completes, fed by Redis pub/sub:
+        - status: the status and pending counter, on start and after `heartbeat`
+          seconds without events, which also makes up for missed messages;
+        - pending: the pending counter, whenever it changes;
+        - page: each page, summary or explanation written by the writer worker;
+        - completed: the end of the scraping, after which the stream ends;
+        - failed: a scraping that could not be started, after which the stream
+          ends.
+        """
+        pending_key = PENDING_KEY.format(scraping_id=scraping_id)
+        progress_channel = PROGRESS_CHANNEL.format(scraping_id=scraping_id)
+        channels = [progress_channel, self.pubsub_client.keyspace_channel(pending_key)]
+        messages: asyncio.Queue[tuple[str, str]] = asyncio.Queue()
+
+        async def forward() -> None:
+            try:
+                async for message in self.pubsub_client.subscribe_many(channels):
+                    messages.put_nowait(message)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.warning("Progress subscription of %s lost: %s", scraping_id, e)
+
+        forwarder = asyncio.create_task(forward())
+        try:
+            resync = True
+            while True:
+                if resync:
+                    snapshot = await self.__get_progress(scraping_id, pending_key)
+                    yield snapshot
+                    if snapshot["event"] in FINAL_PROGRESS_EVENTS:
+                        return
+                try:
+                    batch = [await asyncio.wait_for(messages.get(), heartbeat)]
+                except asyncio.TimeoutError:
+                    resync = True
+                    continue
+                resync = False
+                while not messages.empty():
+                    batch.append(messages.get_nowait())
+
+                for event in await self.__progress_events(
+                    batch, progress_channel, pending_key
+                ):
+                    yield event
+                    if event["event"] in FINAL_PROGRESS_EVENTS:
+                        return
+        finally:
+            forwarder.cancel()
+            with suppress(asyncio.CancelledError):
+                await forwarder
+
+    async def __progress_events(
+        self, batch: list[tuple[str, str]], progress_channel: str, pending_key: str
+    ) -> list[ProgressEvent]:
+        """
+        Converts a batch of pub/sub messages into progress events.
+        Keyspace notifications only name the command, and a busy crawl sends
+        many: the pending counter is read once per batch.
+        """
+        events: list[ProgressEvent] = []
+        pending_changed = False
+        for channel, data in batch:
+            if channel != progress_channel:
+                pending_changed = True
+            elif (event := _progress_event(data)) is not None:
+                events.append(event)
+        if pending_changed:
+            pending = await self.__get_pending(pending_key)
+            events.append({"event": "pending", "data": {"pending": pending}})
+        return events
+
+    async def __get_progress(self, scraping_id: int, pending_key: str) -> ProgressEvent:
+        item, pending = await asyncio.gather(
+            self.__get_metadata_item(scraping_id), self.__get_pending(pending_key)
+        )
+        status = item.get("status", "PENDING") if item else "PENDING"
+        if status == "COMPLETED":
+            return {"event": "completed", "data": {"status": status}}
+        # A job that could not be started is FAILED and will not progress
+        if status == "FAILED":
+            return {"event": "failed", "data": {"status": status}}
+        return {"event": "status", "data": {"status": status, "pending": pending}}
+
+    async def __get_pending(self, pending_key: str) -> int | None:
+        try:
+            value = await self.redis_client.get(pending_key)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Failed to read %s: %s", pending_key, e)
+            return None
+        return int(value) if value is not None else None
+
+    async def check_ownership(
+        self, scraping_id: int, user_id: int, action: str = "access"
+    ) -> ScrapingRecord:
+        """
+        Returns the scraping if it exists and belongs to the user.
         """
         scraping_record = await self.db_repository.get_scraping(scraping_id)
         if not scraping_record:
@@ -199,9 +611,16 @@ class ScraperService:
 
         if scraping_record["user_id"] != user_id:
             raise NotAuthorizedError(
-                f"User {user_id} is not authorized to delete scraping {scraping_id}"
+                f"User {user_id} is not authorized to {action} scraping {scraping_id}"
             )
+        return scraping_record
 
+    async def delete_scraping(self, scraping_id: int, user_id: int) -> bool:
+        """
+        Initiates the deletion of a scraping job.
+        Verifies existence and ownership before enqueuing to the deletion worker.
+        """
+        await self.check_ownership(scraping_id, user_id, action="delete")
         return await self.enqueue_deletion(scraping_id)
 
     async def enqueue_deletion(self, scraping_id: int) -> bool:
@@ -211,6 +630,22 @@ class ScraperService:
         if not self.deletion_queue_url:
             return False
 
-        message = {"scraping_id": scraping_id}
+        message = DeletionMessage(scraping_id=scraping_id)
         await self.sqs_client.send_message(message, queue_url=self.deletion_queue_url)
         return True
+
+    async def enqueue_deletions(self, scraping_ids: list[int]) -> list[bool]:
+        """
+        Sends deletion messages for many scrapings using batched SQS requests.
+        Returns whether each deletion was enqueued, in the same order.
+        """
+        if not self.deletion_queue_url:
+            return [False] * len(scraping_ids)
+
+        messages = [
+            DeletionMessage(scraping_id=scraping_id) for scraping_id in scraping_ids
+        ]
+        results = await self.sqs_client.send_messages(
+            messages, queue_url=self.deletion_queue_url
+        )
+        return [result["success"] for result in results]
@@ -0,0 +1,170 @@
+import hashlib
+import json
+import logging
+from typing import TypedDict
+
+from api.clients.redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+# Bumped by the writer worker whenever it writes results of the scraping,
+# and by the deletion worker once the scraping is deleted
+SCRAPING_VERSION_KEY = "scrape:{scraping_id}:version"
+SCRAPING_RESPONSE_KEY = "scrape:{scraping_id}:response"
+# Set while the deletion of the scraping is pending
+SCRAPING_DELETING_KEY = "scrape:{scraping_id}:deleting"
+# Version of a scraping the writer has not written to yet
+INITIAL_VERSION = "0"
+
+DEFAULT_TTL_SECONDS = 3600
+# Outlives the redeliveries of a deletion message
+DELETING_TTL_SECONDS = 86400
+# Same as the writer worker's
+VERSION_TTL_SECONDS = 30 * 86400
+
+# Bumps the version of a deleted scraping, which invalidates the entries built
+# from its results, and drops its response and deletion marker
+PURGE_SCRIPT = """
+redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+redis.call('DEL', KEYS[2], KEYS[3])
+"""
+
+
+class CachedResponse(TypedDict):
+    etag: str
+    body: str
+
+
+def compute_etag(body: bytes) -> str:
+    """
+    Returns the strong ETag of a response body.
+    """
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+class ScrapingCache:
+    """
+    Redis cache of the rendered GET /scraping/{id} responses of completed
+    scrapings. Each entry records the scraping holding its results (the source
+    of an alias) and that scraping's result version, and is ignored once the
+    writer or deletion worker has bumped that version. Scrapings pending
+    deletion are neither served from nor added to the cache.
+    Redis errors are logged and treated as cache misses.
+    """
+
+    def __init__(
+        self, redis_client: RedisClient, ttl: int = DEFAULT_TTL_SECONDS
+    ) -> None:
+        self.__redis_client = redis_client
+        self.__ttl = ttl
+
+    async def get(self, scraping_id: int) -> tuple[str | None, CachedResponse | None]:
+        """
+        Returns the current result version of a scraping, and its cached response
+        if it was built from the current version of its results.
+        The version is None when it cannot be read or the scraping is pending
+        deletion; nothing must then be cached.
+        """
+        try:
+            version, cached, deleting = await self.__redis_client.mget(
+                [
+                    SCRAPING_VERSION_KEY.format(scraping_id=scraping_id),
+                    SCRAPING_RESPONSE_KEY.format(scraping_id=scraping_id),
+                    SCRAPING_DELETING_KEY.format(scraping_id=scraping_id),
+                ]
+            )
+            if deleting is not None:
+                return None, None
+            version = version or INITIAL_VERSION
+            if cached is None:
+                return version, None
+
+            entry = json.loads(cached)
+            source_id = entry.get("source_id", scraping_id)
+            source_version = version
+            if source_id != scraping_id:
+                source_version = await self.__read_version(source_id)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Scraping cache unavailable: %s", e)
+            return None, None
+
+        if entry["version"] != source_version:
+            return version, None
+        return version, {"etag": entry["etag"], "body": entry["body"]}
+
+    async def version(self, scraping_id: int) -> str | None:
+        """
+        Returns the current result version of a scraping, or None when it
+        cannot be read.
+        """
+        try:
+            return await self.__read_version(scraping_id)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Scraping cache unavailable: %s", e)
+            return None
+
+    async def set(
+        self,
+        scraping_id: int,
+        version: str,
+        response: CachedResponse,
+        source_id: int | None = None,
+    ) -> None:
+        """
+        Caches the response of a scraping built from the given result version
+        of source_id, the scraping holding its results (itself by default).
+        """
+        entry = json.dumps(
+            {"source_id": source_id or scraping_id, "version": version, **response}
+        )
+        try:
+            await self.__redis_client.set(
+                SCRAPING_RESPONSE_KEY.format(scraping_id=scraping_id),
+                entry,
+                ex=self.__ttl,
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Failed to cache scraping %s: %s", scraping_id, e)
+
+    async def mark_deleting(self, scraping_id: int) -> None:
+        """
+        Drops the cached response of a scraping whose deletion was enqueued,
+        and keeps it out of the cache until the deletion worker purges it.
+        """
+        try:
+            await self.__redis_client.set(
+                SCRAPING_DELETING_KEY.format(scraping_id=scraping_id),
+                "1",
+                ex=DELETING_TTL_SECONDS,
+            )
+            await self.__redis_client.delete(
+                SCRAPING_RESPONSE_KEY.format(scraping_id=scraping_id)
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Failed to invalidate scraping %s: %s", scraping_id, e)
+
+    async def purge(self, scraping_id: int) -> None:
+        """
+        Forgets a deleted scraping: bumps its result version, which invalidates
+        the entries of the aliases built from its results, and drops its
+        response and deletion marker.
+        """
+        try:
+            await self.__redis_client.eval(
+                PURGE_SCRIPT,
+                [
+                    SCRAPING_VERSION_KEY.format(scraping_id=scraping_id),
+                    SCRAPING_RESPONSE_KEY.format(scraping_id=scraping_id),
+                    SCRAPING_DELETING_KEY.format(scraping_id=scraping_id),
+                ],
+                [VERSION_TTL_SECONDS],
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Failed to purge scraping %s: %s", scraping_id, e)
+
+    async def __read_version(self, scraping_id: int) -> str:
+        version = await self.__redis_client.get(
+            SCRAPING_VERSION_KEY.format(scraping_id=scraping_id)
+        )
+        return version or INITIAL_VERSION
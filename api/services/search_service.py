@@ -1,7 +1,28 @@
-from typing import TypedDict
+import hashlib
+import json
+import logging
+from typing import Any, TypedDict
 
+from api.clients.redis_client import RedisClient
 from api.repositories.search_repository import SearchRepository
 
+logger = logging.getLogger(__name__)
+
+SEARCH_CACHE_PREFIX = "search:"
+# Only the fields of a hit that make it to the results are fetched
+SEARCH_SOURCE_FIELDS = ["url", "scraping_id", "created_at"]
+# search_after needs a total order: ties on score are broken by page
+SEARCH_SORT = [
+    {"_score": "desc"},
+    {"scraping_id": "desc"},
+    {"url.keyword": "asc"},
+]
+
+DEFAULT_PAGE_SIZE = 10
+DEFAULT_FRAGMENT_SIZE = 150
+DEFAULT_FRAGMENTS = 3
+DEFAULT_CACHE_TTL_SECONDS = 30
+
 
 class SearchPageResult(TypedDict):
     url: str
@@ -10,17 +31,46 @@ class SearchPageResult(TypedDict):
     highlights: list[str]
 
 
+class SearchResultsPage(TypedDict):
+    results: list[SearchPageResult]
+    # Sort values of the last hit, to pass as search_after for the next page
+    next_search_after: list[Any] | None
+
+
 class SearchService:  # pylint: disable=too-few-public-methods
-    def __init__(self, repository: SearchRepository):
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(
+        self,
+        repository: SearchRepository,
+        redis_client: RedisClient | None = None,
+        cache_ttl: int = DEFAULT_CACHE_TTL_SECONDS,
+        fragment_size: int = DEFAULT_FRAGMENT_SIZE,
+        fragments: int = DEFAULT_FRAGMENTS,
+    ):
         self.__repository = repository
+        self.__redis_client = redis_client
+        self.__cache_ttl = cache_ttl
+        self.__fragment_size = fragment_size
+        self.__fragments = fragments
 
     async def search_pages(
-        self, query_term: str, user_id: int
-    ) -> list[SearchPageResult]:
+        self,
+        query_term: str,
+        user_id: int,
+        size: int = DEFAULT_PAGE_SIZE,
+        search_after: list[Any] | None = None,
+    ) -> SearchResultsPage:
         """
-        Searches for pages containing the query term, scoped by user_id.
+        Searches for pages containing the query term, scoped by user_id, one page
+        of `size` hits at a time starting after the search_after sort values.
+        Pages are cached in Redis for a few seconds.
         """
-        query = {
+        cache_key = self.__cache_key(query_term, user_id, size, search_after)
+        cached = await self.__get_cached(cache_key)
+        if cached is not None:
+            return cached
+
+        query: dict[str, Any] = {
             "query": {
                 "bool": {
                     "must": [
@@ -34,26 +84,71 @@ class SearchService:  # pylint: disable=too-few-public-methods
                     ]
                 }
             },
-            "highlight": {"fields": {"content": {}, "summary": {}}},
+            "highlight": {
+                "fields": {"content": {}, "summary": {}},
+                "fragment_size": self.__fragment_size,
+                "number_of_fragments": self.__fragments,
+            },
+            "_source": SEARCH_SOURCE_FIELDS,
+            "sort": SEARCH_SORT,
+            # One extra hit tells whether there is a next page
+            "size": size + 1,
+            "track_total_hits": False,
         }
+        if search_after is not None:
+            query["search_after"] = search_after
 
         response = await self.__repository.search(index="scraped_pages", body=query)
 
-        results: list[SearchPageResult] = []
-        for hit in response["hits"]["hits"]:
-            source = hit["_source"]
-            highlights = []
-            if "highlight" in hit:
-                for field in hit["highlight"]:
-                    highlights.extend(hit["highlight"][field])
-
-            results.append(
-                {
-                    "url": source["url"],
-                    "scraping_id": source["scraping_id"],
-                    "created_at": source.get("created_at", ""),
-                    "highlights": highlights[:3],  # Limit to 3 snippets
-                }
-            )
+        hits = response["hits"]["hits"]
+        page: SearchResultsPage = {
+            "results": [self.__result(hit) for hit in hits[:size]],
+            "next_search_after": hits[size - 1]["sort"] if len(hits) > size else None,
+        }
+        await self.__set_cached(cache_key, page)
+        return page
+
+    def __result(self, hit: dict[str, Any]) -> SearchPageResult:
+        source = hit["_source"]
+        highlights = []
+        if "highlight" in hit:
+            for field in hit["highlight"]:
+                highlights.extend(hit["highlight"][field])
+
+        return {
+            "url": source["url"],
+            "scraping_id": source["scraping_id"],
+            "created_at": source.get("created_at", ""),
+            "highlights": highlights[: self.__fragments],
+        }
+
+    @staticmethod
+    def __cache_key(
+        query_term: str, user_id: int, size: int, search_after: list[Any] | None
+    ) -> str:
+        params = json.dumps([query_term, size, search_after], separators=(",", ":"))
+        digest = hashlib.sha256(params.encode("utf-8")).hexdigest()
+        return f"{SEARCH_CACHE_PREFIX}{user_id}:{digest}"
 
-        return results
+    async def __get_cached(self, cache_key: str) -> SearchResultsPage | None:
+        if self.__redis_client is None or self.__cache_ttl <= 0:
+            return None
+        try:
+            cached = await self.__redis_client.get(cache_key)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Search cache unavailable: %s", e)
+            return None
+        if cached is None:
+            return None
+        page: SearchResultsPage = json.loads(cached)
+        return page
+
+    async def __set_cached(self, cache_key: str, page: SearchResultsPage) -> None:
+        if self.__redis_client is None or self.__cache_ttl <= 0:
+            return
+        try:
+            await self.__redis_client.set(
+                cache_key, json.dumps(page), ex=self.__cache_ttl
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Failed to cache search results: %s", e)
@@ -0,0 +1,49 @@
+DEFAULT_MAX_STREAMS = 100
+
+
+class StreamLimitExceededError(Exception):
+    """Exception raised when the API already serves as many streams as it may."""
+
+
+class StreamSlot:  # pylint: disable=too-few-public-methods
+    """
+    A slot of an open stream, freed once by release() however often it is called.
+    """
+
+    def __init__(self, limiter: "StreamLimiter") -> None:
+        self.__limiter: StreamLimiter | None = limiter
+
+    def release(self) -> None:
+        if self.__limiter is not None:
+            self.__limiter.release()
+            self.__limiter = None
+
+
+class StreamLimiter:
+    """
+    In-process cap on the Server-Sent Event streams open at once, each of which
+    holds a connection of the Redis pub/sub pool for as long as it lasts.
+    """
+
+    def __init__(self, max_streams: int = DEFAULT_MAX_STREAMS) -> None:
+        self.__max_streams = max_streams
+        self.__open = 0
+
+    @property
+    def open_streams(self) -> int:
+        return self.__open
+
+    def acquire(self) -> StreamSlot:
+        """
+        Reserves a slot for a stream, raising StreamLimitExceededError when
+        all of them are taken.
+        """
+        if self.__open >= self.__max_streams:
+            raise StreamLimitExceededError(
+                f"Too many open event streams (max {self.__max_streams})"
+            )
+        self.__open += 1
+        return StreamSlot(self)
+
+    def release(self) -> None:
+        self.__open -= 1
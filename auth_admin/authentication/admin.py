@@ -17,10 +17,17 @@ class APIKeyAdmin(admin.ModelAdmin):
         "expires_at",
         "created_at",
         "last_used_at",
+        "request_count",
     )
     list_filter = ("is_active", "created_at", "expires_at", "user")
     search_fields = ("name", "prefix", "user__username")
-    readonly_fields = ("prefix", "hashed_key", "last_used_at", "created_at")
+    readonly_fields = (
+        "prefix",
+        "hashed_key",
+        "last_used_at",
+        "request_count",
+        "created_at",
+    )
 
     def save_model(self, request: Any, obj: APIKey, form: Any, change: bool) -> None:
         if not change:  # If creating a new APIKey
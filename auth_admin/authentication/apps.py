@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class AuthenticationConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "authentication"
+
+    def ready(self) -> None:
+        # Connects the cache invalidation receivers
+        # pylint: disable-next=import-outside-toplevel,unused-import
+        from . import signals  # noqa: F401
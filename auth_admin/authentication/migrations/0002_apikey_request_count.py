@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="apikey",
+            name="request_count",
+            field=models.PositiveBigIntegerField(
+                default=0, editable=False, help_text="Requests made with the API Key"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="apikey",
+            name="hashed_key",
+            field=models.CharField(db_index=True, editable=False, max_length=128),
+        ),
+    ]
@@ -16,13 +16,16 @@ class APIKey(models.Model):
         max_length=100, unique=True, help_text="A descriptive name for the API Key"
     )
     prefix = models.CharField(max_length=8, editable=False)
-    hashed_key = models.CharField(max_length=128, editable=False)
+    hashed_key = models.CharField(max_length=128, editable=False, db_index=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     expires_at = models.DateTimeField(
         null=True, blank=True, help_text="Optional expiration date"
     )
     last_used_at = models.DateTimeField(null=True, blank=True)
+    request_count = models.PositiveBigIntegerField(
+        default=0, editable=False, help_text="Requests made with the API Key"
+    )
 
     class Meta:
         db_table = "api_keys"
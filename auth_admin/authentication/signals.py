@@ -0,0 +1,41 @@
+import logging
+from typing import Any
+
+import redis
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import APIKey
+
+logger = logging.getLogger(__name__)
+
+# Must match api/services/api_key_cache.py
+API_KEY_CACHE_PREFIX = "auth:key:"
+API_KEY_INVALIDATION_CHANNEL = "auth:key:invalidate"
+
+
+def invalidate_api_key(hashed_key: str) -> None:
+    """
+    Drops a key from the API's Redis cache and tells every API replica
+    to evict it from its in-process cache.
+    """
+    try:
+        client = redis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT)
+        with client:
+            client.delete(f"{API_KEY_CACHE_PREFIX}{hashed_key}")
+            client.publish(API_KEY_INVALIDATION_CHANNEL, hashed_key)
+    except redis.RedisError as e:
+        # The API caches expire on their own, within 5 minutes
+        logger.warning("Failed to invalidate cached API key: %s", e)
+
+
+@receiver(post_save, sender=APIKey)
+def api_key_saved(instance: APIKey, **_kwargs: Any) -> None:
+    # A new key may have been cached as unknown
+    invalidate_api_key(instance.hashed_key)
+
+
+@receiver(post_delete, sender=APIKey)
+def api_key_deleted(instance: APIKey, **_kwargs: Any) -> None:
+    invalidate_api_key(instance.hashed_key)
@@ -90,6 +90,10 @@ DATABASES = {
     ),
 }
 
+# Redis used by the API to cache API keys, invalidated when a key changes
+REDIS_HOST = env("REDIS_HOST", default="redis")
+REDIS_PORT = env.int("REDIS_PORT", default=6379)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
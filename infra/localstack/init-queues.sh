@@ -17,3 +17,5 @@ awslocal dynamodb create-table \
     --provisioned-throughput ReadCapacityUnits=5,WriteCapacityUnits=5
 
 awslocal s3 mb s3://isidorus-images
+# Message bodies too large for SQS, offloaded by their producers
+awslocal s3 mb s3://isidorus-claim-checks
@@ -1,7 +1,12 @@
 CREATE TABLE IF NOT EXISTS scrapings (
     id SERIAL PRIMARY KEY,
     user_id INTEGER,
-    url TEXT NOT NULL
+    url TEXT NOT NULL,
+    depth INTEGER,
+    normalized_url TEXT,
+    completed_at TIMESTAMP WITH TIME ZONE,
+    -- Set on aliases, which reuse the results of a recent scraping
+    source_scraping_id INTEGER REFERENCES scrapings(id) ON DELETE SET NULL
 );
 
 CREATE TABLE IF NOT EXISTS scraped_pages (
@@ -38,5 +43,9 @@ CREATE TABLE IF NOT EXISTS page_links (
 
 CREATE INDEX idx_page_terms_term ON page_terms(term);
 CREATE INDEX idx_scraped_pages_url ON scraped_pages(url);
-
-
+CREATE INDEX IF NOT EXISTS idx_scrapings_user_id ON scrapings(user_id, id DESC);
+CREATE INDEX IF NOT EXISTS idx_scraped_pages_scraping_url ON scraped_pages(scraping_id, url);
+CREATE INDEX IF NOT EXISTS idx_scrapings_fresh ON scrapings(normalized_url, depth, completed_at DESC)
+    WHERE completed_at IS NOT NULL AND source_scraping_id IS NULL;
+CREATE INDEX IF NOT EXISTS idx_scrapings_source ON scrapings(source_scraping_id)
+    WHERE source_scraping_id IS NOT NULL;
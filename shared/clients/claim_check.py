@@ -0,0 +1,111 @@
+import gzip
+import json
+import logging
+import uuid
+from typing import TypedDict
+
+from shared.clients.s3_client import S3Client
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CLAIM_CHECK_THRESHOLD_BYTES = 64 * 1024
+DEFAULT_CLAIM_CHECK_PREFIX = "claim-checks/"
+CLAIM_CHECK_FIELD = "claim_check"
+CLAIM_CHECK_ENCODING = "gzip"
+# Cheap test that avoids parsing every inline body as JSON
+CLAIM_CHECK_MARKER = f'{{"{CLAIM_CHECK_FIELD}":'
+
+
+class ClaimCheckPointer(TypedDict):
+    bucket: str
+    key: str
+    encoding: str
+
+
+class ClaimCheckError(Exception):
+    """Exception raised when an offloaded message body cannot be retrieved."""
+
+
+class ClaimCheck:
+    """
+    Claim-check pattern for SQS: bodies above a size threshold are stored
+    gzip-compressed in S3 and replaced by a small pointer message.
+    Receivers resolve the pointer when they need the body and release
+    the S3 object once the message has been acknowledged.
+    """
+
+    def __init__(
+        self,
+        s3_client: S3Client,
+        bucket: str | None = None,
+        threshold_bytes: int = DEFAULT_CLAIM_CHECK_THRESHOLD_BYTES,
+        prefix: str = DEFAULT_CLAIM_CHECK_PREFIX,
+    ) -> None:
+        self.__s3_client = s3_client
+        self.__bucket = bucket
+        self.__threshold_bytes = threshold_bytes
+        self.__prefix = prefix
+
+    @staticmethod
+    def pointer(message_body: str) -> ClaimCheckPointer | None:
+        """
+        Returns the claim-check pointer of a message body, or None if it is inline.
+        """
+        if not message_body.startswith(CLAIM_CHECK_MARKER):
+            return None
+        try:
+            pointer: ClaimCheckPointer = json.loads(message_body)[CLAIM_CHECK_FIELD]
+        except (ValueError, KeyError, TypeError):
+            return None
+        return pointer
+
+    async def offload(self, message_body: str) -> str:
+        """
+        Stores the body in S3 and returns a pointer message if it is above the
+        threshold. Without a bucket, or below the threshold, the body is returned.
+        """
+        data = message_body.encode("utf-8")
+        if self.__bucket is None or len(data) <= self.__threshold_bytes:
+            return message_body
+
+        key = f"{self.__prefix}{uuid.uuid4().hex}"
+        await self.__s3_client.upload_bytes(
+            gzip.compress(data), self.__bucket, key, content_type="application/gzip"
+        )
+        pointer: ClaimCheckPointer = {
+            "bucket": self.__bucket,
+            "key": key,
+            "encoding": CLAIM_CHECK_ENCODING,
+        }
+        return json.dumps({CLAIM_CHECK_FIELD: pointer})
+
+    async def resolve(self, message_body: str) -> str:
+        """
+        Returns the original body, downloading it from S3 if it was offloaded.
+        """
+        pointer = self.pointer(message_body)
+        if pointer is None:
+            return message_body
+
+        data = await self.__s3_client.download_bytes(pointer["bucket"], pointer["key"])
+        if data is None:
+            raise ClaimCheckError(
+                f"Claim-checked body s3://{pointer['bucket']}/{pointer['key']} "
+                "is not available"
+            )
+        if pointer.get("encoding") == CLAIM_CHECK_ENCODING:
+            data = gzip.decompress(data)
+        return data.decode("utf-8")
+
+    async def release(self, message_body: str) -> None:
+        """
+        Deletes the S3 object behind an acknowledged pointer message.
+        """
+        pointer = self.pointer(message_body)
+        if pointer is None:
+            return
+        try:
+            await self.__s3_client.delete_object(pointer["bucket"], pointer["key"])
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # A leftover object only costs storage, the message itself is done
+            logger.warning("Failed to release claim check %s: %s", pointer["key"], e)
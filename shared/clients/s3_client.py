@@ -1,27 +1,48 @@
+import asyncio
 import logging
-from typing import cast
+from collections.abc import AsyncIterable, AsyncIterator, Sequence
+from contextlib import suppress
+from typing import Any, TypedDict, cast
 
 import aioboto3  # type: ignore
-from botocore.exceptions import ClientError  # type: ignore
+from aiobotocore.config import AioConfig  # type: ignore
+from botocore.exceptions import BotoCoreError, ClientError  # type: ignore
 
 from shared.config import Configuration
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+# S3 rejects multipart parts smaller than 5 MiB, except for the last one
+MIN_PART_SIZE = 5 * 1024 * 1024
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+DEFAULT_MAX_CONCURRENT_PARTS = 4
+DEFAULT_MAX_POOL_CONNECTIONS = 10
+# DeleteObjects accepts at most 1000 keys per request
+MAX_DELETE_KEYS = 1000
+DEFAULT_MAX_CONCURRENT_DELETES = 4
+
+
+class DeleteObjectsResult(TypedDict):
+    deleted: int
+    failed_keys: list[str]
+
 
 class S3Client:
-    # pylint: disable=too-few-public-methods
+    # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
     def __init__(
         self,
         endpoint_url: str | None = None,
         region_name: str = "us-east-1",
         access_key: str | None = None,
         secret_key: str | None = None,
+        max_pool_connections: int = DEFAULT_MAX_POOL_CONNECTIONS,
     ):
         self.__endpoint_url = endpoint_url
         self.__region_name = region_name
         self.__access_key = access_key
         self.__secret_key = secret_key
+        self.__max_pool_connections = max_pool_connections
         self.__session = aioboto3.Session()
 
     @staticmethod
@@ -34,6 +55,17 @@ class S3Client:
             region_name=config.aws_region,
             access_key=config.aws_access_key_id,
             secret_key=config.aws_secret_access_key,
+            max_pool_connections=config.aws_max_pool_connections,
+        )
+
+    def __create_client(self) -> Any:
+        return self.__session.client(
+            "s3",
+            endpoint_url=self.__endpoint_url,
+            region_name=self.__region_name,
+            aws_access_key_id=self.__access_key,
+            aws_secret_access_key=self.__secret_key,
+            config=AioConfig(max_pool_connections=self.__max_pool_connections),
         )
 
     async def upload_bytes(
@@ -44,13 +76,7 @@ class S3Client:
         content_type: str = "application/octet-stream",
     ) -> str:
         try:
-            async with self.__session.client(
-                "s3",
-                endpoint_url=self.__endpoint_url,
-                region_name=self.__region_name,
-                aws_access_key_id=self.__access_key,
-                aws_secret_access_key=self.__secret_key,
-            ) as client:
+            async with self.__create_client() as client:
                 await client.put_object(
                     Body=data, Bucket=bucket, Key=key, ContentType=content_type
                 )
@@ -61,52 +87,188 @@ class S3Client:
 
     async def delete_object(self, bucket: str, key: str) -> bool:
         try:
-            async with self.__session.client(
-                "s3",
-                endpoint_url=self.__endpoint_url,
-                region_name=self.__region_name,
-                aws_access_key_id=self.__access_key,
-                aws_secret_access_key=self.__secret_key,
-            ) as client:
+            async with self.__create_client() as client:
                 await client.delete_object(Bucket=bucket, Key=key)
                 return True
         except ClientError as e:
             logger.error("Failed to delete from S3: %s", e)
             raise
 
-    async def delete_objects(self, bucket: str, keys: list[str]) -> bool:
+    async def delete_objects(
+        self,
+        bucket: str,
+        keys: Sequence[str],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENT_DELETES,
+    ) -> DeleteObjectsResult:
         """
-        Deletes multiple objects from S3 in a single request (max 1000).
+        Deletes any number of objects from S3, split into 1000-key requests
+        that run concurrently on a single client.
+        Returns how many keys were deleted and which ones failed.
         """
+        result: DeleteObjectsResult = {"deleted": 0, "failed_keys": []}
         if not keys:
-            return True
-        try:
-            async with self.__session.client(
-                "s3",
-                endpoint_url=self.__endpoint_url,
-                region_name=self.__region_name,
-                aws_access_key_id=self.__access_key,
-                aws_secret_access_key=self.__secret_key,
-            ) as client:
-                delete_dict = {"Objects": [{"Key": k} for k in keys]}
-                await client.delete_objects(Bucket=bucket, Delete=delete_dict)
-                return True
-        except ClientError as e:
-            logger.error("Failed to batch delete from S3: %s", e)
-            raise e
+            return result
+        semaphore = asyncio.Semaphore(max_concurrency)
+        chunks = [
+            keys[i : i + MAX_DELETE_KEYS] for i in range(0, len(keys), MAX_DELETE_KEYS)
+        ]
+        async with self.__create_client() as client:
+            failed_per_chunk = await asyncio.gather(
+                *(
+                    self.__delete_chunk(client, semaphore, bucket, chunk)
+                    for chunk in chunks
+                )
+            )
+        for failed in failed_per_chunk:
+            result["failed_keys"].extend(failed)
+        result["deleted"] = len(keys) - len(result["failed_keys"])
+        return result
+
+    @staticmethod
+    async def __delete_chunk(
+        client: Any, semaphore: asyncio.Semaphore, bucket: str, keys: Sequence[str]
+    ) -> list[str]:
+        async with semaphore:
+            try:
+                response = await client.delete_objects(
+                    Bucket=bucket,
+                    Delete={"Objects": [{"Key": k} for k in keys], "Quiet": True},
+                )
+            except (ClientError, BotoCoreError) as e:
+                # Connection errors too: the other chunks' results must survive
+                logger.error("Failed to batch delete from S3: %s", e)
+                return list(keys)
+        errors = response.get("Errors", [])
+        for error in errors:
+            logger.warning(
+                "Failed to delete s3://%s/%s: %s",
+                bucket,
+                error.get("Key"),
+                error.get("Code"),
+            )
+        return [error["Key"] for error in errors]
 
     async def download_bytes(self, bucket: str, key: str) -> bytes | None:
         try:
-            async with self.__session.client(
-                "s3",
-                endpoint_url=self.__endpoint_url,
-                region_name=self.__region_name,
-                aws_access_key_id=self.__access_key,
-                aws_secret_access_key=self.__secret_key,
-            ) as client:
+            async with self.__create_client() as client:
                 response = await client.get_object(Bucket=bucket, Key=key)
                 async with response["Body"] as stream:
                     return cast(bytes, await stream.read())
         except ClientError as e:
             logger.error("Failed to download from S3: %s", e)
             return None
+
+    async def download_stream(
+        self,
+        bucket: str,
+        key: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        start: int = 0,
+        end: int | None = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Yields the object in chunks of at most chunk_size bytes.
+        start and end (inclusive) restrict the download to a byte range.
+        """
+        params = {"Bucket": bucket, "Key": key}
+        if start or end is not None:
+            params["Range"] = f"bytes={start}-{'' if end is None else end}"
+        try:
+            async with self.__create_client() as client:
+                response = await client.get_object(**params)
+                async with response["Body"] as stream:
+                    while chunk := await stream.read(chunk_size):
+                        yield chunk
+        except ClientError as e:
+            logger.error("Failed to stream from S3: %s", e)
+            raise
+
+    async def upload_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        bucket: str,
+        key: str,
+        content_type: str = "application/octet-stream",
+        part_size: int = DEFAULT_PART_SIZE,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENT_PARTS,
+    ) -> str:
+        """
+        Uploads an object from an async iterable of chunks.
+        Objects smaller than part_size are sent in a single PUT, larger ones as a
+        multipart upload with up to max_concurrency parts in flight, so at most
+        max_concurrency + 1 parts are held in memory.
+        """
+        part_size = max(part_size, MIN_PART_SIZE)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        tasks: list[asyncio.Task] = []
+        upload_id: str | None = None
+        buffer = bytearray()
+        async with self.__create_client() as client:
+
+            async def submit_part(body: bytes) -> None:
+                # Blocks while max_concurrency parts are still uploading
+                await semaphore.acquire()
+                params = {
+                    "Bucket": bucket,
+                    "Key": key,
+                    "UploadId": upload_id,
+                    "PartNumber": len(tasks) + 1,
+                    "Body": body,
+                }
+                tasks.append(
+                    asyncio.create_task(self.__upload_part(client, semaphore, params))
+                )
+
+            try:
+                async for chunk in chunks:
+                    buffer.extend(chunk)
+                    while len(buffer) >= part_size:
+                        if upload_id is None:
+                            upload = await client.create_multipart_upload(
+                                Bucket=bucket, Key=key, ContentType=content_type
+                            )
+                            upload_id = upload["UploadId"]
+                        await submit_part(bytes(buffer[:part_size]))
+                        del buffer[:part_size]
+
+                if upload_id is None:
+                    await client.put_object(
+                        Body=bytes(buffer),
+                        Bucket=bucket,
+                        Key=key,
+                        ContentType=content_type,
+                    )
+                    return f"s3://{bucket}/{key}"
+
+                if buffer:
+                    await submit_part(bytes(buffer))
+                parts = await asyncio.gather(*tasks)
+                await client.complete_multipart_upload(
+                    Bucket=bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    MultipartUpload={"Parts": list(parts)},
+                )
+                return f"s3://{bucket}/{key}"
+            except Exception as e:
+                logger.error("Failed to stream upload to S3: %s", e)
+                for task in tasks:
+                    task.cancel()
+                # No part may still be uploading once the upload is aborted
+                await asyncio.gather(*tasks, return_exceptions=True)
+                if upload_id is not None:
+                    with suppress(ClientError):
+                        await client.abort_multipart_upload(
+                            Bucket=bucket, Key=key, UploadId=upload_id
+                        )
+                raise
+
+    @staticmethod
+    async def __upload_part(
+        client: Any, semaphore: asyncio.Semaphore, params: dict[str, Any]
+    ) -> dict[str, Any]:
+        try:
+            response = await client.upload_part(**params)
+            return {"ETag": response["ETag"], "PartNumber": params["PartNumber"]}
+        finally:
+            semaphore.release()
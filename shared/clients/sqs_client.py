@@ -1,16 +1,43 @@
-import json
+import asyncio
 import logging
-from typing import Any
+from collections.abc import AsyncIterator, Sequence
+from contextlib import AsyncExitStack, asynccontextmanager, suppress
+from typing import Any, TypedDict
 
 import aioboto3  # type: ignore
+from aiobotocore.config import AioConfig  # type: ignore
 
+from shared.clients.claim_check import ClaimCheck
 from shared.config import Configuration
+from shared.messages import Message, encode_message
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_POOL_CONNECTIONS = 10
+
+# SendMessageBatch limits: 10 entries and 256 KiB of payload per request
+MAX_BATCH_ENTRIES = 10
+MAX_BATCH_BYTES = 256 * 1024
+DEFAULT_BATCH_RETRIES = 3
+DEFAULT_RETRY_BACKOFF_SECONDS = 0.1
+DEFAULT_ACK_MAX_LATENCY_SECONDS = 1.0
+DEFAULT_VISIBILITY_TIMEOUT_SECONDS = 60
+
+
+class SendMessageResult(TypedDict):
+    success: bool
+    message_id: str | None
+    error: str | None
+
+
+class AckMetrics(TypedDict):
+    buffered: int
+    flushed: int
+    failed: int
+
 
 class SQSClient:
-    # pylint: disable=too-few-public-methods
+    # pylint: disable=too-many-instance-attributes
     def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
         self,
         endpoint_url: str | None,
@@ -18,18 +45,27 @@ class SQSClient:
         access_key: str | None,
         secret_key: str | None,
         queue_url: str | None,
+        max_pool_connections: int = DEFAULT_MAX_POOL_CONNECTIONS,
+        claim_check: ClaimCheck | None = None,
     ) -> None:
         self.__endpoint_url = endpoint_url
         self.__region = region
         self.__access_key = access_key
         self.__secret_key = secret_key
         self.__queue_url = queue_url
+        self.__max_pool_connections = max_pool_connections
+        self.__claim_check = claim_check
         self.__session = aioboto3.Session()
+        self.__exit_stack: AsyncExitStack | None = None
+        self.__client: Any = None
 
     @staticmethod
-    def create(config: "Configuration") -> "SQSClient":  # type: ignore
+    def create(
+        config: Configuration, claim_check: ClaimCheck | None = None
+    ) -> "SQSClient":
         """
         Creates an SQSClient instance from the configuration.
+        Bodies above the claim check threshold are offloaded to S3 when given.
         """
         return SQSClient(
             endpoint_url=config.aws_endpoint_url,
@@ -37,23 +73,76 @@ class SQSClient:
             access_key=config.aws_access_key_id,
             secret_key=config.aws_secret_access_key,
             queue_url=config.sqs_queue_url,
+            max_pool_connections=config.aws_max_pool_connections,
+            claim_check=claim_check,
         )
 
+    async def start(self) -> "SQSClient":
+        """
+        Opens the long-lived, connection-pooled SQS client shared by every call.
+        Calls made before start() (or after close()) open a client per call.
+        """
+        if self.__client is not None:
+            return self
+
+        exit_stack = AsyncExitStack()
+        self.__client = await exit_stack.enter_async_context(self.__create_client())
+        self.__exit_stack = exit_stack
+        return self
+
+    async def close(self) -> None:
+        """
+        Closes the long-lived SQS client and its connection pool.
+        """
+        exit_stack = self.__exit_stack
+        self.__exit_stack = None
+        self.__client = None
+        if exit_stack is not None:
+            await exit_stack.aclose()
+
+    async def __aenter__(self) -> "SQSClient":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    def __create_client(self) -> Any:
+        return self.__session.client(
+            "sqs",
+            endpoint_url=self.__endpoint_url,
+            region_name=self.__region,
+            aws_access_key_id=self.__access_key,
+            aws_secret_access_key=self.__secret_key,
+            config=AioConfig(max_pool_connections=self.__max_pool_connections),
+        )
+
+    @asynccontextmanager
+    async def __acquire_client(self) -> AsyncIterator[Any]:
+        """
+        Yields the long-lived client if started, or a short-lived one otherwise.
+        """
+        if self.__client is not None:
+            yield self.__client
+            return
+
+        async with self.__create_client() as client:
+            yield client
+
     async def send_message(
-        self, message_body: dict, queue_url: str | None = None
+        self,
+        message_body: Message | dict,
+        queue_url: str | None = None,
+        claim_check: ClaimCheck | None = None,
     ) -> bool:
+        """
+        Sends a message, offloading its body to S3 if it is above the threshold of
+        the given claim check (by default, the client's own).
+        """
         try:
             target_queue = queue_url or self.__queue_url
-            async with self.__session.client(
-                "sqs",
-                endpoint_url=self.__endpoint_url,
-                region_name=self.__region,
-                aws_access_key_id=self.__access_key,
-                aws_secret_access_key=self.__secret_key,
-            ) as client:
-                await client.send_message(
-                    QueueUrl=target_queue, MessageBody=json.dumps(message_body)
-                )
+            body = await self.__encode(message_body, claim_check)
+            async with self.__acquire_client() as client:
+                await client.send_message(QueueUrl=target_queue, MessageBody=body)
                 return True
         except Exception as e:
             logger.error("Failed to send SQS message: %s", e)
@@ -66,13 +155,7 @@ class SQSClient:
         Receives messages from the SQS queue.
         """
         try:
-            async with self.__session.client(
-                "sqs",
-                endpoint_url=self.__endpoint_url,
-                region_name=self.__region,
-                aws_access_key_id=self.__access_key,
-                aws_secret_access_key=self.__secret_key,
-            ) as client:
+            async with self.__acquire_client() as client:
                 response = await client.receive_message(
                     QueueUrl=queue_url,
                     MaxNumberOfMessages=max_messages,
@@ -89,13 +172,7 @@ class SQSClient:
         Deletes a message from the SQS queue.
         """
         try:
-            async with self.__session.client(
-                "sqs",
-                endpoint_url=self.__endpoint_url,
-                region_name=self.__region,
-                aws_access_key_id=self.__access_key,
-                aws_secret_access_key=self.__secret_key,
-            ) as client:
+            async with self.__acquire_client() as client:
                 await client.delete_message(
                     QueueUrl=queue_url, ReceiptHandle=receipt_handle
                 )
@@ -103,3 +180,328 @@ class SQSClient:
         except Exception as e:
             logger.error("Failed to delete SQS message: %s", e)
             return False
+
+    async def change_message_visibility(
+        self, queue_url: str, receipt_handle: str, visibility_timeout: int
+    ) -> bool:
+        """
+        Sets the visibility timeout of an in-flight message, counted from now.
+        """
+        try:
+            async with self.__acquire_client() as client:
+                await client.change_message_visibility(
+                    QueueUrl=queue_url,
+                    ReceiptHandle=receipt_handle,
+                    VisibilityTimeout=visibility_timeout,
+                )
+                return True
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("Failed to change SQS message visibility: %s", e)
+            return False
+
+    async def send_messages(
+        self,
+        message_bodies: Sequence[Message | dict],
+        queue_url: str | None = None,
+        max_retries: int = DEFAULT_BATCH_RETRIES,
+    ) -> list[SendMessageResult]:
+        """
+        Sends many messages with SendMessageBatch, splitting them into batches of
+        at most 10 entries / 256 KiB and retrying only the entries that failed.
+        Returns one result per message body, in the same order.
+        """
+        target_queue = queue_url or self.__queue_url
+        results: list[SendMessageResult] = [
+            {"success": False, "message_id": None, "error": None}
+            for _ in message_bodies
+        ]
+
+        encoded: dict[int, str] = {}
+        for index, message_body in enumerate(message_bodies):
+            body = await self.__encode(message_body)
+            if len(body.encode("utf-8")) > MAX_BATCH_BYTES:
+                results[index]["error"] = "Message exceeds the SQS size limit"
+                continue
+            encoded[index] = body
+
+        async with self.__acquire_client() as client:
+            for batch in self.__split_batches(encoded):
+                batch_results = await self.__run_batch(
+                    client.send_message_batch,
+                    target_queue,
+                    {index: {"MessageBody": body} for index, body in batch.items()},
+                    max_retries,
+                )
+                for index, result in batch_results.items():
+                    results[index] = result
+
+        failed = sum(1 for result in results if not result["success"])
+        if failed:
+            logger.error("Failed to send %d of %d SQS messages", failed, len(results))
+        return results
+
+    async def delete_messages(
+        self,
+        queue_url: str,
+        receipt_handles: Sequence[str],
+        max_retries: int = DEFAULT_BATCH_RETRIES,
+    ) -> list[bool]:
+        """
+        Deletes many messages with DeleteMessageBatch (10 entries per request),
+        retrying only the entries that failed.
+        Returns whether each message was deleted, in the same order.
+        """
+        results = [False] * len(receipt_handles)
+        try:
+            async with self.__acquire_client() as client:
+                for batch in self.__split_batches(dict(enumerate(receipt_handles))):
+                    batch_results = await self.__run_batch(
+                        client.delete_message_batch,
+                        queue_url,
+                        {index: {"ReceiptHandle": h} for index, h in batch.items()},
+                        max_retries,
+                    )
+                    for index, result in batch_results.items():
+                        results[index] = result["success"]
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("Failed to delete SQS messages: %s", e)
+
+        failed = results.count(False)
+        if failed:
+            logger.error("Failed to delete %d of %d SQS messages", failed, len(results))
+        return results
+
+    async def __encode(
+        self, message_body: Message | dict, claim_check: ClaimCheck | None = None
+    ) -> str:
+        body = encode_message(message_body)
+        claim_check = claim_check or self.__claim_check
+        if claim_check is None:
+            return body
+        return await claim_check.offload(body)
+
+    @staticmethod
+    def __split_batches(encoded: dict[int, str]) -> list[dict[int, str]]:
+        batches: list[dict[int, str]] = []
+        batch: dict[int, str] = {}
+        batch_bytes = 0
+        for index, body in encoded.items():
+            body_bytes = len(body.encode("utf-8"))
+            if batch and (
+                len(batch) >= MAX_BATCH_ENTRIES
+                or batch_bytes + body_bytes > MAX_BATCH_BYTES
+            ):
+                batches.append(batch)
+                batch, batch_bytes = {}, 0
+            batch[index] = body
+            batch_bytes += body_bytes
+        if batch:
+            batches.append(batch)
+        return batches
+
+    @staticmethod
+    async def __run_batch(
+        operation: Any,
+        queue_url: str | None,
+        entries: dict[int, dict[str, str]],
+        max_retries: int,
+    ) -> dict[int, SendMessageResult]:
+        """
+        Runs a *MessageBatch operation, retrying only the failed entries.
+        """
+        results: dict[int, SendMessageResult] = {
+            index: {"success": False, "message_id": None, "error": None}
+            for index in entries
+        }
+        pending = dict(entries)
+        for attempt in range(max_retries + 1):
+            if attempt:
+                await asyncio.sleep(DEFAULT_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+            try:
+                response = await operation(
+                    QueueUrl=queue_url,
+                    Entries=[
+                        {"Id": str(index), **fields}
+                        for index, fields in pending.items()
+                    ],
+                )
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.warning("SQS batch attempt %d failed: %s", attempt, e)
+                for index in pending:
+                    results[index]["error"] = str(e)
+                continue
+
+            for entry in response.get("Successful", []):
+                index = int(entry["Id"])
+                results[index] = {
+                    "success": True,
+                    "message_id": entry.get("MessageId"),
+                    "error": None,
+                }
+                pending.pop(index, None)
+
+            for entry in response.get("Failed", []):
+                index = int(entry["Id"])
+                results[index]["error"] = entry.get("Message") or entry.get("Code")
+                # Sender faults (e.g. an invalid entry) will not succeed on retry
+                if entry.get("SenderFault"):
+                    pending.pop(index, None)
+
+            if not pending:
+                break
+
+        return results
+
+
+class AckBuffer:
+    """
+    Buffers the receipt handles of processed messages and deletes them with
+    DeleteMessageBatch once 10 are pending or the oldest one reaches the
+    max-latency deadline. close() flushes whatever is left.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self,
+        sqs_client: SQSClient,
+        queue_url: str,
+        max_latency: float = DEFAULT_ACK_MAX_LATENCY_SECONDS,
+        claim_check: ClaimCheck | None = None,
+    ) -> None:
+        self.__sqs_client = sqs_client
+        self.__queue_url = queue_url
+        self.__max_latency = max_latency
+        self.__claim_check = claim_check
+        self.__pending: list[str] = []
+        # Pointer bodies whose S3 objects are released once their message is deleted
+        self.__claims: dict[str, str] = {}
+        self.__lock = asyncio.Lock()
+        self.__timer: asyncio.Task | None = None
+        self.__metrics: AckMetrics = {"buffered": 0, "flushed": 0, "failed": 0}
+
+    @property
+    def metrics(self) -> AckMetrics:
+        """
+        Counters of buffered, flushed (deleted) and failed acknowledgements.
+        """
+        return {**self.__metrics}
+
+    async def add(self, receipt_handle: str, message_body: str | None = None) -> None:
+        """
+        Buffers the acknowledgement of a processed message.
+        Pass the raw message body to release its claim check after the delete.
+        """
+        async with self.__lock:
+            self.__pending.append(receipt_handle)
+            if (
+                self.__claim_check is not None
+                and message_body is not None
+                and ClaimCheck.pointer(message_body) is not None
+            ):
+                self.__claims[receipt_handle] = message_body
+            self.__metrics["buffered"] += 1
+            if len(self.__pending) >= MAX_BATCH_ENTRIES:
+                await self.__flush()
+            elif self.__timer is None:
+                self.__timer = asyncio.create_task(self.__flush_after_deadline())
+
+    async def flush(self) -> None:
+        """
+        Deletes every buffered message now.
+        """
+        async with self.__lock:
+            await self.__flush()
+
+    async def close(self) -> None:
+        """
+        Flushes the remaining acknowledgements. Call it on shutdown.
+        """
+        await self.flush()
+
+    async def __aenter__(self) -> "AckBuffer":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    async def __flush_after_deadline(self) -> None:
+        await asyncio.sleep(self.__max_latency)
+        async with self.__lock:
+            self.__timer = None
+            await self.__flush()
+
+    async def __flush(self) -> None:
+        if self.__timer is not None and self.__timer is not asyncio.current_task():
+            self.__timer.cancel()
+        self.__timer = None
+
+        receipt_handles, self.__pending = self.__pending, []
+        if not receipt_handles:
+            return
+
+        results = await self.__sqs_client.delete_messages(
+            self.__queue_url, receipt_handles
+        )
+        deleted = sum(1 for result in results if result)
+        self.__metrics["flushed"] += deleted
+        self.__metrics["failed"] += len(receipt_handles) - deleted
+        for receipt_handle, result in zip(receipt_handles, results, strict=True):
+            claim = self.__claims.pop(receipt_handle, None)
+            if not result:
+                # The message will be redelivered once its visibility timeout ends
+                logger.error("Failed to acknowledge SQS message %s", receipt_handle)
+            elif claim is not None and self.__claim_check is not None:
+                await self.__claim_check.release(claim)
+
+
+class VisibilityHeartbeat:
+    """
+    Keeps a message hidden from other consumers while it is being processed by
+    extending its visibility timeout (ChangeMessageVisibility) periodically.
+    The first extension is made on entry, since the queue's own visibility
+    timeout may be shorter than the interval.
+    The heartbeat stops when the context exits, whether processing succeeded or not.
+    """
+
+    def __init__(
+        self,
+        sqs_client: SQSClient,
+        queue_url: str,
+        receipt_handle: str,
+        visibility_timeout: int = DEFAULT_VISIBILITY_TIMEOUT_SECONDS,
+        interval: float | None = None,
+    ) -> None:
+        self.__sqs_client = sqs_client
+        self.__queue_url = queue_url
+        self.__receipt_handle = receipt_handle
+        self.__visibility_timeout = visibility_timeout
+        # Extend well before the current timeout runs out
+        self.__interval = visibility_timeout / 2 if interval is None else interval
+        self.__task: asyncio.Task | None = None
+
+    async def __aenter__(self) -> "VisibilityHeartbeat":
+        await self.__extend()
+        self.__task = asyncio.create_task(self.__beat())
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        task, self.__task = self.__task, None
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+    async def __beat(self) -> None:
+        while True:
+            await asyncio.sleep(self.__interval)
+            await self.__extend()
+
+    async def __extend(self) -> None:
+        extended = await self.__sqs_client.change_message_visibility(
+            self.__queue_url, self.__receipt_handle, self.__visibility_timeout
+        )
+        if not extended:
+            logger.warning(
+                "Could not extend visibility of SQS message %s",
+                self.__receipt_handle,
+            )
@@ -12,6 +12,7 @@ class Configuration:  # pylint: disable=too-many-instance-attributes
     aws_region: str
     aws_access_key_id: str
     aws_secret_access_key: str
+    aws_max_pool_connections: int
     sqs_queue_url: str
     dynamodb_table: str
     database_url: str
@@ -28,6 +29,7 @@ class Configuration:  # pylint: disable=too-many-instance-attributes
             aws_region=os.getenv("AWS_REGION", "us-east-1"),
             aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID", "test"),
             aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY", "test"),
+            aws_max_pool_connections=int(os.getenv("AWS_MAX_POOL_CONNECTIONS", "10")),
             sqs_queue_url=os.getenv(
                 "SQS_QUEUE_URL",
                 "http://localstack:4566/000000000000/scraper-queue",
@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import signal
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from typing import Any, TypedDict
+
+from shared.clients.claim_check import ClaimCheck
+from shared.clients.sqs_client import (
+    MAX_BATCH_ENTRIES,
+    AckBuffer,
+    SQSClient,
+    VisibilityHeartbeat,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MESSAGE_TIMEOUT_SECONDS = 300.0
+DEFAULT_WAIT_TIME_SECONDS = 20
+
+MessageHandler = Callable[[str], Awaitable[None]]
+
+
+class ConsumerMetrics(TypedDict):
+    processed: int
+    failed: int
+    timed_out: int
+
+
+class SQSConsumer:
+    """
+    Runs a message handler over an SQS queue with up to `concurrency` messages in
+    flight. Each receive asks for as many messages as there are free slots, so
+    every received message starts (and keeps its visibility extended) right away.
+    Each message is bounded by `message_timeout`. Messages whose handler succeeds
+    are acknowledged in batches; failed or timed-out ones are left for redelivery.
+    stop() (or SIGTERM/SIGINT once the signal handlers are installed) stops
+    receiving and drains the messages already in flight.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        sqs_client: SQSClient,
+        queue_url: str,
+        handler: MessageHandler,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        message_timeout: float = DEFAULT_MESSAGE_TIMEOUT_SECONDS,
+        wait_time: int = DEFAULT_WAIT_TIME_SECONDS,
+        claim_check: ClaimCheck | None = None,
+    ) -> None:
+        self.__sqs_client = sqs_client
+        self.__queue_url = queue_url
+        self.__handler = handler
+        self.__concurrency = concurrency
+        self.__message_timeout = message_timeout
+        self.__wait_time = wait_time
+        self.__claim_check = claim_check
+        self.__stop_event = asyncio.Event()
+        self.__metrics: ConsumerMetrics = {"processed": 0, "failed": 0, "timed_out": 0}
+
+    @property
+    def metrics(self) -> ConsumerMetrics:
+        """
+        Counters of processed, failed and timed-out messages.
+        """
+        return {**self.__metrics}
+
+    def stop(self) -> None:
+        """
+        Stops receiving new messages; run() returns once in-flight ones finish.
+        """
+        self.__stop_event.set()
+
+    def install_signal_handlers(self) -> None:
+        """
+        Stops the consumer gracefully on SIGTERM and SIGINT.
+        """
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except NotImplementedError:
+                # Signal handlers are not supported on some platforms (e.g. Windows)
+                return
+
+    async def run(self) -> None:
+        """
+        Consumes the queue until stop() is called.
+        """
+        semaphore = asyncio.Semaphore(self.__concurrency)
+        in_flight: set[asyncio.Task] = set()
+        batch_size = min(MAX_BATCH_ENTRIES, self.__concurrency)
+        async with AckBuffer(
+            self.__sqs_client, self.__queue_url, claim_check=self.__claim_check
+        ) as ack_buffer:
+            while not self.__stop_event.is_set():
+                free_slots = await self.__acquire_slots(semaphore, batch_size)
+                if self.__stop_event.is_set():
+                    break
+                messages = await self.__receive(free_slots)
+                for _ in range(free_slots - len(messages)):
+                    semaphore.release()
+                for message in messages:
+                    task = asyncio.create_task(
+                        self.__process(message, ack_buffer, semaphore)
+                    )
+                    in_flight.add(task)
+                    task.add_done_callback(in_flight.discard)
+
+            if in_flight:
+                logger.info("Draining %s in-flight messages", len(in_flight))
+                await asyncio.gather(*in_flight)
+        logger.info("Consumer stopped: %s, acks: %s", self.metrics, ack_buffer.metrics)
+
+    @staticmethod
+    async def __acquire_slots(semaphore: asyncio.Semaphore, batch_size: int) -> int:
+        """
+        Waits for a free slot, then takes the others that are free, up to batch_size.
+        """
+        await semaphore.acquire()
+        acquired = 1
+        while acquired < batch_size and not semaphore.locked():
+            await semaphore.acquire()
+            acquired += 1
+        return acquired
+
+    async def __receive(self, batch_size: int) -> list[dict[str, Any]]:
+        """
+        Long-polls the queue, giving up early if the consumer is stopped.
+        """
+        receive = asyncio.create_task(
+            self.__sqs_client.receive_messages(
+                self.__queue_url, max_messages=batch_size, wait_time=self.__wait_time
+            )
+        )
+        stopped = asyncio.create_task(self.__stop_event.wait())
+        await asyncio.wait({receive, stopped}, return_when=asyncio.FIRST_COMPLETED)
+        stopped.cancel()
+        if receive.done():
+            return receive.result()
+        receive.cancel()
+        with suppress(asyncio.CancelledError):
+            await receive
+        return []
+
+    async def __process(
+        self,
+        message: dict[str, Any],
+        ack_buffer: AckBuffer,
+        semaphore: asyncio.Semaphore,
+    ) -> None:
+        receipt_handle = message["ReceiptHandle"]
+        try:
+            async with VisibilityHeartbeat(
+                self.__sqs_client, self.__queue_url, receipt_handle
+            ):
+                body = message["Body"]
+                if self.__claim_check is not None:
+                    body = await self.__claim_check.resolve(body)
+                await asyncio.wait_for(self.__handler(body), self.__message_timeout)
+            await ack_buffer.add(receipt_handle, message["Body"])
+            self.__metrics["processed"] += 1
+        except asyncio.TimeoutError:
+            logger.error(
+                "Message %s timed out after %ss", receipt_handle, self.__message_timeout
+            )
+            self.__metrics["timed_out"] += 1
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("Error processing message %s: %s", receipt_handle, e)
+            self.__metrics["failed"] += 1
+        finally:
+            semaphore.release()
@@ -0,0 +1,114 @@
+# pylint: disable=too-few-public-methods
+from typing import Any, TypeVar
+
+import msgspec
+
+
+class InvalidMessageError(ValueError):
+    """Exception raised when a message body does not match its schema."""
+
+
+class Message(msgspec.Struct, kw_only=True):
+    """
+    Base class of the typed messages exchanged through the queues.
+    """
+
+
+class ScrapeMessage(Message):
+    """
+    scraper-queue: a URL to scrape.
+    """
+
+    url: str
+    depth: int
+    scraping_id: int
+    user_id: int | None = None
+
+
+class PageSummaryMessage(Message):
+    """
+    page-summarizer-queue: the text of a scraped page.
+    """
+
+    url: str
+    content: str
+    scraping_id: int
+    user_id: int | None = None
+
+
+class ImageExplainerMessage(Message):
+    """
+    image-explainer-queue: an image stored in S3 by the image extractor.
+    """
+
+    s3_path: str
+    scraping_id: int
+    image_url: str = ""
+    original_url: str = ""
+
+
+class PageSummaryWriterMessage(Message, tag_field="type", tag="page_summary"):
+    """
+    writer-queue: the summary of a page.
+    """
+
+    scraping_id: int
+    url: str
+    summary: str
+
+
+class ImageExplanationWriterMessage(Message, tag_field="type", tag="image_explanation"):
+    """
+    writer-queue: the explanation of an image.
+    """
+
+    url: str
+    original_url: str
+    page_url: str
+    scraping_id: int
+    s3_path: str
+    explanation: str
+
+
+class IndexMessage(Message):
+    """
+    indexer-queue: a page to index in OpenSearch.
+    """
+
+    url: str
+    content: str
+    summary: str
+    scraping_id: int
+    user_id: int | None = None
+
+
+class DeletionMessage(Message):
+    """
+    deletion-queue: a scraping whose data must be purged.
+    """
+
+    scraping_id: int
+
+
+MessageT = TypeVar("MessageT", bound=Message)
+
+_ENCODER = msgspec.json.Encoder()
+
+
+def encode_message(message: Message | dict[str, Any]) -> str:
+    """
+    Serializes a typed message (or a plain dict) to a JSON message body.
+    """
+    return _ENCODER.encode(message).decode("utf-8")
+
+
+def decode_message(body: str | bytes, message_type: type[MessageT]) -> MessageT:
+    """
+    Parses and validates a JSON message body against its schema in one pass.
+    """
+    try:
+        return msgspec.json.decode(body, type=message_type)
+    except msgspec.DecodeError as e:
+        raise InvalidMessageError(
+            f"Invalid {message_type.__name__} message: {e}"
+        ) from e
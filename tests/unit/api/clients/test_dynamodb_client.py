@@ -1,6 +1,8 @@
 import unittest
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from botocore.exceptions import ClientError  # type: ignore
+
 from api.clients.dynamodb_client import DynamoDBClient
 
 
@@ -153,6 +155,181 @@ class TestDynamoDBClient(unittest.IsolatedAsyncioTestCase):
         with self.assertRaisesRegex(Exception, "DynamoDB error"):
             await client.get_item({"id": "1"})
 
+    def _mock_session(self, mock_session_cls: MagicMock) -> AsyncMock:
+        mock_dynamodb = AsyncMock()
+        mock_resource_cm = MagicMock()
+        mock_resource_cm.__aenter__.return_value = mock_dynamodb
+        mock_resource_cm.__aexit__.return_value = None
+        mock_session = MagicMock()
+        mock_session.resource.return_value = mock_resource_cm
+        mock_session_cls.return_value = mock_session
+        return mock_dynamodb
+
+    def _client(self) -> DynamoDBClient:
+        return DynamoDBClient(
+            self.endpoint_url,
+            self.region,
+            self.access_key,
+            self.secret_key,
+            self.table_name,
+        )
+
+    @patch("api.clients.dynamodb_client.aioboto3.Session")
+    async def test_start_reuses_table(self, mock_session_cls: MagicMock) -> None:
+        mock_dynamodb = self._mock_session(mock_session_cls)
+        mock_table = AsyncMock()
+        mock_dynamodb.Table.return_value = mock_table
+        mock_table.get_item.return_value = {}
+
+        client = await self._client().start()
+        await client.get_item({"id": "1"})
+        await client.get_item({"id": "2"})
+        await client.close()
+
+        mock_session_cls.return_value.resource.assert_called_once()
+        mock_dynamodb.Table.assert_awaited_once_with(self.table_name)
+        self.assertEqual(mock_table.get_item.await_count, 2)
+
+    @patch("api.clients.dynamodb_client.aioboto3.Session")
+    async def test_put_item_if_absent(self, mock_session_cls: MagicMock) -> None:
+        mock_dynamodb = self._mock_session(mock_session_cls)
+        mock_table = AsyncMock()
+        mock_dynamodb.Table.return_value = mock_table
+        mock_table.put_item.side_effect = ClientError(
+            {"Error": {"Code": "ConditionalCheckFailedException"}}, "PutItem"
+        )
+
+        result = await self._client().put_item({"id": "1"}, if_absent="id")
+
+        self.assertFalse(result)
+        mock_table.put_item.assert_awaited_once_with(
+            Item={"id": "1"},
+            ConditionExpression="attribute_not_exists(#k)",
+            ExpressionAttributeNames={"#k": "id"},
+        )
+
+    @patch("api.clients.dynamodb_client.aioboto3.Session")
+    async def test_put_item_client_error(self, mock_session_cls: MagicMock) -> None:
+        mock_dynamodb = self._mock_session(mock_session_cls)
+        mock_table = AsyncMock()
+        mock_dynamodb.Table.return_value = mock_table
+        mock_table.put_item.side_effect = ClientError(
+            {"Error": {"Code": "ConditionalCheckFailedException"}}, "PutItem"
+        )
+
+        with self.assertRaises(ClientError):
+            await self._client().put_item({"id": "1"})
+
+    @patch("api.clients.dynamodb_client.aioboto3.Session")
+    async def test_update_item(self, mock_session_cls: MagicMock) -> None:
+        mock_dynamodb = self._mock_session(mock_session_cls)
+        mock_table = AsyncMock()
+        mock_dynamodb.Table.return_value = mock_table
+
+        result = await self._client().update_item(
+            {"id": "1"}, {"status": "FAILED", "links_count": 0}
+        )
+
+        self.assertTrue(result)
+        mock_table.update_item.assert_awaited_once_with(
+            Key={"id": "1"},
+            UpdateExpression="SET #a0 = :v0, #a1 = :v1",
+            ExpressionAttributeNames={"#a0": "status", "#a1": "links_count"},
+            ExpressionAttributeValues={":v0": "FAILED", ":v1": 0},
+        )
+
+    @patch("api.clients.dynamodb_client.aioboto3.Session")
+    async def test_batch_get_items_chunks_and_projects(
+        self, mock_session_cls: MagicMock
+    ) -> None:
+        mock_dynamodb = self._mock_session(mock_session_cls)
+        mock_dynamodb.batch_get_item.side_effect = lambda RequestItems: {
+            "Responses": {self.table_name: RequestItems[self.table_name]["Keys"]}
+        }
+        keys = [{"id": str(i)} for i in range(150)] + [{"id": "0"}]
+
+        items = await self._client().batch_get_items(keys, attributes=["id", "status"])
+
+        self.assertEqual(len(items), 150)
+        requests = [
+            c.kwargs["RequestItems"][self.table_name]
+            for c in mock_dynamodb.batch_get_item.call_args_list
+        ]
+        self.assertEqual([len(r["Keys"]) for r in requests], [100, 50])
+        self.assertEqual(requests[0]["ProjectionExpression"], "#a0, #a1")
+        self.assertEqual(
+            requests[0]["ExpressionAttributeNames"], {"#a0": "id", "#a1": "status"}
+        )
+
+    @patch("api.clients.dynamodb_client.asyncio.sleep", new_callable=AsyncMock)
+    @patch("api.clients.dynamodb_client.aioboto3.Session")
+    async def test_batch_get_items_retries_unprocessed_keys(
+        self, mock_session_cls: MagicMock, mock_sleep: AsyncMock
+    ) -> None:
+        mock_dynamodb = self._mock_session(mock_session_cls)
+        mock_dynamodb.batch_get_item.side_effect = [
+            {
+                "Responses": {self.table_name: [{"id": "1"}]},
+                "UnprocessedKeys": {self.table_name: {"Keys": [{"id": "2"}]}},
+            },
+            {"Responses": {self.table_name: [{"id": "2"}]}, "UnprocessedKeys": {}},
+        ]
+
+        items = await self._client().batch_get_items([{"id": "1"}, {"id": "2"}])
+
+        self.assertEqual(items, [{"id": "1"}, {"id": "2"}])
+        retry = mock_dynamodb.batch_get_item.call_args_list[1]
+        self.assertEqual(
+            retry.kwargs["RequestItems"], {self.table_name: {"Keys": [{"id": "2"}]}}
+        )
+        mock_sleep.assert_awaited_once()
+
+    @patch("api.clients.dynamodb_client.aioboto3.Session")
+    async def test_batch_get_items_empty(self, mock_session_cls: MagicMock) -> None:
+        mock_dynamodb = self._mock_session(mock_session_cls)
+
+        self.assertEqual(await self._client().batch_get_items([]), [])
+        mock_dynamodb.batch_get_item.assert_not_awaited()
+
+    @patch("api.clients.dynamodb_client.aioboto3.Session")
+    async def test_batch_write_items_chunks(self, mock_session_cls: MagicMock) -> None:
+        mock_dynamodb = self._mock_session(mock_session_cls)
+        mock_dynamodb.batch_write_item.return_value = {"UnprocessedItems": {}}
+        items = [{"id": str(i)} for i in range(60)]
+
+        unprocessed = await self._client().batch_write_items(items)
+
+        self.assertEqual(unprocessed, 0)
+        requests = [
+            c.kwargs["RequestItems"][self.table_name]
+            for c in mock_dynamodb.batch_write_item.call_args_list
+        ]
+        self.assertEqual([len(r) for r in requests], [25, 25, 10])
+        self.assertEqual(requests[0][0], {"PutRequest": {"Item": {"id": "0"}}})
+
+    @patch("api.clients.dynamodb_client.asyncio.sleep", new_callable=AsyncMock)
+    @patch("api.clients.dynamodb_client.aioboto3.Session")
+    async def test_batch_write_items_retries_unprocessed_items(
+        self, mock_session_cls: MagicMock, mock_sleep: AsyncMock
+    ) -> None:
+        mock_dynamodb = self._mock_session(mock_session_cls)
+        unprocessed_request = {"PutRequest": {"Item": {"id": "2"}}}
+        mock_dynamodb.batch_write_item.side_effect = [
+            {"UnprocessedItems": {self.table_name: [unprocessed_request]}},
+            {"UnprocessedItems": {self.table_name: [unprocessed_request]}},
+        ]
+
+        unprocessed = await self._client().batch_write_items(
+            [{"id": "1"}, {"id": "2"}], max_retries=1
+        )
+
+        self.assertEqual(unprocessed, 1)
+        retry = mock_dynamodb.batch_write_item.call_args_list[1]
+        self.assertEqual(
+            retry.kwargs["RequestItems"], {self.table_name: [unprocessed_request]}
+        )
+        mock_sleep.assert_awaited_once()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,10 +1,14 @@
 import unittest
-from unittest.mock import AsyncMock, patch
+from collections.abc import AsyncIterator
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from api.clients.redis_client import RedisClient
 
 
-class TestRedisClient(unittest.IsolatedAsyncioTestCase):
+class TestRedisClient(  # pylint: disable=too-many-public-methods
+    unittest.IsolatedAsyncioTestCase
+):
     # pylint: disable=protected-access
     async def asyncSetUp(self) -> None:
         self.mock_redis = AsyncMock()
@@ -21,12 +25,29 @@ class TestRedisClient(unittest.IsolatedAsyncioTestCase):
     async def test_init(self) -> None:
         """Test RedisClient initialization"""
         with patch("api.clients.redis_client.redis.Redis") as mock_redis_val:
-            client = RedisClient(host="testhost", port=1234, db=5)
-            mock_redis_val.assert_called_with(host="testhost", port=1234, db=5)
+            client = RedisClient(host="testhost", port=1234, db=5, max_connections=7)
+            mock_redis_val.assert_called_with(
+                host="testhost", port=1234, db=5, max_connections=7
+            )
             self.assertIsNotNone(
                 client._RedisClient__client  # type: ignore[attr-defined]
             )
 
+    async def test_create(self) -> None:
+        """Test create sizes the pool from the configuration unless told otherwise"""
+        config = MagicMock(
+            redis_host="testhost", redis_port=1234, redis_max_connections=50
+        )
+        with patch("api.clients.redis_client.redis.Redis") as mock_redis_val:
+            RedisClient.create(config)
+            mock_redis_val.assert_called_with(
+                host="testhost", port=1234, db=0, max_connections=50
+            )
+            RedisClient.create(config, max_connections=100)
+            mock_redis_val.assert_called_with(
+                host="testhost", port=1234, db=0, max_connections=100
+            )
+
     async def test_set(self) -> None:
         """Test set operation"""
         await self.client.set("key1", "value1")
@@ -37,6 +58,12 @@ class TestRedisClient(unittest.IsolatedAsyncioTestCase):
         await self.client.set("key2", "value2", ex=60)
         self.mock_redis.set.assert_called_once_with("key2", "value2", ex=60)
 
+    async def test_set_if_absent(self) -> None:
+        """Test set operation only when the key does not exist"""
+        self.mock_redis.set.return_value = None
+        self.assertFalse(await self.client.set_if_absent("key1", "value1", ex=60))
+        self.mock_redis.set.assert_called_once_with("key1", "value1", ex=60, nx=True)
+
     async def test_get_with_value(self) -> None:
         """Test get operation when value exists"""
         self.mock_redis.get.return_value = b"test_value"
@@ -79,6 +106,92 @@ class TestRedisClient(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(result, 0)
         self.mock_redis.decrby.assert_called_once_with("counter", 3)
 
+    async def test_mset(self) -> None:
+        """Test mset operation"""
+        await self.client.mset({"key1": 1, "key2": 2})
+        self.mock_redis.mset.assert_called_once_with({"key1": 1, "key2": 2})
+
+    async def test_mget(self) -> None:
+        """Test mget operation"""
+        self.mock_redis.mget.return_value = [b"1", None]
+        result = await self.client.mget(["key1", "key2"])
+        self.assertEqual(result, ["1", None])
+        self.mock_redis.mget.assert_called_once_with(["key1", "key2"])
+
+    async def test_delete(self) -> None:
+        """Test delete operation"""
+        await self.client.delete("key1")
+        self.mock_redis.delete.assert_called_once_with("key1")
+
+    async def test_zrem(self) -> None:
+        """Test zrem operation"""
+        self.mock_redis.zrem.return_value = 2
+        result = await self.client.zrem("key1", ["a", "b"])
+        self.assertEqual(result, 2)
+        self.mock_redis.zrem.assert_called_once_with("key1", "a", "b")
+
+    async def test_eval(self) -> None:
+        """Test running a Lua script"""
+        mock_script = AsyncMock(return_value=[1, 2])
+        self.mock_redis.register_script = MagicMock(return_value=mock_script)
+        result = await self.client.eval("return 1", ["key1"], [10, "x"])
+        self.assertEqual(result, [1, 2])
+        self.mock_redis.register_script.assert_called_once_with("return 1")
+        mock_script.assert_awaited_once_with(keys=["key1"], args=[10, "x"])
+
+    async def test_publish(self) -> None:
+        """Test publish operation"""
+        self.mock_redis.publish.return_value = 2
+        result = await self.client.publish("channel", "message")
+        self.assertEqual(result, 2)
+        self.mock_redis.publish.assert_called_once_with("channel", "message")
+
+    async def test_subscribe(self) -> None:
+        """Test subscribe yields the decoded messages"""
+
+        async def listen() -> AsyncIterator[dict[str, Any]]:
+            yield {"type": "message", "data": b"first"}
+            yield {"type": "message", "data": b"second"}
+
+        mock_pubsub = AsyncMock()
+        mock_pubsub.listen = MagicMock(side_effect=listen)
+        self.mock_redis.pubsub = MagicMock(return_value=mock_pubsub)
+
+        messages = [message async for message in self.client.subscribe("channel")]
+
+        self.assertEqual(messages, ["first", "second"])
+        mock_pubsub.subscribe.assert_awaited_once_with("channel")
+        mock_pubsub.aclose.assert_awaited_once()
+
+    async def test_subscribe_many(self) -> None:
+        """Test subscribe_many yields the decoded channels and messages"""
+
+        async def listen() -> AsyncIterator[dict[str, Any]]:
+            yield {"type": "message", "channel": b"a", "data": b"first"}
+            yield {"type": "message", "channel": b"b", "data": b"second"}
+
+        mock_pubsub = AsyncMock()
+        mock_pubsub.listen = MagicMock(side_effect=listen)
+        self.mock_redis.pubsub = MagicMock(return_value=mock_pubsub)
+
+        messages = [m async for m in self.client.subscribe_many(["a", "b"])]
+
+        self.assertEqual(messages, [("a", "first"), ("b", "second")])
+        mock_pubsub.subscribe.assert_awaited_once_with("a", "b")
+        mock_pubsub.aclose.assert_awaited_once()
+
+    def test_keyspace_channel(self) -> None:
+        """Test keyspace_channel uses the client's database"""
+        self.assertEqual(
+            self.client.keyspace_channel("scrape:1:pending"),
+            "__keyspace@0__:scrape:1:pending",
+        )
+
+    async def test_close(self) -> None:
+        """Test close disconnects the connection pool"""
+        await self.client.close()
+        self.mock_redis.aclose.assert_awaited_once()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,7 +1,8 @@
 import unittest
+from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from api.repositories.db_repository import DbRepository
+from api.repositories.db_repository import APIKeyUsage, DbRepository
 
 
 class TestDbRepository(unittest.IsolatedAsyncioTestCase):
@@ -14,9 +15,14 @@ class TestDbRepository(unittest.IsolatedAsyncioTestCase):
         mock_scraping.id = 123
         mock_create.return_value = mock_scraping
 
-        result = await self.repo.create_scraping("http://url.com")
+        result = await self.repo.create_scraping("HTTP://URL.com", depth=2)
         self.assertEqual(result, 123)
-        mock_create.assert_called_once_with(url="http://url.com", user_id=None)
+        mock_create.assert_called_once_with(
+            url="HTTP://URL.com",
+            user_id=None,
+            depth=2,
+            normalized_url="http://url.com/",
+        )
 
     @patch("api.models.Scraping.get_or_none", new_callable=AsyncMock)
     async def test_delete_scraping(self, mock_get: AsyncMock) -> None:
@@ -38,24 +44,19 @@ class TestDbRepository(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(paths, ["s3://b/k1", "s3://b/k2"])
         mock_filter.assert_called_once_with(scraping_id=123)
 
-    @patch("api.models.ScrapedPage.filter")
-    @patch("api.models.Scraping.get_or_none", new_callable=AsyncMock)
-    async def test_get_scraping(
-        self, mock_get: AsyncMock, mock_page_filter: MagicMock
-    ) -> None:
-        mock_scraping = MagicMock()
-        mock_scraping.id = 123
-        mock_scraping.url = "http://url.com"
-        mock_scraping.status = "PENDING"
-        # Dates...
-        mock_get.return_value = mock_scraping
-
-        # Mock page fetch for summary
-        mock_page_qs = MagicMock()
-        mock_page_filter.return_value = mock_page_qs
-        mock_page = MagicMock()
-        mock_page.summary = "Mock Summary"
-        mock_page_qs.first = AsyncMock(return_value=mock_page)
+    @patch("api.repositories.db_repository.connections")
+    async def test_get_scraping(self, mock_connections: MagicMock) -> None:
+        mock_connection = AsyncMock()
+        mock_connections.get.return_value = mock_connection
+        mock_connection.execute_query_dict.return_value = [
+            {
+                "id": 123,
+                "url": "http://url.com",
+                "user_id": 1,
+                "summary": "Mock Summary",
+                "scraped_at": None,
+            }
+        ]
 
         result = await self.repo.get_scraping(123)
         self.assertIsNotNone(result)
@@ -63,11 +64,204 @@ class TestDbRepository(unittest.IsolatedAsyncioTestCase):
             self.assertEqual(result["id"], 123)
             self.assertEqual(result["summary"], "Mock Summary")
 
-        mock_get.assert_called_once_with(id=123)
-        mock_page_filter.assert_called_once_with(scraping_id=123, url="http://url.com")
+        # The seed page is joined in the same statement
+        mock_connection.execute_query_dict.assert_awaited_once()
+        sql, values = mock_connection.execute_query_dict.call_args[0]
+        self.assertIn("LEFT JOIN LATERAL", sql)
+        self.assertEqual(values, [123])
+
+    @patch("api.repositories.db_repository.connections")
+    async def test_create_scrapings(self, mock_connections: MagicMock) -> None:
+        mock_connection = AsyncMock()
+        mock_connections.get.return_value = mock_connection
+        mock_connection.execute_query_dict.return_value = [{"id": 8}, {"id": 7}]
+
+        ids = await self.repo.create_scrapings(
+            [("http://a.com", 1), ("http://B.com", 2)], 1
+        )
+
+        self.assertEqual(ids, [7, 8])
+        mock_connection.execute_query_dict.assert_awaited_once()
+        sql, values = mock_connection.execute_query_dict.call_args[0]
+        self.assertIn("WITH ORDINALITY", sql)
+        self.assertIn("RETURNING id", sql)
+        self.assertEqual(
+            values,
+            [
+                ["http://a.com", "http://B.com"],
+                [1, 2],
+                ["http://a.com/", "http://b.com/"],
+                1,
+            ],
+        )
+
+    @patch("api.repositories.db_repository.connections")
+    async def test_create_fresh_alias(self, mock_connections: MagicMock) -> None:
+        mock_connection = AsyncMock()
+        mock_connections.get.return_value = mock_connection
+        mock_connection.execute_query_dict.return_value = [
+            {"id": 9, "source_scraping_id": 4}
+        ]
+
+        alias = await self.repo.create_fresh_alias("http://A.com", 2, 1, 3600)
+
+        self.assertEqual(alias, (9, 4))
+        sql, values = mock_connection.execute_query_dict.call_args[0]
+        self.assertIn("source_scraping_id IS NULL", sql)
+        self.assertIn("make_interval(secs => $5)", sql)
+        self.assertEqual(values, ["http://A.com", 2, "http://a.com/", 1, 3600])
+
+        mock_connection.execute_query_dict.return_value = []
+        self.assertIsNone(await self.repo.create_fresh_alias("http://a.com", 2, 1, 60))
+
+    @patch("api.repositories.db_repository.in_transaction")
+    async def test_transfer_results(self, mock_in_transaction: MagicMock) -> None:
+        mock_connection = AsyncMock()
+        mock_in_transaction.return_value.__aenter__.return_value = mock_connection
+        mock_connection.execute_query_dict.return_value = [{"id": 9, "user_id": 2}]
+
+        heir = await self.repo.transfer_results(4)
+
+        self.assertEqual(heir, {"id": 9, "user_id": 2})
+        statements = [c[0] for c in mock_connection.execute_query.call_args_list]
+        self.assertEqual(
+            [sql.split(" SET")[0] for sql, _ in statements[:3]],
+            [
+                "UPDATE scraped_pages",
+                "UPDATE page_images",
+                "UPDATE page_links",
+            ],
+        )
+        self.assertTrue(all(values == [9, 4] for _, values in statements[:4]))
+        self.assertEqual(statements[4][1], [4])
+
+    @patch("api.repositories.db_repository.in_transaction")
+    async def test_transfer_results_without_alias(
+        self, mock_in_transaction: MagicMock
+    ) -> None:
+        mock_connection = AsyncMock()
+        mock_in_transaction.return_value.__aenter__.return_value = mock_connection
+        mock_connection.execute_query_dict.return_value = []
+
+        self.assertIsNone(await self.repo.transfer_results(4))
+        mock_connection.execute_query.assert_not_called()
+
+    @patch("api.repositories.db_repository.connections")
+    async def test_create_scrapings_empty(self, mock_connections: MagicMock) -> None:
+        self.assertEqual(await self.repo.create_scrapings([]), [])
+        mock_connections.get.assert_not_called()
+
+    @patch("api.repositories.db_repository.connections")
+    async def test_get_scraping_not_found(self, mock_connections: MagicMock) -> None:
+        mock_connections.get.return_value.execute_query_dict = AsyncMock(
+            return_value=[]
+        )
+        self.assertIsNone(await self.repo.get_scraping(123))
+
+    @patch("api.repositories.db_repository.connections")
+    async def test_get_scrapings(self, mock_connections: MagicMock) -> None:
+        mock_connection = AsyncMock()
+        mock_connections.get.return_value = mock_connection
+        scraped_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        mock_connection.execute_query_dict.return_value = [
+            {
+                "id": 2,
+                "url": "http://b.com",
+                "user_id": 1,
+                "total": 12,
+                "summary": "sum",
+                "scraped_at": scraped_at,
+            },
+            {
+                "id": 1,
+                "url": "http://a.com",
+                "user_id": 1,
+                "total": 12,
+                "summary": None,
+                "scraped_at": None,
+            },
+        ]
+
+        results, total = await self.repo.get_scrapings(1, offset=10, limit=2)
+
+        self.assertEqual(total, 12)
+        self.assertEqual([r["id"] for r in results], [2, 1])
+        self.assertEqual(results[0]["summary"], "sum")
+        self.assertEqual(results[0]["scraped_at"], scraped_at)
+        self.assertNotIn("total", results[0])
+        mock_connection.execute_query_dict.assert_awaited_once()
+        sql, values = mock_connection.execute_query_dict.call_args[0]
+        self.assertIn("count(*) OVER ()", sql)
+        self.assertEqual(values, [1, 2, 10])
+
+    @patch("api.repositories.db_repository.connections")
+    async def test_get_scrapings_without_total(
+        self, mock_connections: MagicMock
+    ) -> None:
+        mock_connection = AsyncMock()
+        mock_connections.get.return_value = mock_connection
+        mock_connection.execute_query_dict.return_value = []
 
+        results, total = await self.repo.get_scrapings(1, include_total=False)
+
+        self.assertEqual(results, [])
+        self.assertIsNone(total)
+        sql = mock_connection.execute_query_dict.call_args[0][0]
+        self.assertNotIn("count(*)", sql)
+
+    @patch("api.models.Scraping.filter")
+    @patch("api.repositories.db_repository.connections")
+    async def test_get_scrapings_past_last_page(
+        self, mock_connections: MagicMock, mock_filter: MagicMock
+    ) -> None:
+        mock_connections.get.return_value.execute_query_dict = AsyncMock(
+            return_value=[]
+        )
+        mock_filter.return_value.count = AsyncMock(return_value=4)
+
+        results, total = await self.repo.get_scrapings(1, offset=20)
+
+        self.assertEqual(results, [])
+        self.assertEqual(total, 4)
+        mock_filter.assert_called_once_with(user_id=1)
+
+    @patch("api.models.Scraping.filter")
+    @patch("api.repositories.db_repository.connections")
+    async def test_get_scrapings_before_id(
+        self, mock_connections: MagicMock, mock_filter: MagicMock
+    ) -> None:
+        mock_connection = AsyncMock()
+        mock_connections.get.return_value = mock_connection
+        mock_connection.execute_query_dict.return_value = [
+            {
+                "id": 4,
+                "url": "http://a.com",
+                "user_id": 1,
+                "total": None,
+                "summary": None,
+                "scraped_at": None,
+            }
+        ]
+        mock_filter.return_value.count = AsyncMock(return_value=9)
+
+        results, total = await self.repo.get_scrapings(1, limit=2, before_id=5)
+
+        self.assertEqual([r["id"] for r in results], [4])
+        # The total of all the user's scrapings, not of the rows below the cursor
+        self.assertEqual(total, 9)
+        sql, values = mock_connection.execute_query_dict.call_args[0]
+        self.assertIn("user_id = $1 AND id < $4", sql)
+        self.assertNotIn("count(*)", sql)
+        self.assertEqual(values, [1, 2, 0, 5])
+
+    @patch("api.repositories.db_repository.connections")
     @patch("api.models.ScrapedPage.filter")
-    async def test_get_scraping_results(self, mock_filter: MagicMock) -> None:
+    async def test_get_scraping_results(
+        self, mock_filter: MagicMock, mock_connections: MagicMock
+    ) -> None:
+        mock_connections.get.return_value.execute_query_dict = AsyncMock(
+            return_value=[{"source_scraping_id": None}]
+        )
         mock_qs = MagicMock()
         mock_filter.return_value = mock_qs
         mock_order = MagicMock()
@@ -93,6 +287,85 @@ class TestDbRepository(unittest.IsolatedAsyncioTestCase):
 
         mock_filter.assert_called_once_with(scraping_id=123)
 
+    @patch("api.repositories.db_repository.connections")
+    @patch("api.models.ScrapedPage.filter")
+    async def test_get_scraping_results_page(
+        self, mock_filter: MagicMock, mock_connections: MagicMock
+    ) -> None:
+        mock_connections.get.return_value.execute_query_dict = AsyncMock(
+            return_value=[]
+        )
+        mock_qs = MagicMock()
+        mock_filter.return_value = mock_qs
+        mock_qs.filter.return_value = mock_qs
+        mock_qs.order_by.return_value = mock_qs
+        mock_qs.limit.return_value = mock_qs
+
+        pages = []
+        for page_id in (11, 12, 13):
+            page = MagicMock()
+            page.id = page_id
+            page.url = f"http://site.com/{page_id}"
+            page.summary = None
+            page.images = []
+            pages.append(page)
+        mock_qs.prefetch_related = AsyncMock(return_value=pages)
+
+        results, after_id = await self.repo.get_scraping_results_page(
+            123, after_id=10, limit=2
+        )
+
+        # The extra row is only fetched to detect the next page
+        self.assertEqual([r["url"] for r in results], [p.url for p in pages[:2]])
+        self.assertEqual(after_id, 12)
+        mock_filter.assert_called_once_with(scraping_id=123)
+        mock_qs.filter.assert_called_once_with(id__gt=10)
+        mock_qs.order_by.assert_called_once_with("id")
+        mock_qs.limit.assert_called_once_with(3)
+
+        # A page with no extra row is the last one
+        results, after_id = await self.repo.get_scraping_results_page(123, limit=3)
+        self.assertEqual(len(results), 3)
+        self.assertIsNone(after_id)
+
+    @patch("api.repositories.db_repository.connections")
+    @patch("api.models.ScrapedPage.filter")
+    async def test_get_scraping_results_of_alias(
+        self, mock_filter: MagicMock, mock_connections: MagicMock
+    ) -> None:
+        mock_connections.get.return_value.execute_query_dict = AsyncMock(
+            return_value=[{"source_scraping_id": 99}]
+        )
+        mock_filter.return_value.order_by.return_value.prefetch_related = AsyncMock(
+            return_value=[]
+        )
+
+        self.assertEqual(await self.repo.get_scraping_results(123), [])
+        mock_filter.assert_called_once_with(scraping_id=99)
+
+    @patch("api.repositories.db_repository.API_KEY_USAGE_BATCH_SIZE", 2)
+    @patch("api.repositories.db_repository.connections")
+    async def test_record_api_key_usage(self, mock_connections: MagicMock) -> None:
+        mock_connection = AsyncMock()
+        mock_connections.get.return_value = mock_connection
+        used_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        usages: list[APIKeyUsage] = [
+            {"hashed_key": f"h{i}", "last_used_at": used_at, "requests": i}
+            for i in range(3)
+        ]
+
+        await self.repo.record_api_key_usage(usages)
+
+        mock_connections.get.assert_called_once_with("default")
+        self.assertEqual(mock_connection.execute_query.await_count, 2)
+        sql, values = mock_connection.execute_query.call_args_list[0][0]
+        self.assertIn("UPDATE api_keys", sql)
+        self.assertIn("FROM (VALUES ($1::text", sql)
+        self.assertIn("($4::text, $5::timestamptz, $6::bigint)", sql)
+        self.assertEqual(values, ["h0", used_at, 0, "h1", used_at, 1])
+        _, values = mock_connection.execute_query.call_args_list[1][0]
+        self.assertEqual(values, ["h2", used_at, 2])
+
 
 if __name__ == "__main__":
     unittest.main()
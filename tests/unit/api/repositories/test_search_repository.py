@@ -14,8 +14,10 @@ class TestSearchRepository(unittest.IsolatedAsyncioTestCase):
 
         config = MagicMock(spec=Configuration)
         config.opensearch_url = "http://localhost:9200"
+        config.opensearch_max_connections = 25
 
         repo = SearchRepository(config)
+        self.assertEqual(mock_os_class.call_args[1]["maxsize"], 25)
 
         mock_client.search.return_value = {"hits": {"hits": []}}
 
@@ -32,6 +34,7 @@ class TestSearchRepository(unittest.IsolatedAsyncioTestCase):
 
         config = MagicMock(spec=Configuration)
         config.opensearch_url = "http://localhost:9200"
+        config.opensearch_max_connections = 25
         repo = SearchRepository(config)
 
         await repo.close()
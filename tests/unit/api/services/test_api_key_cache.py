@@ -0,0 +1,132 @@
+import asyncio
+import unittest
+from collections.abc import AsyncIterator
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from api.services.api_key_cache import (
+    API_KEY_INVALIDATION_CHANNEL,
+    INVALID_API_KEY,
+    APIKeyCache,
+)
+
+
+class TestAPIKeyCache(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.mock_redis = AsyncMock()
+        self.mock_redis.get.return_value = None
+        self.cache = APIKeyCache(
+            self.mock_redis, max_size=2, local_ttl=30, redis_ttl=300, negative_ttl=60
+        )
+
+    async def test_get_miss(self) -> None:
+        self.assertIsNone(await self.cache.get("h1"))
+        self.mock_redis.get.assert_awaited_once_with("auth:key:h1")
+
+    async def test_get_from_redis_is_cached_locally(self) -> None:
+        self.mock_redis.get.return_value = "name:1"
+
+        self.assertEqual(await self.cache.get("h1"), "name:1")
+        self.assertEqual(await self.cache.get("h1"), "name:1")
+
+        self.mock_redis.get.assert_awaited_once()
+
+    async def test_set(self) -> None:
+        await self.cache.set("h1", "name:1")
+
+        self.mock_redis.set.assert_awaited_once_with("auth:key:h1", "name:1", ex=300)
+        self.assertEqual(await self.cache.get("h1"), "name:1")
+        self.mock_redis.get.assert_not_awaited()
+
+    async def test_set_ttl_is_capped(self) -> None:
+        await self.cache.set("h1", "name:1", ttl=1000)
+        self.mock_redis.set.assert_awaited_once_with("auth:key:h1", "name:1", ex=300)
+
+    async def test_set_expired_ttl_is_not_cached(self) -> None:
+        await self.cache.set("h1", "name:1", ttl=0)
+
+        self.mock_redis.set.assert_not_awaited()
+        self.assertIsNone(await self.cache.get("h1"))
+
+    async def test_set_invalid(self) -> None:
+        await self.cache.set_invalid("h1")
+
+        self.mock_redis.set.assert_awaited_once_with(
+            "auth:key:h1", INVALID_API_KEY, ex=60
+        )
+        self.assertEqual(await self.cache.get("h1"), INVALID_API_KEY)
+
+    async def test_local_entries_expire(self) -> None:
+        with patch("api.services.api_key_cache.time.monotonic", return_value=0.0):
+            await self.cache.set("h1", "name:1")
+        with patch("api.services.api_key_cache.time.monotonic", return_value=31.0):
+            self.assertIsNone(await self.cache.get("h1"))
+        self.mock_redis.get.assert_awaited_once()
+
+    async def test_least_recently_used_is_evicted(self) -> None:
+        await self.cache.set("h1", "a:1")
+        await self.cache.set("h2", "b:2")
+        await self.cache.get("h1")
+        await self.cache.set("h3", "c:3")
+
+        self.assertEqual(await self.cache.get("h1"), "a:1")
+        self.assertEqual(await self.cache.get("h3"), "c:3")
+        self.mock_redis.get.assert_not_awaited()
+        self.assertIsNone(await self.cache.get("h2"))
+        self.mock_redis.get.assert_awaited_once_with("auth:key:h2")
+
+    async def test_invalidate(self) -> None:
+        await self.cache.set("h1", "name:1")
+
+        await self.cache.invalidate("h1")
+
+        self.mock_redis.delete.assert_awaited_once_with("auth:key:h1")
+        self.mock_redis.publish.assert_awaited_once_with(
+            API_KEY_INVALIDATION_CHANNEL, "h1"
+        )
+        self.assertIsNone(await self.cache.get("h1"))
+
+    async def test_listen_evicts_published_keys(self) -> None:
+        await self.cache.set("h1", "a:1")
+        evicted = asyncio.Event()
+
+        async def subscribe(channel: str) -> AsyncIterator[str]:
+            self.assertEqual(channel, API_KEY_INVALIDATION_CHANNEL)
+            await self.cache.set("h2", "b:2")
+            yield "h2"
+            evicted.set()
+            await asyncio.Event().wait()
+
+        self.mock_redis.subscribe = MagicMock(side_effect=subscribe)
+        listener = asyncio.create_task(self.cache.listen())
+        await asyncio.wait_for(evicted.wait(), 1)
+        listener.cancel()
+
+        # h1 was cleared on subscription, h2 by the published invalidation
+        self.assertIsNone(await self.cache.get("h1"))
+        self.assertIsNone(await self.cache.get("h2"))
+
+    @patch("api.services.api_key_cache.asyncio.sleep", new_callable=AsyncMock)
+    async def test_listen_resubscribes(self, mock_sleep: AsyncMock) -> None:
+        subscribed = asyncio.Event()
+        calls = 0
+
+        async def subscribe(_channel: str) -> AsyncIterator[str]:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise ConnectionError("lost")
+            subscribed.set()
+            await asyncio.Event().wait()
+            yield ""
+
+        self.mock_redis.subscribe = MagicMock(side_effect=subscribe)
+        listener = asyncio.create_task(self.cache.listen())
+        await asyncio.wait_for(subscribed.wait(), 1)
+        listener.cancel()
+
+        self.assertEqual(calls, 2)
+        mock_sleep.assert_awaited_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
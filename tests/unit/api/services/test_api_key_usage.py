@@ -0,0 +1,61 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock
+
+from api.services.api_key_usage import APIKeyUsageRecorder
+
+
+class TestAPIKeyUsageRecorder(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.mock_repository = AsyncMock()
+        self.recorder = APIKeyUsageRecorder(self.mock_repository, flush_interval=10)
+
+    async def test_flush_aggregates_requests(self) -> None:
+        self.recorder.record("h1")
+        self.recorder.record("h2")
+        self.recorder.record("h1")
+
+        self.assertEqual(await self.recorder.flush(), 2)
+
+        usages = self.mock_repository.record_api_key_usage.call_args[0][0]
+        requests = {usage["hashed_key"]: usage["requests"] for usage in usages}
+        self.assertEqual(requests, {"h1": 2, "h2": 1})
+
+    async def test_flush_nothing_recorded(self) -> None:
+        self.assertEqual(await self.recorder.flush(), 0)
+        self.mock_repository.record_api_key_usage.assert_not_called()
+
+    async def test_flush_resets_usage(self) -> None:
+        self.recorder.record("h1")
+        await self.recorder.flush()
+
+        self.assertEqual(await self.recorder.flush(), 0)
+        self.mock_repository.record_api_key_usage.assert_awaited_once()
+
+    async def test_failed_flush_is_retried(self) -> None:
+        self.mock_repository.record_api_key_usage.side_effect = [
+            Exception("DB down"),
+            None,
+        ]
+        self.recorder.record("h1")
+
+        self.assertEqual(await self.recorder.flush(), 0)
+        self.recorder.record("h1")
+        self.assertEqual(await self.recorder.flush(), 1)
+
+        usages = self.mock_repository.record_api_key_usage.call_args[0][0]
+        self.assertEqual(usages[0]["requests"], 2)
+
+    async def test_run_flushes_on_cancel(self) -> None:
+        task = asyncio.create_task(self.recorder.run())
+        await asyncio.sleep(0)
+        self.recorder.record("h1")
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+        self.mock_repository.record_api_key_usage.assert_awaited_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import hashlib
+import json
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from api.services.idempotency import (
+    IdempotencyKeyInProgressError,
+    IdempotencyKeyReusedError,
+    IdempotencyStore,
+    fingerprint,
+)
+
+REDIS_KEY = "idempotency:1:" + hashlib.sha256(b"k1").hexdigest()
+
+
+class TestIdempotencyStore(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.mock_redis = AsyncMock()
+        self.store = IdempotencyStore(self.mock_redis, ttl=600, lock_ttl=30, wait=1)
+
+    def test_fingerprint(self) -> None:
+        self.assertEqual(fingerprint("u", 1), fingerprint("u", 1))
+        self.assertNotEqual(fingerprint("u", 1), fingerprint("u", 2))
+
+    async def test_claim_new_key(self) -> None:
+        self.mock_redis.set_if_absent.return_value = True
+
+        self.assertIsNone(await self.store.claim(1, "k1", "r"))
+
+        key, value = self.mock_redis.set_if_absent.call_args[0]
+        self.assertEqual(key, REDIS_KEY)
+        self.assertEqual(json.loads(value), {"request": "r", "scraping_id": None})
+        self.assertEqual(self.mock_redis.set_if_absent.call_args.kwargs, {"ex": 30})
+
+    async def test_claim_completed_key(self) -> None:
+        self.mock_redis.set_if_absent.return_value = False
+        self.mock_redis.get.return_value = json.dumps(
+            {"request": "r", "scraping_id": 123}
+        )
+
+        self.assertEqual(await self.store.claim(1, "k1", "r"), 123)
+
+    async def test_claim_reused_key(self) -> None:
+        self.mock_redis.set_if_absent.return_value = False
+        self.mock_redis.get.return_value = json.dumps(
+            {"request": "other", "scraping_id": 123}
+        )
+
+        with self.assertRaises(IdempotencyKeyReusedError):
+            await self.store.claim(1, "k1", "r")
+
+    @patch("api.services.idempotency.asyncio.sleep", new_callable=AsyncMock)
+    async def test_claim_waits_for_request_in_progress(
+        self, mock_sleep: AsyncMock
+    ) -> None:
+        self.mock_redis.set_if_absent.return_value = False
+        self.mock_redis.get.side_effect = [
+            json.dumps({"request": "r", "scraping_id": None}),
+            json.dumps({"request": "r", "scraping_id": 123}),
+        ]
+
+        self.assertEqual(await self.store.claim(1, "k1", "r"), 123)
+        mock_sleep.assert_awaited_once()
+
+    @patch("api.services.idempotency.asyncio.sleep", new_callable=AsyncMock)
+    async def test_claim_request_in_progress_times_out(
+        self, _mock_sleep: AsyncMock
+    ) -> None:
+        self.mock_redis.set_if_absent.return_value = False
+        self.mock_redis.get.return_value = json.dumps(
+            {"request": "r", "scraping_id": None}
+        )
+
+        with patch(
+            "api.services.idempotency.time.monotonic", side_effect=[0.0, 0.5, 1.0]
+        ):
+            with self.assertRaises(IdempotencyKeyInProgressError):
+                await self.store.claim(1, "k1", "r")
+
+    async def test_claim_released_key(self) -> None:
+        self.mock_redis.set_if_absent.side_effect = [False, True]
+        self.mock_redis.get.return_value = None
+
+        self.assertIsNone(await self.store.claim(1, "k1", "r"))
+        self.assertEqual(self.mock_redis.set_if_absent.await_count, 2)
+
+    async def test_claim_redis_failure(self) -> None:
+        self.mock_redis.set_if_absent.side_effect = ConnectionError("down")
+
+        self.assertIsNone(await self.store.claim(1, "k1", "r"))
+
+    async def test_complete(self) -> None:
+        await self.store.complete(1, "k1", "r", 123)
+
+        key, value = self.mock_redis.set.call_args[0]
+        self.assertEqual(key, REDIS_KEY)
+        self.assertEqual(json.loads(value), {"request": "r", "scraping_id": 123})
+        self.assertEqual(self.mock_redis.set.call_args.kwargs, {"ex": 600})
+
+    async def test_release(self) -> None:
+        self.mock_redis.delete.side_effect = ConnectionError("down")
+
+        await self.store.release(1, "k1")
+
+        self.mock_redis.delete.assert_awaited_once_with(REDIS_KEY)
+
+    async def test_keys_are_scoped_by_user(self) -> None:
+        await self.store.release(1, "k1")
+        await self.store.release(2, "k1")
+
+        first, second = (c[0][0] for c in self.mock_redis.delete.call_args_list)
+        self.assertNotEqual(first, second)
@@ -0,0 +1,79 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from api.services.job_quota import (
+    ACQUIRE_SCRIPT,
+    ASSIGN_SCRIPT,
+    BatchTooLargeError,
+    JobQuota,
+    QuotaExceededError,
+)
+
+
+class TestJobQuota(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.mock_redis = AsyncMock()
+        self.quota = JobQuota(
+            self.mock_redis, max_inflight=5, stale_after=3600, retry_after=30
+        )
+
+    @patch("api.services.job_quota.time.time", return_value=10_000.0)
+    async def test_acquire(self, _mock_time: MagicMock) -> None:
+        self.mock_redis.eval.return_value = 1
+
+        reservations = await self.quota.acquire(1, 2)
+
+        self.assertEqual(len(reservations), 2)
+        self.assertEqual(len(set(reservations)), 2)
+        script, keys, args = self.mock_redis.eval.call_args[0]
+        self.assertEqual(script, ACQUIRE_SCRIPT)
+        self.assertEqual(keys, ["quota:1:inflight"])
+        self.assertEqual(args, [10_000.0, 6_400.0, 5, 3600, *reservations])
+
+    async def test_acquire_exceeded(self) -> None:
+        self.mock_redis.eval.return_value = 0
+
+        with self.assertRaises(QuotaExceededError) as cm:
+            await self.quota.acquire(1)
+        self.assertEqual(cm.exception.retry_after, 30)
+
+    async def test_acquire_more_than_the_cap(self) -> None:
+        with self.assertRaises(BatchTooLargeError):
+            await self.quota.acquire(1, 6)
+        self.mock_redis.eval.assert_not_awaited()
+
+    async def test_acquire_without_user_or_cap(self) -> None:
+        self.assertEqual(await self.quota.acquire(None), [])
+        self.assertEqual(await JobQuota(self.mock_redis, max_inflight=0).acquire(1), [])
+        self.mock_redis.eval.assert_not_awaited()
+
+    async def test_acquire_redis_failure(self) -> None:
+        self.mock_redis.eval.side_effect = ConnectionError("down")
+        self.assertEqual(await self.quota.acquire(1), [])
+
+    @patch("api.services.job_quota.time.time", return_value=10_000.0)
+    async def test_assign(self, _mock_time: MagicMock) -> None:
+        await self.quota.assign(1, ["reserved:a", "reserved:b"], [7, 8])
+
+        self.mock_redis.eval.assert_awaited_once_with(
+            ASSIGN_SCRIPT,
+            ["quota:1:inflight"],
+            [10_000.0, 2, "reserved:a", "reserved:b", "7", "8"],
+        )
+
+    async def test_assign_nothing_reserved(self) -> None:
+        await self.quota.assign(1, [], [7])
+        self.mock_redis.eval.assert_not_awaited()
+
+    async def test_release(self) -> None:
+        self.mock_redis.zrem.side_effect = ConnectionError("down")
+
+        await self.quota.release(1, ["reserved:a", 7])
+
+        self.mock_redis.zrem.assert_awaited_once_with(
+            "quota:1:inflight", ["reserved:a", "7"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from api.services.rate_limiter import (
+    SLIDING_WINDOW_SCRIPT,
+    RateLimiter,
+    RateLimitExceededError,
+    retry_after_seconds,
+)
+
+
+class TestRateLimiter(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.mock_redis = AsyncMock()
+        self.limiter = RateLimiter(self.mock_redis, limit=10, window=60)
+
+    @patch("api.services.rate_limiter.time.time", return_value=6015.0)
+    async def test_check_allowed(self, _mock_time: MagicMock) -> None:
+        self.mock_redis.eval.return_value = [1, 3, 0]
+
+        await self.limiter.check("h1")
+
+        self.mock_redis.eval.assert_awaited_once_with(
+            SLIDING_WINDOW_SCRIPT,
+            ["ratelimit:h1:100", "ratelimit:h1:99"],
+            [10, 60, 15.0],
+        )
+
+    @patch("api.services.rate_limiter.time.time", return_value=6015.0)
+    async def test_check_exceeded(self, _mock_time: MagicMock) -> None:
+        self.mock_redis.eval.return_value = [0, 10, 4]
+
+        with self.assertRaises(RateLimitExceededError) as cm:
+            await self.limiter.check("h1")
+
+        self.assertEqual(
+            cm.exception.retry_after, retry_after_seconds(10, 4, 10, 60, 15.0)
+        )
+
+    async def test_check_disabled(self) -> None:
+        await RateLimiter(self.mock_redis, limit=0).check("h1")
+        self.mock_redis.eval.assert_not_awaited()
+
+    async def test_check_redis_failure(self) -> None:
+        self.mock_redis.eval.side_effect = ConnectionError("down")
+        await self.limiter.check("h1")
+
+    def test_retry_after_seconds(self) -> None:
+        # 5 of the previous window's 10 requests are still in the sliding window:
+        # one slides out every 6 seconds
+        self.assertEqual(retry_after_seconds(5, 10, 10, 60, 30.0), 6)
+        # The current window alone is full: wait for it to become the previous
+        # one, and for a tenth of it to slide out
+        self.assertEqual(retry_after_seconds(10, 0, 10, 60, 15.0), 51)
+        self.assertEqual(retry_after_seconds(0, 0, 10, 60, 59.9), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
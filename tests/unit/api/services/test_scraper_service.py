@@ -1,10 +1,24 @@
+import asyncio
+import json
 import unittest
-from unittest.mock import AsyncMock
-
-from api.services.scraper_service import ScraperService
-
-
-class TestScraperService(unittest.IsolatedAsyncioTestCase):
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+from typing import Any
+from unittest.mock import ANY, AsyncMock, MagicMock
+
+from api.services.job_quota import QuotaExceededError
+from api.services.scraper_service import (
+    NotAuthorizedError,
+    ProgressEvent,
+    ScraperService,
+    ScrapingNotFoundError,
+)
+from shared.messages import DeletionMessage, ScrapeMessage
+
+
+class TestScraperService(  # pylint: disable=too-many-public-methods
+    unittest.IsolatedAsyncioTestCase
+):
     async def test_start_scraping(self) -> None:
         mock_sqs_client = AsyncMock()
         mock_redis_client = AsyncMock()
@@ -27,7 +41,7 @@ class TestScraperService(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(scraping_id, 123)
 
         # Verify DB Global ID Creation
-        mock_db_repository.create_scraping.assert_called_once_with(url, None)
+        mock_db_repository.create_scraping.assert_called_once_with(url, None, depth)
 
         # Verify Redis Initialization
         mock_redis_client.set.assert_called_once_with("scrape:123:pending", 1)
@@ -36,9 +50,7 @@ class TestScraperService(unittest.IsolatedAsyncioTestCase):
         mock_sqs_client.send_message.assert_called_once()
         call_msg = mock_sqs_client.send_message.call_args[0][0]
 
-        self.assertEqual(call_msg["url"], url)
-        self.assertEqual(call_msg["depth"], depth)
-        self.assertEqual(call_msg["scraping_id"], 123)
+        self.assertEqual(call_msg, ScrapeMessage(url=url, depth=depth, scraping_id=123))
 
     async def test_start_scraping_with_dynamodb(self) -> None:
         mock_sqs_client = AsyncMock()
@@ -69,6 +81,135 @@ class TestScraperService(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(put_item_call["status"], "PENDING")
         self.assertIn("created_at", put_item_call)
 
+    async def test_start_scraping_runs_steps_concurrently(self) -> None:
+        mock_sqs_client = AsyncMock()
+        mock_redis_client = AsyncMock()
+        mock_db_repository = AsyncMock()
+        mock_dynamodb_client = AsyncMock()
+        mock_db_repository.create_scraping.return_value = 123
+        started = asyncio.Event()
+
+        async def put_item(*_args: Any, **_kwargs: Any) -> bool:
+            # Blocks until the job is enqueued
+            await asyncio.wait_for(started.wait(), 1)
+            return True
+
+        async def send_message(*_args: Any) -> None:
+            started.set()
+
+        mock_dynamodb_client.put_item.side_effect = put_item
+        mock_sqs_client.send_message.side_effect = send_message
+        service = ScraperService(
+            mock_sqs_client, mock_redis_client, mock_db_repository, mock_dynamodb_client
+        )
+
+        self.assertEqual(await service.start_scraping("http://a.com", 1), 123)
+        self.assertEqual(
+            mock_dynamodb_client.put_item.call_args.kwargs, {"if_absent": "scraping_id"}
+        )
+
+    async def test_start_scraping_enqueue_failure_marks_failed(self) -> None:
+        mock_sqs_client = AsyncMock()
+        mock_redis_client = AsyncMock()
+        mock_db_repository = AsyncMock()
+        mock_dynamodb_client = AsyncMock()
+        mock_db_repository.create_scraping.return_value = 123
+        mock_sqs_client.send_message.side_effect = RuntimeError("SQS down")
+        mock_redis_client.delete.side_effect = ConnectionError("Redis down")
+        service = ScraperService(
+            mock_sqs_client, mock_redis_client, mock_db_repository, mock_dynamodb_client
+        )
+
+        with self.assertRaisesRegex(RuntimeError, "SQS down"):
+            await service.start_scraping("http://a.com", 1)
+
+        mock_redis_client.delete.assert_awaited_once_with("scrape:123:pending")
+        mock_dynamodb_client.update_item.assert_awaited_once_with(
+            {"scraping_id": "123"}, {"status": "FAILED"}
+        )
+
+    async def test_start_scraping_redis_failure_does_not_enqueue(self) -> None:
+        mock_sqs_client = AsyncMock()
+        mock_redis_client = AsyncMock()
+        mock_db_repository = AsyncMock()
+        mock_db_repository.create_scraping.return_value = 123
+        mock_redis_client.set.side_effect = ConnectionError("Redis down")
+        service = ScraperService(mock_sqs_client, mock_redis_client, mock_db_repository)
+
+        with self.assertRaises(ConnectionError):
+            await service.start_scraping("http://a.com", 1)
+
+        mock_sqs_client.send_message.assert_not_awaited()
+        mock_redis_client.delete.assert_awaited_once_with("scrape:123:pending")
+
+    async def test_start_scraping_dynamodb_failure_is_tolerated(self) -> None:
+        mock_sqs_client = AsyncMock()
+        mock_redis_client = AsyncMock()
+        mock_db_repository = AsyncMock()
+        mock_dynamodb_client = AsyncMock()
+        mock_db_repository.create_scraping.return_value = 123
+        mock_dynamodb_client.put_item.side_effect = RuntimeError("DynamoDB down")
+        service = ScraperService(
+            mock_sqs_client, mock_redis_client, mock_db_repository, mock_dynamodb_client
+        )
+
+        self.assertEqual(await service.start_scraping("http://a.com", 1), 123)
+
+        mock_sqs_client.send_message.assert_awaited_once()
+        mock_dynamodb_client.update_item.assert_not_awaited()
+        mock_redis_client.delete.assert_not_awaited()
+
+    async def test_start_scraping_reuses_fresh_scraping(self) -> None:
+        mock_sqs_client = AsyncMock()
+        mock_redis_client = AsyncMock()
+        mock_db_repository = AsyncMock()
+        mock_dynamodb_client = AsyncMock()
+        mock_db_repository.create_fresh_alias.return_value = (124, 99)
+        mock_dynamodb_client.get_item.return_value = {
+            "scraping_id": "99",
+            "status": "COMPLETED",
+            "links_count": 42,
+            "completed_at": "2026-01-01T00:00:00+00:00",
+        }
+        service = ScraperService(
+            mock_sqs_client, mock_redis_client, mock_db_repository, mock_dynamodb_client
+        )
+
+        scraping_id = await service.start_scraping(
+            "http://a.com", 2, user_id=5, max_age=3600
+        )
+
+        self.assertEqual(scraping_id, 124)
+        mock_db_repository.create_fresh_alias.assert_awaited_once_with(
+            "http://a.com", 2, 5, 3600
+        )
+        mock_dynamodb_client.get_item.assert_awaited_once_with({"scraping_id": "99"})
+        item = mock_dynamodb_client.put_item.call_args[0][0]
+        self.assertEqual(item["scraping_id"], "124")
+        self.assertEqual(item["status"], "COMPLETED")
+        self.assertEqual(item["links_count"], 42)
+        self.assertEqual(item["completed_at"], "2026-01-01T00:00:00+00:00")
+        self.assertEqual(item["source_scraping_id"], "99")
+        mock_db_repository.create_scraping.assert_not_called()
+        mock_redis_client.set.assert_not_called()
+        mock_sqs_client.send_message.assert_not_called()
+
+    async def test_start_scraping_without_fresh_scraping(self) -> None:
+        mock_sqs_client = AsyncMock()
+        mock_redis_client = AsyncMock()
+        mock_db_repository = AsyncMock()
+        mock_db_repository.create_fresh_alias.return_value = None
+        mock_db_repository.create_scraping.return_value = 123
+        service = ScraperService(mock_sqs_client, mock_redis_client, mock_db_repository)
+
+        scraping_id = await service.start_scraping("http://a.com", 2, max_age=60)
+
+        self.assertEqual(scraping_id, 123)
+        mock_db_repository.create_scraping.assert_awaited_once_with(
+            "http://a.com", None, 2
+        )
+        mock_sqs_client.send_message.assert_awaited_once()
+
     async def test_get_scraping_status(self) -> None:
         mock_sqs_client = AsyncMock()
         mock_redis_client = AsyncMock()
@@ -209,7 +350,7 @@ class TestScraperService(unittest.IsolatedAsyncioTestCase):
 
         self.assertTrue(result)
         mock_sqs_client.send_message.assert_called_once_with(
-            {"scraping_id": 123}, queue_url="http://deletion-q"
+            DeletionMessage(scraping_id=123), queue_url="http://deletion-q"
         )
 
     async def test_delete_scraping_not_found(self) -> None:
@@ -250,9 +391,505 @@ class TestScraperService(unittest.IsolatedAsyncioTestCase):
         await service.enqueue_deletion(123)
 
         mock_sqs_client.send_message.assert_called_once_with(
-            {"scraping_id": 123}, queue_url="http://deletion-q"
+            DeletionMessage(scraping_id=123), queue_url="http://deletion-q"
+        )
+
+    async def test_enqueue_deletions(self) -> None:
+        mock_sqs_client = AsyncMock()
+        mock_sqs_client.send_messages.return_value = [
+            {"success": True, "message_id": "m1", "error": None},
+            {"success": False, "message_id": None, "error": "Throttled"},
+        ]
+        service = ScraperService(
+            mock_sqs_client,
+            AsyncMock(),
+            AsyncMock(),
+            deletion_queue_url="http://deletion-q",
+        )
+
+        result = await service.enqueue_deletions([1, 2])
+
+        self.assertEqual(result, [True, False])
+        mock_sqs_client.send_messages.assert_called_once_with(
+            [DeletionMessage(scraping_id=1), DeletionMessage(scraping_id=2)],
+            queue_url="http://deletion-q",
+        )
+
+    async def test_enqueue_deletions_without_queue(self) -> None:
+        mock_sqs_client = AsyncMock()
+        service = ScraperService(mock_sqs_client, AsyncMock(), AsyncMock())
+
+        result = await service.enqueue_deletions([1, 2])
+
+        self.assertEqual(result, [False, False])
+        mock_sqs_client.send_messages.assert_not_called()
+
+    async def test_get_full_scrapings_batches_dynamodb(self) -> None:
+        mock_db_repository = AsyncMock()
+        mock_dynamodb_client = AsyncMock()
+        mock_db_repository.get_scrapings.return_value = (
+            [
+                {"id": 1, "url": "http://a.com", "scraped_at": None},
+                {"id": 2, "url": "http://b.com", "scraped_at": None},
+            ],
+            2,
+        )
+        mock_dynamodb_client.batch_get_items.return_value = [
+            {"scraping_id": "2", "status": "COMPLETED", "depth": 3}
+        ]
+
+        service = ScraperService(
+            AsyncMock(), AsyncMock(), mock_db_repository, mock_dynamodb_client
+        )
+        scrapings, total, next_before_id = await service.get_full_scrapings(user_id=1)
+
+        self.assertEqual(total, 2)
+        self.assertIsNone(next_before_id)
+        self.assertEqual(scrapings[0]["status"], "PENDING")
+        self.assertEqual(scrapings[1]["status"], "COMPLETED")
+        self.assertEqual(scrapings[1]["depth"], 3)
+        mock_dynamodb_client.batch_get_items.assert_awaited_once_with(
+            [{"scraping_id": "1"}, {"scraping_id": "2"}], attributes=ANY
+        )
+        mock_dynamodb_client.get_item.assert_not_called()
+
+    async def test_get_full_scrapings_next_page(self) -> None:
+        mock_db_repository = AsyncMock()
+        mock_db_repository.get_scrapings.return_value = (
+            [{"id": i, "url": "http://a.com", "scraped_at": None} for i in (9, 8, 7)],
+            None,
+        )
+
+        service = ScraperService(AsyncMock(), AsyncMock(), mock_db_repository)
+        scrapings, total, next_before_id = await service.get_full_scrapings(
+            user_id=1, limit=2, include_total=False, before_id=10
+        )
+
+        self.assertEqual([s["id"] for s in scrapings], [9, 8])
+        self.assertIsNone(total)
+        self.assertEqual(next_before_id, 8)
+        mock_db_repository.get_scrapings.assert_awaited_once_with(
+            1, 0, 3, include_total=False, before_id=10
+        )
+
+    async def test_get_full_scrapings_dynamodb_failure(self) -> None:
+        mock_db_repository = AsyncMock()
+        mock_dynamodb_client = AsyncMock()
+        scraped_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        mock_db_repository.get_scrapings.return_value = (
+            [{"id": 1, "url": "http://a.com", "scraped_at": scraped_at}],
+            1,
+        )
+        mock_dynamodb_client.batch_get_items.side_effect = Exception("Throttled")
+
+        service = ScraperService(
+            AsyncMock(), AsyncMock(), mock_db_repository, mock_dynamodb_client
+        )
+        scrapings, total, _ = await service.get_full_scrapings(user_id=1)
+
+        self.assertEqual(total, 1)
+        self.assertEqual(scrapings[0]["status"], "PENDING")
+        self.assertEqual(scrapings[0]["created_at"], scraped_at.isoformat())
+
+    async def test_get_full_scraping_dynamodb_failure(self) -> None:
+        mock_db_repository = AsyncMock()
+        mock_dynamodb_client = AsyncMock()
+        mock_db_repository.get_scraping.return_value = {
+            "id": 123,
+            "url": "http://x.com",
+            "summary": None,
+            "scraped_at": None,
+        }
+        mock_dynamodb_client.get_item.side_effect = Exception("Throttled")
+
+        service = ScraperService(
+            AsyncMock(), AsyncMock(), mock_db_repository, mock_dynamodb_client
+        )
+        result = await service.get_full_scraping(123)
+
+        assert result is not None
+        self.assertEqual(result["status"], "UNKNOWN")
+
+    async def test_get_full_scraping_queries_concurrently(self) -> None:
+        mock_db_repository = AsyncMock()
+        mock_dynamodb_client = AsyncMock()
+        pg_started = asyncio.Event()
+        dynamo_started = asyncio.Event()
+
+        # Each call only returns once the other one has started
+        async def get_scraping(_scraping_id: int) -> dict:
+            pg_started.set()
+            await asyncio.wait_for(dynamo_started.wait(), 1)
+            return {"id": 123, "url": "http://x.com", "scraped_at": None}
+
+        async def get_item(_key: dict) -> dict:
+            dynamo_started.set()
+            await asyncio.wait_for(pg_started.wait(), 1)
+            return {"status": "COMPLETED"}
+
+        mock_db_repository.get_scraping.side_effect = get_scraping
+        mock_dynamodb_client.get_item.side_effect = get_item
+
+        service = ScraperService(
+            AsyncMock(), AsyncMock(), mock_db_repository, mock_dynamodb_client
+        )
+        result = await service.get_full_scraping(123)
+
+        assert result is not None
+        self.assertEqual(result["status"], "COMPLETED")
+
+    async def test_stream_scraping_results(self) -> None:
+        mock_db_repository = AsyncMock()
+        page: dict[str, Any] = {"url": "http://a.com", "images": [], "summary": None}
+        mock_db_repository.get_scraping_results_page.side_effect = [
+            ([page, page], 7),
+            ([page], None),
+        ]
+
+        service = ScraperService(AsyncMock(), AsyncMock(), mock_db_repository)
+        results = [
+            result
+            async for result in service.stream_scraping_results(123, batch_size=2)
+        ]
+
+        self.assertEqual(len(results), 3)
+        calls = mock_db_repository.get_scraping_results_page.call_args_list
+        self.assertEqual(calls[0].kwargs, {"after_id": None, "limit": 2})
+        self.assertEqual(calls[1].kwargs, {"after_id": 7, "limit": 2})
+
+    async def test_start_scrapings(self) -> None:
+        mock_sqs_client = AsyncMock()
+        mock_redis_client = AsyncMock()
+        mock_db_repository = AsyncMock()
+        mock_dynamodb_client = AsyncMock()
+        mock_db_repository.create_scrapings.return_value = [7, 8]
+        mock_dynamodb_client.batch_write_items.return_value = 0
+        mock_sqs_client.send_messages.return_value = [
+            {"success": True, "message_id": "m1", "error": None},
+            {"success": False, "message_id": None, "error": "Throttled"},
+        ]
+        service = ScraperService(
+            mock_sqs_client, mock_redis_client, mock_db_repository, mock_dynamodb_client
+        )
+
+        scraping_ids, failed_ids = await service.start_scrapings(
+            [("http://a.com", 1), ("http://b.com", 2)], user_id=5
+        )
+
+        self.assertEqual(scraping_ids, [7, 8])
+        self.assertEqual(failed_ids, [8])
+        mock_db_repository.create_scrapings.assert_awaited_once_with(
+            [("http://a.com", 1), ("http://b.com", 2)], 5
+        )
+        mock_redis_client.mset.assert_awaited_once_with(
+            {"scrape:7:pending": 1, "scrape:8:pending": 1}
+        )
+        items = mock_dynamodb_client.batch_write_items.call_args[0][0]
+        self.assertEqual([item["scraping_id"] for item in items], ["7", "8"])
+        self.assertEqual([item["depth"] for item in items], [1, 2])
+        self.assertEqual(items[0]["status"], "PENDING")
+        mock_sqs_client.send_messages.assert_awaited_once_with(
+            [
+                ScrapeMessage(url="http://a.com", depth=1, scraping_id=7, user_id=5),
+                ScrapeMessage(url="http://b.com", depth=2, scraping_id=8, user_id=5),
+            ]
+        )
+        # The job that was not enqueued is cleaned up like a single one
+        mock_redis_client.delete.assert_awaited_once_with("scrape:8:pending")
+        mock_dynamodb_client.update_item.assert_awaited_once_with(
+            {"scraping_id": "8"}, {"status": "FAILED"}
+        )
+
+    async def test_start_scrapings_aborts_when_setup_fails(self) -> None:
+        mock_sqs_client = AsyncMock()
+        mock_redis_client = AsyncMock()
+        mock_redis_client.mset.side_effect = ConnectionError("down")
+        mock_db_repository = AsyncMock()
+        mock_db_repository.create_scrapings.return_value = [7, 8]
+        mock_dynamodb_client = AsyncMock()
+        mock_dynamodb_client.batch_write_items.return_value = 0
+        mock_quota = AsyncMock()
+        mock_quota.acquire.return_value = ["reserved:r1", "reserved:r2"]
+        service = ScraperService(
+            mock_sqs_client,
+            mock_redis_client,
+            mock_db_repository,
+            mock_dynamodb_client,
+            job_quota=mock_quota,
         )
 
+        with self.assertRaises(ConnectionError):
+            await service.start_scrapings([("http://a.com", 1), ("http://b.com", 2)], 5)
+
+        mock_sqs_client.send_messages.assert_not_awaited()
+        self.assertEqual(
+            [c.args[0] for c in mock_redis_client.delete.await_args_list],
+            ["scrape:7:pending", "scrape:8:pending"],
+        )
+        self.assertEqual(
+            [c.args for c in mock_dynamodb_client.update_item.await_args_list],
+            [
+                ({"scraping_id": "7"}, {"status": "FAILED"}),
+                ({"scraping_id": "8"}, {"status": "FAILED"}),
+            ],
+        )
+        mock_quota.release.assert_awaited_once_with(
+            5, ["reserved:r1", "reserved:r2", 7, 8]
+        )
+
+    async def test_start_scrapings_aborts_when_enqueueing_fails(self) -> None:
+        mock_sqs_client = AsyncMock()
+        mock_sqs_client.send_messages.side_effect = ConnectionError("down")
+        mock_redis_client = AsyncMock()
+        mock_db_repository = AsyncMock()
+        mock_db_repository.create_scrapings.return_value = [7]
+        service = ScraperService(mock_sqs_client, mock_redis_client, mock_db_repository)
+
+        with self.assertRaises(ConnectionError):
+            await service.start_scrapings([("http://a.com", 1)], 5)
+
+        mock_redis_client.delete.assert_awaited_once_with("scrape:7:pending")
+
+    async def test_start_scraping_assigns_quota_before_enqueueing(self) -> None:
+        calls: list[str] = []
+        mock_sqs_client = AsyncMock()
+        mock_sqs_client.send_message.side_effect = lambda *_: calls.append("send")
+        mock_db_repository = AsyncMock()
+        mock_db_repository.create_scraping.return_value = 123
+        mock_quota = AsyncMock()
+        mock_quota.acquire.return_value = ["reserved:r1"]
+        mock_quota.assign.side_effect = lambda *_: calls.append("assign")
+        service = ScraperService(
+            mock_sqs_client, AsyncMock(), mock_db_repository, job_quota=mock_quota
+        )
+
+        self.assertEqual(await service.start_scraping("http://a.com", 1, 5), 123)
+
+        mock_quota.acquire.assert_awaited_once_with(5, 1)
+        mock_quota.assign.assert_awaited_once_with(5, ["reserved:r1"], [123])
+        mock_quota.release.assert_not_awaited()
+        self.assertEqual(calls, ["assign", "send"])
+
+    async def test_start_scraping_quota_exceeded(self) -> None:
+        mock_db_repository = AsyncMock()
+        mock_quota = AsyncMock()
+        mock_quota.acquire.side_effect = QuotaExceededError("Too many", 30)
+        service = ScraperService(
+            AsyncMock(), AsyncMock(), mock_db_repository, job_quota=mock_quota
+        )
+
+        with self.assertRaises(QuotaExceededError):
+            await service.start_scraping("http://a.com", 1, 5)
+
+        mock_db_repository.create_scraping.assert_not_awaited()
+
+    async def test_start_scraping_enqueue_failure_releases_quota(self) -> None:
+        mock_sqs_client = AsyncMock()
+        mock_sqs_client.send_message.side_effect = RuntimeError("SQS down")
+        mock_db_repository = AsyncMock()
+        mock_db_repository.create_scraping.return_value = 123
+        mock_quota = AsyncMock()
+        mock_quota.acquire.return_value = ["reserved:r1"]
+        service = ScraperService(
+            mock_sqs_client, AsyncMock(), mock_db_repository, job_quota=mock_quota
+        )
+
+        with self.assertRaises(RuntimeError):
+            await service.start_scraping("http://a.com", 1, 5)
+
+        mock_quota.release.assert_awaited_once_with(5, ["reserved:r1", 123])
+
+    async def test_start_scraping_create_failure_releases_quota(self) -> None:
+        mock_db_repository = AsyncMock()
+        mock_db_repository.create_scraping.side_effect = RuntimeError("DB down")
+        mock_quota = AsyncMock()
+        mock_quota.acquire.return_value = ["reserved:r1"]
+        service = ScraperService(
+            AsyncMock(), AsyncMock(), mock_db_repository, job_quota=mock_quota
+        )
+
+        with self.assertRaises(RuntimeError):
+            await service.start_scraping("http://a.com", 1, 5)
+
+        mock_quota.release.assert_awaited_once_with(5, ["reserved:r1"])
+
+    async def test_start_scrapings_releases_quota_of_failed_jobs(self) -> None:
+        mock_sqs_client = AsyncMock()
+        mock_sqs_client.send_messages.return_value = [
+            {"success": True, "message_id": "m1", "error": None},
+            {"success": False, "message_id": None, "error": "Throttled"},
+        ]
+        mock_db_repository = AsyncMock()
+        mock_db_repository.create_scrapings.return_value = [7, 8]
+        mock_quota = AsyncMock()
+        mock_quota.acquire.return_value = ["reserved:r1", "reserved:r2"]
+        service = ScraperService(
+            mock_sqs_client, AsyncMock(), mock_db_repository, job_quota=mock_quota
+        )
+
+        await service.start_scrapings([("http://a.com", 1), ("http://b.com", 2)], 5)
+
+        mock_quota.acquire.assert_awaited_once_with(5, 2)
+        mock_quota.assign.assert_awaited_once_with(
+            5, ["reserved:r1", "reserved:r2"], [7, 8]
+        )
+        mock_quota.release.assert_awaited_once_with(5, [8])
+
+    async def test_start_scraping_alias_bypasses_quota(self) -> None:
+        mock_db_repository = AsyncMock()
+        mock_db_repository.create_fresh_alias.return_value = (124, 100)
+        mock_quota = AsyncMock()
+        service = ScraperService(
+            AsyncMock(), AsyncMock(), mock_db_repository, job_quota=mock_quota
+        )
+
+        self.assertEqual(
+            await service.start_scraping("http://a.com", 1, 5, max_age=60), 124
+        )
+
+        mock_quota.acquire.assert_not_awaited()
+
+    async def _collect_progress(
+        self, service: ScraperService, **kwargs: Any
+    ) -> list[ProgressEvent]:
+        async def collect() -> list[ProgressEvent]:
+            return [e async for e in service.stream_progress(123, **kwargs)]
+
+        return await asyncio.wait_for(collect(), 1)
+
+    async def test_stream_progress(self) -> None:
+        mock_redis_client = AsyncMock()
+        mock_redis_client.keyspace_channel = MagicMock(return_value="keyspace")
+        mock_redis_client.get.side_effect = ["3", "1"]
+        mock_dynamodb_client = AsyncMock()
+        snapshot_read = asyncio.Event()
+
+        def get_item(_key: dict[str, str]) -> dict[str, str]:
+            snapshot_read.set()
+            return {"status": "PENDING"}
+
+        mock_dynamodb_client.get_item.side_effect = get_item
+
+        async def subscribe_many(channels: list[str]) -> AsyncIterator[tuple[str, str]]:
+            self.assertEqual(channels, ["scrape:123:progress", "keyspace"])
+            await snapshot_read.wait()
+            # Both notifications are read at once, so the counter is read once
+            yield "keyspace", "decrby"
+            yield "keyspace", "decrby"
+            await asyncio.sleep(0.01)
+            yield "scrape:123:progress", "garbage"
+            page = {"type": "page_data", "url": "http://a.com"}
+            yield "scrape:123:progress", json.dumps(page)
+            yield "scrape:123:progress", json.dumps({"type": "scraping_complete"})
+            await asyncio.Event().wait()
+
+        mock_redis_client.subscribe_many = MagicMock(side_effect=subscribe_many)
+        service = ScraperService(
+            AsyncMock(), mock_redis_client, AsyncMock(), mock_dynamodb_client
+        )
+
+        events = await self._collect_progress(service)
+
+        self.assertEqual(
+            events,
+            [
+                {"event": "status", "data": {"status": "PENDING", "pending": 3}},
+                {"event": "pending", "data": {"pending": 1}},
+                {"event": "page", "data": {"type": "page_data", "url": "http://a.com"}},
+                {"event": "completed", "data": {"status": "COMPLETED"}},
+            ],
+        )
+        mock_redis_client.get.assert_awaited_with("scrape:123:pending")
+
+    async def test_stream_progress_already_completed(self) -> None:
+        mock_redis_client = AsyncMock()
+        mock_pubsub_client = AsyncMock()
+        mock_pubsub_client.keyspace_channel = MagicMock(return_value="keyspace")
+        cancelled = asyncio.Event()
+
+        async def subscribe_many(
+            _channels: list[str],
+        ) -> AsyncIterator[tuple[str, str]]:
+            try:
+                await asyncio.Event().wait()
+            finally:
+                cancelled.set()
+            yield "", ""
+
+        mock_pubsub_client.subscribe_many = MagicMock(side_effect=subscribe_many)
+        mock_dynamodb_client = AsyncMock()
+        mock_dynamodb_client.get_item.return_value = {"status": "COMPLETED"}
+        service = ScraperService(
+            AsyncMock(),
+            mock_redis_client,
+            AsyncMock(),
+            mock_dynamodb_client,
+            pubsub_client=mock_pubsub_client,
+        )
+
+        events = await self._collect_progress(service)
+
+        self.assertEqual(
+            events, [{"event": "completed", "data": {"status": "COMPLETED"}}]
+        )
+        # The subscription is closed along with the stream
+        self.assertTrue(cancelled.is_set())
+        # and was held on the pub/sub client's pool
+        mock_redis_client.subscribe_many.assert_not_called()
+
+    async def test_stream_progress_failed(self) -> None:
+        mock_redis_client = AsyncMock()
+        mock_redis_client.keyspace_channel = MagicMock(return_value="keyspace")
+        mock_redis_client.subscribe_many = MagicMock(side_effect=ConnectionError)
+        mock_dynamodb_client = AsyncMock()
+        mock_dynamodb_client.get_item.return_value = {"status": "FAILED"}
+        service = ScraperService(
+            AsyncMock(), mock_redis_client, AsyncMock(), mock_dynamodb_client
+        )
+
+        events = await self._collect_progress(service)
+
+        self.assertEqual(events, [{"event": "failed", "data": {"status": "FAILED"}}])
+
+    async def test_stream_progress_resyncs_on_heartbeat(self) -> None:
+        mock_redis_client = AsyncMock()
+        mock_redis_client.keyspace_channel = MagicMock(return_value="keyspace")
+        # The subscription is lost: the stream falls back to heartbeat snapshots
+        mock_redis_client.subscribe_many = MagicMock(side_effect=ConnectionError)
+        mock_redis_client.get.return_value = None
+        mock_dynamodb_client = AsyncMock()
+        mock_dynamodb_client.get_item.side_effect = [
+            {"status": "PENDING"},
+            {"status": "COMPLETED"},
+        ]
+        service = ScraperService(
+            AsyncMock(), mock_redis_client, AsyncMock(), mock_dynamodb_client
+        )
+
+        events = await self._collect_progress(service, heartbeat=0.01)
+
+        self.assertEqual(
+            events,
+            [
+                {"event": "status", "data": {"status": "PENDING", "pending": None}},
+                {"event": "completed", "data": {"status": "COMPLETED"}},
+            ],
+        )
+
+    async def test_check_ownership(self) -> None:
+        mock_db_repository = AsyncMock()
+        record = {"id": 123, "url": "http://x.com", "user_id": 1}
+        mock_db_repository.get_scraping.return_value = record
+        service = ScraperService(AsyncMock(), AsyncMock(), mock_db_repository)
+
+        self.assertEqual(await service.check_ownership(123, 1), record)
+        with self.assertRaises(NotAuthorizedError):
+            await service.check_ownership(123, 2)
+
+        mock_db_repository.get_scraping.return_value = None
+        with self.assertRaises(ScrapingNotFoundError):
+            await service.check_ownership(123, 1)
+
 
 if __name__ == "__main__":
     unittest.main()
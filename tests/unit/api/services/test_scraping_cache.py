@@ -0,0 +1,123 @@
+import json
+import unittest
+from unittest.mock import AsyncMock
+
+from api.services.scraping_cache import ScrapingCache, compute_etag
+
+
+class TestScrapingCache(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.mock_redis = AsyncMock()
+        self.cache = ScrapingCache(self.mock_redis, ttl=60)
+
+    async def test_get_miss(self) -> None:
+        self.mock_redis.mget.return_value = [None, None, None]
+
+        self.assertEqual(await self.cache.get(1), ("0", None))
+        self.mock_redis.mget.assert_awaited_once_with(
+            ["scrape:1:version", "scrape:1:response", "scrape:1:deleting"]
+        )
+
+    async def test_get_hit(self) -> None:
+        entry = {"version": "3", "etag": '"e"', "body": "{}"}
+        self.mock_redis.mget.return_value = ["3", json.dumps(entry), None]
+
+        self.assertEqual(await self.cache.get(1), ("3", {"etag": '"e"', "body": "{}"}))
+        self.mock_redis.get.assert_not_awaited()
+
+    async def test_get_stale_version(self) -> None:
+        entry = {"version": "3", "etag": '"e"', "body": "{}"}
+        self.mock_redis.mget.return_value = ["4", json.dumps(entry), None]
+
+        self.assertEqual(await self.cache.get(1), ("4", None))
+
+    async def test_get_pending_deletion(self) -> None:
+        entry = {"version": "3", "etag": '"e"', "body": "{}"}
+        self.mock_redis.mget.return_value = ["3", json.dumps(entry), "1"]
+
+        self.assertEqual(await self.cache.get(1), (None, None))
+
+    async def test_get_alias_hit(self) -> None:
+        entry = {"source_id": 2, "version": "5", "etag": '"e"', "body": "{}"}
+        self.mock_redis.mget.return_value = [None, json.dumps(entry), None]
+        self.mock_redis.get.return_value = "5"
+
+        self.assertEqual(await self.cache.get(1), ("0", {"etag": '"e"', "body": "{}"}))
+        self.mock_redis.get.assert_awaited_once_with("scrape:2:version")
+
+    async def test_get_alias_stale_source_version(self) -> None:
+        entry = {"source_id": 2, "version": "5", "etag": '"e"', "body": "{}"}
+        self.mock_redis.mget.return_value = [None, json.dumps(entry), None]
+        self.mock_redis.get.return_value = "6"
+
+        self.assertEqual(await self.cache.get(1), ("0", None))
+
+    async def test_version(self) -> None:
+        self.mock_redis.get.return_value = None
+
+        self.assertEqual(await self.cache.version(2), "0")
+        self.mock_redis.get.assert_awaited_once_with("scrape:2:version")
+
+    async def test_version_redis_error(self) -> None:
+        self.mock_redis.get.side_effect = ConnectionError("down")
+
+        self.assertIsNone(await self.cache.version(2))
+
+    async def test_get_redis_error(self) -> None:
+        self.mock_redis.mget.side_effect = ConnectionError("down")
+
+        self.assertEqual(await self.cache.get(1), (None, None))
+
+    async def test_set(self) -> None:
+        await self.cache.set(1, "3", {"etag": '"e"', "body": "{}"})
+
+        key, entry = self.mock_redis.set.call_args[0]
+        self.assertEqual(key, "scrape:1:response")
+        self.assertEqual(
+            json.loads(entry),
+            {"source_id": 1, "version": "3", "etag": '"e"', "body": "{}"},
+        )
+        self.assertEqual(self.mock_redis.set.call_args[1], {"ex": 60})
+
+    async def test_set_alias(self) -> None:
+        await self.cache.set(1, "3", {"etag": '"e"', "body": "{}"}, source_id=2)
+
+        self.assertEqual(
+            json.loads(self.mock_redis.set.call_args[0][1])["source_id"], 2
+        )
+
+    async def test_set_redis_error(self) -> None:
+        self.mock_redis.set.side_effect = ConnectionError("down")
+
+        await self.cache.set(1, "3", {"etag": '"e"', "body": "{}"})
+
+    async def test_mark_deleting(self) -> None:
+        await self.cache.mark_deleting(1)
+
+        self.mock_redis.set.assert_awaited_once_with("scrape:1:deleting", "1", ex=86400)
+        self.mock_redis.delete.assert_awaited_once_with("scrape:1:response")
+
+    async def test_purge(self) -> None:
+        await self.cache.purge(1)
+
+        _, keys, args = self.mock_redis.eval.call_args[0]
+        self.assertEqual(
+            keys, ["scrape:1:version", "scrape:1:response", "scrape:1:deleting"]
+        )
+        self.assertEqual(args, [30 * 86400])
+
+    async def test_purge_redis_error(self) -> None:
+        self.mock_redis.eval.side_effect = ConnectionError("down")
+
+        await self.cache.purge(1)
+
+    def test_compute_etag(self) -> None:
+        etag = compute_etag(b"{}")
+
+        self.assertRegex(etag, r'^"[0-9a-f]{32}"$')
+        self.assertEqual(etag, compute_etag(b"{}"))
+        self.assertNotEqual(etag, compute_etag(b"[]"))
+
+
+if __name__ == "__main__":
+    unittest.main()
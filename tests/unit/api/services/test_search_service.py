@@ -1,4 +1,6 @@
+import json
 import unittest
+from typing import Any
 from unittest.mock import AsyncMock
 
 from api.services.search_service import SearchService
@@ -7,6 +9,8 @@ from api.services.search_service import SearchService
 class TestSearchService(unittest.IsolatedAsyncioTestCase):
     def setUp(self) -> None:
         self.mock_repository = AsyncMock()
+        self.mock_redis = AsyncMock()
+        self.mock_redis.get.return_value = None
         self.service = SearchService(self.mock_repository)
 
     async def test_search_pages_success(self) -> None:
@@ -24,18 +28,21 @@ class TestSearchService(unittest.IsolatedAsyncioTestCase):
                             "content": ["<em>test</em> snippet"],
                             "summary": ["<em>test</em> summary"],
                         },
+                        "sort": [1.0, 123, "http://example.com"],
                     }
                 ]
             }
         }
 
-        results = await self.service.search_pages("test", 1)
+        page = await self.service.search_pages("test", 1)
+        results = page["results"]
 
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0]["url"], "http://example.com")
         self.assertEqual(results[0]["scraping_id"], 123)
         self.assertEqual(results[0]["created_at"], "2026-02-05T20:00:00Z")
         self.assertEqual(len(results[0]["highlights"]), 2)
+        self.assertIsNone(page["next_search_after"])
 
         self.mock_repository.search.assert_called_once()
         call_args = self.mock_repository.search.call_args
@@ -45,6 +52,10 @@ class TestSearchService(unittest.IsolatedAsyncioTestCase):
             query["query"]["bool"]["must"][0]["multi_match"]["query"], "test"
         )
         self.assertEqual(query["query"]["bool"]["must"][1]["term"]["user_id"], 1)
+        self.assertEqual(query["_source"], ["url", "scraping_id", "created_at"])
+        self.assertEqual(query["size"], 11)
+        self.assertEqual(query["highlight"]["fragment_size"], 150)
+        self.assertNotIn("search_after", query)
 
     async def test_search_pages_no_highlights(self) -> None:
         self.mock_repository.search.return_value = {
@@ -53,9 +64,9 @@ class TestSearchService(unittest.IsolatedAsyncioTestCase):
             }
         }
 
-        results = await self.service.search_pages("test", 1)
-        self.assertEqual(len(results), 1)
-        self.assertEqual(results[0]["highlights"], [])
+        page = await self.service.search_pages("test", 1)
+        self.assertEqual(len(page["results"]), 1)
+        self.assertEqual(page["results"][0]["highlights"], [])
 
     async def test_search_pages_limit_highlights(self) -> None:
         self.mock_repository.search.return_value = {
@@ -69,5 +80,72 @@ class TestSearchService(unittest.IsolatedAsyncioTestCase):
             }
         }
 
-        results = await self.service.search_pages("test", 1)
-        self.assertEqual(len(results[0]["highlights"]), 3)
+        page = await self.service.search_pages("test", 1)
+        self.assertEqual(len(page["results"][0]["highlights"]), 3)
+
+    async def test_search_pages_search_after(self) -> None:
+        hits = [
+            {
+                "_source": {"url": f"http://example.com/{i}", "scraping_id": 1},
+                "sort": [1.0, 1, f"http://example.com/{i}"],
+            }
+            for i in range(3)
+        ]
+        self.mock_repository.search.return_value = {"hits": {"hits": hits}}
+        service = SearchService(self.mock_repository, fragment_size=80, fragments=1)
+
+        page = await service.search_pages(
+            "test", 1, size=2, search_after=[2.0, 1, "http://example.com/x"]
+        )
+
+        # The extra hit is only fetched to detect the next page
+        self.assertEqual(len(page["results"]), 2)
+        self.assertEqual(page["next_search_after"], [1.0, 1, "http://example.com/1"])
+        query = self.mock_repository.search.call_args.kwargs["body"]
+        self.assertEqual(query["size"], 3)
+        self.assertEqual(query["search_after"], [2.0, 1, "http://example.com/x"])
+        self.assertEqual(query["highlight"]["fragment_size"], 80)
+        self.assertEqual(query["highlight"]["number_of_fragments"], 1)
+
+    async def test_search_pages_cached(self) -> None:
+        page: dict[str, Any] = {"results": [], "next_search_after": None}
+        self.mock_redis.get.return_value = json.dumps(page)
+        service = SearchService(self.mock_repository, self.mock_redis)
+
+        self.assertEqual(await service.search_pages("test", 1), page)
+        self.mock_repository.search.assert_not_called()
+        self.assertTrue(self.mock_redis.get.call_args[0][0].startswith("search:1:"))
+
+    async def test_search_pages_cache_miss(self) -> None:
+        self.mock_repository.search.return_value = {"hits": {"hits": []}}
+        service = SearchService(self.mock_repository, self.mock_redis, cache_ttl=5)
+
+        page = await service.search_pages("test", 1)
+
+        key, value = self.mock_redis.set.call_args[0]
+        self.assertEqual(key, self.mock_redis.get.call_args[0][0])
+        self.assertEqual(json.loads(value), page)
+        self.assertEqual(self.mock_redis.set.call_args[1], {"ex": 5})
+
+    async def test_search_pages_cache_keys(self) -> None:
+        self.mock_repository.search.return_value = {"hits": {"hits": []}}
+        service = SearchService(self.mock_repository, self.mock_redis)
+
+        await service.search_pages("test", 1)
+        await service.search_pages("test", 2)
+        await service.search_pages("test", 1, search_after=[1.0, 1, "u"])
+        await service.search_pages("other", 1)
+
+        keys = {call[0][0] for call in self.mock_redis.get.call_args_list}
+        self.assertEqual(len(keys), 4)
+
+    async def test_search_pages_cache_unavailable(self) -> None:
+        self.mock_redis.get.side_effect = ConnectionError("down")
+        self.mock_redis.set.side_effect = ConnectionError("down")
+        self.mock_repository.search.return_value = {"hits": {"hits": []}}
+        service = SearchService(self.mock_repository, self.mock_redis)
+
+        page = await service.search_pages("test", 1)
+
+        self.assertEqual(page["results"], [])
+        self.mock_repository.search.assert_awaited_once()
@@ -0,0 +1,32 @@
+import unittest
+
+from api.services.stream_limiter import StreamLimiter, StreamLimitExceededError
+
+
+class TestStreamLimiter(unittest.TestCase):
+    def test_acquire_up_to_the_cap(self) -> None:
+        limiter = StreamLimiter(max_streams=2)
+
+        first = limiter.acquire()
+        limiter.acquire()
+        with self.assertRaises(StreamLimitExceededError):
+            limiter.acquire()
+        self.assertEqual(limiter.open_streams, 2)
+
+        first.release()
+        limiter.acquire()
+        self.assertEqual(limiter.open_streams, 2)
+
+    def test_slot_is_released_once(self) -> None:
+        limiter = StreamLimiter(max_streams=2)
+        slot = limiter.acquire()
+        limiter.acquire()
+
+        slot.release()
+        slot.release()
+
+        self.assertEqual(limiter.open_streams, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
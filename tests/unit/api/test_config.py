@@ -15,6 +15,15 @@ class TestConfiguration(unittest.TestCase):
 
         self.assertEqual(config.aws_endpoint_url, "http://localstack:4566")
         self.assertEqual(config.aws_region, "us-east-1")
+        self.assertEqual(config.search_highlight_fragment_size, 150)
+        self.assertEqual(config.search_highlight_fragments, 3)
+        self.assertEqual(config.search_cache_ttl, 30)
+        self.assertEqual(config.idempotency_ttl, 86400)
+        self.assertEqual(config.rate_limit_requests, 120)
+        self.assertEqual(config.rate_limit_window, 60)
+        self.assertEqual(config.max_inflight_scrapings, 20)
+        self.assertEqual(config.inflight_scraping_ttl, 21600)
+        self.assertEqual(config.sse_max_streams, 100)
         # Validate other defaults...
 
     def test_from_env_custom(self) -> None:
@@ -31,6 +40,12 @@ class TestConfiguration(unittest.TestCase):
             "DATABASE_URL": "postgres://prod",
             "REDIS_HOST": "redis-prod",
             "REDIS_PORT": "1234",
+            "SEARCH_HIGHLIGHT_FRAGMENT_SIZE": "80",
+            "SEARCH_CACHE_TTL": "5",
+            "IDEMPOTENCY_TTL": "600",
+            "RATE_LIMIT_REQUESTS": "0",
+            "MAX_INFLIGHT_SCRAPINGS": "5",
+            "SSE_MAX_STREAMS": "10",
         }
         with patch.dict("os.environ", env_vars):
             config = Configuration.from_env()
@@ -38,3 +53,9 @@ class TestConfiguration(unittest.TestCase):
         self.assertEqual(config.aws_endpoint_url, "http://production")
         self.assertEqual(config.aws_region, "eu-west-1")
         self.assertEqual(config.redis_port, 1234)
+        self.assertEqual(config.search_highlight_fragment_size, 80)
+        self.assertEqual(config.search_cache_ttl, 5)
+        self.assertEqual(config.idempotency_ttl, 600)
+        self.assertEqual(config.rate_limit_requests, 0)
+        self.assertEqual(config.max_inflight_scrapings, 5)
+        self.assertEqual(config.sse_max_streams, 10)
@@ -1,22 +1,113 @@
+import asyncio
 import unittest
-from unittest.mock import AsyncMock, MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 from api.clients.sqs_client import SQSClient
 from api.dependencies import (
     get_db_repository,
+    get_dynamodb_client,
+    get_pubsub_client,
+    get_redis_client,
     get_scraper_service,
+    get_search_repository,
     get_sqs_client,
+    get_stream_limiter,
+    open_clients,
 )
 from api.repositories.db_repository import DbRepository
 
 
-# pylint: disable=import-outside-toplevel
+def _request(**state: object) -> MagicMock:
+    request = MagicMock()
+    request.app.state = SimpleNamespace(**state)
+    return request
+
+
 # pylint: disable=import-outside-toplevel
 class TestDependencies(unittest.IsolatedAsyncioTestCase):
-    @patch("shared.clients.sqs_client.aioboto3.Session")
-    def test_get_sqs_client(self, _mock_session: MagicMock) -> None:
-        client = get_sqs_client()
-        self.assertIsInstance(client, SQSClient)
+    def setUp(self) -> None:
+        self.mock_usage = MagicMock()
+
+    @patch("api.dependencies.APIKeyUsageRecorder")
+    @patch("api.dependencies.APIKeyCache")
+    @patch("api.dependencies.SearchRepository")
+    @patch("api.dependencies.RedisClient")
+    @patch("api.dependencies.DynamoDBClient")
+    @patch("api.dependencies.SQSClient")
+    # pylint: disable-next=too-many-arguments,too-many-positional-arguments
+    async def test_open_clients(
+        self,
+        mock_sqs_cls: MagicMock,
+        mock_dynamodb_cls: MagicMock,
+        mock_redis_cls: MagicMock,
+        mock_search_cls: MagicMock,
+        mock_cache_cls: MagicMock,
+        mock_usage_cls: MagicMock,
+    ) -> None:
+        mock_sqs = AsyncMock()
+        mock_sqs.__aenter__.return_value = mock_sqs
+        mock_sqs_cls.create.return_value = mock_sqs
+        mock_dynamodb = AsyncMock()
+        mock_dynamodb.start.return_value = mock_dynamodb
+        mock_dynamodb_cls.create.return_value = mock_dynamodb
+        mock_redis = AsyncMock()
+        mock_pubsub = AsyncMock()
+        mock_redis_cls.create.side_effect = [mock_redis, mock_pubsub]
+        mock_search = AsyncMock()
+        mock_search_cls.return_value = mock_search
+        listening = asyncio.Event()
+        mock_cache_cls.return_value.listen = AsyncMock(side_effect=listening.wait)
+        mock_usage_cls.return_value.run = AsyncMock(side_effect=listening.wait)
+        app = MagicMock()
+        app.state = SimpleNamespace()
+
+        async with open_clients(app):
+            self.assertIs(app.state.sqs_client, mock_sqs)
+            self.assertIs(app.state.dynamodb_client, mock_dynamodb)
+            self.assertIs(app.state.redis_client, mock_redis)
+            self.assertIs(app.state.pubsub_client, mock_pubsub)
+            mock_redis_cls.create.assert_called_with(ANY, max_connections=100)
+            self.assertEqual(app.state.stream_limiter.open_streams, 0)
+            self.assertIs(app.state.search_repository, mock_search)
+            self.assertIs(app.state.api_key_cache, mock_cache_cls.return_value)
+            mock_cache_cls.assert_called_once_with(mock_redis)
+            await asyncio.sleep(0)
+            mock_cache_cls.return_value.listen.assert_awaited_once()
+            self.assertIs(app.state.api_key_usage, mock_usage_cls.return_value)
+            mock_usage_cls.return_value.run.assert_awaited_once()
+            mock_dynamodb.start.assert_awaited_once()
+            mock_redis.close.assert_not_awaited()
+
+        mock_sqs.__aexit__.assert_awaited_once()
+        mock_dynamodb.close.assert_awaited_once()
+        mock_redis.close.assert_awaited_once()
+        mock_pubsub.close.assert_awaited_once()
+        mock_search.close.assert_awaited_once()
+
+    def test_clients_come_from_app_state(self) -> None:
+        sqs, dynamodb, redis, search = (
+            MagicMock(),
+            MagicMock(),
+            MagicMock(),
+            MagicMock(),
+        )
+        pubsub, limiter = MagicMock(), MagicMock()
+        request = _request(
+            sqs_client=sqs,
+            dynamodb_client=dynamodb,
+            redis_client=redis,
+            search_repository=search,
+            pubsub_client=pubsub,
+            stream_limiter=limiter,
+        )
+
+        self.assertIs(get_sqs_client(request), sqs)
+        self.assertIs(get_dynamodb_client(request), dynamodb)
+        self.assertIs(get_redis_client(request), redis)
+        self.assertIs(get_search_repository(request), search)
+        self.assertIs(get_pubsub_client(request), pubsub)
+        self.assertIs(get_stream_limiter(request), limiter)
 
     def test_get_db_repository(self) -> None:
         repo = get_db_repository()
@@ -30,26 +121,16 @@ class TestDependencies(unittest.IsolatedAsyncioTestCase):
         mock_redis = MagicMock(spec=RedisClient)
         mock_dynamo = MagicMock(spec=DynamoDBClient)
         mock_repo = MagicMock(spec=DbRepository)
+        mock_quota = MagicMock()
+        mock_pubsub = MagicMock(spec=RedisClient)
 
-        service = get_scraper_service(mock_sqs, mock_redis, mock_dynamo, mock_repo)
+        service = get_scraper_service(
+            mock_sqs, mock_redis, mock_dynamo, mock_repo, mock_quota, mock_pubsub
+        )
         self.assertEqual(service.sqs_client, mock_sqs)
+        self.assertEqual(service.pubsub_client, mock_pubsub)
         self.assertEqual(service.db_repository, mock_repo)
-
-    @patch("api.clients.redis_client.redis.Redis")
-    def test_get_redis_client(self, _mock_redis: MagicMock) -> None:
-        from api.clients.redis_client import RedisClient
-        from api.dependencies import get_redis_client
-
-        client = get_redis_client()
-        self.assertIsInstance(client, RedisClient)
-
-    @patch("api.clients.dynamodb_client.aioboto3.Session")
-    def test_get_dynamodb_client(self, _mock_session: MagicMock) -> None:
-        from api.clients.dynamodb_client import DynamoDBClient
-        from api.dependencies import get_dynamodb_client
-
-        client = get_dynamodb_client()
-        self.assertIsInstance(client, DynamoDBClient)
+        self.assertEqual(service.job_quota, mock_quota)
 
     async def test_get_api_key_missing(self) -> None:
         from fastapi import HTTPException
@@ -57,7 +138,11 @@ class TestDependencies(unittest.IsolatedAsyncioTestCase):
         from api.dependencies import get_api_key
 
         with self.assertRaises(HTTPException) as cm:
-            await get_api_key(api_key_header=None, redis_client=MagicMock())
+            await get_api_key(
+                api_key_header=None,
+                api_key_cache=MagicMock(),
+                api_key_usage=self.mock_usage,
+            )
         self.assertEqual(cm.exception.status_code, 401)
 
     @patch("api.models.APIKey.filter")
@@ -67,8 +152,8 @@ class TestDependencies(unittest.IsolatedAsyncioTestCase):
         from api.dependencies import get_api_key
         from api.models import APIKey
 
-        mock_redis = AsyncMock()
-        mock_redis.get.return_value = None
+        mock_cache = AsyncMock()
+        mock_cache.get.return_value = None
 
         key = "test-key"
         hashed = hashlib.sha256(key.encode()).hexdigest()
@@ -79,22 +164,30 @@ class TestDependencies(unittest.IsolatedAsyncioTestCase):
 
         mock_filter.return_value.first = AsyncMock(return_value=mock_api_key)
 
-        result = await get_api_key(api_key_header=key, redis_client=mock_redis)
+        result = await get_api_key(
+            api_key_header=key, api_key_cache=mock_cache, api_key_usage=self.mock_usage
+        )
 
         self.assertEqual(result, mock_api_key)
-        mock_redis.set.assert_called_once()
+        mock_cache.set.assert_called_once()
         mock_filter.assert_called_once_with(hashed_key=hashed, is_active=True)
+        self.mock_usage.record.assert_called_once_with(hashed)
 
     async def test_get_api_key_valid_cache(self) -> None:
         from api.dependencies import get_api_key
 
-        mock_redis = AsyncMock()
-        mock_redis.get.return_value = "Cached Name:1"
+        mock_cache = AsyncMock()
+        mock_cache.get.return_value = "Cached Name:1"
 
-        result = await get_api_key(api_key_header="some-key", redis_client=mock_redis)
+        result = await get_api_key(
+            api_key_header="some-key",
+            api_key_cache=mock_cache,
+            api_key_usage=self.mock_usage,
+        )
         self.assertEqual(result.name, "Cached Name")
         self.assertEqual(result.user_id, 1)
         self.assertTrue(result.is_active)
+        self.mock_usage.record.assert_called_once_with(result.hashed_key)
 
     @patch("api.models.APIKey.filter")
     async def test_get_api_key_invalid(self, mock_filter: MagicMock) -> None:
@@ -102,14 +195,38 @@ class TestDependencies(unittest.IsolatedAsyncioTestCase):
 
         from api.dependencies import get_api_key
 
-        mock_redis = AsyncMock()
-        mock_redis.get.return_value = None
+        mock_cache = AsyncMock()
+        mock_cache.get.return_value = None
         mock_filter.return_value.first = AsyncMock(return_value=None)
 
         with self.assertRaises(HTTPException) as cm:
-            await get_api_key(api_key_header="invalid", redis_client=mock_redis)
+            await get_api_key(
+                api_key_header="invalid",
+                api_key_cache=mock_cache,
+                api_key_usage=self.mock_usage,
+            )
         self.assertEqual(cm.exception.status_code, 401)
         self.assertEqual(cm.exception.detail, "Invalid API Key")
+        mock_cache.set_invalid.assert_awaited_once()
+
+    @patch("api.models.APIKey.filter")
+    async def test_get_api_key_cached_invalid(self, mock_filter: MagicMock) -> None:
+        from fastapi import HTTPException
+
+        from api.dependencies import get_api_key
+        from api.services.api_key_cache import INVALID_API_KEY
+
+        mock_cache = AsyncMock()
+        mock_cache.get.return_value = INVALID_API_KEY
+
+        with self.assertRaises(HTTPException) as cm:
+            await get_api_key(
+                api_key_header="invalid",
+                api_key_cache=mock_cache,
+                api_key_usage=self.mock_usage,
+            )
+        self.assertEqual(cm.exception.status_code, 401)
+        mock_filter.assert_not_called()
 
     @patch("api.models.APIKey.filter")
     async def test_get_api_key_expired(self, mock_filter: MagicMock) -> None:
@@ -120,8 +237,8 @@ class TestDependencies(unittest.IsolatedAsyncioTestCase):
         from api.dependencies import get_api_key
         from api.models import APIKey
 
-        mock_redis = AsyncMock()
-        mock_redis.get.return_value = None
+        mock_cache = AsyncMock()
+        mock_cache.get.return_value = None
 
         mock_api_key = MagicMock(spec=APIKey)
         mock_api_key.expires_at = datetime.now(timezone.utc) - timedelta(days=1)
@@ -130,9 +247,14 @@ class TestDependencies(unittest.IsolatedAsyncioTestCase):
         mock_filter.return_value.first = AsyncMock(return_value=mock_api_key)
 
         with self.assertRaises(HTTPException) as cm:
-            await get_api_key(api_key_header="expired", redis_client=mock_redis)
+            await get_api_key(
+                api_key_header="expired",
+                api_key_cache=mock_cache,
+                api_key_usage=self.mock_usage,
+            )
         self.assertEqual(cm.exception.status_code, 401)
         self.assertEqual(cm.exception.detail, "API Key expired")
+        self.mock_usage.record.assert_not_called()
 
     @patch("api.models.APIKey.filter")
     async def test_get_api_key_inactive(self, mock_filter: MagicMock) -> None:
@@ -140,13 +262,17 @@ class TestDependencies(unittest.IsolatedAsyncioTestCase):
 
         from api.dependencies import get_api_key
 
-        mock_redis = AsyncMock()
-        mock_redis.get.return_value = None
+        mock_cache = AsyncMock()
+        mock_cache.get.return_value = None
         # Inactive key will not be found because we filter by is_active=True
         mock_filter.return_value.first = AsyncMock(return_value=None)
 
         with self.assertRaises(HTTPException) as cm:
-            await get_api_key(api_key_header="inactive", redis_client=mock_redis)
+            await get_api_key(
+                api_key_header="inactive",
+                api_key_cache=mock_cache,
+                api_key_usage=self.mock_usage,
+            )
         self.assertEqual(cm.exception.status_code, 401)
         self.assertEqual(cm.exception.detail, "Invalid API Key")
 
@@ -157,8 +283,8 @@ class TestDependencies(unittest.IsolatedAsyncioTestCase):
         from api.dependencies import get_api_key
         from api.models import APIKey
 
-        mock_redis = AsyncMock()
-        mock_redis.get.return_value = None
+        mock_cache = AsyncMock()
+        mock_cache.get.return_value = None
 
         mock_api_key = MagicMock(spec=APIKey)
         mock_api_key.name = "Future Key"
@@ -167,6 +293,33 @@ class TestDependencies(unittest.IsolatedAsyncioTestCase):
 
         mock_filter.return_value.first = AsyncMock(return_value=mock_api_key)
 
-        result = await get_api_key(api_key_header="future", redis_client=mock_redis)
+        result = await get_api_key(
+            api_key_header="future",
+            api_key_cache=mock_cache,
+            api_key_usage=self.mock_usage,
+        )
         self.assertEqual(result, mock_api_key)
         self.assertEqual(result.user_id, 1)
+        # Not cached past the expiry of the key
+        ttl = mock_cache.set.call_args[1]["ttl"]
+        self.assertLessEqual(ttl, 86400)
+
+    async def test_get_rate_limited_api_key(self) -> None:
+        from fastapi import HTTPException
+
+        from api.dependencies import get_rate_limited_api_key
+        from api.services.rate_limiter import RateLimitExceededError
+
+        api_key = MagicMock()
+        api_key.hashed_key = "h1"
+        rate_limiter = AsyncMock()
+
+        result = await get_rate_limited_api_key(api_key, rate_limiter)
+        self.assertIs(result, api_key)
+        rate_limiter.check.assert_awaited_once_with("h1")
+
+        rate_limiter.check.side_effect = RateLimitExceededError("Too many", 7)
+        with self.assertRaises(HTTPException) as cm:
+            await get_rate_limited_api_key(api_key, rate_limiter)
+        self.assertEqual(cm.exception.status_code, 429)
+        self.assertEqual(cm.exception.headers, {"Retry-After": "7"})
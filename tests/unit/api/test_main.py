@@ -1,4 +1,7 @@
+import json
 import unittest
+from collections.abc import AsyncIterator
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock
 
 from fastapi.testclient import TestClient
@@ -6,14 +9,33 @@ from fastapi.testclient import TestClient
 from api.dependencies import (
     get_api_key,
     get_db_service,
+    get_idempotency_store,
+    get_rate_limiter,
     get_scraper_service,
+    get_scraping_cache,
     get_search_service,
+    get_stream_limiter,
 )
 from api.main import app
+from api.pagination import (
+    decode_cursor,
+    decode_search_cursor,
+    encode_cursor,
+    encode_search_cursor,
+)
+from api.services.idempotency import (
+    IdempotencyKeyInProgressError,
+    IdempotencyKeyReusedError,
+)
+from api.services.job_quota import BatchTooLargeError, QuotaExceededError
+from api.services.rate_limiter import RateLimitExceededError
 from api.services.scraper_service import NotAuthorizedError, ScrapingNotFoundError
+from api.services.stream_limiter import StreamLimiter
 
 
-class TestMain(unittest.TestCase):
+class TestMain(  # pylint: disable=too-many-public-methods,too-many-instance-attributes
+    unittest.TestCase
+):
     def setUp(self) -> None:
         self.client = TestClient(app)
         self.mock_scraper_service = AsyncMock()
@@ -22,6 +44,12 @@ class TestMain(unittest.TestCase):
         self.mock_api_key = MagicMock()
         self.mock_api_key.user_id = 1
         self.mock_db_repository = AsyncMock()
+        self.mock_scraping_cache = AsyncMock()
+        self.mock_scraping_cache.get.return_value = ("0", None)
+        self.mock_idempotency = AsyncMock()
+        self.mock_idempotency.claim.return_value = None
+        self.mock_rate_limiter = AsyncMock()
+        self.stream_limiter = StreamLimiter(max_streams=1)
 
         # Override dependencies
         app.dependency_overrides[get_scraper_service] = (
@@ -30,6 +58,10 @@ class TestMain(unittest.TestCase):
         app.dependency_overrides[get_db_service] = lambda: self.mock_db_service
         app.dependency_overrides[get_search_service] = lambda: self.mock_search_service
         app.dependency_overrides[get_api_key] = lambda: self.mock_api_key
+        app.dependency_overrides[get_scraping_cache] = lambda: self.mock_scraping_cache
+        app.dependency_overrides[get_idempotency_store] = lambda: self.mock_idempotency
+        app.dependency_overrides[get_rate_limiter] = lambda: self.mock_rate_limiter
+        app.dependency_overrides[get_stream_limiter] = lambda: self.stream_limiter
         from api.dependencies import (  # pylint: disable=import-outside-toplevel
             get_db_repository,
         )
@@ -53,9 +85,28 @@ class TestMain(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json(), {"scraping_id": 123})
         self.mock_scraper_service.start_scraping.assert_called_once_with(
-            "http://example.com", 2, 1
+            "http://example.com", 2, 1, None
         )
 
+    def test_scrape_max_age(self) -> None:
+        self.mock_scraper_service.start_scraping.return_value = 124
+        response = self.client.post(
+            "/scrape", json={"url": "http://example.com", "max_age": 3600}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.mock_scraper_service.start_scraping.assert_called_once_with(
+            "http://example.com", 1, 1, 3600
+        )
+
+    def test_scrape_negative_max_age(self) -> None:
+        response = self.client.post(
+            "/scrape", json={"url": "http://example.com", "max_age": -1}
+        )
+
+        self.assertEqual(response.status_code, 422)
+        self.mock_scraper_service.start_scraping.assert_not_called()
+
     def test_scrape_error(self) -> None:
         self.mock_scraper_service.start_scraping.side_effect = Exception("SQS Error")
         response = self.client.post(
@@ -64,22 +115,188 @@ class TestMain(unittest.TestCase):
 
         self.assertEqual(response.status_code, 500)
         self.assertIn("SQS Error", response.json()["detail"])
+        self.mock_idempotency.claim.assert_not_called()
+
+    def test_scrape_idempotency_key_first_request(self) -> None:
+        self.mock_scraper_service.start_scraping.return_value = 123
+
+        response = self.client.post(
+            "/scrape",
+            json={"url": "http://example.com", "depth": 2},
+            headers={"Idempotency-Key": "k1"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"scraping_id": 123})
+        self.assertNotIn("Idempotent-Replayed", response.headers)
+        request = self.mock_idempotency.claim.call_args[0][2]
+        self.mock_idempotency.claim.assert_awaited_once_with(1, "k1", request)
+        self.mock_idempotency.complete.assert_awaited_once_with(1, "k1", request, 123)
+
+    def test_scrape_idempotency_key_replayed(self) -> None:
+        self.mock_idempotency.claim.return_value = 123
+
+        response = self.client.post(
+            "/scrape",
+            json={"url": "http://example.com", "depth": 2},
+            headers={"Idempotency-Key": "k1"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"scraping_id": 123})
+        self.assertEqual(response.headers["Idempotent-Replayed"], "true")
+        self.mock_scraper_service.start_scraping.assert_not_called()
+        self.mock_idempotency.complete.assert_not_called()
+
+    def test_scrape_idempotency_key_error_releases_key(self) -> None:
+        self.mock_scraper_service.start_scraping.side_effect = Exception("SQS Error")
+
+        response = self.client.post(
+            "/scrape",
+            json={"url": "http://example.com"},
+            headers={"Idempotency-Key": "k1"},
+        )
+
+        self.assertEqual(response.status_code, 500)
+        self.mock_idempotency.release.assert_awaited_once_with(1, "k1")
+        self.mock_idempotency.complete.assert_not_called()
+
+    def test_scrape_idempotency_key_conflicts(self) -> None:
+        for error, status_code in (
+            (IdempotencyKeyReusedError("reused"), 422),
+            (IdempotencyKeyInProgressError("in progress"), 409),
+        ):
+            with self.subTest(status_code=status_code):
+                self.mock_idempotency.claim.side_effect = error
+
+                response = self.client.post(
+                    "/scrape",
+                    json={"url": "http://example.com"},
+                    headers={"Idempotency-Key": "k1"},
+                )
+
+                self.assertEqual(response.status_code, status_code)
+                self.mock_scraper_service.start_scraping.assert_not_called()
+
+    def test_scrape_quota_exceeded(self) -> None:
+        self.mock_scraper_service.start_scraping.side_effect = QuotaExceededError(
+            "At most 20 scrapings may be in progress", 30
+        )
+
+        response = self.client.post(
+            "/scrape",
+            json={"url": "http://example.com"},
+            headers={"Idempotency-Key": "k1"},
+        )
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers["Retry-After"], "30")
+        self.mock_idempotency.release.assert_awaited_once_with(1, "k1")
+
+    def test_scrape_batch_quota_exceeded(self) -> None:
+        self.mock_scraper_service.start_scrapings.side_effect = QuotaExceededError(
+            "At most 20 scrapings may be in progress", 30
+        )
+
+        response = self.client.post(
+            "/scrape/batch", json={"scrapes": [{"url": "http://a.com"}]}
+        )
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers["Retry-After"], "30")
+
+    def test_scrape_batch_larger_than_quota(self) -> None:
+        self.mock_scraper_service.start_scrapings.side_effect = BatchTooLargeError(
+            "At most 20 scrapings may be in progress, 21 were requested at once"
+        )
+
+        response = self.client.post(
+            "/scrape/batch", json={"scrapes": [{"url": "http://a.com"}]}
+        )
+
+        self.assertEqual(response.status_code, 422)
+        self.assertIn("At most 20", response.json()["detail"])
+        self.assertNotIn("Retry-After", response.headers)
+
+    def test_rate_limit_exceeded(self) -> None:
+        self.mock_rate_limiter.check.side_effect = RateLimitExceededError(
+            "Rate limit exceeded", 12
+        )
+
+        response = self.client.get("/scrapings")
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers["Retry-After"], "12")
+        self.mock_rate_limiter.check.assert_awaited_once_with(
+            self.mock_api_key.hashed_key
+        )
+        self.mock_scraper_service.get_full_scrapings.assert_not_called()
+
+    def test_scrape_batch(self) -> None:
+        self.mock_scraper_service.start_scrapings.return_value = ([7, 8], [8])
+
+        response = self.client.post(
+            "/scrape/batch",
+            json={"scrapes": [{"url": "http://a.com", "depth": 2}, {"url": "b"}]},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"scraping_ids": [7, 8], "failed_ids": [8]})
+        self.mock_scraper_service.start_scrapings.assert_awaited_once_with(
+            [("http://a.com", 2), ("b", 1)], 1
+        )
+
+    def test_scrape_batch_empty(self) -> None:
+        response = self.client.post("/scrape/batch", json={"scrapes": []})
+
+        self.assertEqual(response.status_code, 422)
+        self.mock_scraper_service.start_scrapings.assert_not_called()
 
     def test_search_success(self) -> None:
-        self.mock_search_service.search_pages.return_value = [
-            {
-                "url": "http://site1.com",
-                "scraping_id": 1,
-                "created_at": "2024-01-01",
-                "highlights": ["<em>test</em>"],
-            }
-        ]
+        self.mock_search_service.search_pages.return_value = {
+            "results": [
+                {
+                    "url": "http://site1.com",
+                    "scraping_id": 1,
+                    "created_at": "2024-01-01",
+                    "highlights": ["<em>test</em>"],
+                }
+            ],
+            "next_search_after": None,
+        }
         response = self.client.get("/search?t=test")
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.json()["results"]), 1)
         self.assertEqual(response.json()["results"][0]["url"], "http://site1.com")
-        self.mock_search_service.search_pages.assert_called_once_with("test", 1)
+        self.assertIsNone(response.json()["next_cursor"])
+        self.mock_search_service.search_pages.assert_called_once_with(
+            "test", 1, size=10, search_after=None
+        )
+
+    def test_search_cursor(self) -> None:
+        self.mock_search_service.search_pages.return_value = {
+            "results": [],
+            "next_search_after": [0.5, 3, "http://b.com"],
+        }
+        cursor = encode_search_cursor([1.5, 2, "http://a.com"])
+
+        response = self.client.get(f"/search?t=test&size=5&cursor={cursor}")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            decode_search_cursor(response.json()["next_cursor"]),
+            [0.5, 3, "http://b.com"],
+        )
+        self.mock_search_service.search_pages.assert_called_once_with(
+            "test", 1, size=5, search_after=[1.5, 2, "http://a.com"]
+        )
+
+    def test_search_invalid_cursor(self) -> None:
+        response = self.client.get("/search?t=test&cursor=garbage")
+
+        self.assertEqual(response.status_code, 400)
+        self.mock_search_service.search_pages.assert_not_called()
 
     def test_search_missing_param(self) -> None:
         response = self.client.get("/search?t=")
@@ -126,6 +343,7 @@ class TestMain(unittest.TestCase):
             "summary": "Mock summary",  # Added summary
             "scraped_at": None,
         }
+        self.mock_scraper_service.get_results_scraping_id.return_value = 123
         self.mock_scraper_service.get_scraping_results.return_value = [
             {"url": "http://foo.com", "images": [], "summary": None}
         ]
@@ -139,6 +357,91 @@ class TestMain(unittest.TestCase):
             [{"url": "http://foo.com", "images": [], "summary": None}],
         )
 
+        # Completed scrapings are cached along with their result version
+        self.mock_scraping_cache.set.assert_awaited_once()
+        scraping_id, version, cached, source_id = (
+            self.mock_scraping_cache.set.call_args[0]
+        )
+        self.assertEqual((scraping_id, version, source_id), (123, "0", 123))
+        self.assertEqual(cached["etag"], response.headers["etag"])
+        self.assertEqual(json.loads(cached["body"]), response.json())
+        self.mock_scraping_cache.version.assert_not_awaited()
+
+    def test_get_scrape_status_alias_cached_with_source_version(self) -> None:
+        self.mock_scraper_service.get_full_scraping.return_value = {
+            "id": 123,
+            "status": "COMPLETED",
+        }
+        self.mock_scraper_service.get_results_scraping_id.return_value = 45
+        self.mock_scraper_service.get_scraping_results.return_value = []
+        self.mock_scraping_cache.version.return_value = "7"
+
+        response = self.client.get("/scraping/123")
+
+        self.assertEqual(response.status_code, 200)
+        self.mock_scraping_cache.version.assert_awaited_once_with(45)
+        scraping_id, version, _, source_id = self.mock_scraping_cache.set.call_args[0]
+        self.assertEqual((scraping_id, version, source_id), (123, "7", 45))
+
+    def test_get_scrape_status_pending_is_not_cached(self) -> None:
+        self.mock_scraper_service.get_full_scraping.return_value = {
+            "id": 123,
+            "status": "PENDING",
+        }
+
+        response = self.client.get("/scraping/123")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["etag"].startswith('"'))
+        self.mock_scraping_cache.set.assert_not_awaited()
+
+    def test_get_scrape_status_cache_unavailable(self) -> None:
+        self.mock_scraping_cache.get.return_value = (None, None)
+        self.mock_scraper_service.get_full_scraping.return_value = {
+            "id": 123,
+            "status": "COMPLETED",
+        }
+        self.mock_scraper_service.get_scraping_results.return_value = []
+
+        response = self.client.get("/scraping/123")
+
+        self.assertEqual(response.status_code, 200)
+        self.mock_scraping_cache.set.assert_not_awaited()
+
+    def test_get_scrape_status_cached(self) -> None:
+        body = json.dumps({"scraping": {"id": 123, "status": "COMPLETED"}})
+        self.mock_scraping_cache.get.return_value = (
+            "4",
+            {"etag": '"abc"', "body": body},
+        )
+
+        response = self.client.get("/scraping/123")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["scraping"]["id"], 123)
+        self.assertEqual(response.headers["etag"], '"abc"')
+        self.mock_scraper_service.get_full_scraping.assert_not_called()
+        self.mock_scraping_cache.set.assert_not_awaited()
+
+    def test_get_scrape_status_not_modified(self) -> None:
+        self.mock_scraping_cache.get.return_value = (
+            "4",
+            {"etag": '"abc"', "body": "{}"},
+        )
+
+        for if_none_match in ('"abc"', 'W/"abc"', '"xyz", "abc"', "*"):
+            with self.subTest(if_none_match=if_none_match):
+                response = self.client.get(
+                    "/scraping/123", headers={"If-None-Match": if_none_match}
+                )
+
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.content, b"")
+                self.assertEqual(response.headers["etag"], '"abc"')
+
+        response = self.client.get("/scraping/123", headers={"If-None-Match": '"x"'})
+        self.assertEqual(response.status_code, 200)
+
     def test_get_scrape_status_not_found(self) -> None:
         self.mock_scraper_service.get_full_scraping.return_value = None
         response = self.client.get("/scraping/999")
@@ -171,16 +474,86 @@ class TestMain(unittest.TestCase):
                 }
             ],
             1,
+            None,
         )
-        response = self.client.get("/scrapings?page=1&size=10")
+        response = self.client.get("/scrapings?page=1&size=10&include_total=true")
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.json()["scrapings"]), 1)
         self.assertEqual(response.json()["meta"]["total"], 1)
+        self.assertIsNone(response.json()["meta"]["next_cursor"])
+        self.mock_scraper_service.get_full_scrapings.assert_called_once_with(
+            user_id=1, offset=0, limit=10, include_total=True, before_id=None
+        )
+
+    def test_scrapings_cursor(self) -> None:
+        self.mock_scraper_service.get_full_scrapings.return_value = ([], None, 41)
+
+        response = self.client.get(
+            f"/scrapings?page=3&size=5&cursor={encode_cursor(50)}"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        meta = response.json()["meta"]
+        self.assertIsNone(meta["total"])
+        self.assertEqual(decode_cursor(meta["next_cursor"]), 41)
+        # The cursor takes precedence over the page number
         self.mock_scraper_service.get_full_scrapings.assert_called_once_with(
-            user_id=1, offset=0, limit=10
+            user_id=1, offset=0, limit=5, include_total=False, before_id=50
+        )
+
+    def test_scrapings_invalid_cursor(self) -> None:
+        response = self.client.get("/scrapings?cursor=garbage")
+
+        self.assertEqual(response.status_code, 400)
+        self.mock_scraper_service.get_full_scrapings.assert_not_called()
+
+    def test_scrapings_size_is_bounded(self) -> None:
+        response = self.client.get("/scrapings?size=1000")
+
+        self.assertEqual(response.status_code, 422)
+        self.mock_scraper_service.get_full_scrapings.assert_not_called()
+
+    def test_scraping_pages(self) -> None:
+        page: dict[str, Any] = {"url": "http://foo.com", "images": [], "summary": None}
+        self.mock_scraper_service.get_scraping_results_page.return_value = (
+            [page],
+            12,
+        )
+
+        response = self.client.get(
+            f"/scraping/123/pages?size=1&cursor={encode_cursor(11)}"
         )
 
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["pages"], [page])
+        self.assertEqual(decode_cursor(response.json()["next_cursor"]), 12)
+        self.mock_scraper_service.check_ownership.assert_awaited_once_with(123, 1)
+        self.mock_scraper_service.get_scraping_results_page.assert_awaited_once_with(
+            123, after_id=11, limit=1
+        )
+
+    def test_scraping_pages_last_page(self) -> None:
+        self.mock_scraper_service.get_scraping_results_page.return_value = ([], None)
+
+        response = self.client.get("/scraping/123/pages")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"pages": [], "next_cursor": None})
+        self.mock_scraper_service.get_scraping_results_page.assert_awaited_once_with(
+            123, after_id=None, limit=50
+        )
+
+    def test_scraping_pages_not_authorized(self) -> None:
+        self.mock_scraper_service.check_ownership.side_effect = NotAuthorizedError(
+            "nope"
+        )
+
+        response = self.client.get("/scraping/123/pages")
+
+        self.assertEqual(response.status_code, 403)
+        self.mock_scraper_service.get_scraping_results_page.assert_not_called()
+
     def test_delete_scraping_success(self) -> None:
         self.mock_scraper_service.delete_scraping.return_value = True
 
@@ -189,6 +562,7 @@ class TestMain(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json(), {"message": "Scraping deletion enqueued"})
         self.mock_scraper_service.delete_scraping.assert_called_once_with(123, 1)
+        self.mock_scraping_cache.mark_deleting.assert_awaited_once_with(123)
 
     def test_delete_scraping_not_found(self) -> None:
         self.mock_scraper_service.delete_scraping.side_effect = ScrapingNotFoundError(
@@ -205,3 +579,87 @@ class TestMain(unittest.TestCase):
         response = self.client.delete("/scraping/123")
         self.assertEqual(response.status_code, 403)
         self.assertEqual(response.json()["detail"], "not authorized")
+
+    def test_scraping_results_stream(self) -> None:
+        pages: list[dict[str, Any]] = [
+            {"url": "http://foo.com", "images": [], "summary": "s"},
+            {"url": "http://foo.com/a", "images": [], "summary": None},
+        ]
+
+        async def stream(_scraping_id: int) -> AsyncIterator[dict]:
+            for page in pages:
+                yield page
+
+        self.mock_scraper_service.stream_scraping_results = MagicMock(
+            side_effect=stream
+        )
+
+        response = self.client.get("/scraping/123/results")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-type"], "application/x-ndjson")
+        lines = response.text.splitlines()
+        self.assertEqual([json.loads(line) for line in lines], pages)
+        self.mock_scraper_service.check_ownership.assert_called_once_with(123, 1)
+
+    def test_scraping_events(self) -> None:
+        async def progress(_scraping_id: int) -> AsyncIterator[dict[str, Any]]:
+            yield {"event": "status", "data": {"status": "PENDING", "pending": 2}}
+            yield {"event": "completed", "data": {"status": "COMPLETED"}}
+
+        self.mock_scraper_service.stream_progress = MagicMock(side_effect=progress)
+
+        response = self.client.get("/scraping/123/events")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(
+            response.headers["content-type"].startswith("text/event-stream")
+        )
+        self.assertEqual(
+            response.text,
+            'event: status\ndata: {"status": "PENDING", "pending": 2}\n\n'
+            'event: completed\ndata: {"status": "COMPLETED"}\n\n',
+        )
+        self.mock_scraper_service.check_ownership.assert_awaited_once_with(123, 1)
+        # The stream freed its slot when it ended
+        self.assertEqual(self.stream_limiter.open_streams, 0)
+
+    def test_scraping_events_too_many_streams(self) -> None:
+        async def progress(_scraping_id: int) -> AsyncIterator[dict[str, Any]]:
+            yield {"event": "completed", "data": {"status": "COMPLETED"}}
+
+        self.mock_scraper_service.stream_progress = MagicMock(side_effect=progress)
+        slot = self.stream_limiter.acquire()
+
+        response = self.client.get("/scraping/123/events")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["retry-after"], "5")
+        self.mock_scraper_service.stream_progress.assert_not_called()
+
+        slot.release()
+        self.assertEqual(self.client.get("/scraping/123/events").status_code, 200)
+
+    def test_scraping_events_not_found(self) -> None:
+        self.mock_scraper_service.check_ownership.side_effect = ScrapingNotFoundError(
+            "not found"
+        )
+
+        response = self.client.get("/scraping/123/events")
+
+        self.assertEqual(response.status_code, 404)
+        self.mock_scraper_service.stream_progress.assert_not_called()
+
+    def test_scraping_results_not_found(self) -> None:
+        self.mock_scraper_service.check_ownership.side_effect = ScrapingNotFoundError(
+            "not found"
+        )
+        response = self.client.get("/scraping/999/results")
+        self.assertEqual(response.status_code, 404)
+
+    def test_scraping_results_unauthorized(self) -> None:
+        self.mock_scraper_service.check_ownership.side_effect = NotAuthorizedError(
+            "not authorized"
+        )
+        response = self.client.get("/scraping/123/results")
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,54 @@
+import base64
+import unittest
+
+from api.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    decode_search_cursor,
+    encode_cursor,
+    encode_search_cursor,
+)
+
+
+class TestPagination(unittest.TestCase):
+    def test_round_trip(self) -> None:
+        for last_id in (1, 42, 2**40):
+            cursor = encode_cursor(last_id)
+            self.assertNotIn("=", cursor)
+            self.assertEqual(decode_cursor(cursor), last_id)
+
+    def test_decode_invalid(self) -> None:
+        for cursor in (
+            "",
+            "not a cursor",
+            "!!!",
+            base64.urlsafe_b64encode(b'{"id": "1"}').decode(),
+            base64.urlsafe_b64encode(b'{"id": 0}').decode(),
+            base64.urlsafe_b64encode(b'{"id": true}').decode(),
+            base64.urlsafe_b64encode(b"[1]").decode(),
+        ):
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(InvalidCursorError):
+                    decode_cursor(cursor)
+
+    def test_search_round_trip(self) -> None:
+        sort_values = [1.25, 42, "http://a.com", None]
+        self.assertEqual(
+            decode_search_cursor(encode_search_cursor(sort_values)), sort_values
+        )
+
+    def test_decode_search_invalid(self) -> None:
+        for cursor in (
+            "garbage",
+            encode_cursor(1),
+            base64.urlsafe_b64encode(b'{"after": []}').decode(),
+            base64.urlsafe_b64encode(b'{"after": [{"a": 1}]}').decode(),
+            base64.urlsafe_b64encode(b'{"after": 1}').decode(),
+        ):
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(InvalidCursorError):
+                    decode_search_cursor(cursor)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+
+from api.urls import normalize_url
+
+
+class TestNormalizeUrl(unittest.TestCase):
+    def test_normalize_url(self) -> None:
+        cases = {
+            "HTTP://Example.COM": "http://example.com/",
+            "https://example.com:443/a?b=1#top": "https://example.com/a?b=1",
+            "http://example.com:8080/A/": "http://example.com:8080/A/",
+            "  https://user:pw@Example.com/  ": "https://user:pw@example.com/",
+            "http://[::1]:80/x": "http://[::1]/x",
+        }
+        for url, expected in cases.items():
+            with self.subTest(url=url):
+                self.assertEqual(normalize_url(url), expected)
+
+    def test_normalize_url_is_idempotent(self) -> None:
+        url = normalize_url("HTTPS://Example.com:443")
+        self.assertEqual(normalize_url(url), url)
+
+    def test_invalid_urls_are_kept(self) -> None:
+        for url in ("example.com", "http://example.com:bad/", ""):
+            with self.subTest(url=url):
+                self.assertEqual(normalize_url(url), url.strip())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import gzip
+import json
+import unittest
+from unittest.mock import ANY, AsyncMock, MagicMock
+
+from shared.clients.claim_check import ClaimCheck, ClaimCheckError
+from shared.clients.s3_client import S3Client
+
+
+class TestClaimCheck(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.mock_s3 = MagicMock(spec=S3Client)
+        self.mock_s3.upload_bytes = AsyncMock()
+        self.mock_s3.download_bytes = AsyncMock()
+        self.mock_s3.delete_object = AsyncMock()
+        self.claim_check = ClaimCheck(self.mock_s3, "claims", threshold_bytes=16)
+
+    async def test_offload_keeps_small_bodies_inline(self) -> None:
+        body = json.dumps({"a": 1})
+
+        self.assertEqual(await self.claim_check.offload(body), body)
+        self.mock_s3.upload_bytes.assert_not_called()
+
+    async def test_offload_without_bucket(self) -> None:
+        body = json.dumps({"content": "x" * 100})
+
+        self.assertEqual(await ClaimCheck(self.mock_s3).offload(body), body)
+        self.mock_s3.upload_bytes.assert_not_called()
+
+    async def test_offload_large_body(self) -> None:
+        body = json.dumps({"content": "x" * 100})
+
+        pointer_body = await self.claim_check.offload(body)
+
+        pointer = ClaimCheck.pointer(pointer_body)
+        assert pointer is not None
+        self.assertEqual(pointer["bucket"], "claims")
+        self.assertTrue(pointer["key"].startswith("claim-checks/"))
+        self.mock_s3.upload_bytes.assert_awaited_once_with(
+            ANY, "claims", pointer["key"], content_type="application/gzip"
+        )
+        uploaded = self.mock_s3.upload_bytes.call_args[0][0]
+        self.assertEqual(gzip.decompress(uploaded).decode("utf-8"), body)
+
+    async def test_resolve_inline_body(self) -> None:
+        body = json.dumps({"content": "x"})
+
+        self.assertEqual(await self.claim_check.resolve(body), body)
+        self.mock_s3.download_bytes.assert_not_called()
+
+    async def test_resolve_offloaded_body(self) -> None:
+        body = json.dumps({"content": "x" * 100})
+        pointer_body = await self.claim_check.offload(body)
+        self.mock_s3.download_bytes.return_value = gzip.compress(body.encode("utf-8"))
+
+        self.assertEqual(await self.claim_check.resolve(pointer_body), body)
+
+    async def test_resolve_missing_object(self) -> None:
+        pointer_body = await self.claim_check.offload("x" * 100)
+        self.mock_s3.download_bytes.return_value = None
+
+        with self.assertRaises(ClaimCheckError):
+            await self.claim_check.resolve(pointer_body)
+
+    async def test_release(self) -> None:
+        pointer_body = await self.claim_check.offload("x" * 100)
+        pointer = ClaimCheck.pointer(pointer_body)
+        assert pointer is not None
+
+        await self.claim_check.release(pointer_body)
+        await self.claim_check.release("inline")
+
+        self.mock_s3.delete_object.assert_awaited_once_with("claims", pointer["key"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,17 @@
+import asyncio
 import unittest
+from collections.abc import AsyncIterator
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from shared.clients.s3_client import S3Client
+from botocore.exceptions import ClientError, EndpointConnectionError  # type: ignore
+
+from shared.clients.s3_client import MIN_PART_SIZE, S3Client
+
+
+async def _stream(*chunks: bytes) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
 
 
 class TestS3Client(unittest.IsolatedAsyncioTestCase):
@@ -63,3 +73,214 @@ class TestS3Client(unittest.IsolatedAsyncioTestCase):
 
         with self.assertRaisesRegex(Exception, "S3 Error"):
             await client.upload_bytes(b"data", self.bucket, "key")
+
+    def _mock_session(self, mock_session_cls: MagicMock) -> AsyncMock:
+        mock_s3_client = AsyncMock()
+        mock_client_cm = MagicMock()
+        mock_client_cm.__aenter__.return_value = mock_s3_client
+        mock_client_cm.__aexit__.return_value = None
+        mock_session = MagicMock()
+        mock_session.client.return_value = mock_client_cm
+        mock_session_cls.return_value = mock_session
+        return mock_s3_client
+
+    def _client(self) -> S3Client:
+        return S3Client(
+            self.endpoint_url, self.region, self.access_key, self.secret_key
+        )
+
+    @patch("shared.clients.s3_client.aioboto3.Session")
+    async def test_download_stream_range(self, mock_session_cls: MagicMock) -> None:
+        mock_s3_client = self._mock_session(mock_session_cls)
+        mock_body = AsyncMock()
+        mock_body.__aenter__.return_value = mock_body
+        mock_body.read.side_effect = [b"abc", b"de", b""]
+        mock_s3_client.get_object.return_value = {"Body": mock_body}
+
+        chunks = [
+            chunk
+            async for chunk in self._client().download_stream(
+                self.bucket, "key", chunk_size=3, start=10, end=14
+            )
+        ]
+
+        self.assertEqual(chunks, [b"abc", b"de"])
+        mock_s3_client.get_object.assert_awaited_once_with(
+            Bucket=self.bucket, Key="key", Range="bytes=10-14"
+        )
+        mock_body.read.assert_awaited_with(3)
+
+    @patch("shared.clients.s3_client.aioboto3.Session")
+    async def test_download_stream_whole_object(
+        self, mock_session_cls: MagicMock
+    ) -> None:
+        mock_s3_client = self._mock_session(mock_session_cls)
+        mock_body = AsyncMock()
+        mock_body.__aenter__.return_value = mock_body
+        mock_body.read.side_effect = [b"data", b""]
+        mock_s3_client.get_object.return_value = {"Body": mock_body}
+
+        chunks = [c async for c in self._client().download_stream(self.bucket, "key")]
+
+        self.assertEqual(chunks, [b"data"])
+        mock_s3_client.get_object.assert_awaited_once_with(
+            Bucket=self.bucket, Key="key"
+        )
+
+    @patch("shared.clients.s3_client.aioboto3.Session")
+    async def test_upload_stream_small_object(
+        self, mock_session_cls: MagicMock
+    ) -> None:
+        mock_s3_client = self._mock_session(mock_session_cls)
+
+        result = await self._client().upload_stream(
+            _stream(b"some ", b"data"), self.bucket, "key"
+        )
+
+        self.assertEqual(result, f"s3://{self.bucket}/key")
+        mock_s3_client.put_object.assert_awaited_once_with(
+            Body=b"some data",
+            Bucket=self.bucket,
+            Key="key",
+            ContentType="application/octet-stream",
+        )
+        mock_s3_client.create_multipart_upload.assert_not_awaited()
+
+    @patch("shared.clients.s3_client.aioboto3.Session")
+    async def test_upload_stream_multipart(self, mock_session_cls: MagicMock) -> None:
+        mock_s3_client = self._mock_session(mock_session_cls)
+        mock_s3_client.create_multipart_upload.return_value = {"UploadId": "up-1"}
+        mock_s3_client.upload_part.side_effect = lambda **kw: {
+            "ETag": f"etag-{kw['PartNumber']}"
+        }
+        half = b"x" * (MIN_PART_SIZE // 2)
+
+        await self._client().upload_stream(
+            _stream(half, half, half, b"tail"),
+            self.bucket,
+            "key",
+            part_size=MIN_PART_SIZE,
+            max_concurrency=2,
+        )
+
+        part_calls = mock_s3_client.upload_part.call_args_list
+        self.assertEqual(len(part_calls), 2)
+        self.assertEqual(len(part_calls[0].kwargs["Body"]), MIN_PART_SIZE)
+        self.assertEqual(part_calls[1].kwargs["Body"], half + b"tail")
+        mock_s3_client.complete_multipart_upload.assert_awaited_once_with(
+            Bucket=self.bucket,
+            Key="key",
+            UploadId="up-1",
+            MultipartUpload={
+                "Parts": [
+                    {"ETag": "etag-1", "PartNumber": 1},
+                    {"ETag": "etag-2", "PartNumber": 2},
+                ]
+            },
+        )
+        mock_s3_client.put_object.assert_not_awaited()
+
+    @patch("shared.clients.s3_client.aioboto3.Session")
+    async def test_upload_stream_aborts_on_failure(
+        self, mock_session_cls: MagicMock
+    ) -> None:
+        mock_s3_client = self._mock_session(mock_session_cls)
+        mock_s3_client.create_multipart_upload.return_value = {"UploadId": "up-1"}
+        mock_s3_client.upload_part.side_effect = Exception("S3 Error")
+
+        with self.assertRaisesRegex(Exception, "S3 Error"):
+            await self._client().upload_stream(
+                _stream(b"x" * MIN_PART_SIZE, b"tail"),
+                self.bucket,
+                "key",
+                part_size=MIN_PART_SIZE,
+            )
+
+        mock_s3_client.abort_multipart_upload.assert_awaited_once_with(
+            Bucket=self.bucket, Key="key", UploadId="up-1"
+        )
+        mock_s3_client.complete_multipart_upload.assert_not_awaited()
+
+    @patch("shared.clients.s3_client.aioboto3.Session")
+    async def test_upload_stream_aborts_after_parts_settle(
+        self, mock_session_cls: MagicMock
+    ) -> None:
+        mock_s3_client = self._mock_session(mock_session_cls)
+        mock_s3_client.create_multipart_upload.return_value = {"UploadId": "up-1"}
+        events: list[str] = []
+
+        async def upload_part(**_kwargs: Any) -> dict[str, str]:
+            try:
+                await asyncio.sleep(10)
+            finally:
+                events.append("part settled")
+            return {"ETag": "etag"}
+
+        async def failing_stream() -> AsyncIterator[bytes]:
+            yield b"x" * MIN_PART_SIZE
+            await asyncio.sleep(0)
+            raise ValueError("stream broken")
+
+        mock_s3_client.upload_part.side_effect = upload_part
+        mock_s3_client.abort_multipart_upload.side_effect = lambda **_: events.append(
+            "aborted"
+        )
+
+        with self.assertRaisesRegex(ValueError, "stream broken"):
+            await self._client().upload_stream(
+                failing_stream(), self.bucket, "key", part_size=MIN_PART_SIZE
+            )
+
+        self.assertEqual(events, ["part settled", "aborted"])
+
+    @patch("shared.clients.s3_client.aioboto3.Session")
+    async def test_delete_objects_splits_requests(
+        self, mock_session_cls: MagicMock
+    ) -> None:
+        mock_s3_client = self._mock_session(mock_session_cls)
+        mock_s3_client.delete_objects.side_effect = [
+            {"Errors": [{"Key": "k5", "Code": "AccessDenied"}]},
+            ClientError({"Error": {"Code": "SlowDown"}}, "DeleteObjects"),
+            {},
+        ]
+        keys = [f"k{i}" for i in range(2500)]
+
+        result = await self._client().delete_objects(self.bucket, keys)
+
+        requests = [
+            c.kwargs["Delete"]["Objects"]
+            for c in mock_s3_client.delete_objects.call_args_list
+        ]
+        self.assertEqual([len(r) for r in requests], [1000, 1000, 500])
+        self.assertEqual(mock_session_cls.return_value.client.call_count, 1)
+        self.assertEqual(result["failed_keys"], ["k5"] + keys[1000:2000])
+        self.assertEqual(result["deleted"], 1499)
+
+    @patch("shared.clients.s3_client.aioboto3.Session")
+    async def test_delete_objects_connection_error(
+        self, mock_session_cls: MagicMock
+    ) -> None:
+        mock_s3_client = self._mock_session(mock_session_cls)
+        mock_s3_client.delete_objects.side_effect = [
+            {},
+            EndpointConnectionError(endpoint_url="http://s3"),
+        ]
+        keys = [f"k{i}" for i in range(1500)]
+
+        result = await self._client().delete_objects(self.bucket, keys)
+
+        self.assertEqual(result["failed_keys"], keys[1000:])
+        self.assertEqual(result["deleted"], 1000)
+
+    @patch("shared.clients.s3_client.aioboto3.Session")
+    async def test_delete_objects_empty(self, mock_session_cls: MagicMock) -> None:
+        mock_s3_client = self._mock_session(mock_session_cls)
+
+        result = await self._client().delete_objects(self.bucket, [])
+
+        self.assertEqual(result, {"deleted": 0, "failed_keys": []})
+        mock_s3_client.delete_objects.assert_not_awaited()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,10 @@
+import asyncio
 import json
 import unittest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
-from shared.clients.sqs_client import SQSClient
+from shared.clients.claim_check import ClaimCheck
+from shared.clients.sqs_client import AckBuffer, SQSClient, VisibilityHeartbeat
 
 
 class TestSQSClient(unittest.IsolatedAsyncioTestCase):
@@ -58,7 +60,7 @@ class TestSQSClient(unittest.IsolatedAsyncioTestCase):
         # 4. Verify
         self.assertTrue(result)
         mock_sqs_client.send_message.assert_called_once_with(
-            QueueUrl=self.queue_url, MessageBody=json.dumps(message)
+            QueueUrl=self.queue_url, MessageBody='{"foo":"bar"}'
         )
         mock_session.client.assert_called_once_with(
             "sqs",
@@ -66,6 +68,7 @@ class TestSQSClient(unittest.IsolatedAsyncioTestCase):
             region_name=self.region,
             aws_access_key_id=self.access_key,
             aws_secret_access_key=self.secret_key,
+            config=ANY,
         )
 
     @patch("shared.clients.sqs_client.aioboto3.Session")
@@ -93,6 +96,460 @@ class TestSQSClient(unittest.IsolatedAsyncioTestCase):
         with self.assertRaisesRegex(Exception, "SQS Error"):
             await client.send_message(message)
 
+    @patch("shared.clients.sqs_client.AioConfig")
+    @patch("shared.clients.sqs_client.aioboto3.Session")
+    async def test_start_reuses_pooled_client(
+        self, mock_session_cls: MagicMock, mock_config_cls: MagicMock
+    ) -> None:
+        mock_sqs_client = AsyncMock()
+        mock_sqs_client.receive_message.return_value = {"Messages": []}
+        mock_client_cm = MagicMock()
+        mock_client_cm.__aenter__.return_value = mock_sqs_client
+        mock_client_cm.__aexit__.return_value = None
+
+        mock_session = MagicMock()
+        mock_session.client.return_value = mock_client_cm
+        mock_session_cls.return_value = mock_session
+
+        client = SQSClient(
+            self.endpoint_url,
+            self.region,
+            self.access_key,
+            self.secret_key,
+            self.queue_url,
+            max_pool_connections=25,
+        )
+
+        await client.start()
+        await client.start()
+        await client.send_message({"foo": "bar"})
+        await client.send_message({"foo": "baz"})
+        await client.receive_messages(self.queue_url)
+        await client.delete_message(self.queue_url, "handle")
+
+        # A single pooled client serves every call
+        mock_session.client.assert_called_once()
+        mock_config_cls.assert_called_once_with(max_pool_connections=25)
+        self.assertEqual(mock_sqs_client.send_message.call_count, 2)
+        mock_client_cm.__aexit__.assert_not_called()
+
+        await client.close()
+        mock_client_cm.__aexit__.assert_called_once()
+
+        # Closing twice is a no-op
+        await client.close()
+        mock_client_cm.__aexit__.assert_called_once()
+
+    @patch("shared.clients.sqs_client.aioboto3.Session")
+    async def test_async_context_manager(self, mock_session_cls: MagicMock) -> None:
+        mock_sqs_client = AsyncMock()
+        mock_client_cm = MagicMock()
+        mock_client_cm.__aenter__.return_value = mock_sqs_client
+        mock_client_cm.__aexit__.return_value = None
+
+        mock_session = MagicMock()
+        mock_session.client.return_value = mock_client_cm
+        mock_session_cls.return_value = mock_session
+
+        async with SQSClient(
+            self.endpoint_url,
+            self.region,
+            self.access_key,
+            self.secret_key,
+            self.queue_url,
+        ) as client:
+            result = await client.delete_message(self.queue_url, "handle")
+
+        self.assertTrue(result)
+        mock_sqs_client.delete_message.assert_called_once_with(
+            QueueUrl=self.queue_url, ReceiptHandle="handle"
+        )
+        mock_client_cm.__aexit__.assert_called_once()
+
+    def _mock_session(self, mock_session_cls: MagicMock) -> AsyncMock:
+        mock_sqs_client = AsyncMock()
+        mock_client_cm = MagicMock()
+        mock_client_cm.__aenter__.return_value = mock_sqs_client
+        mock_client_cm.__aexit__.return_value = None
+
+        mock_session = MagicMock()
+        mock_session.client.return_value = mock_client_cm
+        mock_session_cls.return_value = mock_session
+        return mock_sqs_client
+
+    def _client(self) -> SQSClient:
+        return SQSClient(
+            self.endpoint_url,
+            self.region,
+            self.access_key,
+            self.secret_key,
+            self.queue_url,
+        )
+
+    @patch("shared.clients.sqs_client.aioboto3.Session")
+    async def test_send_messages_splits_batches(
+        self, mock_session_cls: MagicMock
+    ) -> None:
+        mock_sqs_client = self._mock_session(mock_session_cls)
+
+        def send_batch(QueueUrl: str, Entries: list[dict]) -> dict:
+            # pylint: disable=invalid-name,unused-argument
+            return {
+                "Successful": [
+                    {"Id": e["Id"], "MessageId": f"m{e['Id']}"} for e in Entries
+                ]
+            }
+
+        mock_sqs_client.send_message_batch.side_effect = send_batch
+
+        bodies = [{"n": i} for i in range(25)]
+        results = await self._client().send_messages(bodies)
+
+        self.assertEqual(mock_sqs_client.send_message_batch.call_count, 3)
+        sizes = [
+            len(c.kwargs["Entries"])
+            for c in mock_sqs_client.send_message_batch.call_args_list
+        ]
+        self.assertEqual(sizes, [10, 10, 5])
+        self.assertEqual(len(results), 25)
+        self.assertTrue(all(r["success"] for r in results))
+        self.assertEqual(results[24]["message_id"], "m24")
+        first_entry = mock_sqs_client.send_message_batch.call_args_list[0].kwargs[
+            "Entries"
+        ][0]
+        self.assertEqual(json.loads(first_entry["MessageBody"]), {"n": 0})
+
+    @patch("shared.clients.sqs_client.aioboto3.Session")
+    async def test_send_messages_splits_by_payload_size(
+        self, mock_session_cls: MagicMock
+    ) -> None:
+        mock_sqs_client = self._mock_session(mock_session_cls)
+        mock_sqs_client.send_message_batch.return_value = {}
+
+        # Three ~100 KiB bodies cannot share a single 256 KiB batch
+        bodies = [{"content": "x" * 100_000} for _ in range(3)]
+        with patch("shared.clients.sqs_client.asyncio.sleep", new_callable=AsyncMock):
+            await self._client().send_messages(bodies, max_retries=0)
+
+        sizes = [
+            len(c.kwargs["Entries"])
+            for c in mock_sqs_client.send_message_batch.call_args_list
+        ]
+        self.assertEqual(sizes, [2, 1])
+
+    @patch("shared.clients.sqs_client.asyncio.sleep", new_callable=AsyncMock)
+    @patch("shared.clients.sqs_client.aioboto3.Session")
+    async def test_send_messages_retries_only_failed_entries(
+        self, mock_session_cls: MagicMock, mock_sleep: AsyncMock
+    ) -> None:
+        mock_sqs_client = self._mock_session(mock_session_cls)
+        mock_sqs_client.send_message_batch.side_effect = [
+            {
+                "Successful": [{"Id": "0", "MessageId": "m0"}],
+                "Failed": [
+                    {"Id": "1", "SenderFault": False, "Code": "Throttled"},
+                    {"Id": "2", "SenderFault": True, "Message": "Invalid body"},
+                ],
+            },
+            {"Successful": [{"Id": "1", "MessageId": "m1"}]},
+        ]
+
+        results = await self._client().send_messages(
+            [{"n": 0}, {"n": 1}, {"n": 2}], queue_url="http://other-queue"
+        )
+
+        self.assertEqual(mock_sqs_client.send_message_batch.call_count, 2)
+        retry_call = mock_sqs_client.send_message_batch.call_args_list[1]
+        self.assertEqual(retry_call.kwargs["QueueUrl"], "http://other-queue")
+        self.assertEqual([e["Id"] for e in retry_call.kwargs["Entries"]], ["1"])
+        mock_sleep.assert_awaited_once()
+
+        self.assertEqual(
+            results,
+            [
+                {"success": True, "message_id": "m0", "error": None},
+                {"success": True, "message_id": "m1", "error": None},
+                {"success": False, "message_id": None, "error": "Invalid body"},
+            ],
+        )
+
+    @patch("shared.clients.sqs_client.asyncio.sleep", new_callable=AsyncMock)
+    @patch("shared.clients.sqs_client.aioboto3.Session")
+    async def test_send_messages_gives_up_after_retries(
+        self, mock_session_cls: MagicMock, _mock_sleep: AsyncMock
+    ) -> None:
+        mock_sqs_client = self._mock_session(mock_session_cls)
+        mock_sqs_client.send_message_batch.side_effect = Exception("SQS down")
+
+        results = await self._client().send_messages([{"n": 0}], max_retries=2)
+
+        self.assertEqual(mock_sqs_client.send_message_batch.call_count, 3)
+        self.assertEqual(
+            results, [{"success": False, "message_id": None, "error": "SQS down"}]
+        )
+
+    @patch("shared.clients.sqs_client.aioboto3.Session")
+    async def test_send_messages_rejects_oversized_body(
+        self, mock_session_cls: MagicMock
+    ) -> None:
+        mock_sqs_client = self._mock_session(mock_session_cls)
+        mock_sqs_client.send_message_batch.return_value = {
+            "Successful": [{"Id": "1", "MessageId": "m1"}]
+        }
+
+        results = await self._client().send_messages(
+            [{"content": "x" * 300_000}, {"n": 1}]
+        )
+
+        self.assertFalse(results[0]["success"])
+        self.assertIsNotNone(results[0]["error"])
+        self.assertTrue(results[1]["success"])
+        entries = mock_sqs_client.send_message_batch.call_args.kwargs["Entries"]
+        self.assertEqual([e["Id"] for e in entries], ["1"])
+
+    @patch("shared.clients.sqs_client.aioboto3.Session")
+    async def test_delete_messages(self, mock_session_cls: MagicMock) -> None:
+        mock_sqs_client = self._mock_session(mock_session_cls)
+        mock_sqs_client.delete_message_batch.side_effect = [
+            {
+                "Successful": [{"Id": str(i)} for i in range(9)],
+                "Failed": [
+                    {"Id": "9", "SenderFault": True, "Code": "ReceiptHandleIsInvalid"}
+                ],
+            },
+            {"Successful": [{"Id": "10"}]},
+        ]
+
+        handles = [f"h{i}" for i in range(11)]
+        results = await self._client().delete_messages(self.queue_url, handles)
+
+        self.assertEqual(results, [True] * 9 + [False, True])
+        first_call = mock_sqs_client.delete_message_batch.call_args_list[0]
+        self.assertEqual(first_call.kwargs["QueueUrl"], self.queue_url)
+        self.assertEqual(
+            first_call.kwargs["Entries"][0], {"Id": "0", "ReceiptHandle": "h0"}
+        )
+
+    @patch("shared.clients.sqs_client.aioboto3.Session")
+    async def test_delete_messages_client_error(
+        self, mock_session_cls: MagicMock
+    ) -> None:
+        mock_client_cm = MagicMock()
+        mock_client_cm.__aenter__.side_effect = Exception("SQS Error")
+        mock_session = MagicMock()
+        mock_session.client.return_value = mock_client_cm
+        mock_session_cls.return_value = mock_session
+
+        results = await self._client().delete_messages(self.queue_url, ["h0", "h1"])
+
+        self.assertEqual(results, [False, False])
+
+    @patch("shared.clients.sqs_client.aioboto3.Session")
+    async def test_change_message_visibility(self, mock_session_cls: MagicMock) -> None:
+        mock_sqs_client = self._mock_session(mock_session_cls)
+
+        extended = await self._client().change_message_visibility(
+            self.queue_url, "h0", 60
+        )
+
+        self.assertTrue(extended)
+        mock_sqs_client.change_message_visibility.assert_awaited_once_with(
+            QueueUrl=self.queue_url, ReceiptHandle="h0", VisibilityTimeout=60
+        )
+
+    @patch("shared.clients.sqs_client.aioboto3.Session")
+    async def test_change_message_visibility_error(
+        self, mock_session_cls: MagicMock
+    ) -> None:
+        mock_sqs_client = self._mock_session(mock_session_cls)
+        mock_sqs_client.change_message_visibility.side_effect = Exception("SQS Error")
+
+        extended = await self._client().change_message_visibility(
+            self.queue_url, "h0", 60
+        )
+
+        self.assertFalse(extended)
+
+    @patch("shared.clients.sqs_client.aioboto3.Session")
+    async def test_send_message_offloads_to_claim_check(
+        self, mock_session_cls: MagicMock
+    ) -> None:
+        mock_sqs_client = self._mock_session(mock_session_cls)
+        mock_sqs_client.send_message_batch.return_value = {
+            "Successful": [{"Id": "0", "MessageId": "m0"}]
+        }
+        mock_claim_check = MagicMock(spec=ClaimCheck)
+        mock_claim_check.offload = AsyncMock(return_value="pointer")
+        client = SQSClient(
+            self.endpoint_url,
+            self.region,
+            self.access_key,
+            self.secret_key,
+            self.queue_url,
+            claim_check=mock_claim_check,
+        )
+
+        await client.send_message({"content": "big"})
+        await client.send_messages([{"content": "big"}])
+
+        mock_claim_check.offload.assert_awaited_with('{"content":"big"}')
+        mock_sqs_client.send_message.assert_awaited_once_with(
+            QueueUrl=self.queue_url, MessageBody="pointer"
+        )
+        entries = mock_sqs_client.send_message_batch.call_args.kwargs["Entries"]
+        self.assertEqual(entries[0]["MessageBody"], "pointer")
+
+    @patch("shared.clients.sqs_client.aioboto3.Session")
+    async def test_send_message_with_claim_check(
+        self, mock_session_cls: MagicMock
+    ) -> None:
+        mock_sqs_client = self._mock_session(mock_session_cls)
+        mock_claim_check = MagicMock(spec=ClaimCheck)
+        mock_claim_check.offload = AsyncMock(return_value="pointer")
+        client = SQSClient(
+            self.endpoint_url,
+            self.region,
+            self.access_key,
+            self.secret_key,
+            self.queue_url,
+        )
+
+        await client.send_message({"content": "big"}, claim_check=mock_claim_check)
+        await client.send_message({"content": "small"})
+
+        mock_claim_check.offload.assert_awaited_once_with('{"content":"big"}')
+        self.assertEqual(
+            [
+                c.kwargs["MessageBody"]
+                for c in mock_sqs_client.send_message.call_args_list
+            ],
+            ["pointer", '{"content":"small"}'],
+        )
+
+
+class TestVisibilityHeartbeat(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.mock_sqs = MagicMock(spec=SQSClient)
+        self.mock_sqs.change_message_visibility = AsyncMock(return_value=True)
+        self.queue_url = "http://queue/input"
+
+    async def test_extends_visibility_while_processing(self) -> None:
+        async with VisibilityHeartbeat(
+            self.mock_sqs, self.queue_url, "h0", visibility_timeout=30, interval=0.01
+        ):
+            await asyncio.sleep(0.05)
+
+        self.mock_sqs.change_message_visibility.assert_awaited_with(
+            self.queue_url, "h0", 30
+        )
+        calls = self.mock_sqs.change_message_visibility.await_count
+        await asyncio.sleep(0.03)
+        self.assertEqual(self.mock_sqs.change_message_visibility.await_count, calls)
+
+    async def test_extends_visibility_on_entry(self) -> None:
+        async with VisibilityHeartbeat(self.mock_sqs, self.queue_url, "h0"):
+            # Before the queue's default 30s timeout can expire
+            self.mock_sqs.change_message_visibility.assert_awaited_once_with(
+                self.queue_url, "h0", 60
+            )
+
+        self.mock_sqs.change_message_visibility.assert_awaited_once()
+
+    async def test_stops_when_processing_fails(self) -> None:
+        with self.assertRaises(ValueError):
+            async with VisibilityHeartbeat(
+                self.mock_sqs, self.queue_url, "h0", interval=0.01
+            ):
+                raise ValueError("boom")
+
+        await asyncio.sleep(0.03)
+        self.mock_sqs.change_message_visibility.assert_awaited_once()
+
+    async def test_keeps_beating_after_failed_extension(self) -> None:
+        self.mock_sqs.change_message_visibility.return_value = False
+
+        async with VisibilityHeartbeat(
+            self.mock_sqs, self.queue_url, "h0", interval=0.01
+        ):
+            await asyncio.sleep(0.05)
+
+        self.assertGreater(self.mock_sqs.change_message_visibility.await_count, 1)
+
+
+class TestAckBuffer(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.mock_sqs = MagicMock(spec=SQSClient)
+        self.mock_sqs.delete_messages = AsyncMock(
+            side_effect=lambda _queue, handles: [True] * len(handles)
+        )
+        self.queue_url = "http://queue/input"
+
+    async def test_flushes_when_batch_is_full(self) -> None:
+        ack_buffer = AckBuffer(self.mock_sqs, self.queue_url, max_latency=60)
+
+        for i in range(10):
+            await ack_buffer.add(f"h{i}")
+
+        self.mock_sqs.delete_messages.assert_awaited_once_with(
+            self.queue_url, [f"h{i}" for i in range(10)]
+        )
+        self.assertEqual(
+            ack_buffer.metrics, {"buffered": 10, "flushed": 10, "failed": 0}
+        )
+        await ack_buffer.close()
+        self.mock_sqs.delete_messages.assert_awaited_once()
+
+    async def test_flushes_after_deadline(self) -> None:
+        ack_buffer = AckBuffer(self.mock_sqs, self.queue_url, max_latency=0.01)
+
+        await ack_buffer.add("h0")
+        self.mock_sqs.delete_messages.assert_not_awaited()
+
+        await asyncio.sleep(0.05)
+
+        self.mock_sqs.delete_messages.assert_awaited_once_with(self.queue_url, ["h0"])
+        self.assertEqual(ack_buffer.metrics["flushed"], 1)
+
+    async def test_close_flushes_remaining(self) -> None:
+        async with AckBuffer(self.mock_sqs, self.queue_url, max_latency=60) as ack:
+            await ack.add("h0")
+            await ack.add("h1")
+
+        self.mock_sqs.delete_messages.assert_awaited_once_with(
+            self.queue_url, ["h0", "h1"]
+        )
+
+    async def test_close_without_pending(self) -> None:
+        ack_buffer = AckBuffer(self.mock_sqs, self.queue_url)
+        await ack_buffer.close()
+        self.mock_sqs.delete_messages.assert_not_awaited()
+
+    async def test_counts_failed_acks(self) -> None:
+        self.mock_sqs.delete_messages = AsyncMock(return_value=[True, False])
+        ack_buffer = AckBuffer(self.mock_sqs, self.queue_url, max_latency=60)
+
+        await ack_buffer.add("h0")
+        await ack_buffer.add("h1")
+        await ack_buffer.flush()
+
+        self.assertEqual(ack_buffer.metrics, {"buffered": 2, "flushed": 1, "failed": 1})
+
+    async def test_releases_claim_checks_after_delete(self) -> None:
+        self.mock_sqs.delete_messages = AsyncMock(return_value=[True, False, True])
+        mock_claim_check = MagicMock(spec=ClaimCheck)
+        mock_claim_check.release = AsyncMock()
+        pointer = json.dumps({"claim_check": {"bucket": "b", "key": "k"}})
+        ack_buffer = AckBuffer(
+            self.mock_sqs, self.queue_url, max_latency=60, claim_check=mock_claim_check
+        )
+
+        await ack_buffer.add("h0", pointer)
+        await ack_buffer.add("h1", pointer)
+        await ack_buffer.add("h2", "{}")
+        await ack_buffer.flush()
+
+        mock_claim_check.release.assert_awaited_once_with(pointer)
+
 
 if __name__ == "__main__":
     unittest.main()
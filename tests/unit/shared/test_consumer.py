@@ -0,0 +1,180 @@
+import asyncio
+import signal
+import unittest
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from shared.clients.claim_check import ClaimCheck
+from shared.clients.sqs_client import SQSClient
+from shared.consumer import SQSConsumer
+
+
+def _message(index: int) -> dict[str, str]:
+    return {"Body": f'{{"n": {index}}}', "ReceiptHandle": f"h{index}"}
+
+
+class TestSQSConsumer(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.queue_url = "http://queue/input"
+        self.mock_sqs = MagicMock(spec=SQSClient)
+        self.mock_sqs.delete_messages = AsyncMock(
+            side_effect=lambda _queue, handles: [True] * len(handles)
+        )
+        self.mock_sqs.change_message_visibility = AsyncMock(return_value=True)
+
+    def _serve(self, *batches: list[dict[str, str]]) -> None:
+        """
+        Returns the given batches, at most max_messages at a time, then long-polls
+        an empty queue.
+        """
+        pending = list(batches)
+
+        async def receive_messages(
+            *_args: Any, max_messages: int, **_kwargs: Any
+        ) -> list:
+            if pending:
+                batch = pending.pop(0)
+                if len(batch) > max_messages:
+                    pending.insert(0, batch[max_messages:])
+                return batch[:max_messages]
+            await asyncio.sleep(10)
+            return []
+
+        self.mock_sqs.receive_messages = AsyncMock(side_effect=receive_messages)
+
+    async def test_processes_messages_concurrently(self) -> None:
+        self._serve([_message(0), _message(1), _message(2)])
+        running = 0
+        max_running = 0
+        done = asyncio.Event()
+        handled: list[str] = []
+
+        async def handler(body: str) -> None:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            handled.append(body)
+            if len(handled) == 3:
+                done.set()
+
+        consumer = SQSConsumer(self.mock_sqs, self.queue_url, handler, concurrency=2)
+        run = asyncio.create_task(consumer.run())
+        await asyncio.wait_for(done.wait(), 1)
+        consumer.stop()
+        await asyncio.wait_for(run, 1)
+
+        self.assertEqual(max_running, 2)
+        self.assertEqual(len(handled), 3)
+        self.assertEqual(consumer.metrics["processed"], 3)
+        self.mock_sqs.receive_messages.assert_any_await(
+            self.queue_url, max_messages=2, wait_time=20
+        )
+        acked = [
+            handle
+            for call in self.mock_sqs.delete_messages.await_args_list
+            for handle in call.args[1]
+        ]
+        self.assertEqual(sorted(acked), ["h0", "h1", "h2"])
+
+    async def test_failed_and_timed_out_messages_are_not_acked(self) -> None:
+        self._serve([_message(0), _message(1)])
+
+        async def handler(body: str) -> None:
+            if body == '{"n": 0}':
+                raise ValueError("boom")
+            await asyncio.sleep(1)
+
+        consumer = SQSConsumer(
+            self.mock_sqs, self.queue_url, handler, message_timeout=0.01
+        )
+        run = asyncio.create_task(consumer.run())
+        await asyncio.sleep(0.1)
+        consumer.stop()
+        await asyncio.wait_for(run, 1)
+
+        self.assertEqual(
+            consumer.metrics, {"processed": 0, "failed": 1, "timed_out": 1}
+        )
+        self.mock_sqs.delete_messages.assert_not_awaited()
+
+    async def test_stop_drains_in_flight(self) -> None:
+        self._serve([_message(0), _message(1)])
+        consumer: SQSConsumer
+
+        async def handler(_body: str) -> None:
+            consumer.stop()
+            await asyncio.sleep(0.01)
+
+        consumer = SQSConsumer(self.mock_sqs, self.queue_url, handler, concurrency=1)
+        await asyncio.wait_for(consumer.run(), 1)
+
+        self.assertEqual(consumer.metrics["processed"], 1)
+        self.mock_sqs.delete_messages.assert_awaited_once_with(self.queue_url, ["h0"])
+        # h1 was never received, so it is not left waiting for a slot
+        self.mock_sqs.receive_messages.assert_awaited_once_with(
+            self.queue_url, max_messages=1, wait_time=20
+        )
+
+    async def test_receives_only_for_free_slots(self) -> None:
+        self._serve([_message(0), _message(1)], [_message(2)])
+        release = asyncio.Event()
+
+        async def handler(body: str) -> None:
+            if body == '{"n": 0}':
+                await release.wait()
+
+        consumer = SQSConsumer(self.mock_sqs, self.queue_url, handler, concurrency=3)
+        run = asyncio.create_task(consumer.run())
+        await asyncio.sleep(0.05)
+        release.set()
+        await asyncio.sleep(0.05)
+        consumer.stop()
+        await asyncio.wait_for(run, 1)
+
+        requested = [
+            c.kwargs["max_messages"]
+            for c in self.mock_sqs.receive_messages.await_args_list
+        ]
+        # h0 and h1 hold 2 of the 3 slots, and h0 keeps its own until released
+        self.assertEqual(requested[:2], [3, 1])
+        self.assertLessEqual(max(requested[2:]), 2)
+        self.assertEqual(consumer.metrics["processed"], 3)
+
+    async def test_resolves_claim_checks(self) -> None:
+        self._serve([_message(0)])
+        mock_claim_check = MagicMock(spec=ClaimCheck)
+        mock_claim_check.resolve = AsyncMock(return_value="resolved")
+        handler = AsyncMock()
+
+        consumer = SQSConsumer(
+            self.mock_sqs, self.queue_url, handler, claim_check=mock_claim_check
+        )
+        run = asyncio.create_task(consumer.run())
+        await asyncio.sleep(0.05)
+        consumer.stop()
+        await asyncio.wait_for(run, 1)
+
+        mock_claim_check.resolve.assert_awaited_once_with('{"n": 0}')
+        handler.assert_awaited_once_with("resolved")
+
+    @patch("shared.consumer.asyncio.get_running_loop")
+    async def test_signal_handlers_stop_the_consumer(
+        self, mock_get_loop: MagicMock
+    ) -> None:
+        self._serve()
+        handlers: dict[int, Any] = {}
+        mock_get_loop.return_value.add_signal_handler.side_effect = handlers.__setitem__
+
+        consumer = SQSConsumer(self.mock_sqs, self.queue_url, AsyncMock())
+        consumer.install_signal_handlers()
+        handlers[signal.SIGTERM]()
+        await asyncio.wait_for(consumer.run(), 1)
+
+        self.assertIn(signal.SIGINT, handlers)
+        self.mock_sqs.receive_messages.assert_not_awaited()
+
+
+if __name__ == "__main__":
+    unittest.main()
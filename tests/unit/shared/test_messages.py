@@ -0,0 +1,86 @@
+import json
+import unittest
+
+from shared.messages import (
+    DeletionMessage,
+    ImageExplainerMessage,
+    ImageExplanationWriterMessage,
+    InvalidMessageError,
+    PageSummaryMessage,
+    PageSummaryWriterMessage,
+    ScrapeMessage,
+    decode_message,
+    encode_message,
+)
+
+
+class TestMessages(unittest.TestCase):
+    def test_encode_message(self) -> None:
+        message = ScrapeMessage(url="http://example.com", depth=2, scraping_id=1)
+        self.assertEqual(
+            json.loads(encode_message(message)),
+            {
+                "url": "http://example.com",
+                "depth": 2,
+                "scraping_id": 1,
+                "user_id": None,
+            },
+        )
+
+    def test_encode_dict(self) -> None:
+        self.assertEqual(encode_message({"foo": "bar"}), '{"foo":"bar"}')
+
+    def test_encode_writer_messages_are_tagged(self) -> None:
+        summary = PageSummaryWriterMessage(scraping_id=1, url="u", summary="s")
+        explanation = ImageExplanationWriterMessage(
+            url="i",
+            original_url="p",
+            page_url="p",
+            scraping_id=1,
+            s3_path="s3://b/k",
+            explanation="e",
+        )
+        self.assertEqual(json.loads(encode_message(summary))["type"], "page_summary")
+        self.assertEqual(
+            json.loads(encode_message(explanation))["type"], "image_explanation"
+        )
+
+    def test_decode_message(self) -> None:
+        body = json.dumps(
+            {"url": "http://example.com", "content": "text", "scraping_id": 3}
+        )
+        message = decode_message(body, PageSummaryMessage)
+        self.assertEqual(
+            message,
+            PageSummaryMessage(url="http://example.com", content="text", scraping_id=3),
+        )
+
+    def test_decode_ignores_unknown_fields(self) -> None:
+        body = json.dumps({"scraping_id": 3, "extra": True})
+        self.assertEqual(
+            decode_message(body, DeletionMessage), DeletionMessage(scraping_id=3)
+        )
+
+    def test_decode_defaults(self) -> None:
+        body = json.dumps({"s3_path": "s3://b/k", "scraping_id": 3})
+        message = decode_message(body, ImageExplainerMessage)
+        self.assertEqual(message.image_url, "")
+        self.assertEqual(message.original_url, "")
+
+    def test_decode_round_trip(self) -> None:
+        message = ScrapeMessage(url="u", depth=1, scraping_id=2, user_id=5)
+        self.assertEqual(
+            decode_message(encode_message(message), ScrapeMessage), message
+        )
+
+    def test_decode_invalid_json(self) -> None:
+        with self.assertRaises(InvalidMessageError):
+            decode_message("not json", DeletionMessage)
+
+    def test_decode_missing_field(self) -> None:
+        with self.assertRaises(InvalidMessageError):
+            decode_message("{}", DeletionMessage)
+
+    def test_decode_wrong_type(self) -> None:
+        with self.assertRaises(InvalidMessageError):
+            decode_message('{"scraping_id": "abc"}', DeletionMessage)
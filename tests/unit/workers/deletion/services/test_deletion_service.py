@@ -1,7 +1,11 @@
 import unittest
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from workers.deletion.services.deletion_service import DeletionService
+from shared.messages import InvalidMessageError
+from workers.deletion.services.deletion_service import (
+    DeletionService,
+    S3CleanupError,
+)
 
 
 class TestDeletionService(
@@ -10,7 +14,11 @@ class TestDeletionService(
     def setUp(self) -> None:
         self.mock_dynamodb = AsyncMock()
         self.mock_s3 = AsyncMock()
+        self.mock_s3.delete_objects.return_value = {"deleted": 0, "failed_keys": []}
         self.mock_os = AsyncMock()
+        self.mock_db_repository = AsyncMock()
+        self.mock_db_repository.transfer_results.return_value = None
+        self.mock_scraping_cache = AsyncMock()
         self.service = DeletionService(
             dynamodb_client=self.mock_dynamodb,
             s3_client=self.mock_s3,
@@ -18,6 +26,8 @@ class TestDeletionService(
             images_bucket="test-bucket",
             batch_size=2,
             s3_batch_size=2,
+            db_repository=self.mock_db_repository,
+            scraping_cache=self.mock_scraping_cache,
         )
 
     @patch("api.models.Scraping.get_or_none", new_callable=AsyncMock)
@@ -84,6 +94,40 @@ class TestDeletionService(
 
         # Verify OpenSearch deletion
         self.mock_os.delete_by_query.assert_called_once()
+        self.mock_os.update_by_query.assert_not_called()
+        self.mock_db_repository.transfer_results.assert_awaited_once_with(123)
+
+        # Verify the cached responses are purged
+        self.mock_scraping_cache.purge.assert_awaited_once_with(123)
+
+    @patch("api.models.Scraping.get_or_none", new_callable=AsyncMock)
+    async def test_cleanup_scraping_transfers_results_to_alias(
+        self, mock_scraping_get: AsyncMock
+    ) -> None:
+        mock_scraping_get.return_value = AsyncMock()
+        self.mock_db_repository.transfer_results.return_value = {
+            "id": 456,
+            "user_id": 7,
+        }
+        with (
+            patch.object(
+                self.service,
+                "_DeletionService__cleanup_s3_objects",
+                new_callable=AsyncMock,
+            ),
+            patch.object(
+                self.service,
+                "_DeletionService__cleanup_relational_data",
+                new_callable=AsyncMock,
+            ),
+        ):
+            await self.service.cleanup_scraping(123)
+
+        self.mock_os.delete_by_query.assert_not_called()
+        body = self.mock_os.update_by_query.call_args.kwargs["body"]
+        self.assertEqual(body["query"], {"term": {"scraping_id": 123}})
+        self.assertEqual(body["script"]["params"], {"scraping_id": 456, "user_id": 7})
+        self.mock_dynamodb.delete_item.assert_awaited_once_with({"scraping_id": "123"})
 
     @patch("api.models.Scraping.get_or_none", new_callable=AsyncMock)
     async def test_cleanup_scraping_not_found(
@@ -109,6 +153,20 @@ class TestDeletionService(
         self.mock_dynamodb.delete_item.side_effect = Exception("DB Error")
         with self.assertRaises(Exception):  # noqa: B017
             await self.service.cleanup_scraping(123)
+        self.mock_scraping_cache.purge.assert_not_awaited()
+
+    async def test_process_message(self) -> None:
+        with patch.object(
+            self.service, "cleanup_scraping", new_callable=AsyncMock
+        ) as mock_cleanup:
+            await self.service.process_message('{"scraping_id": 123}')
+            with self.assertRaises(InvalidMessageError):
+                await self.service.process_message("{}")
+        mock_cleanup.assert_awaited_once_with(123)
+
+    async def test_process_message_invalid_json(self) -> None:
+        with self.assertRaises(ValueError):
+            await self.service.process_message("invalid json")
 
     @patch("api.models.PageImage.filter")
     async def test_cleanup_s3_objects_varied_paths(
@@ -140,6 +198,48 @@ class TestDeletionService(
         await self.service._DeletionService__cleanup_s3_objects(123)  # type: ignore[attr-defined]  # noqa: E501  # pylint: disable=line-too-long
         self.mock_s3.delete_objects.assert_not_called()
 
+    @patch("workers.deletion.services.deletion_service.asyncio.sleep")
+    @patch("api.models.PageImage.filter")
+    async def test_cleanup_s3_objects_retries_failed_keys(
+        self, mock_filter: MagicMock, mock_sleep: AsyncMock
+    ) -> None:
+        mock_filter.return_value.offset.return_value.limit.return_value.values_list = (
+            AsyncMock(return_value=["s3://test-bucket/k1"])
+        )
+        self.mock_s3.delete_objects.side_effect = [
+            {"deleted": 1, "failed_keys": ["k2"]},
+            {"deleted": 1, "failed_keys": []},
+        ]
+        service = DeletionService(
+            dynamodb_client=self.mock_dynamodb,
+            s3_client=self.mock_s3,
+            os_client=self.mock_os,
+            images_bucket="test-bucket",
+        )
+
+        await service._DeletionService__cleanup_s3_objects(123)  # type: ignore[attr-defined]  # noqa: E501  # pylint: disable=line-too-long
+
+        self.assertEqual(self.mock_s3.delete_objects.call_count, 2)
+        self.mock_s3.delete_objects.assert_called_with("test-bucket", ["k2"])
+        mock_sleep.assert_awaited_once()
+
+    @patch("workers.deletion.services.deletion_service.asyncio.sleep")
+    @patch("api.models.PageImage.filter")
+    async def test_cleanup_s3_objects_gives_up(
+        self, mock_filter: MagicMock, _mock_sleep: AsyncMock
+    ) -> None:
+        mock_filter.return_value.offset.return_value.limit.return_value.values_list = (
+            AsyncMock(return_value=["s3://test-bucket/k1"])
+        )
+        self.mock_s3.delete_objects.return_value = {
+            "deleted": 0,
+            "failed_keys": ["k1"],
+        }
+
+        with self.assertRaises(S3CleanupError):
+            await self.service._DeletionService__cleanup_s3_objects(123)  # type: ignore[attr-defined]  # noqa: E501  # pylint: disable=line-too-long
+        self.assertEqual(self.mock_s3.delete_objects.call_count, 4)
+
     @patch("api.models.PageLink.filter")
     async def test_batch_delete_multiple_batches(self, mock_filter: MagicMock) -> None:
         mock_qs = MagicMock()
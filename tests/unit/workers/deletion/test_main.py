@@ -1,6 +1,4 @@
-import json
 import unittest
-from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from workers.deletion.main import main
@@ -8,206 +6,127 @@ from workers.deletion.main import main
 
 class TestDeletionMain(unittest.IsolatedAsyncioTestCase):
     @patch("workers.deletion.main.Configuration")
+    @patch("workers.deletion.main.RedisClient")
     @patch("workers.deletion.main.SQSClient")
     @patch("workers.deletion.main.DynamoDBClient")
     @patch("workers.deletion.main.S3Client")
     @patch("workers.deletion.main.DeletionService")
     @patch("workers.deletion.main.Tortoise")
+    @patch("workers.deletion.main.AsyncOpenSearch")
+    @patch("workers.deletion.main.SQSConsumer")
     async def test_main_loop(
         self,
+        mock_consumer_cls: MagicMock,
+        mock_os_cls: MagicMock,
         mock_tortoise: MagicMock,
         mock_service_cls: MagicMock,
         mock_s3_cls: MagicMock,
         mock_dynamo_cls: MagicMock,
         mock_sqs_cls: MagicMock,
+        mock_redis_cls: MagicMock,
         mock_config_cls: MagicMock,
     ) -> None:
-        # pylint: disable=too-many-arguments,too-many-positional-arguments,unused-argument  # noqa: E501
+        # pylint: disable=too-many-arguments,too-many-positional-arguments,unused-argument,too-many-locals  # noqa: E501
         # Mock setup
         mock_config = MagicMock()
         mock_config.input_queue_url = "http://test-queue"
         mock_config.database_url = "sqlite://:memory:"
-        mock_config.aws_endpoint_url = "http://test"
-        mock_config.aws_region = "us-east-1"
-        mock_config.aws_access_key_id = "test"
-        mock_config.aws_secret_access_key = "test"
-        mock_config.dynamodb_table = "test-table"
-        mock_config.images_bucket = "test-bucket"
+        mock_config.worker_concurrency = 2
+        mock_config.message_timeout_seconds = 300.0
         mock_config_cls.from_env.return_value = mock_config
 
         mock_tortoise.init = AsyncMock()
         mock_tortoise.close_connections = AsyncMock()
 
-        mock_stop_event = MagicMock()
-        mock_stop_event.is_set.side_effect = [False, True]  # Run once then stop
-
         mock_sqs = AsyncMock()
         mock_sqs_cls.return_value = mock_sqs
-        mock_sqs.receive_messages.return_value = [
-            {"Body": json.dumps({"scraping_id": 123}), "ReceiptHandle": "abc"}
-        ]
+        mock_dynamo = AsyncMock()
+        mock_dynamo_cls.return_value = mock_dynamo
+        mock_os = AsyncMock()
+        mock_os_cls.return_value = mock_os
+        mock_redis = AsyncMock()
+        mock_redis_cls.return_value = mock_redis
 
         mock_service = AsyncMock()
         mock_service_cls.return_value = mock_service
 
+        mock_consumer = MagicMock()
+        mock_consumer.run = AsyncMock()
+        mock_consumer_cls.return_value = mock_consumer
+
         # Run main
-        await main(stop_event=mock_stop_event)
+        await main()
 
         # Verify
-        mock_service.cleanup_scraping.assert_called_with(123)
-        mock_sqs.delete_message.assert_called_with("http://test-queue", "abc")
+        mock_consumer_cls.assert_called_once_with(
+            mock_sqs,
+            "http://test-queue",
+            mock_service.process_message,
+            concurrency=2,
+            message_timeout=300.0,
+        )
+        mock_consumer.install_signal_handlers.assert_called_once()
+        mock_consumer.run.assert_awaited_once()
+        mock_sqs.start.assert_awaited_once()
+        mock_sqs.close.assert_awaited_once()
+        mock_dynamo.start.assert_awaited_once()
+        mock_dynamo.close.assert_awaited_once()
+        mock_os.close.assert_awaited_once()
+        mock_redis.close.assert_awaited_once()
         mock_tortoise.init.assert_called()
         mock_tortoise.close_connections.assert_called()
 
     @patch("workers.deletion.main.Configuration")
-    @patch("workers.deletion.main.logger")
-    async def test_main_no_queue_url(
-        self, mock_logger: MagicMock, mock_config_cls: MagicMock
-    ) -> None:
-        mock_config = MagicMock()
-        mock_config.input_queue_url = ""
-        mock_config_cls.from_env.return_value = mock_config
-        await main()
-        mock_logger.error.assert_called_with("INPUT_QUEUE_URL must be set")
-
-    @patch("workers.deletion.main.Configuration")
-    @patch("workers.deletion.main.SQSClient")
-    @patch("workers.deletion.main.logger")
-    async def test_main_loop_error(
-        self,
-        mock_logger: MagicMock,
-        mock_sqs_cls: MagicMock,
-        mock_config_cls: MagicMock,
-    ) -> None:
-        mock_config = MagicMock()
-        mock_config.input_queue_url = "http://test-queue"
-        mock_config.database_url = "sqlite://:memory:"
-        mock_config.aws_endpoint_url = "http://test"
-        mock_config.aws_region = "us-east-1"
-        mock_config.aws_access_key_id = "test"
-        mock_config.aws_secret_access_key = "test"
-        mock_config.dynamodb_table = "test-table"
-        mock_config.images_bucket = "test-bucket"
-        mock_config_cls.from_env.return_value = mock_config
-
-        mock_sqs = AsyncMock()
-        mock_sqs_cls.return_value = mock_sqs
-        mock_sqs.receive_messages.side_effect = Exception("SQS Error")
-
-        mock_stop_event = MagicMock()
-        mock_stop_event.is_set.side_effect = [False, True]
-
-        # Mock sleep to avoid waiting
-        with patch("workers.deletion.main.asyncio.sleep", new_callable=AsyncMock):
-            await main(stop_event=mock_stop_event)
-
-        mock_logger.error.assert_any_call("Error receiving messages: SQS Error")
-
-    @patch("workers.deletion.main.Configuration")
+    @patch("workers.deletion.main.RedisClient")
     @patch("workers.deletion.main.SQSClient")
-    @patch("workers.deletion.main.logger")
-    @patch("workers.deletion.main.DeletionService")
     @patch("workers.deletion.main.DynamoDBClient")
     @patch("workers.deletion.main.S3Client")
+    @patch("workers.deletion.main.DeletionService")
     @patch("workers.deletion.main.Tortoise")
-    async def test_main_loop_processing_error(
+    @patch("workers.deletion.main.AsyncOpenSearch")
+    @patch("workers.deletion.main.SQSConsumer")
+    async def test_main_closes_clients_on_error(
         self,
+        mock_consumer_cls: MagicMock,
+        mock_os_cls: MagicMock,
         mock_tortoise: MagicMock,
-        mock_s3_cls: MagicMock,
+        _mock_service_cls: MagicMock,
+        _mock_s3_cls: MagicMock,
         mock_dynamo_cls: MagicMock,
-        mock_service_cls: MagicMock,
-        mock_logger: MagicMock,
         mock_sqs_cls: MagicMock,
+        mock_redis_cls: MagicMock,
         mock_config_cls: MagicMock,
     ) -> None:
-        # pylint: disable=too-many-arguments,too-many-positional-arguments,unused-argument  # noqa: E501
-        mock_config = MagicMock()
-        mock_config.input_queue_url = "http://test-queue"
-        mock_config.database_url = "sqlite://:memory:"
-        mock_config.aws_endpoint_url = "http://test"
-        mock_config.aws_region = "us-east-1"
-        mock_config.aws_access_key_id = "test"
-        mock_config.aws_secret_access_key = "test"
-        mock_config.dynamodb_table = "test-table"
-        mock_config.images_bucket = "test-bucket"
-        mock_config_cls.from_env.return_value = mock_config
-
+        # pylint: disable=too-many-arguments,too-many-positional-arguments
+        mock_config_cls.from_env.return_value.input_queue_url = "http://test-queue"
         mock_tortoise.init = AsyncMock()
         mock_tortoise.close_connections = AsyncMock()
+        mock_sqs_cls.return_value = AsyncMock()
+        mock_dynamo_cls.return_value = AsyncMock()
+        mock_os_cls.return_value = AsyncMock()
+        mock_redis_cls.return_value = AsyncMock()
+        mock_consumer_cls.return_value.run = AsyncMock(side_effect=KeyboardInterrupt)
 
-        mock_sqs = AsyncMock()
-        mock_sqs_cls.return_value = mock_sqs
-        mock_sqs.receive_messages.return_value = [
-            {"Body": "invalid json", "ReceiptHandle": "abc"}
-        ]
-
-        mock_stop_event = MagicMock()
-        mock_stop_event.is_set.side_effect = [False, True]
-
-        await main(stop_event=mock_stop_event)
+        with self.assertRaises(KeyboardInterrupt):
+            await main()
 
-        mock_logger.error.assert_any_call(
-            "Error processing message: Expecting value: line 1 column 1 (char 0)"
-        )
+        mock_sqs_cls.return_value.close.assert_awaited_once()
+        mock_dynamo_cls.return_value.close.assert_awaited_once()
+        mock_os_cls.return_value.close.assert_awaited_once()
+        mock_redis_cls.return_value.close.assert_awaited_once()
+        mock_tortoise.close_connections.assert_awaited_once()
 
     @patch("workers.deletion.main.Configuration")
-    @patch("workers.deletion.main.SQSClient")
-    @patch("workers.deletion.main.DynamoDBClient")
-    @patch("workers.deletion.main.S3Client")
-    @patch("workers.deletion.main.DeletionService")
-    @patch("workers.deletion.main.Tortoise")
-    @patch("workers.deletion.main.asyncio")
-    @patch("workers.deletion.main.signal")
-    async def test_main_signal_handling(
-        self,
-        mock_signal: MagicMock,
-        mock_asyncio: MagicMock,
-        mock_tortoise: MagicMock,
-        mock_service_cls: MagicMock,
-        mock_s3_cls: MagicMock,
-        mock_dynamo_cls: MagicMock,
-        mock_sqs_cls: MagicMock,
-        mock_config_cls: MagicMock,
+    @patch("workers.deletion.main.logger")
+    async def test_main_no_queue_url(
+        self, mock_logger: MagicMock, mock_config_cls: MagicMock
     ) -> None:
-        # pylint: disable=too-many-arguments,too-many-positional-arguments,unused-argument  # noqa: E501
-        # Mock config
         mock_config = MagicMock()
-        mock_config.input_queue_url = "http://test-queue"
+        mock_config.input_queue_url = ""
         mock_config_cls.from_env.return_value = mock_config
+        await main()
+        mock_logger.error.assert_called_with("INPUT_QUEUE_URL must be set")
 
-        mock_tortoise.init = AsyncMock()
-        mock_tortoise.close_connections = AsyncMock()
-
-        # Mock loop
-        mock_loop = MagicMock()
-        mock_asyncio.get_running_loop.return_value = mock_loop
-
-        # Mock SQS to return nothing then stop
-        mock_sqs = AsyncMock()
-        mock_sqs_cls.return_value = mock_sqs
-        mock_sqs.receive_messages.return_value = []
-
-        # We need to capture the signal handler
-        captured_handler = None
-
-        def add_signal_handler(sig: Any, handler: Any) -> None:
-            nonlocal captured_handler
-            captured_handler = handler
-
-        mock_loop.add_signal_handler.side_effect = add_signal_handler
-
-        # Mock stop event to control loop
-        mock_stop_event = MagicMock()
-        # Initial check returns False (loop runs), then we trigger signal,
-        # then next check returns True (loop stops)
-        mock_stop_event.is_set.side_effect = [False, True]
-
-        await main(stop_event=mock_stop_event)
-
-        # Verify signal handler was added
-        self.assertTrue(mock_loop.add_signal_handler.called)
 
-        # Verify signal handler logic
-        if captured_handler:
-            captured_handler()
-            mock_stop_event.set.assert_called_once()
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,19 @@
+import base64
 import json
 import unittest
-from unittest.mock import AsyncMock, MagicMock, patch
+from collections.abc import AsyncIterator
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 from shared.clients.s3_client import S3Client
 from shared.clients.sqs_client import SQSClient
 from workers.image_explainer.services.explainer_service import ExplainerService
 
 
+async def _stream(*chunks: bytes) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
 class TestExplainerService(unittest.IsolatedAsyncioTestCase):
     # pylint: disable=protected-access
     async def asyncSetUp(self) -> None:
@@ -24,8 +31,10 @@ class TestExplainerService(unittest.IsolatedAsyncioTestCase):
         )
 
     async def test_process_message_success(self) -> None:
-        # Mock S3 download
-        self.mock_s3.download_bytes = AsyncMock(return_value=b"fake-image-bytes")
+        # Mock S3 download, split so that chunks are not 3-byte aligned
+        self.mock_s3.download_stream = MagicMock(
+            return_value=_stream(b"fake-", b"image", b"-bytes")
+        )
         self.mock_sqs.send_message = AsyncMock()
 
         message_body = json.dumps(
@@ -46,14 +55,18 @@ class TestExplainerService(unittest.IsolatedAsyncioTestCase):
             await self.service.process_message(message_body)
 
             mock_explain.assert_called_once()
-            self.mock_s3.download_bytes.assert_called_once_with(
-                "bucket", "123/image.jpg"
+            expected = base64.b64encode(b"fake-image-bytes").decode("utf-8")
+            self.assertEqual(
+                mock_explain.call_args[0][1], f"data:image/jpeg;base64,{expected}"
+            )
+            self.mock_s3.download_stream.assert_called_once_with(
+                "bucket", "123/image.jpg", chunk_size=ANY
             )
             self.mock_sqs.send_message.assert_called_once()
 
             sent_msg = self.mock_sqs.send_message.call_args[0][0]
-            self.assertEqual(sent_msg["explanation"], "Beautiful landscape")
-            self.assertEqual(sent_msg["scraping_id"], 123)
+            self.assertEqual(sent_msg.explanation, "Beautiful landscape")
+            self.assertEqual(sent_msg.scraping_id, 123)
 
     async def test_process_message_no_s3_path(self) -> None:
         await self.service.process_message(json.dumps({}))
@@ -65,7 +78,7 @@ class TestExplainerService(unittest.IsolatedAsyncioTestCase):
         self.mock_sqs.send_message.assert_not_called()
 
     async def test_process_message_download_failure(self) -> None:
-        self.mock_s3.download_bytes = AsyncMock(return_value=None)
+        self.mock_s3.download_stream = MagicMock(return_value=_stream())
 
         message_body = json.dumps(
             {
@@ -83,7 +96,7 @@ class TestExplainerService(unittest.IsolatedAsyncioTestCase):
 
     async def test_process_message_exception(self) -> None:
         # Broad exception test
-        self.mock_s3.download_bytes = AsyncMock(side_effect=Exception("S3 Error"))
+        self.mock_s3.download_stream = MagicMock(side_effect=Exception("S3 Error"))
 
         message_body = json.dumps(
             {
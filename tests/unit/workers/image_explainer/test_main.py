@@ -1,33 +1,30 @@
-import json
 import unittest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 from workers.image_explainer.main import main
 
 
-# pylint: disable=too-many-arguments,too-many-positional-arguments
-# pylint: disable=broad-exception-caught,unused-argument
 class TestMain(unittest.IsolatedAsyncioTestCase):
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
     @patch("workers.image_explainer.main.Configuration")
     @patch("workers.image_explainer.main.SQSClient")
     @patch("workers.image_explainer.main.S3Client")
     @patch("workers.image_explainer.main.ExplainerService")
-    @patch("workers.image_explainer.main.asyncio.sleep")
+    @patch("workers.image_explainer.main.SQSConsumer")
     async def test_main_success(
         self,
-        mock_sleep: MagicMock,
+        mock_consumer_cls: MagicMock,
         mock_service_cls: MagicMock,
         mock_s3_cls: MagicMock,
         mock_sqs_cls: MagicMock,
         mock_config_cls: MagicMock,
     ) -> None:
-        # Prevent infinite loop by making sleep raise an exception on second call
-        mock_sleep.side_effect = [None, Exception("Break Loop")]
-
         # Configuration mock
         mock_config = MagicMock()
         mock_config.input_queue_url = "http://queue/input"
         mock_config.writer_queue_url = "http://queue/writer"
+        mock_config.worker_concurrency = 4
+        mock_config.message_timeout_seconds = 300.0
         mock_config_cls.from_env.return_value = mock_config
 
         # Client mocks
@@ -38,44 +35,44 @@ class TestMain(unittest.IsolatedAsyncioTestCase):
         mock_service = AsyncMock()
         mock_service_cls.return_value = mock_service
 
-        # Simulate one message and then empty list
-        mock_sqs.receive_messages.side_effect = [
-            [{"Body": json.dumps({"test": "data"}), "ReceiptHandle": "abc"}],
-            [],
-        ]
+        mock_consumer = MagicMock()
+        mock_consumer.run = AsyncMock()
+        mock_consumer_cls.return_value = mock_consumer
 
-        # Run main and catch the "Break Loop" exception if it reaches the sleep
-        try:
-            await main()
-        except Exception as e:
-            if str(e) != "Break Loop":
-                raise e
+        await main()
 
         # Verify initializations
         mock_config_cls.from_env.assert_called_once()
         mock_sqs_cls.create.assert_called_once_with(mock_config)
         mock_s3_cls.create.assert_called_once_with(mock_config)
 
-        # Verify service call
-        mock_service.process_message.assert_called_once()
-        mock_sqs.delete_message.assert_called_once_with("http://queue/input", "abc")
+        # Verify the consumer runs the service handler
+        mock_consumer_cls.assert_called_once_with(
+            mock_sqs,
+            "http://queue/input",
+            mock_service.process_message,
+            concurrency=4,
+            message_timeout=300.0,
+            claim_check=ANY,
+        )
+        mock_consumer.install_signal_handlers.assert_called_once()
+        mock_consumer.run.assert_awaited_once()
+        mock_sqs.start.assert_awaited_once()
+        mock_sqs.close.assert_awaited_once()
 
     @patch("workers.image_explainer.main.Configuration")
     @patch("workers.image_explainer.main.SQSClient")
     @patch("workers.image_explainer.main.S3Client")
     @patch("workers.image_explainer.main.ExplainerService")
-    @patch("workers.image_explainer.main.asyncio.sleep")
-    async def test_main_polling_error(
+    @patch("workers.image_explainer.main.SQSConsumer")
+    async def test_main_consumer_error(
         self,
-        mock_sleep: MagicMock,
-        mock_service_cls: MagicMock,
-        mock_s3_cls: MagicMock,
+        mock_consumer_cls: MagicMock,
+        _mock_service_cls: MagicMock,
+        _mock_s3_cls: MagicMock,
         mock_sqs_cls: MagicMock,
         mock_config_cls: MagicMock,
     ) -> None:
-        # Prevent infinite loop
-        mock_sleep.side_effect = [None, Exception("Break Loop")]
-
         mock_config = MagicMock()
         mock_config.input_queue_url = "http://queue/input"
         mock_config.writer_queue_url = "http://queue/writer"
@@ -84,17 +81,15 @@ class TestMain(unittest.IsolatedAsyncioTestCase):
         mock_sqs = AsyncMock()
         mock_sqs_cls.create.return_value = mock_sqs
 
-        # Raise exception on first call, empty on second
-        mock_sqs.receive_messages.side_effect = [Exception("Polling Error"), []]
+        mock_consumer_cls.return_value.run = AsyncMock(
+            side_effect=Exception("Consumer Error")
+        )
 
-        try:
+        with self.assertRaisesRegex(Exception, "Consumer Error"):
             await main()
-        except Exception as e:
-            if str(e) != "Break Loop":
-                raise e
 
-        # Should have called sleep once due to polling error
-        mock_sleep.assert_any_call(5)
+        # The SQS client is closed even if the consumer fails
+        mock_sqs.close.assert_awaited_once()
 
     @patch("workers.image_explainer.main.Configuration")
     async def test_main_missing_config(self, mock_config_cls: MagicMock) -> None:
@@ -2,6 +2,7 @@ import json
 import unittest
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from shared.messages import PageSummaryWriterMessage
 from workers.page_summarizer.services.summarizer_service import SummarizerService
 
 
@@ -49,10 +50,41 @@ class TestSummarizerService(unittest.IsolatedAsyncioTestCase):
 
         # Check Writer Message
         writer_args = self.mock_sqs.send_message.call_args_list[0][0]
-        self.assertEqual(writer_args[0]["type"], "page_summary")
-        self.assertEqual(writer_args[0]["summary"], "Summary")
+        self.assertEqual(
+            writer_args[0],
+            PageSummaryWriterMessage(
+                scraping_id=123, url="http://example.com", summary="Summary"
+            ),
+        )
         self.assertEqual(writer_args[1], self.writer_queue)
 
+        # Check Indexer Message
+        indexer_args = self.mock_sqs.send_message.call_args_list[1][0]
+        self.assertEqual(indexer_args[0].user_id, 1)
+        self.assertEqual(indexer_args[1], indexer_queue)
+
+    async def test_process_message_offloads_indexer_message(
+        self, mock_factory: MagicMock
+    ) -> None:
+        msg_body = json.dumps(
+            {"scraping_id": 123, "url": "http://example.com", "content": "text"}
+        )
+        mock_factory.summarize_text = AsyncMock(return_value="Summary")
+        mock_claim_check = MagicMock()
+        service = SummarizerService(
+            self.mock_sqs,
+            self.writer_queue,
+            indexer_queue_url="indexer-queue",
+            claim_check=mock_claim_check,
+        )
+
+        await service.process_message(msg_body)
+
+        writer_call, indexer_call = self.mock_sqs.send_message.call_args_list
+        # The writer does not resolve claim checks
+        self.assertEqual(len(writer_call[0]), 2)
+        self.assertIs(indexer_call[0][2], mock_claim_check)
+
     async def test_process_message_missing_fields(
         self, _mock_factory: MagicMock
     ) -> None:
@@ -21,6 +21,7 @@ class TestConfiguration(unittest.TestCase):
             "WRITER_QUEUE_URL",
             "LLM_PROVIDER",
             "LLM_API_KEY",
+            "CLAIM_CHECK_BUCKET",
         ]
         old_values = {v: os.environ.get(v) for v in vars_to_clear}
         for v in vars_to_clear:
@@ -32,6 +33,7 @@ class TestConfiguration(unittest.TestCase):
             self.assertEqual(config.aws_endpoint_url, "http://localstack:4566")
             self.assertEqual(config.input_queue_url, "")
             self.assertEqual(config.llm_provider, "openai")
+            self.assertIsNone(config.claim_check_bucket)
         finally:
             # Restore
             for v, val in old_values.items():
@@ -41,10 +43,13 @@ class TestConfiguration(unittest.TestCase):
     def test_from_env_custom(self) -> None:
         os.environ["INPUT_QUEUE_URL"] = "http://custom-input"
         os.environ["REDIS_PORT"] = "1234"
+        os.environ["CLAIM_CHECK_BUCKET"] = "claims"
         try:
             config = Configuration.from_env()
             self.assertEqual(config.input_queue_url, "http://custom-input")
             self.assertEqual(config.redis_port, 1234)
+            self.assertEqual(config.claim_check_bucket, "claims")
         finally:
             del os.environ["INPUT_QUEUE_URL"]
             del os.environ["REDIS_PORT"]
+            del os.environ["CLAIM_CHECK_BUCKET"]
@@ -1,48 +1,56 @@
 import unittest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 from workers.page_summarizer.main import main
 
 
 class TestMain(unittest.IsolatedAsyncioTestCase):
+    @patch("workers.page_summarizer.main.SQSConsumer")
     @patch("workers.page_summarizer.main.SQSClient")
     @patch("workers.page_summarizer.main.SummarizerService")
     @patch("workers.page_summarizer.main.Configuration")
-    async def test_main_loop_success(
+    async def test_main_runs_consumer(
         self,
         mock_config_cls: MagicMock,
         mock_service_cls: MagicMock,
         mock_sqs_cls: MagicMock,
+        mock_consumer_cls: MagicMock,
     ) -> None:
         # Setup Mocks
         mock_config = MagicMock()
         mock_config.input_queue_url = "input"
         mock_config.writer_queue_url = "writer"
         mock_config.llm_provider = "mock"
+        mock_config.worker_concurrency = 4
+        mock_config.message_timeout_seconds = 300.0
         mock_config_cls.from_env.return_value = mock_config
 
         mock_sqs = AsyncMock()
         mock_sqs_cls.create.return_value = mock_sqs
 
-        # Mock message receipt
-        mock_sqs.receive_messages.side_effect = [
-            [{"Body": "{}", "ReceiptHandle": "handle"}],  # First iteration: 1 message
-            KeyboardInterrupt("Stop Loop"),  # Second iteration: Stop loop
-        ]
-
         mock_service = AsyncMock()
         mock_service_cls.return_value = mock_service
 
+        mock_consumer = MagicMock()
+        mock_consumer.run = AsyncMock()
+        mock_consumer_cls.return_value = mock_consumer
+
         # Run Main
-        try:
-            await main()
-        except KeyboardInterrupt:
-            pass
+        await main()
 
         # Verify
-        mock_sqs.receive_messages.assert_called()
-        mock_service.process_message.assert_called()
-        mock_sqs.delete_message.assert_called()
+        mock_consumer_cls.assert_called_once_with(
+            mock_sqs,
+            "input",
+            mock_service.process_message,
+            concurrency=4,
+            message_timeout=300.0,
+            claim_check=ANY,
+        )
+        mock_consumer.install_signal_handlers.assert_called_once()
+        mock_consumer.run.assert_awaited_once()
+        mock_sqs.start.assert_awaited_once()
+        mock_sqs.close.assert_awaited_once()
 
     @patch("workers.page_summarizer.main.Configuration")
     async def test_main_missing_config(self, mock_config_cls: MagicMock) -> None:
@@ -53,39 +61,32 @@ class TestMain(unittest.IsolatedAsyncioTestCase):
         await main()
         # Should return immediately
 
-    @patch("workers.page_summarizer.main.asyncio.sleep", new_callable=AsyncMock)
+    @patch("workers.page_summarizer.main.SQSConsumer")
     @patch("workers.page_summarizer.main.SQSClient")
     @patch("workers.page_summarizer.main.SummarizerService")
     @patch("workers.page_summarizer.main.Configuration")
-    async def test_main_loop_exception(
+    async def test_main_closes_client_on_error(
         self,
         mock_config_cls: MagicMock,
-        mock_service_cls: MagicMock,
+        _mock_service_cls: MagicMock,
         mock_sqs_cls: MagicMock,
-        mock_sleep: AsyncMock,
+        mock_consumer_cls: MagicMock,
     ) -> None:
         mock_config = MagicMock()
         mock_config.input_queue_url = "input"
         mock_config.writer_queue_url = "writer"
-        mock_config.llm_provider = "mock"
         mock_config_cls.from_env.return_value = mock_config
 
         mock_sqs = AsyncMock()
         mock_sqs_cls.create.return_value = mock_sqs
 
-        # Raise exception first, then stop
-        mock_sqs.receive_messages.side_effect = [
-            Exception("Polling error"),
-            KeyboardInterrupt("Stop"),
-        ]
+        mock_consumer_cls.return_value.run = AsyncMock(side_effect=KeyboardInterrupt)
 
-        # Mock service to avoid instantiation issues if any
-        mock_service = AsyncMock()
-        mock_service_cls.return_value = mock_service
-
-        try:
+        with self.assertRaises(KeyboardInterrupt):
             await main()
-        except KeyboardInterrupt:
-            pass
 
-        mock_sleep.assert_called_once_with(1)
+        mock_sqs.close.assert_awaited_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import json
 import os
 import sys
 import time
@@ -57,47 +58,44 @@ def submit_job() -> int:
 
 
 def monitor_job(job_id: int) -> None:
-    """Polls the job status until completion."""
-    headers = {"X-API-Key": API_KEY}
-    start_time = time.time()
+    """
+    Follows the progress events of the job until it ends, exiting non-zero
+    unless it completed within TIMEOUT seconds.
+    """
+    headers = {"X-API-Key": API_KEY, "Accept": "text/event-stream"}
+    deadline = time.time() + TIMEOUT
 
     print(f"Monitoring job {job_id}...")
-    while time.time() - start_time < TIMEOUT:
-        try:
-            response = requests.get(
-                f"{API_URL}/scrape", params={"scraping_id": job_id}, headers=headers
-            )
+    try:
+        with requests.get(
+            f"{API_URL}/scraping/{job_id}/events",
+            headers=headers,
+            stream=True,
+            # The stream sends a status event at least every 15 seconds
+            timeout=(5, 60),
+        ) as response:
             response.raise_for_status()
-            data = response.json()
-
-            # Assuming the API returns a list or a single object.
-            # Adjusting based on likely API structure.
-            # If the API returns a list of scrapings,
-            # we pick the first one matching our ID.
-            if isinstance(data, list):
-                if not data:
-                    print("Job not found.")
+            event = None
+            for line in response.iter_lines(decode_unicode=True):
+                if time.time() > deadline:
+                    print("Timeout waiting for job completion.")
                     sys.exit(1)
-                job = data[0]
-            else:
-                job = data
-
-            status = job.get("status")
-            print(f"Job Status: {status}")
-
-            if status == "COMPLETED":
-                print("Job completed successfully!")
-                return
-            elif status == "FAILED" or status == "ERROR":
-                print("Job failed.")
-                sys.exit(1)
-
-        except requests.RequestException as e:
-            print(f"Error checking job status: {e}")
-
-        time.sleep(POLL_INTERVAL)
+                if line.startswith("event: "):
+                    event = line.removeprefix("event: ")
+                elif line.startswith("data: "):
+                    data = line.removeprefix("data: ")
+                    print(f"Job {event}: {data}")
+                    if event in ("completed", "failed"):
+                        if json.loads(data).get("status") != "COMPLETED":
+                            print("Job failed.")
+                            sys.exit(1)
+                        print("Job completed successfully!")
+                        return
+    except requests.RequestException as e:
+        print(f"Error following job progress: {e}")
+        sys.exit(1)
 
-    print("Timeout waiting for job completion.")
+    print("Progress stream ended before job completion.")
     sys.exit(1)
 
 
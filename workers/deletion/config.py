@@ -13,6 +13,8 @@ class Configuration(BaseConfiguration):
     input_queue_url: str
     images_bucket: str
     opensearch_url: str
+    worker_concurrency: int
+    message_timeout_seconds: float
 
     @classmethod
     def from_env(cls) -> "Configuration":
@@ -25,6 +27,7 @@ class Configuration(BaseConfiguration):
             aws_region=os.getenv("AWS_REGION", "us-east-1"),
             aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID", "test"),
             aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY", "test"),
+            aws_max_pool_connections=int(os.getenv("AWS_MAX_POOL_CONNECTIONS", "10")),
             sqs_queue_url=os.getenv(
                 "SQS_QUEUE_URL",
                 "http://localstack:4566/000000000000/scraper-queue",
@@ -43,4 +46,6 @@ class Configuration(BaseConfiguration):
             ),
             images_bucket=os.getenv("IMAGES_BUCKET", "isidorus-images"),
             opensearch_url=os.getenv("OPENSEARCH_URL", "http://opensearch:9200"),
+            worker_concurrency=int(os.getenv("WORKER_CONCURRENCY", "2")),
+            message_timeout_seconds=float(os.getenv("MESSAGE_TIMEOUT_SECONDS", "300")),
         )
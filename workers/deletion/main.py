@@ -1,14 +1,15 @@
 import asyncio
-import json
 import logging
-import signal
 
 from opensearchpy import AsyncOpenSearch
 from tortoise import Tortoise
 
 from api.clients.dynamodb_client import DynamoDBClient
+from api.clients.redis_client import RedisClient
+from api.services.scraping_cache import ScrapingCache
 from shared.clients.s3_client import S3Client
 from shared.clients.sqs_client import SQSClient
+from shared.consumer import SQSConsumer
 from workers.deletion.config import Configuration
 from workers.deletion.services.deletion_service import DeletionService
 
@@ -27,7 +28,7 @@ async def init_db(database_url: str) -> None:
     )
 
 
-async def main(stop_event: asyncio.Event | None = None) -> None:
+async def main() -> None:
     # Configuration
     config = Configuration.from_env()
 
@@ -43,7 +44,9 @@ async def main(stop_event: asyncio.Event | None = None) -> None:
         access_key=config.aws_access_key_id,
         secret_key=config.aws_secret_access_key,
         queue_url=config.input_queue_url,
+        max_pool_connections=config.aws_max_pool_connections,
     )
+    await sqs_client.start()
 
     dynamodb_client = DynamoDBClient(
         endpoint_url=config.aws_endpoint_url,
@@ -51,13 +54,16 @@ async def main(stop_event: asyncio.Event | None = None) -> None:
         access_key=config.aws_access_key_id,
         secret_key=config.aws_secret_access_key,
         table_name=config.dynamodb_table,
+        max_pool_connections=config.aws_max_pool_connections,
     )
+    await dynamodb_client.start()
 
     s3_client = S3Client(
         endpoint_url=config.aws_endpoint_url,
         region_name=config.aws_region,
         access_key=config.aws_access_key_id,
         secret_key=config.aws_secret_access_key,
+        max_pool_connections=config.aws_max_pool_connections,
     )
 
     os_client = AsyncOpenSearch(
@@ -69,54 +75,34 @@ async def main(stop_event: asyncio.Event | None = None) -> None:
         ssl_show_warn=False,
     )
 
+    redis_client = RedisClient(host=config.redis_host, port=config.redis_port)
+
     deletion_service = DeletionService(
         dynamodb_client=dynamodb_client,
         s3_client=s3_client,
         os_client=os_client,
         images_bucket=config.images_bucket,
+        scraping_cache=ScrapingCache(redis_client),
     )
 
     logger.info("Deletion worker started. Listening for deletion requests...")
 
-    if stop_event is None:
-        stop_event = asyncio.Event()
-
-    def signal_handler() -> None:
-        logger.info("Shutdown signal received")
-        if stop_event:
-            stop_event.set()
-
+    consumer = SQSConsumer(
+        sqs_client,
+        config.input_queue_url,
+        deletion_service.process_message,
+        concurrency=config.worker_concurrency,
+        message_timeout=config.message_timeout_seconds,
+    )
+    consumer.install_signal_handlers()
     try:
-        loop = asyncio.get_running_loop()
-        for sig in (signal.SIGINT, signal.SIGTERM):
-            loop.add_signal_handler(sig, signal_handler)
-    except NotImplementedError:
-        # Signal handlers not supported on some platforms (e.g. Windows)
-        pass
-
-    while not stop_event.is_set():
-        try:
-            messages = await sqs_client.receive_messages(
-                config.input_queue_url, max_messages=1, wait_time=5
-            )
-            for msg in messages:
-                try:
-                    body = json.loads(msg["Body"])
-                    scraping_id = body.get("scraping_id")
-                    if scraping_id:
-                        await deletion_service.cleanup_scraping(scraping_id)
-
-                    await sqs_client.delete_message(
-                        config.input_queue_url, msg["ReceiptHandle"]
-                    )
-                except Exception as e:
-                    logger.error(f"Error processing message: {e}")
-        except Exception as e:
-            logger.error(f"Error receiving messages: {e}")
-            await asyncio.sleep(5)
-
-    await os_client.close()
-    await Tortoise.close_connections()
+        await consumer.run()
+    finally:
+        await sqs_client.close()
+        await dynamodb_client.close()
+        await os_client.close()
+        await redis_client.close()
+        await Tortoise.close_connections()
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import Any
 
@@ -5,12 +6,26 @@ from opensearchpy import AsyncOpenSearch
 
 from api import models as api_models
 from api.clients.dynamodb_client import DynamoDBClient
+from api.repositories.db_repository import DbRepository, ResultsHeir
+from api.services.scraping_cache import ScrapingCache
 from shared.clients.s3_client import S3Client
+from shared.messages import DeletionMessage, decode_message
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_S3_BATCH_SIZE = 10000
+S3_DELETE_RETRIES = 3
+S3_DELETE_RETRY_BACKOFF_SECONDS = 0.5
+
+
+class S3CleanupError(Exception):
+    """
+    Raised when some S3 objects of a scraping could not be deleted.
+    """
+
 
 class DeletionService:  # pylint: disable=too-few-public-methods
+    # pylint: disable=too-many-instance-attributes
     def __init__(
         self,
         dynamodb_client: DynamoDBClient,
@@ -18,7 +33,9 @@ class DeletionService:  # pylint: disable=too-few-public-methods
         os_client: AsyncOpenSearch,
         images_bucket: str,
         batch_size: int = 5000,
-        s3_batch_size: int = 1000,
+        s3_batch_size: int = DEFAULT_S3_BATCH_SIZE,
+        db_repository: DbRepository | None = None,
+        scraping_cache: ScrapingCache | None = None,
     ):
         self.__dynamodb_client = dynamodb_client
         self.__s3_client = s3_client
@@ -26,6 +43,16 @@ class DeletionService:  # pylint: disable=too-few-public-methods
         self.__images_bucket = images_bucket
         self.__batch_size = batch_size
         self.__s3_batch_size = s3_batch_size
+        self.__db_repository = db_repository or DbRepository()
+        self.__scraping_cache = scraping_cache
+
+    async def process_message(self, message_body: str) -> None:
+        """
+        Processes a message from the deletion-queue.
+        Raises if the cleanup fails so that the message is redelivered.
+        """
+        message = decode_message(message_body, DeletionMessage)
+        await self.cleanup_scraping(message.scraping_id)
 
     async def cleanup_scraping(self, scraping_id: int) -> bool:
         """
@@ -34,11 +61,18 @@ class DeletionService:  # pylint: disable=too-few-public-methods
         logger.info("Starting cleanup for scraping_id: %s", scraping_id)
 
         try:
+            # 0. Results still reused by an alias are handed over to it,
+            # after which the steps below find nothing of them to delete
+            heir = await self.__db_repository.transfer_results(scraping_id)
+
             # 1. Delete S3 Objects first (we need the paths from DB)
             await self.__cleanup_s3_objects(scraping_id)
 
             # 2. Delete OpenSearch Data
-            await self.__cleanup_opensearch_data(scraping_id)
+            if heir:
+                await self.__transfer_opensearch_data(scraping_id, heir)
+            else:
+                await self.__cleanup_opensearch_data(scraping_id)
 
             # 3. Delete Relational Data in batches
             await self.__cleanup_relational_data(scraping_id)
@@ -51,6 +85,11 @@ class DeletionService:  # pylint: disable=too-few-public-methods
             if scraping:
                 await scraping.delete()
 
+            # 5. Stop serving the scraping and the aliases of its results
+            # from the API cache
+            if self.__scraping_cache:
+                await self.__scraping_cache.purge(scraping_id)
+
             logger.info("Successfully cleaned up scraping_id: %s", scraping_id)
             return True
         except Exception as e:
@@ -84,12 +123,33 @@ class DeletionService:  # pylint: disable=too-few-public-methods
                         keys.append(parts[0])
 
             if keys:
-                await self.__s3_client.delete_objects(self.__images_bucket, keys)
+                await self.__delete_s3_keys(keys)
 
             if len(images) < self.__s3_batch_size:
                 break
             offset += self.__s3_batch_size
 
+    async def __delete_s3_keys(self, keys: list[str]) -> None:
+        """
+        Deletes the keys from the images bucket, retrying the ones that failed.
+        """
+        result = await self.__s3_client.delete_objects(self.__images_bucket, keys)
+        for attempt in range(S3_DELETE_RETRIES):
+            if not result["failed_keys"]:
+                return
+            logger.warning(
+                "Retrying deletion of %s S3 objects", len(result["failed_keys"])
+            )
+            await asyncio.sleep(S3_DELETE_RETRY_BACKOFF_SECONDS * 2**attempt)
+            result = await self.__s3_client.delete_objects(
+                self.__images_bucket, result["failed_keys"]
+            )
+        if result["failed_keys"]:
+            # Failing the cleanup keeps the DB paths so a redelivery can retry
+            raise S3CleanupError(
+                f"Could not delete {len(result['failed_keys'])} S3 objects"
+            )
+
     async def __cleanup_relational_data(self, scraping_id: int) -> None:
         """
         Deletes related records in batches to avoid locking issues.
@@ -148,3 +208,39 @@ class DeletionService:  # pylint: disable=too-few-public-methods
             logger.error(
                 "Failed to cleanup OpenSearch for scraping_id %s: %s", scraping_id, e
             )
+
+    async def __transfer_opensearch_data(
+        self, scraping_id: int, heir: ResultsHeir
+    ) -> None:
+        """
+        Reassigns the OpenSearch documents of the scraping to the alias that
+        took over its results, so that they are searched by its owner.
+        """
+        logger.info(
+            "Transferring OpenSearch documents of scraping_id %s to %s",
+            scraping_id,
+            heir["id"],
+        )
+        try:
+            body = {
+                "query": {"term": {"scraping_id": scraping_id}},
+                "script": {
+                    "source": "ctx._source.scraping_id = params.scraping_id; "
+                    "ctx._source.user_id = params.user_id",
+                    "params": {"scraping_id": heir["id"], "user_id": heir["user_id"]},
+                },
+            }
+            await self.__os_client.update_by_query(
+                index="scraped_pages",
+                body=body,
+                conflicts="proceed",
+                wait_for_completion=True,
+                refresh=True,
+            )
+        except Exception as e:
+            # Like deletions, a failure only leaves the search index stale
+            logger.error(
+                "Failed to transfer OpenSearch documents of scraping_id %s: %s",
+                scraping_id,
+                e,
+            )
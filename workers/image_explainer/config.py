@@ -5,7 +5,7 @@ from shared.config import Configuration as BaseConfiguration
 
 
 @dataclass
-class Configuration(BaseConfiguration):
+class Configuration(BaseConfiguration):  # pylint: disable=too-many-instance-attributes
     """
     Worker-specific configuration.
     """
@@ -16,6 +16,8 @@ class Configuration(BaseConfiguration):
     images_bucket: str
     llm_provider: str
     llm_api_key: str | None
+    worker_concurrency: int
+    message_timeout_seconds: float
 
     @classmethod
     def from_env(cls) -> "Configuration":
@@ -28,6 +30,7 @@ class Configuration(BaseConfiguration):
             aws_region=os.getenv("AWS_REGION", "us-east-1"),
             aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID", "test"),
             aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY", "test"),
+            aws_max_pool_connections=int(os.getenv("AWS_MAX_POOL_CONNECTIONS", "10")),
             sqs_queue_url=os.getenv(
                 "SQS_QUEUE_URL",
                 "http://localstack:4566/000000000000/scraper-queue",
@@ -46,4 +49,6 @@ class Configuration(BaseConfiguration):
             images_bucket=os.getenv("IMAGES_BUCKET", "isidorus-images"),
             llm_provider=os.getenv("LLM_PROVIDER", "openai"),
             llm_api_key=os.getenv("LLM_API_KEY"),
+            worker_concurrency=int(os.getenv("WORKER_CONCURRENCY", "4")),
+            message_timeout_seconds=float(os.getenv("MESSAGE_TIMEOUT_SECONDS", "300")),
         )
@@ -1,8 +1,10 @@
 import asyncio
 import logging
 
+from shared.clients.claim_check import ClaimCheck
 from shared.clients.s3_client import S3Client
 from shared.clients.sqs_client import SQSClient
+from shared.consumer import SQSConsumer
 from workers.image_explainer.config import Configuration
 from workers.image_explainer.services.explainer_service import ExplainerService
 
@@ -23,7 +25,10 @@ async def main() -> None:
 
     # Dependency Injection
     sqs_client = SQSClient.create(config)
+    await sqs_client.start()
     s3_client = S3Client.create(config)
+    # Resolves bodies that producers offloaded to S3
+    claim_check = ClaimCheck(s3_client)
 
     service = ExplainerService(
         sqs_client=sqs_client,
@@ -35,21 +40,19 @@ async def main() -> None:
 
     # Main Loop
     logger.info("Image Explainer Worker listening on %s...", config.input_queue_url)
-    while True:
-        try:
-            # SQSClient.receive_messages is now async
-            messages = await sqs_client.receive_messages(config.input_queue_url)
-            for message in messages:
-                await service.process_message(message["Body"])
-
-                # Delete message is now async
-                await sqs_client.delete_message(
-                    config.input_queue_url, message["ReceiptHandle"]
-                )
-
-        except Exception as e:  # pylint: disable=broad-exception-caught
-            logger.error("Polling error: %s", e)
-            await asyncio.sleep(5)
+    consumer = SQSConsumer(
+        sqs_client,
+        config.input_queue_url,
+        service.process_message,
+        concurrency=config.worker_concurrency,
+        message_timeout=config.message_timeout_seconds,
+        claim_check=claim_check,
+    )
+    consumer.install_signal_handlers()
+    try:
+        await consumer.run()
+    finally:
+        await sqs_client.close()
 
 
 if __name__ == "__main__":  # pragma: no cover
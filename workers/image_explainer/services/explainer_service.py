@@ -1,13 +1,21 @@
 import base64
-import json
 import logging
 
 from shared.clients.s3_client import S3Client
 from shared.clients.sqs_client import SQSClient
+from shared.messages import (
+    ImageExplainerMessage,
+    ImageExplanationWriterMessage,
+    InvalidMessageError,
+    decode_message,
+)
 from workers.image_explainer.services.explainer_factory import ExplainerFactory
 
 logger = logging.getLogger(__name__)
 
+# A multiple of 3 lets full chunks be encoded without carrying bytes over
+DOWNLOAD_CHUNK_SIZE = 3 * 256 * 1024
+
 
 class ExplainerService:
     # pylint: disable=too-few-public-methods,too-many-arguments
@@ -33,11 +41,8 @@ class ExplainerService:
         3. Sends explanation to writer-queue.
         """
         try:
-            body = json.loads(message_body)
-            s3_path = body.get("s3_path")
-            scraping_id = body.get("scraping_id")
-            image_url = body.get("image_url")
-            original_url = body.get("original_url")
+            message = decode_message(message_body, ImageExplainerMessage)
+            s3_path = message.s3_path
 
             if not s3_path:
                 logger.warning("No s3_path in message")
@@ -54,30 +59,49 @@ class ExplainerService:
             bucket, key = path_parts
 
             # 1. Download image from S3
-            image_bytes = await self.__s3_client.download_bytes(bucket, key)
-            if not image_bytes:
+            base64_image = await self.__download_base64(bucket, key)
+            if not base64_image:
                 logger.error("Failed to download image from S3: %s", s3_path)
                 return
 
             # 2. Generate explanation
             # We pass a data URL to the explainer factory
-            base64_image = base64.b64encode(image_bytes).decode("utf-8")
             data_url = f"data:image/jpeg;base64,{base64_image}"
             explanation = await ExplainerFactory.explain_image(self.__llm, data_url)
 
             # 3. Send to Writer
-            writer_msg = {
-                "type": "image_explanation",
-                "url": image_url,
-                "original_url": original_url,
-                "page_url": original_url,
-                "scraping_id": scraping_id,
-                "s3_path": s3_path,
-                "explanation": explanation,
-            }
+            writer_msg = ImageExplanationWriterMessage(
+                url=message.image_url,
+                original_url=message.original_url,
+                page_url=message.original_url,
+                scraping_id=message.scraping_id,
+                s3_path=s3_path,
+                explanation=explanation,
+            )
 
             await self.__sqs_client.send_message(writer_msg, self.__writer_queue_url)
-            logger.info("Sent image explanation to writer queue: %s", image_url)
+            logger.info("Sent image explanation to writer queue: %s", message.image_url)
 
+        except InvalidMessageError as e:
+            # Redelivering a malformed message would fail the same way
+            logger.warning("Discarding image explanation message: %s", e)
         except Exception as e:  # pylint: disable=broad-exception-caught
             logger.error("Error processing image explanation: %s", e)
+
+    async def __download_base64(self, bucket: str, key: str) -> str:
+        """
+        Streams the image from S3 and base64-encodes it chunk by chunk,
+        so the raw image bytes are never held in memory as a whole.
+        """
+        encoded: list[str] = []
+        pending = b""
+        async for chunk in self.__s3_client.download_stream(
+            bucket, key, chunk_size=DOWNLOAD_CHUNK_SIZE
+        ):
+            data = pending + chunk
+            # Only whole 3-byte groups can be encoded without padding
+            cut = len(data) - len(data) % 3
+            encoded.append(base64.b64encode(data[:cut]).decode("utf-8"))
+            pending = data[cut:]
+        encoded.append(base64.b64encode(pending).decode("utf-8"))
+        return "".join(encoded)
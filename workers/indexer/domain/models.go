@@ -6,4 +6,15 @@ type IndexMessage struct {
 	Summary    string `json:"summary"`
 	ScrapingID int    `json:"scraping_id"`
 	UserID     int    `json:"user_id"`
+	// Set instead of the other fields when the producer offloaded the body to S3
+	ClaimCheck *ClaimCheckPointer `json:"claim_check,omitempty"`
 }
+
+// ClaimCheckPointer locates a message body stored in S3 (shared.clients.claim_check)
+type ClaimCheckPointer struct {
+	Bucket   string `json:"bucket"`
+	Key      string `json:"key"`
+	Encoding string `json:"encoding"`
+}
+
+const ClaimCheckEncodingGzip = "gzip"
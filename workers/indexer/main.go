@@ -12,6 +12,7 @@ import (
 	"github.com/aws/aws-sdk-go-v2/aws"
 	"github.com/aws/aws-sdk-go-v2/config"
 	"github.com/aws/aws-sdk-go-v2/credentials"
+	"github.com/aws/aws-sdk-go-v2/service/s3"
 	"github.com/aws/aws-sdk-go-v2/service/sqs"
 	"github.com/opensearch-project/opensearch-go/v2"
 
@@ -41,6 +42,9 @@ func main() {
 	}
 
 	sqsClient := sqs.NewFromConfig(awsCfg)
+	s3Client := s3.NewFromConfig(awsCfg, func(o *s3.Options) {
+		o.UsePathStyle = true
+	})
 
 	// OpenSearch Client
 	osClient, err := opensearch.NewClient(opensearch.Config{
@@ -56,7 +60,8 @@ func main() {
 	// Setup Repositories and Service
 	sqsRepo := repositories.NewSQSRepository(sqsClient, cfg.InputQueueURL)
 	osRepo := repositories.NewOpenSearchRepository(osClient)
-	indexerService := services.NewIndexerService(sqsRepo, osRepo)
+	claimCheckRepo := repositories.NewClaimCheckRepository(s3Client)
+	indexerService := services.NewIndexerService(sqsRepo, osRepo, services.WithClaimCheckRepository(claimCheckRepo))
 
 	// Context for graceful shutdown
 	ctx, cancel := context.WithCancel(context.Background())
@@ -0,0 +1,60 @@
+package repositories
+
+import (
+	"compress/gzip"
+	"context"
+	"encoding/json"
+	"fmt"
+	"io"
+
+	"github.com/aws/aws-sdk-go-v2/aws"
+	"github.com/aws/aws-sdk-go-v2/service/s3"
+	"indexer-worker/domain"
+)
+
+// ClaimCheckRepository resolves the message bodies that producers offloaded to S3.
+type ClaimCheckRepository struct {
+	client *s3.Client
+}
+
+func NewClaimCheckRepository(client *s3.Client) *ClaimCheckRepository {
+	return &ClaimCheckRepository{client: client}
+}
+
+func (r *ClaimCheckRepository) Resolve(ctx context.Context, pointer domain.ClaimCheckPointer) (domain.IndexMessage, error) {
+	var msg domain.IndexMessage
+	output, err := r.client.GetObject(ctx, &s3.GetObjectInput{
+		Bucket: aws.String(pointer.Bucket),
+		Key:    aws.String(pointer.Key),
+	})
+	if err != nil {
+		return msg, fmt.Errorf("failed to download claim check %s: %w", pointer.Key, err)
+	}
+	defer output.Body.Close()
+
+	var body io.Reader = output.Body
+	if pointer.Encoding == domain.ClaimCheckEncodingGzip {
+		gz, err := gzip.NewReader(output.Body)
+		if err != nil {
+			return msg, fmt.Errorf("failed to decompress claim check %s: %w", pointer.Key, err)
+		}
+		defer gz.Close()
+		body = gz
+	}
+	if err := json.NewDecoder(body).Decode(&msg); err != nil {
+		return msg, fmt.Errorf("invalid claim-checked message %s: %w", pointer.Key, err)
+	}
+	return msg, nil
+}
+
+// Release deletes the S3 object of a message that has been acknowledged.
+func (r *ClaimCheckRepository) Release(ctx context.Context, pointer domain.ClaimCheckPointer) error {
+	_, err := r.client.DeleteObject(ctx, &s3.DeleteObjectInput{
+		Bucket: aws.String(pointer.Bucket),
+		Key:    aws.String(pointer.Key),
+	})
+	if err != nil {
+		return fmt.Errorf("failed to release claim check %s: %w", pointer.Key, err)
+	}
+	return nil
+}
@@ -0,0 +1,56 @@
+package repositories
+
+import (
+	"bytes"
+	"compress/gzip"
+	"context"
+	"errors"
+	"io"
+	"testing"
+
+	"github.com/aws/aws-sdk-go-v2/aws"
+	"github.com/aws/aws-sdk-go-v2/service/s3"
+	"github.com/stretchr/testify/assert"
+	"indexer-worker/domain"
+)
+
+func newMockS3Client(output interface{}, err error) *s3.Client {
+	return s3.NewFromConfig(aws.Config{Region: "us-east-1"}, func(o *s3.Options) {
+		o.APIOptions = append(o.APIOptions, mockSQSMiddleware(output, err))
+	})
+}
+
+func TestClaimCheckRepository_Resolve(t *testing.T) {
+	var body bytes.Buffer
+	gz := gzip.NewWriter(&body)
+	_, _ = gz.Write([]byte(`{"url":"http://test.com","content":"big","scraping_id":1,"user_id":2}`))
+	_ = gz.Close()
+	client := newMockS3Client(&s3.GetObjectOutput{Body: io.NopCloser(&body)}, nil)
+
+	repo := NewClaimCheckRepository(client)
+	msg, err := repo.Resolve(context.TODO(), domain.ClaimCheckPointer{Bucket: "b", Key: "k", Encoding: "gzip"})
+
+	assert.NoError(t, err)
+	assert.Equal(t, "http://test.com", msg.URL)
+	assert.Equal(t, "big", msg.Content)
+	assert.Equal(t, 2, msg.UserID)
+}
+
+func TestClaimCheckRepository_Resolve_Error(t *testing.T) {
+	client := newMockS3Client(nil, errors.New("s3 error"))
+
+	repo := NewClaimCheckRepository(client)
+	_, err := repo.Resolve(context.TODO(), domain.ClaimCheckPointer{Bucket: "b", Key: "k"})
+
+	assert.Error(t, err)
+	assert.Contains(t, err.Error(), "failed to download claim check")
+}
+
+func TestClaimCheckRepository_Release(t *testing.T) {
+	client := newMockS3Client(&s3.DeleteObjectOutput{}, nil)
+
+	repo := NewClaimCheckRepository(client)
+	err := repo.Release(context.TODO(), domain.ClaimCheckPointer{Bucket: "b", Key: "k"})
+
+	assert.NoError(t, err)
+}
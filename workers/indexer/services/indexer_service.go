@@ -17,18 +17,36 @@ type OpenSearchRepository interface {
 	IndexDocument(ctx context.Context, msg domain.IndexMessage) error
 }
 
+type ClaimCheckRepository interface {
+	Resolve(ctx context.Context, pointer domain.ClaimCheckPointer) (domain.IndexMessage, error)
+	Release(ctx context.Context, pointer domain.ClaimCheckPointer) error
+}
+
 type IndexerService struct {
 	sqsRepo        SQSRepository
 	openSearchRepo OpenSearchRepository
+	claimCheckRepo ClaimCheckRepository
 	retryDelay     time.Duration
 }
 
-func NewIndexerService(sqsRepo SQSRepository, openSearchRepo OpenSearchRepository) *IndexerService {
-	return &IndexerService{
+// Functional Options Pattern
+type IndexerOption func(*IndexerService)
+
+// WithClaimCheckRepository resolves messages whose body the producer offloaded to S3.
+func WithClaimCheckRepository(r ClaimCheckRepository) IndexerOption {
+	return func(s *IndexerService) { s.claimCheckRepo = r }
+}
+
+func NewIndexerService(sqsRepo SQSRepository, openSearchRepo OpenSearchRepository, opts ...IndexerOption) *IndexerService {
+	s := &IndexerService{
 		sqsRepo:        sqsRepo,
 		openSearchRepo: openSearchRepo,
 		retryDelay:     5 * time.Second,
 	}
+	for _, opt := range opts {
+		opt(s)
+	}
+	return s
 }
 
 func (s *IndexerService) Start(ctx context.Context) {
@@ -47,6 +65,19 @@ func (s *IndexerService) Start(ctx context.Context) {
 			}
 
 			for i, msg := range messages {
+				pointer := msg.ClaimCheck
+				if pointer != nil {
+					if s.claimCheckRepo == nil {
+						log.Printf("Cannot resolve claim check %s without S3", pointer.Key)
+						continue
+					}
+					// Left for redelivery if the body cannot be fetched
+					if msg, err = s.claimCheckRepo.Resolve(ctx, *pointer); err != nil {
+						log.Printf("Error resolving claim check %s: %v", pointer.Key, err)
+						continue
+					}
+				}
+
 				log.Printf("Indexing document for URL: %s", msg.URL)
 				if err := s.openSearchRepo.IndexDocument(ctx, msg); err != nil {
 					log.Printf("Error indexing document %s: %v", msg.URL, err)
@@ -55,6 +86,13 @@ func (s *IndexerService) Start(ctx context.Context) {
 
 				if err := s.sqsRepo.DeleteMessage(ctx, handles[i]); err != nil {
 					log.Printf("Error deleting message %s: %v", handles[i], err)
+					continue
+				}
+				// The body is only needed until the message is acknowledged
+				if pointer != nil {
+					if err := s.claimCheckRepo.Release(ctx, *pointer); err != nil {
+						log.Printf("Error releasing claim check %s: %v", pointer.Key, err)
+					}
 				}
 			}
 		}
@@ -173,3 +173,85 @@ func TestIndexerService_Start_DeleteError(t *testing.T) {
 	assert.GreaterOrEqual(t, osRepo.IndexCalled, 1)
 	assert.GreaterOrEqual(t, sqsRepo.DeleteCalled, 1)
 }
+
+type MockClaimCheckRepository struct {
+	ResolveFunc   func(ctx context.Context, pointer domain.ClaimCheckPointer) (domain.IndexMessage, error)
+	ReleaseCalled int
+}
+
+func (m *MockClaimCheckRepository) Resolve(ctx context.Context, pointer domain.ClaimCheckPointer) (domain.IndexMessage, error) {
+	return m.ResolveFunc(ctx, pointer)
+}
+
+func (m *MockClaimCheckRepository) Release(ctx context.Context, pointer domain.ClaimCheckPointer) error {
+	m.ReleaseCalled++
+	return nil
+}
+
+func TestIndexerService_Start_ResolvesClaimChecks(t *testing.T) {
+	pointer := &domain.ClaimCheckPointer{Bucket: "b", Key: "k", Encoding: "gzip"}
+	sqsRepo := &MockSQSRepository{
+		ReceiveMessagesFunc: func(ctx context.Context) ([]domain.IndexMessage, []string, error) {
+			if ctx.Err() != nil {
+				return nil, nil, ctx.Err()
+			}
+			return []domain.IndexMessage{{ClaimCheck: pointer}}, []string{"handle1"}, nil
+		},
+	}
+
+	var indexed []domain.IndexMessage
+	osRepo := &MockOpenSearchRepository{
+		IndexDocumentFunc: func(ctx context.Context, msg domain.IndexMessage) error {
+			indexed = append(indexed, msg)
+			return nil
+		},
+	}
+	claimCheckRepo := &MockClaimCheckRepository{
+		ResolveFunc: func(ctx context.Context, p domain.ClaimCheckPointer) (domain.IndexMessage, error) {
+			assert.Equal(t, *pointer, p)
+			return domain.IndexMessage{URL: "http://example.com", Content: "big", ScrapingID: 1}, nil
+		},
+	}
+
+	service := NewIndexerService(sqsRepo, osRepo, WithClaimCheckRepository(claimCheckRepo))
+	service.retryDelay = 1 * time.Millisecond
+
+	ctx, cancel := context.WithTimeout(context.Background(), 100*time.Millisecond)
+	defer cancel()
+
+	go service.Start(ctx)
+
+	time.Sleep(200 * time.Millisecond)
+
+	assert.NotEmpty(t, indexed)
+	assert.Equal(t, "big", indexed[0].Content)
+	assert.GreaterOrEqual(t, sqsRepo.DeleteCalled, 1)
+	assert.Equal(t, sqsRepo.DeleteCalled, claimCheckRepo.ReleaseCalled)
+}
+
+func TestIndexerService_Start_UnresolvedClaimCheckIsKept(t *testing.T) {
+	sqsRepo := &MockSQSRepository{
+		ReceiveMessagesFunc: func(ctx context.Context) ([]domain.IndexMessage, []string, error) {
+			return []domain.IndexMessage{{ClaimCheck: &domain.ClaimCheckPointer{Key: "k"}}}, []string{"handle1"}, nil
+		},
+	}
+	osRepo := &MockOpenSearchRepository{}
+	claimCheckRepo := &MockClaimCheckRepository{
+		ResolveFunc: func(ctx context.Context, p domain.ClaimCheckPointer) (domain.IndexMessage, error) {
+			return domain.IndexMessage{}, errors.New("s3 error")
+		},
+	}
+
+	service := NewIndexerService(sqsRepo, osRepo, WithClaimCheckRepository(claimCheckRepo))
+	service.retryDelay = 1 * time.Millisecond
+
+	ctx, cancel := context.WithTimeout(context.Background(), 50*time.Millisecond)
+	defer cancel()
+
+	go service.Start(ctx)
+
+	time.Sleep(100 * time.Millisecond)
+
+	assert.Equal(t, 0, osRepo.IndexCalled)
+	assert.Equal(t, 0, sqsRepo.DeleteCalled) // Redelivered once S3 is reachable
+}
@@ -5,7 +5,7 @@ from shared.config import Configuration as BaseConfiguration
 
 
 @dataclass
-class Configuration(BaseConfiguration):
+class Configuration(BaseConfiguration):  # pylint: disable=too-many-instance-attributes
     """
     Worker-specific configuration.
     """
@@ -15,6 +15,9 @@ class Configuration(BaseConfiguration):
     llm_provider: str
     llm_api_key: str | None
     indexer_queue_url: str
+    worker_concurrency: int
+    message_timeout_seconds: float
+    claim_check_bucket: str | None
 
     @classmethod
     def from_env(cls) -> "Configuration":
@@ -27,6 +30,7 @@ class Configuration(BaseConfiguration):
             aws_region=os.getenv("AWS_REGION", "us-east-1"),
             aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID", "test"),
             aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY", "test"),
+            aws_max_pool_connections=int(os.getenv("AWS_MAX_POOL_CONNECTIONS", "10")),
             sqs_queue_url=os.getenv(
                 "SQS_QUEUE_URL",
                 "http://localstack:4566/000000000000/scraper-queue",
@@ -44,4 +48,7 @@ class Configuration(BaseConfiguration):
             llm_provider=os.getenv("LLM_PROVIDER", "openai"),
             llm_api_key=os.getenv("LLM_API_KEY"),
             indexer_queue_url=os.getenv("INDEXER_QUEUE_URL", ""),
+            worker_concurrency=int(os.getenv("WORKER_CONCURRENCY", "4")),
+            message_timeout_seconds=float(os.getenv("MESSAGE_TIMEOUT_SECONDS", "300")),
+            claim_check_bucket=os.getenv("CLAIM_CHECK_BUCKET") or None,
         )
@@ -1,7 +1,10 @@
 import asyncio
 import logging
 
+from shared.clients.claim_check import ClaimCheck
+from shared.clients.s3_client import S3Client
 from shared.clients.sqs_client import SQSClient
+from shared.consumer import SQSConsumer
 from workers.page_summarizer.config import Configuration
 from workers.page_summarizer.services.summarizer_service import SummarizerService
 
@@ -22,6 +25,10 @@ async def main() -> None:
 
     # Dependency Injection
     sqs_client = SQSClient.create(config)
+    await sqs_client.start()
+    # Resolves bodies that producers offloaded to S3, and offloads the page
+    # contents sent to the indexer when a bucket is configured
+    claim_check = ClaimCheck(S3Client.create(config), config.claim_check_bucket)
 
     summarizer_service = SummarizerService(
         sqs_client=sqs_client,
@@ -29,22 +36,23 @@ async def main() -> None:
         indexer_queue_url=config.indexer_queue_url,
         llm_provider=config.llm_provider,
         llm_api_key=config.llm_api_key,
+        claim_check=claim_check,
     )
 
-    # Main Loop
-    while True:
-        try:
-            messages = await sqs_client.receive_messages(config.input_queue_url)
-            for message in messages:
-                await summarizer_service.process_message(message["Body"])
-
-                await sqs_client.delete_message(
-                    config.input_queue_url, message["ReceiptHandle"]
-                )
-
-        except Exception as e:  # pylint: disable=broad-exception-caught
-            logger.error("Polling error: %s", e)
-            await asyncio.sleep(1)
+    # Main Loop: several LLM calls in flight per replica
+    consumer = SQSConsumer(
+        sqs_client,
+        config.input_queue_url,
+        summarizer_service.process_message,
+        concurrency=config.worker_concurrency,
+        message_timeout=config.message_timeout_seconds,
+        claim_check=claim_check,
+    )
+    consumer.install_signal_handlers()
+    try:
+        await consumer.run()
+    finally:
+        await sqs_client.close()
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -1,7 +1,14 @@
-import json
 import logging
 
+from shared.clients.claim_check import ClaimCheck
 from shared.clients.sqs_client import SQSClient
+from shared.messages import (
+    IndexMessage,
+    InvalidMessageError,
+    PageSummaryMessage,
+    PageSummaryWriterMessage,
+    decode_message,
+)
 from workers.page_summarizer.services.summarizer_factory import SummarizerFactory
 
 logger = logging.getLogger(__name__)
@@ -17,19 +24,20 @@ class SummarizerService:
         indexer_queue_url: str | None = None,
         llm_provider: str = "openai",
         llm_api_key: str | None = None,
+        claim_check: ClaimCheck | None = None,
     ):
         self.__sqs_client = sqs_client
         self.__writer_queue_url = writer_queue_url
         self.__indexer_queue_url = indexer_queue_url
+        self.__claim_check = claim_check
         self.__llm = SummarizerFactory.get_llm(llm_provider, llm_api_key)
 
     async def process_message(self, message_body: str) -> None:
         try:
-            body = json.loads(message_body)
-            scraping_id = body.get("scraping_id")
-            user_id = body.get("user_id")
-            url = body.get("url")
-            content = body.get("content")
+            message = decode_message(message_body, PageSummaryMessage)
+            scraping_id = message.scraping_id
+            url = message.url
+            content = message.content
 
             if not scraping_id or not content:
                 logger.warning("Missing required fields (scraping_id, content)")
@@ -42,30 +50,32 @@ class SummarizerService:
             logger.info("Generated summary for %s", url)
 
             # Send to Writer
-            writer_msg = {
-                "type": "page_summary",
-                "scraping_id": scraping_id,
-                "url": url,
-                "summary": summary,
-            }
+            writer_msg = PageSummaryWriterMessage(
+                scraping_id=scraping_id, url=url, summary=summary
+            )
 
             await self.__sqs_client.send_message(writer_msg, self.__writer_queue_url)
             logger.info("Sent summary for %s to writer queue", url)
 
             # Send to Indexer
             if self.__indexer_queue_url:
-                indexer_msg = {
-                    "url": url,
-                    "content": content,
-                    "summary": summary,
-                    "scraping_id": scraping_id,
-                    "user_id": user_id,
-                }
+                indexer_msg = IndexMessage(
+                    url=url,
+                    content=content,
+                    summary=summary,
+                    scraping_id=scraping_id,
+                    user_id=message.user_id,
+                )
+                # Only the indexer resolves claim checks, the writer gets the
+                # summary inline
                 await self.__sqs_client.send_message(
-                    indexer_msg, self.__indexer_queue_url
+                    indexer_msg, self.__indexer_queue_url, self.__claim_check
                 )
                 logger.info("Sent data for %s to indexer queue", url)
 
+        except InvalidMessageError as e:
+            # Redelivering a malformed message would fail the same way
+            logger.warning("Discarding page summary message: %s", e)
         except Exception as e:  # pylint: disable=broad-exception-caught
             # Catch-all to prevent worker crash on single message failure
             logger.error("Error processing page summary: %s", e)
@@ -16,6 +16,7 @@ type WriterMessage struct {
 	Explanation string   `json:"explanation,omitempty"`
 	Summary     string   `json:"summary,omitempty"`
 	ScrapingID  int      `json:"scraping_id,omitempty"`
+	UserID      int      `json:"user_id,omitempty"`
 }
 
 // ImageMessage represents a task for the image extractor
@@ -107,6 +107,7 @@ func (s *ScraperService) ProcessMessage(msg domain.ScrapeMessage) {
 			completionMsg := domain.WriterMessage{
 				Type:       domain.MsgTypeScrapingComplete,
 				ScrapingID: msg.ScrapingID,
+				UserID:     msg.UserID,
 			}
 			if err := s.sqsClient.SendMessage(ctx, s.writerQueueURL, completionMsg); err != nil {
 				log.Printf("failed to send completion signal: %v", err)
@@ -293,6 +294,7 @@ func (s *ScraperService) ProcessMessage(msg domain.ScrapeMessage) {
 			URL:        link,
 			Depth:      msg.Depth - 1,
 			ScrapingID: msg.ScrapingID,
+			UserID:     msg.UserID,
 		}
 		err := s.sqsClient.SendMessage(ctx, s.inputQueueURL, newMsg)
 		if err != nil {
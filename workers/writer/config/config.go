@@ -11,6 +11,8 @@ type Config struct {
 	DatabaseURL   string
 	DynamoDBTable string
 	BatchSize     int
+	RedisHost     string
+	RedisPort     string
 }
 
 func Load() (*Config, error) {
@@ -25,6 +27,8 @@ func Load() (*Config, error) {
 		DatabaseURL:   os.Getenv("DATABASE_URL"),
 		DynamoDBTable: os.Getenv("DYNAMODB_TABLE"),
 		BatchSize:     batchSize,
+		RedisHost:     os.Getenv("REDIS_HOST"),
+		RedisPort:     os.Getenv("REDIS_PORT"),
 	}
 
 	if cfg.InputQueueURL == "" {
@@ -34,5 +38,12 @@ func Load() (*Config, error) {
 		return nil, fmt.Errorf("DATABASE_URL is required")
 	}
 
+	if cfg.RedisHost == "" {
+		cfg.RedisHost = "localhost"
+	}
+	if cfg.RedisPort == "" {
+		cfg.RedisPort = "6379"
+	}
+
 	return cfg, nil
 }
@@ -1,6 +1,19 @@
 package domain
 
+import "time"
+
 const (
+	// Redis key of the result version of a scraping, bumped on every write so
+	// that the API can tell whether its cached response is stale
+	RedisKeyVersion = "scrape:%d:version"
+	VersionTTL      = 30 * 24 * time.Hour
+
+	// Redis channel on which each write to a scraping is announced
+	RedisChannelProgress = "scrape:%d:progress"
+
+	// Redis sorted set of the in-flight scrapings of a user, capped by the API
+	RedisKeyInflight = "quota:%d:inflight"
+
 	// Job Statuses
 	StatusPending   = "PENDING"
 	StatusCompleted = "COMPLETED"
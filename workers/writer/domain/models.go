@@ -9,4 +9,5 @@ type WriterMessage struct {
 	S3Path      string   `json:"s3_path,omitempty"`
 	ScrapingID  int      `json:"scraping_id,omitempty"`
 	PageURL     string   `json:"page_url,omitempty"` // Link to parent page
+	UserID      int      `json:"user_id,omitempty"`
 }
@@ -52,9 +52,14 @@ func main() {
 	rawDynamoClient := dynamodb.NewFromConfig(awsCfg)
 	dynamoClient := repositories.NewDynamoDBClient(rawDynamoClient, cfg.DynamoDBTable)
 
+	redisClient := repositories.NewRedisClient(cfg.RedisHost, cfg.RedisPort)
+
 	writerService := services.NewWriterService(
 		services.WithDBRepository(dbRepo),
 		services.WithJobStatusRepository(dynamoClient),
+		services.WithVersionRepository(redisClient),
+		services.WithProgressPublisher(redisClient),
+		services.WithInflightRepository(redisClient),
 	)
 
 	log.Println("Writer worker started (DDD Refactor with community standards)")
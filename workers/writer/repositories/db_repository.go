@@ -118,9 +118,14 @@ func (repo *PostgresDBRepository) InsertPageSummary(msg domain.WriterMessage) er
 }
 
 func (repo *PostgresDBRepository) CompleteScraping(scrapingID int) error {
-	// Job completion is now handled entirely in DynamoDB.
-	// We keep this hook for now to satisfy the interface,
-	// but it no longer modifies PostgreSQL.
-	log.Printf("Postgres hook: Scraping %d marked complete (No DB changes)", scrapingID)
+	// The status lives in DynamoDB; completed_at lets the API reuse the results
+	// of recent scrapings of the same URL (POST /scrape with max_age).
+	result := repo.db.Exec(
+		"UPDATE scrapings SET completed_at = now() WHERE id = ? AND completed_at IS NULL",
+		scrapingID,
+	)
+	if result.Error != nil {
+		return fmt.Errorf("failed to record completion of scraping %d: %w", scrapingID, result.Error)
+	}
 	return nil
 }
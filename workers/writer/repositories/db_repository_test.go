@@ -132,7 +132,10 @@ func TestCompleteScraping_Success(t *testing.T) {
 	db, mock := newMockDB(t)
 	repo := NewDBRepository(db, 100)
 
-	// CompleteScraping is now a no-op hook that doesn't execute SQL
+	mock.ExpectExec(`UPDATE scrapings SET completed_at = now\(\) WHERE id = \$1 AND completed_at IS NULL`).
+		WithArgs(123).
+		WillReturnResult(sqlmock.NewResult(0, 1))
+
 	err := repo.CompleteScraping(123)
 	assert.NoError(t, err)
 
@@ -0,0 +1,45 @@
+package repositories
+
+import (
+	"context"
+	"fmt"
+	"time"
+
+	"github.com/redis/go-redis/v9"
+)
+
+type RedisClient struct {
+	client *redis.Client
+}
+
+func NewRedisClient(host, port string) *RedisClient {
+	rdb := redis.NewClient(&redis.Options{
+		Addr: fmt.Sprintf("%s:%s", host, port),
+	})
+	return &RedisClient{client: rdb}
+}
+
+// IncrWithTTL increments a counter and (re)sets its expiry in one round trip.
+func (r *RedisClient) IncrWithTTL(ctx context.Context, key string, ttl time.Duration) error {
+	pipe := r.client.TxPipeline()
+	pipe.Incr(ctx, key)
+	pipe.Expire(ctx, key, ttl)
+	if _, err := pipe.Exec(ctx); err != nil {
+		return fmt.Errorf("redis incr failure for key %s: %w", key, err)
+	}
+	return nil
+}
+
+func (r *RedisClient) Publish(ctx context.Context, channel string, message string) error {
+	if err := r.client.Publish(ctx, channel, message).Err(); err != nil {
+		return fmt.Errorf("redis publish failure for channel %s: %w", channel, err)
+	}
+	return nil
+}
+
+func (r *RedisClient) ZRem(ctx context.Context, key string, member string) error {
+	if err := r.client.ZRem(ctx, key, member).Err(); err != nil {
+		return fmt.Errorf("redis zrem failure for key %s: %w", key, err)
+	}
+	return nil
+}
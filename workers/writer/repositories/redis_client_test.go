@@ -0,0 +1,80 @@
+package repositories
+
+import (
+	"context"
+	"errors"
+	"testing"
+	"time"
+
+	"github.com/go-redis/redismock/v9"
+	"github.com/stretchr/testify/assert"
+)
+
+func TestRedisClient_IncrWithTTL(t *testing.T) {
+	db, mock := redismock.NewClientMock()
+	client := &RedisClient{client: db}
+	ctx := context.TODO()
+
+	// Success
+	mock.ExpectTxPipeline()
+	mock.ExpectIncr("key").SetVal(1)
+	mock.ExpectExpire("key", time.Hour).SetVal(true)
+	mock.ExpectTxPipelineExec()
+	err := client.IncrWithTTL(ctx, "key", time.Hour)
+	assert.NoError(t, err)
+
+	// Error
+	mock.ExpectTxPipeline()
+	mock.ExpectIncr("key").SetErr(errors.New("redis error"))
+	mock.ExpectExpire("key", time.Hour).SetVal(true)
+	mock.ExpectTxPipelineExec()
+	err = client.IncrWithTTL(ctx, "key", time.Hour)
+	assert.Error(t, err)
+	assert.Contains(t, err.Error(), "redis incr failure")
+
+	if err := mock.ExpectationsWereMet(); err != nil {
+		t.Errorf("there were unfulfilled expectations: %s", err)
+	}
+}
+
+func TestRedisClient_Publish(t *testing.T) {
+	db, mock := redismock.NewClientMock()
+	client := &RedisClient{client: db}
+	ctx := context.TODO()
+
+	// Success
+	mock.ExpectPublish("channel", "message").SetVal(1)
+	err := client.Publish(ctx, "channel", "message")
+	assert.NoError(t, err)
+
+	// Error
+	mock.ExpectPublish("channel", "message").SetErr(errors.New("redis error"))
+	err = client.Publish(ctx, "channel", "message")
+	assert.Error(t, err)
+	assert.Contains(t, err.Error(), "redis publish failure")
+
+	if err := mock.ExpectationsWereMet(); err != nil {
+		t.Errorf("there were unfulfilled expectations: %s", err)
+	}
+}
+
+func TestRedisClient_ZRem(t *testing.T) {
+	db, mock := redismock.NewClientMock()
+	client := &RedisClient{client: db}
+	ctx := context.TODO()
+
+	// Success
+	mock.ExpectZRem("key", "123").SetVal(1)
+	err := client.ZRem(ctx, "key", "123")
+	assert.NoError(t, err)
+
+	// Error
+	mock.ExpectZRem("key", "123").SetErr(errors.New("redis error"))
+	err = client.ZRem(ctx, "key", "123")
+	assert.Error(t, err)
+	assert.Contains(t, err.Error(), "redis zrem failure")
+
+	if err := mock.ExpectationsWereMet(); err != nil {
+		t.Errorf("there were unfulfilled expectations: %s", err)
+	}
+}
@@ -2,6 +2,7 @@ package services
 
 import (
 	"context"
+	"encoding/json"
 	"fmt"
 	"log"
 	"strconv"
@@ -23,9 +24,24 @@ type JobStatusRepository interface {
 	IncrementLinkCount(ctx context.Context, jobID string, increment int) error
 }
 
+type VersionRepository interface {
+	IncrWithTTL(ctx context.Context, key string, ttl time.Duration) error
+}
+
+type ProgressPublisher interface {
+	Publish(ctx context.Context, channel string, message string) error
+}
+
+type InflightRepository interface {
+	ZRem(ctx context.Context, key string, member string) error
+}
+
 type WriterService struct {
-	dbRepo     DBRepository
-	statusRepo JobStatusRepository
+	dbRepo            DBRepository
+	statusRepo        JobStatusRepository
+	versionRepo       VersionRepository
+	progressPublisher ProgressPublisher
+	inflightRepo      InflightRepository
 }
 
 // Functional Options Pattern
@@ -39,6 +55,18 @@ func WithJobStatusRepository(r JobStatusRepository) WriterOption {
 	return func(s *WriterService) { s.statusRepo = r }
 }
 
+func WithVersionRepository(r VersionRepository) WriterOption {
+	return func(s *WriterService) { s.versionRepo = r }
+}
+
+func WithProgressPublisher(p ProgressPublisher) WriterOption {
+	return func(s *WriterService) { s.progressPublisher = p }
+}
+
+func WithInflightRepository(r InflightRepository) WriterOption {
+	return func(s *WriterService) { s.inflightRepo = r }
+}
+
 func NewWriterService(opts ...WriterOption) *WriterService {
 	s := &WriterService{}
 	for _, opt := range opts {
@@ -68,8 +96,10 @@ func (s *WriterService) ProcessMessage(msg domain.WriterMessage) error {
 		log.Printf("Writer: Processing PageSummary for job %d, URL %s", msg.ScrapingID, msg.URL)
 		err = s.dbRepo.InsertPageSummary(msg)
 	} else if msg.Type == domain.MsgTypeScrapingComplete {
-		// 1. Optional Postgres hook (currently no-op/logging)
-		_ = s.dbRepo.CompleteScraping(msg.ScrapingID)
+		// 1. Completion time in Postgres, for the reuse of fresh results
+		if cErr := s.dbRepo.CompleteScraping(msg.ScrapingID); cErr != nil {
+			log.Printf("Error recording completion of job %d: %v", msg.ScrapingID, cErr)
+		}
 
 		// 2. Sync to DynamoDB if repository is available - THIS IS THE SOURCE OF TRUTH
 		if s.statusRepo != nil {
@@ -79,6 +109,9 @@ func (s *WriterService) ProcessMessage(msg domain.WriterMessage) error {
 				log.Printf("Error syncing status to DynamoDB for job %s: %v", jobID, dErr)
 			}
 		}
+
+		// 3. Free the slot of the job in the quota of its user
+		s.releaseInflight(ctx, msg)
 	} else {
 		return nil
 	}
@@ -86,5 +119,49 @@ func (s *WriterService) ProcessMessage(msg domain.WriterMessage) error {
 	if err != nil {
 		return fmt.Errorf("failed to process message type %s: %w", msg.Type, err)
 	}
+
+	s.bumpVersion(ctx, msg.ScrapingID)
+	s.publishProgress(ctx, msg)
 	return nil
 }
+
+// bumpVersion marks the cached API responses of a scraping as stale.
+// A failure only delays the refresh of the cache, so it does not fail the message.
+func (s *WriterService) bumpVersion(ctx context.Context, scrapingID int) {
+	if s.versionRepo == nil {
+		return
+	}
+	key := fmt.Sprintf(domain.RedisKeyVersion, scrapingID)
+	if err := s.versionRepo.IncrWithTTL(ctx, key, domain.VersionTTL); err != nil {
+		log.Printf("Error bumping result version for job %d: %v", scrapingID, err)
+	}
+}
+
+// releaseInflight removes a completed scraping from the in-flight scrapings of its user.
+// The API drops entries that are never removed once they get stale, so failures are only logged.
+func (s *WriterService) releaseInflight(ctx context.Context, msg domain.WriterMessage) {
+	if s.inflightRepo == nil || msg.UserID == 0 {
+		return
+	}
+	key := fmt.Sprintf(domain.RedisKeyInflight, msg.UserID)
+	if err := s.inflightRepo.ZRem(ctx, key, strconv.Itoa(msg.ScrapingID)); err != nil {
+		log.Printf("Error releasing quota of job %d: %v", msg.ScrapingID, err)
+	}
+}
+
+// publishProgress announces a write to the clients following the scraping
+// through the API's event stream. Nobody may be listening, so failures are only logged.
+func (s *WriterService) publishProgress(ctx context.Context, msg domain.WriterMessage) {
+	if s.progressPublisher == nil {
+		return
+	}
+	event, err := json.Marshal(map[string]string{"type": msg.Type, "url": msg.URL})
+	if err != nil {
+		log.Printf("Error encoding progress for job %d: %v", msg.ScrapingID, err)
+		return
+	}
+	channel := fmt.Sprintf(domain.RedisChannelProgress, msg.ScrapingID)
+	if err := s.progressPublisher.Publish(ctx, channel, string(event)); err != nil {
+		log.Printf("Error publishing progress for job %d: %v", msg.ScrapingID, err)
+	}
+}
@@ -3,6 +3,7 @@ package services
 import (
 	"context"
 	"testing"
+	"time"
 	"writer-worker/domain"
 
 	"github.com/aws/aws-sdk-go-v2/service/sqs"
@@ -54,6 +55,33 @@ func (m *MockJobStatusRepository) IncrementLinkCount(ctx context.Context, jobID
 	return args.Error(0)
 }
 
+type MockVersionRepository struct {
+	mock.Mock
+}
+
+func (m *MockVersionRepository) IncrWithTTL(ctx context.Context, key string, ttl time.Duration) error {
+	args := m.Called(ctx, key, ttl)
+	return args.Error(0)
+}
+
+type MockProgressPublisher struct {
+	mock.Mock
+}
+
+func (m *MockProgressPublisher) Publish(ctx context.Context, channel string, message string) error {
+	args := m.Called(ctx, channel, message)
+	return args.Error(0)
+}
+
+type MockInflightRepository struct {
+	mock.Mock
+}
+
+func (m *MockInflightRepository) ZRem(ctx context.Context, key string, member string) error {
+	args := m.Called(ctx, key, member)
+	return args.Error(0)
+}
+
 type MockSQSClient struct {
 	mock.Mock
 }
@@ -198,6 +226,27 @@ func TestProcessMessage_DynamoFullError(t *testing.T) {
 	mockStatusRepo.AssertExpectations(t)
 }
 
+func TestProcessMessage_ScrapingComplete_ReleasesInflight(t *testing.T) {
+	mockDbRepo := new(MockDBRepository)
+	mockInflightRepo := new(MockInflightRepository)
+	s := NewWriterService(
+		WithDBRepository(mockDbRepo),
+		WithInflightRepository(mockInflightRepo),
+	)
+
+	mockDbRepo.On("CompleteScraping", mock.Anything).Return(nil)
+	mockInflightRepo.On("ZRem", mock.Anything, "quota:7:inflight", "123").Return(assert.AnError)
+
+	err := s.ProcessMessage(domain.WriterMessage{Type: "scraping_complete", ScrapingID: 123, UserID: 7})
+	assert.NoError(t, err) // Stale entries expire on their own
+	mockInflightRepo.AssertExpectations(t)
+
+	// Anonymous scrapings have no quota
+	err = s.ProcessMessage(domain.WriterMessage{Type: "scraping_complete", ScrapingID: 124})
+	assert.NoError(t, err)
+	mockInflightRepo.AssertNumberOfCalls(t, "ZRem", 1)
+}
+
 func TestProcessMessage_PageData_IncrementsLinks(t *testing.T) {
 	mockDbRepo := new(MockDBRepository)
 	mockStatusRepo := new(MockJobStatusRepository)
@@ -222,3 +271,70 @@ func TestProcessMessage_PageData_IncrementsLinks(t *testing.T) {
 	mockDbRepo.AssertExpectations(t)
 	mockStatusRepo.AssertExpectations(t)
 }
+
+func TestProcessMessage_BumpsVersion(t *testing.T) {
+	mockRepo := new(MockDBRepository)
+	mockVersionRepo := new(MockVersionRepository)
+	s := NewWriterService(
+		WithDBRepository(mockRepo),
+		WithVersionRepository(mockVersionRepo),
+	)
+
+	msg := domain.WriterMessage{
+		Type:       "page_summary",
+		Summary:    "A late summary",
+		ScrapingID: 123,
+	}
+
+	mockRepo.On("InsertPageSummary", msg).Return(nil)
+	mockVersionRepo.On("IncrWithTTL", mock.Anything, "scrape:123:version", domain.VersionTTL).Return(assert.AnError)
+
+	err := s.ProcessMessage(msg)
+
+	assert.NoError(t, err) // A stale cache must not fail the write
+	mockVersionRepo.AssertExpectations(t)
+}
+
+func TestProcessMessage_RepoErrorDoesNotBumpVersion(t *testing.T) {
+	mockRepo := new(MockDBRepository)
+	mockVersionRepo := new(MockVersionRepository)
+	s := NewWriterService(
+		WithDBRepository(mockRepo),
+		WithVersionRepository(mockVersionRepo),
+	)
+
+	msg := domain.WriterMessage{
+		Type:       "image_explanation",
+		ScrapingID: 123,
+	}
+
+	mockRepo.On("InsertImageExplanation", msg).Return(assert.AnError)
+
+	err := s.ProcessMessage(msg)
+
+	assert.Error(t, err)
+	mockVersionRepo.AssertNotCalled(t, "IncrWithTTL", mock.Anything, mock.Anything, mock.Anything)
+}
+
+func TestProcessMessage_PublishesProgress(t *testing.T) {
+	mockRepo := new(MockDBRepository)
+	mockPublisher := new(MockProgressPublisher)
+	s := NewWriterService(
+		WithDBRepository(mockRepo),
+		WithProgressPublisher(mockPublisher),
+	)
+
+	msg := domain.WriterMessage{
+		Type:       "page_data",
+		URL:        "http://example.com",
+		ScrapingID: 123,
+	}
+
+	mockRepo.On("InsertPageData", msg).Return(nil)
+	mockPublisher.On("Publish", mock.Anything, "scrape:123:progress", `{"type":"page_data","url":"http://example.com"}`).Return(assert.AnError)
+
+	err := s.ProcessMessage(msg)
+
+	assert.NoError(t, err) // Progress is best effort
+	mockPublisher.AssertExpectations(t)
+}